@@ -162,8 +162,8 @@ class WikiArenaApp {
         
         this.taskManager.createTask(gameConfigs);
         
-        // Connect to all games in the task using connection manager
-        await this.connectionManager.connectToTask(game_ids);
+        // Connect to all games in the task over one task socket
+        await this.connectionManager.connectToTask(game_ids, task_id);
         
         console.log(`🔌 Connected to custom task ${task_id} with ${game_ids.length} games`);
       } else {
@@ -37,13 +37,15 @@ export class TaskConnectionManager {
   // Connection Lifecycle Management
   // =============================================================================
 
-  async connectToTask(gameIds: string[]): Promise<void> {
+  async connectToTask(gameIds: string[], taskId?: string): Promise<void> {
     console.log(`🔌 Connecting to task with ${gameIds.length} games:`, gameIds);
     
     this.notifyStatusListeners(); // Initial status update
     
-    // Create connection promises for all games
-    const connectionPromises = gameIds.map(gameId => this.connectToGame(gameId));
+    // One task socket covers every game; without a task id connect to each game
+    const connectionPromises = taskId
+      ? [this.connectToTaskChannel(taskId, gameIds)]
+      : gameIds.map(gameId => this.connectToGame(gameId));
     
     try {
       // Attempt to connect to all games simultaneously
@@ -108,6 +110,62 @@ export class TaskConnectionManager {
     }
   }
 
+  private async connectToTaskChannel(taskId: string, gameIds: string[]): Promise<void> {
+    const taskWebSocketUrl = `ws://localhost:8000/api/tasks/${taskId}/ws`;
+    
+    console.log(`🔌 Connecting to task ${taskId}: ${taskWebSocketUrl}`);
+    
+    const client = new WebSocketClient({
+      url: taskWebSocketUrl,
+      ...this.baseConfig
+    });
+    
+    client.onMessage(event => {
+      console.log(`📨 Received event for task ${taskId}:`, event.type);
+      this.routeTaskEvent(gameIds, event);
+    });
+    
+    client.onStatusChange(status => {
+      console.log(`📊 Task ${taskId} status:`, status.connected ? 'connected' : 'disconnected');
+      this.notifyStatusListeners();
+    });
+    
+    // Every game shares the task socket, so per-game status reflects it
+    gameIds.forEach(gameId => this.connections.set(gameId, client));
+    
+    client.connect();
+    await this.waitForConnection(client, taskId);
+    
+    console.log(`✅ Successfully connected to task ${taskId}`);
+  }
+
+  private routeTaskEvent(gameIds: string[], event: GameEvent): void {
+    const taskEvent = event as any;
+    
+    // The task snapshot holds one game snapshot per game
+    if (event.type === 'CONNECTION_ESTABLISHED' && taskEvent.complete_state?.games) {
+      gameIds.forEach(gameId => {
+        this.eventHandler(gameId, {
+          type: 'CONNECTION_ESTABLISHED',
+          game_id: gameId,
+          complete_state: taskEvent.complete_state.games[gameId] ?? undefined
+        });
+      });
+      return;
+    }
+    
+    if (taskEvent.game_id && gameIds.includes(taskEvent.game_id)) {
+      this.eventHandler(taskEvent.game_id, event);
+    } else if (Array.isArray(taskEvent.game_ids)) {
+      taskEvent.game_ids
+        .filter((gameId: string) => gameIds.includes(gameId))
+        .forEach((gameId: string) => this.eventHandler(gameId, event));
+    } else if (gameIds.length > 0) {
+      // Task-level events (TASK_ENDED, CONNECTION_RESUMED)
+      this.eventHandler(gameIds[0], event);
+    }
+  }
+
   private async waitForConnection(client: WebSocketClient, gameId: string, timeoutMs: number = 10000): Promise<void> {
     return new Promise((resolve, reject) => {
       const timeout = setTimeout(() => {
@@ -145,8 +203,8 @@ export class TaskConnectionManager {
   disconnectFromTask(): void {
     console.log(`🔌 Disconnecting from task with ${this.connections.size} games`);
     
-    this.connections.forEach((client, gameId) => {
-      console.log(`🔌 Disconnecting from game ${gameId}`);
+    new Set(this.connections.values()).forEach(client => {
+      console.log(`🔌 Disconnecting from ${client.getUrl()}`);
       client.disconnect();
     });
     
@@ -88,6 +88,9 @@ export class TaskManager {
       case 'CONNECTION_ESTABLISHED':
         this.handleConnectionEstablished(gameId, event as ConnectionEstablishedEvent);
         break;
+      case 'CONNECTION_RESUMED':
+        // Missed deltas follow; nothing to rebuild
+        break;
       case 'GAME_MOVE_COMPLETED':
         this.handleMoveCompleted(gameId, event as GameMoveCompletedEvent);
         break;
@@ -234,7 +237,7 @@ export class TaskManager {
     // there also may be an error move
 
     const gameSequence = this.task.games.get(gameId)!;
-    gameSequence.status = event.state.status;
+    gameSequence.status = event.final_status;
     
     this.updateTaskProgress();
     this.notifyListeners();
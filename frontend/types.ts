@@ -91,6 +91,7 @@ export interface BaseGameEvent {
   type: string;
   game_id: string;
   timestamp?: string;
+  seq?: number; // Per-game sequence number; snapshots carry the seq they reflect
 }
 
 export interface ConnectionEstablishedEvent extends BaseGameEvent {
@@ -132,6 +133,8 @@ export interface GameMoveCompletedEvent extends BaseGameEvent {
 
 export interface OptimalPathsUpdatedEvent extends BaseGameEvent {
   type: 'OPTIMAL_PATHS_UPDATED';
+  task_id?: string;
+  game_ids?: string[]; // Set when sent for a whole task
   from_page_title?: string;
   to_page_title?: string;
   optimal_paths: string[][];
@@ -140,32 +143,15 @@ export interface OptimalPathsUpdatedEvent extends BaseGameEvent {
 
 export interface GameEndedEvent extends BaseGameEvent {
   type: 'GAME_ENDED';
-  state: { // TODO(hunter): what do we actually need here?
-    game_id: string;
-    config: {
-      start_page_title: string;
-      target_page_title: string;
-      max_steps: number;
-    };
-    current_page?: {
-      title: string;
-      url: string;
-      text: string;
-      links: string[];
-    };
-    status: string;
-    error_message?: string;
-    steps: number;
-    move_history: Array<{
-      step: number;
-      from_page_title: string;
-      to_page_title: string;
-    }>;
-    context: Array<{
-      role: string;
-      content: string;
-    }>;
-  };
+  final_status: string;
+  total_steps: number;
+  error_message?: string | null;
+}
+
+// Sent instead of CONNECTION_ESTABLISHED when a reconnect resumes from since_seq;
+// the missed deltas follow
+export interface ConnectionResumedEvent extends BaseGameEvent {
+  type: 'CONNECTION_RESUMED';
 }
 
 // TODO(hunter): should this be a different event type since it is above game level? (has task_id)
@@ -177,6 +163,7 @@ export interface TaskEndedEvent extends BaseGameEvent {
 
 export type GameEvent = 
   | ConnectionEstablishedEvent
+  | ConnectionResumedEvent
   | GameMoveCompletedEvent 
   | OptimalPathsUpdatedEvent 
   | GameEndedEvent
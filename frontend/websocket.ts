@@ -11,6 +11,7 @@ export class WebSocketClient {
   private reconnectTimeout: number | null = null;
   private messageHandlers: Set<(event: GameEvent) => void> = new Set();
   private statusHandlers: Set<(status: ConnectionStatus) => void> = new Set();
+  private lastSeq: number | null = null; // Last applied seq, used to resume after reconnecting
 
   constructor(config: WebSocketConfig) {
     this.config = {
@@ -34,6 +35,7 @@ export class WebSocketClient {
   updateUrl(newUrl: string): void {
     console.log(`🔄 Updating WebSocket URL from ${this.config.url} to ${newUrl}`);
     this.config.url = newUrl;
+    this.lastSeq = null;
     
     // If currently connected, disconnect first
     if (this.isConnected()) {
@@ -57,10 +59,13 @@ export class WebSocketClient {
       error: null 
     });
 
-    console.log(`🔌 Connecting to WebSocket: ${this.config.url}`);
+    const url = this.lastSeq === null
+      ? this.config.url
+      : `${this.config.url}${this.config.url.includes('?') ? '&' : '?'}since_seq=${this.lastSeq}`;
+    console.log(`🔌 Connecting to WebSocket: ${url}`);
 
     try {
-      this.socket = new WebSocket(this.config.url);
+      this.socket = new WebSocket(url);
       this.setupSocketEventHandlers();
     } catch (error) {
       console.error('❌ Failed to create WebSocket:', error);
@@ -156,6 +161,18 @@ export class WebSocketClient {
         return;
       }
 
+      // Snapshots and resumes set the seq; deltas at or below it were already applied
+      if (typeof gameEvent.seq === 'number') {
+        if (gameEvent.type === 'CONNECTION_ESTABLISHED' || gameEvent.type === 'CONNECTION_RESUMED') {
+          this.lastSeq = gameEvent.seq;
+        } else if (this.lastSeq !== null && gameEvent.seq <= this.lastSeq) {
+          console.log('⏭️ Skipping already applied event:', gameEvent.type, gameEvent.seq);
+          return;
+        } else {
+          this.lastSeq = gameEvent.seq;
+        }
+      }
+
       console.log('📨 Received WebSocket event:', gameEvent.type, gameEvent);
       
       // Notify all message handlers
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import secrets
+import threading
+from enum import Enum
+from typing import Annotated, Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from backend.config import config
+from backend.coordinators.game_coordinator import GameCoordinator
+from backend.dependencies import get_game_coordinator
+from backend.utils.profiling import LoopLagMonitor, SamplingProfiler, TaskAgeTracker
+from wiki_arena import spans
+from wiki_arena.link_store import games_memory, link_store
+
+logger = logging.getLogger(__name__)
+
+def require_admin(x_admin_token: Annotated[Optional[str], Header()] = None):
+    """Check the X-Admin-Token header against ADMIN_TOKEN; without one the endpoints are closed unless ADMIN_ENDPOINTS_OPEN is set."""
+    if config.admin_token:
+        if not (x_admin_token and secrets.compare_digest(x_admin_token, config.admin_token)):
+            raise HTTPException(status_code=403, detail="Admin token required")
+    elif not config.admin_endpoints_open:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN or ADMIN_ENDPOINTS_OPEN")
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+# One profile at a time: concurrent samplers would slow the loop they measure
+_profile_lock = asyncio.Lock()
+
+class ProfileFormat(str, Enum):
+    COLLAPSED = "collapsed"
+    SPEEDSCOPE = "speedscope"
+
+def get_loop_lag_monitor(request: Request) -> Optional[LoopLagMonitor]:
+    return getattr(request.app.state, "loop_lag_monitor", None)
+
+def get_task_tracker(request: Request) -> Optional[TaskAgeTracker]:
+    return getattr(request.app.state, "task_tracker", None)
+
+@router.post("/profile")
+async def profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    format: ProfileFormat = Query(ProfileFormat.COLLAPSED),
+    all_threads: bool = Query(False, description="Sample every thread, not only the event loop's"),
+):
+    """
+    Sample the event loop thread's stacks for a few seconds and return the profile.
+
+    The sampler runs in its own thread, so the loop keeps serving (and is
+    profiled) meanwhile. Collapsed stacks load in flamegraph.pl or speedscope;
+    the speedscope format loads directly at https://www.speedscope.app.
+    """
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    async with _profile_lock:
+        profiler = SamplingProfiler(
+            thread_id=threading.get_ident(), interval_s=interval_ms / 1000, all_threads=all_threads
+        )
+        logger.info(f"Profiling for {seconds}s every {interval_ms}ms")
+        await asyncio.to_thread(profiler.run, seconds)
+        logger.info(f"Profile done: {profiler.samples} samples, {len(profiler.stacks)} distinct stacks")
+
+    if format == ProfileFormat.SPEEDSCOPE:
+        return JSONResponse(profiler.speedscope(name=f"wiki-arena {config.worker_id}"))
+    return PlainTextResponse(profiler.collapsed())
+
+@router.put("/span-sample-rate")
+async def set_span_sample_rate(rate: float = Query(..., ge=0.0, le=1.0), reset: bool = False) -> Dict[str, Any]:
+    """Change the share of spans timed at runtime, optionally clearing the histograms."""
+    spans.sample_rate = rate
+    if reset:
+        spans.reset()
+    logger.info(f"Span sample rate set to {rate}{' (histograms reset)' if reset else ''}")
+    return {"sample_rate": spans.sample_rate}
+
+@router.get("/loop-lag")
+async def loop_lag(monitor: Annotated[Optional[LoopLagMonitor], Depends(get_loop_lag_monitor)]) -> Dict[str, Any]:
+    """Event loop lag (timer drift) over the recent window."""
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Loop lag monitor is disabled")
+    return monitor.get_stats()
+
+@router.get("/tasks")
+async def pending_tasks(
+    tracker: Annotated[Optional[TaskAgeTracker], Depends(get_task_tracker)],
+    limit: int = Query(50, ge=1, le=1000),
+    prefix: Optional[str] = Query(None, description="Only tasks whose name starts with this, e.g. game: or solve-"),
+) -> Dict[str, Any]:
+    """The oldest pending asyncio tasks, with where each one is waiting."""
+    tracker = tracker or TaskAgeTracker()  # without the task factory, tasks are listed without ages
+    return {**tracker.get_stats(), "tasks": tracker.pending_tasks(limit=limit, prefix=prefix)}
+
+@router.get("/memory")
+async def game_memory(
+    coordinator: Annotated[GameCoordinator, Depends(get_game_coordinator)],
+    limit: int = Query(50, ge=1, le=1000),
+) -> Dict[str, Any]:
+    """
+    Approximate memory held by each active game's state, largest first.
+
+    own_bytes is held by the game alone; page listings reference links interned
+    in the shared link store (shared_bytes), and rendered_bytes is what they
+    would take stored as text.
+    """
+    report = games_memory(game.state for game in coordinator.active_games.values() if game.state)
+    return {**report, "games": report["games"][:limit], "active_games": len(report["games"]), "link_store": link_store.get_stats()}
@@ -1,37 +1,41 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect, Query, Depends
-from typing import Dict, Any, Annotated
+from typing import Dict, Any, Annotated, Optional
 import logging
 
 from wiki_arena.models import GameState
 from backend.coordinators.game_coordinator import GameCoordinator
 from backend.websockets.game_hub import websocket_manager
-from backend.dependencies import get_game_coordinator
+from backend.dependencies import get_game_coordinator, get_worker_affinity
+from backend.services.worker_affinity import WorkerAffinity
 
 router = APIRouter(prefix="/api/games", tags=["games"])
 logger = logging.getLogger(__name__)
 
 GameCoordinatorDep = Annotated[GameCoordinator, Depends(get_game_coordinator)]
+WorkerAffinityDep = Annotated[Optional[WorkerAffinity], Depends(get_worker_affinity)]
+
+async def _game_not_found(game_id: str, affinity: Optional[WorkerAffinity]) -> HTTPException:
+    """404, or 421 naming the worker if another worker runs the game."""
+    misdirected = await affinity.misdirected("game", game_id) if affinity else None
+    return misdirected or HTTPException(
+        status_code=404,
+        detail=f"Game {game_id} not found"
+    )
 
 @router.get("/{game_id}", response_model=GameState)
-async def get_game_state(game_id: str, coordinator: GameCoordinatorDep) -> GameState:
+async def get_game_state(game_id: str, coordinator: GameCoordinatorDep, affinity: WorkerAffinityDep) -> GameState:
     """Get the current state of a game."""
     state = await coordinator.get_game_state(game_id)
     if not state:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Game {game_id} not found"
-        )
+        raise await _game_not_found(game_id, affinity)
     return state
 
 @router.get("/{game_id}/status")
-async def get_game_status(game_id: str, coordinator: GameCoordinatorDep) -> Dict[str, Any]:
+async def get_game_status(game_id: str, coordinator: GameCoordinatorDep, affinity: WorkerAffinityDep) -> Dict[str, Any]:
     """Get just the status of a game (lightweight endpoint for polling)."""
     state = await coordinator.get_game_state(game_id)
     if not state:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Game {game_id} not found"
-        )
+        raise await _game_not_found(game_id, affinity)
     return {
         "game_id": state.game_id,
         "status": state.status.value,
@@ -40,9 +44,9 @@ async def get_game_status(game_id: str, coordinator: GameCoordinatorDep) -> Dict
     }
 
 @router.websocket("/{game_id}/ws")
-async def game_websocket(websocket: WebSocket, game_id: str):
-    """WebSocket endpoint for real-time game updates."""
-    await websocket_manager.connect(websocket, game_id)
+async def game_websocket(websocket: WebSocket, game_id: str, since_seq: Optional[int] = Query(None)):
+    """WebSocket endpoint for real-time game updates. Pass since_seq to resume after a reconnect."""
+    await websocket_manager.connect(websocket, game_id, since_seq)
     logger.info(f"WebSocket connected for game {game_id}")
     
     try:
@@ -81,8 +85,10 @@ async def list_active_games(coordinator: GameCoordinatorDep) -> Dict[str, Any]:
         
         return {
             "active_games": active_games,
+            "queued_games": coordinator.scheduler.get_queue(),
             "websocket_connections": websocket_connections,
-            "total_games": len(active_games)
+            "total_games": len(active_games),
+            "scheduler": coordinator.scheduler.get_stats()
         }
         
     except Exception as e:
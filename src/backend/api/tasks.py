@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any, Annotated
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect, Query
+from typing import Dict, Any, Annotated, Optional
 import logging
 
 from backend.models.api_models import (
@@ -8,13 +8,16 @@ from backend.models.api_models import (
     ErrorResponse
 )
 from backend.coordinators.task_coordinator import TaskCoordinator
-from backend.dependencies import get_task_coordinator
+from backend.dependencies import get_task_coordinator, get_worker_affinity
+from backend.services.worker_affinity import WorkerAffinity
+from backend.websockets.game_hub import websocket_manager
 from backend.exceptions import PageNotFoundException, WikiServiceUnavailableException, InvalidModelNameException
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 logger = logging.getLogger(__name__)
 
 TaskCoordinatorDep = Annotated[TaskCoordinator, Depends(get_task_coordinator)]
+WorkerAffinityDep = Annotated[Optional[WorkerAffinity], Depends(get_worker_affinity)]
 
 @router.post("", response_model=CreateTaskResponse)
 async def create_task(request: CreateTaskRequest, coordinator: TaskCoordinatorDep) -> CreateTaskResponse:
@@ -36,16 +39,46 @@ async def create_task(request: CreateTaskRequest, coordinator: TaskCoordinatorDe
         )
 
 @router.get("/{task_id}")
-async def get_task_info(task_id: str, coordinator: TaskCoordinatorDep) -> Dict[str, Any]:
+async def get_task_info(task_id: str, coordinator: TaskCoordinatorDep, affinity: WorkerAffinityDep) -> Dict[str, Any]:
     """Get basic information about a task."""
     task_info = await coordinator.get_task_info(task_id)
     if not task_info:
+        misdirected = await affinity.misdirected("task", task_id) if affinity else None
+        if misdirected:
+            raise misdirected
         raise HTTPException(
             status_code=404,
             detail=f"Task {task_id} not found"
         )
     return task_info
 
+@router.websocket("/{task_id}/ws")
+async def task_websocket(websocket: WebSocket, task_id: str, since_seq: Optional[int] = Query(None)):
+    """WebSocket endpoint for real-time updates of every game in a task. Pass since_seq to resume after a reconnect."""
+    await websocket_manager.connect_task(websocket, task_id, since_seq)
+    logger.info(f"WebSocket connected for task {task_id}")
+    
+    try:
+        while True:
+            try:
+                message = await websocket.receive_text()
+                logger.debug(f"Received WebSocket message for task {task_id}: {message}")
+                
+                if message == "ping":
+                    await websocket.send_text("pong")
+                
+            except WebSocketDisconnect:
+                logger.info(f"WebSocket disconnected for task {task_id}")
+                break
+            except Exception as e:
+                logger.error(f"Error in WebSocket for task {task_id}: {e}")
+                break
+                
+    except Exception as e:
+        logger.error(f"WebSocket connection error for task {task_id}: {e}")
+    finally:
+        await websocket_manager.disconnect(websocket)
+
 @router.get("")
 async def list_active_tasks(coordinator: TaskCoordinatorDep) -> Dict[str, Any]:
     """List all active tasks."""
@@ -0,0 +1,26 @@
+"""
+Message brokers that let several backend workers share games and WebSocket clients.
+"""
+
+from typing import Optional
+
+from backend.broker.base import Broker, MessageCallback
+from backend.broker.memory import InProcessBroker
+from backend.broker.redis_broker import RedisBroker, RespConnection
+
+def create_broker(url: Optional[str]) -> Broker:
+    """Create the broker for a URL: redis://... for a Redis-protocol server, memory:// or None for in-process."""
+    if not url or url.startswith("memory://"):
+        return InProcessBroker()
+    if url.startswith("redis://"):
+        return RedisBroker(url)
+    raise ValueError(f"Unsupported broker URL: {url}")
+
+__all__ = [
+    "Broker",
+    "MessageCallback",
+    "InProcessBroker",
+    "RedisBroker",
+    "RespConnection",
+    "create_broker",
+]
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional
+
+# Called with (channel, message) for every message published on a matching channel
+MessageCallback = Callable[[str, str], Awaitable[None]]
+
+class Broker(ABC):
+    """
+    Message broker shared by the backend workers.
+
+    Provides pub/sub with glob channel patterns (used to fan WebSocket deltas out
+    to every worker) and a small key-value store with expiry (used for game
+    ownership and snapshots of games owned by other workers).
+    """
+
+    async def start(self):
+        """Connect to the broker."""
+
+    async def stop(self):
+        """Disconnect from the broker."""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        """Publish a message to every subscriber of a matching pattern."""
+
+    @abstractmethod
+    async def subscribe(self, pattern: str, callback: MessageCallback) -> None:
+        """Call `callback` for each message on channels matching a glob pattern, in publish order."""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_s: Optional[float] = None) -> None:
+        """Store a value, optionally expiring after ttl_s seconds."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Get a stored value, or None if missing or expired."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete a stored value."""
+
+    @abstractmethod
+    async def claim(self, key: str, owner: str, ttl_s: float) -> str:
+        """
+        Claim a key for `owner` unless someone else holds it.
+
+        Claiming a key you already hold extends it. Returns the holder after the
+        call, so the claim succeeded iff the result equals `owner`.
+        """
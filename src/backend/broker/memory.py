@@ -0,0 +1,55 @@
+import fnmatch
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from backend.broker.base import Broker, MessageCallback
+
+logger = logging.getLogger(__name__)
+
+class InProcessBroker(Broker):
+    """
+    Broker for a single process: subscribers are called directly on publish.
+
+    The default when no broker URL is configured, and handy for running several
+    managers against each other in tests.
+    """
+
+    def __init__(self):
+        self._subscriptions: List[Tuple[str, MessageCallback]] = []
+        # key -> (value, expiry as time.monotonic() or None)
+        self._values: Dict[str, Tuple[str, Optional[float]]] = {}
+
+    async def publish(self, channel: str, message: str) -> None:
+        for pattern, callback in list(self._subscriptions):
+            if fnmatch.fnmatchcase(channel, pattern):
+                try:
+                    await callback(channel, message)
+                except Exception as e:
+                    logger.error(f"Broker subscriber for {pattern} failed: {e}", exc_info=True)
+
+    async def subscribe(self, pattern: str, callback: MessageCallback) -> None:
+        self._subscriptions.append((pattern, callback))
+
+    async def set(self, key: str, value: str, ttl_s: Optional[float] = None) -> None:
+        self._values[key] = (value, time.monotonic() + ttl_s if ttl_s is not None else None)
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    async def claim(self, key: str, owner: str, ttl_s: float) -> str:
+        holder = await self.get(key)
+        if holder is None or holder == owner:
+            await self.set(key, owner, ttl_s)
+            return owner
+        return holder
@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from backend.broker.base import Broker, MessageCallback
+from backend.exceptions import BrokerException
+
+logger = logging.getLogger(__name__)
+
+class RespConnection:
+    """One connection speaking the Redis protocol (RESP2)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int, timeout_s: float = 5.0) -> "RespConnection":
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout_s)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise BrokerException(f"Could not connect to broker at {host}:{port}: {e}")
+        return cls(reader, writer)
+
+    @staticmethod
+    def encode(*args: Any) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def send(self, *args: Any):
+        self.writer.write(self.encode(*args))
+        await self.writer.drain()
+
+    async def read_reply(self) -> Any:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Broker closed the connection")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body.decode()
+        if prefix == b"-":
+            raise BrokerException(body.decode())
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            return (await self.reader.readexactly(length + 2))[:-2].decode()
+        if prefix == b"*":
+            count = int(body)
+            if count < 0:
+                return None
+            return [await self.read_reply() for _ in range(count)]
+        raise BrokerException(f"Unexpected reply from broker: {line!r}")
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (OSError, ConnectionError):
+            pass
+
+class RedisBroker(Broker):
+    """
+    Broker backed by a Redis-protocol server (redis://[:password@]host[:port][/db]).
+
+    Commands share one connection, serialized by a lock; pattern subscriptions
+    use a second connection read by a background task. Messages are queued to
+    a dispatcher task that calls the callbacks in the order messages arrive, so
+    a slow callback doesn't stop the reading (messages beyond dispatch_queue_size
+    are dropped).
+
+    A lost connection is reopened: the command connection on the next command
+    (a failed command raises BrokerException), the subscription connection by
+    its reader, which then subscribes to every pattern again. Reconnects back
+    off exponentially up to max_backoff_s. Messages published while the
+    subscription connection is down are lost.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        connect_timeout_s: float = 5.0,
+        max_backoff_s: float = 5.0,
+        dispatch_queue_size: int = 10000,
+    ):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.connect_timeout_s = connect_timeout_s
+        self.max_backoff_s = max_backoff_s
+
+        self._started = False
+        self._conn: Optional[RespConnection] = None
+        self._lock = asyncio.Lock()
+        # No reconnect attempts before this time.monotonic() after a failed one
+        self._retry_at = 0.0
+        self._backoff_s = 0.0
+        self._sub: Optional[RespConnection] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._messages: asyncio.Queue = asyncio.Queue(dispatch_queue_size)
+        self._callbacks: Dict[str, List[MessageCallback]] = {}
+        self._pending_subscribes: Dict[str, asyncio.Future] = {}
+        self.reconnects = 0
+        self.dropped_messages = 0
+
+    async def _open(self, select_db: bool = False) -> RespConnection:
+        conn = await RespConnection.open(self.host, self.port, self.connect_timeout_s)
+        try:
+            if self.password:
+                await conn.send("AUTH", self.password)
+                await conn.read_reply()
+            if select_db and self.db:
+                await conn.send("SELECT", self.db)
+                await conn.read_reply()
+        except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+            await conn.close()
+            raise BrokerException(f"Could not connect to broker at {self.host}:{self.port}: {e}")
+        return conn
+
+    def _next_backoff(self, backoff_s: float) -> float:
+        return min(self.max_backoff_s, backoff_s * 2 or 0.1)
+
+    async def start(self):
+        self._conn = await self._open(select_db=True)
+        self._started = True
+        logger.info(f"Connected to broker at {self.host}:{self.port}/{self.db}")
+
+    async def stop(self):
+        self._started = False
+        for task in (self._reader, self._dispatcher):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._reader = self._dispatcher = None
+        for conn in (self._sub, self._conn):
+            if conn:
+                await conn.close()
+        self._sub = self._conn = None
+
+    async def _command(self, *args: Any) -> Any:
+        if not self._started:
+            raise BrokerException("Broker is not started")
+        async with self._lock:
+            if self._conn is None:
+                if time.monotonic() < self._retry_at:
+                    raise BrokerException(f"Broker connection is down, not retrying {args[0]} yet")
+                try:
+                    self._conn = await self._open(select_db=True)
+                except BrokerException:
+                    self._backoff_s = self._next_backoff(self._backoff_s)
+                    self._retry_at = time.monotonic() + self._backoff_s
+                    raise
+                self._backoff_s = 0.0
+                self.reconnects += 1
+                logger.info(f"Reconnected to broker at {self.host}:{self.port}/{self.db}")
+            try:
+                await self._conn.send(*args)
+                return await self._conn.read_reply()
+            except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+                # Reopened by the next command
+                await self._conn.close()
+                self._conn = None
+                raise BrokerException(f"Broker connection failed during {args[0]}: {e}")
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._command("PUBLISH", channel, message)
+
+    async def subscribe(self, pattern: str, callback: MessageCallback) -> None:
+        if self._reader is None:
+            self._sub = await self._open()
+            self._reader = asyncio.create_task(self._read_messages(), name="broker-subscriber")
+            self._dispatcher = asyncio.create_task(self._dispatch_messages(), name="broker-dispatcher")
+
+        first = pattern not in self._callbacks
+        self._callbacks.setdefault(pattern, []).append(callback)
+        if first and self._sub is not None:
+            # Wait for the confirmation so nothing published afterwards is missed
+            confirmed = asyncio.get_running_loop().create_future()
+            self._pending_subscribes[pattern] = confirmed
+            try:
+                await self._sub.send("PSUBSCRIBE", pattern)
+                await asyncio.wait_for(confirmed, timeout=self.connect_timeout_s)
+            except (OSError, ConnectionError, asyncio.TimeoutError) as e:
+                # The reader subscribes to every pattern again once it has reconnected
+                self._pending_subscribes.pop(pattern, None)
+                logger.warning(f"Could not subscribe to {pattern} yet: {e}")
+
+    async def _read_messages(self):
+        backoff_s = 0.0
+        while True:
+            try:
+                if self._sub is None:
+                    self._sub = await self._open()
+                    for pattern in self._callbacks:
+                        await self._sub.send("PSUBSCRIBE", pattern)
+                    self.reconnects += 1
+                    logger.info(f"Resubscribed to {len(self._callbacks)} broker patterns")
+                while True:
+                    reply = await self._sub.read_reply()
+                    kind = reply[0]
+                    if kind == "pmessage":
+                        try:
+                            self._messages.put_nowait(reply)
+                        except asyncio.QueueFull:
+                            self.dropped_messages += 1
+                            logger.warning(f"Broker dispatch queue full, dropped a message on {reply[2]}")
+                    elif kind == "psubscribe":
+                        # Subscribed (again), so the connection is healthy
+                        backoff_s = 0.0
+                        confirmed = self._pending_subscribes.pop(reply[1], None)
+                        if confirmed and not confirmed.done():
+                            confirmed.set_result(True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                backoff_s = self._next_backoff(backoff_s)
+                logger.error(f"Broker subscription connection lost: {e}; reconnecting in {backoff_s:.1f}s")
+                if self._sub is not None:
+                    await self._sub.close()
+                    self._sub = None
+                await asyncio.sleep(backoff_s)
+
+    async def _dispatch_messages(self):
+        """Call the callbacks of queued messages, in the order they arrived."""
+        while True:
+            _, pattern, channel, message = await self._messages.get()
+            for callback in self._callbacks.get(pattern, []):
+                try:
+                    await callback(channel, message)
+                except Exception as e:
+                    logger.error(f"Broker subscriber for {pattern} failed: {e}", exc_info=True)
+
+    async def set(self, key: str, value: str, ttl_s: Optional[float] = None) -> None:
+        if ttl_s is None:
+            await self._command("SET", key, value)
+        else:
+            await self._command("SET", key, value, "PX", max(1, int(ttl_s * 1000)))
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._command("GET", key)
+
+    async def delete(self, key: str) -> None:
+        await self._command("DEL", key)
+
+    async def claim(self, key: str, owner: str, ttl_s: float) -> str:
+        ttl_ms = max(1, int(ttl_s * 1000))
+        if await self._command("SET", key, owner, "NX", "PX", ttl_ms) == "OK":
+            return owner
+        holder = await self.get(key)
+        if holder == owner:
+            # Extend our own claim; XX leaves it alone if it expired in between
+            await self._command("SET", key, owner, "XX", "PX", ttl_ms)
+            return owner
+        if holder is None:
+            # Expired between the two commands
+            return owner if await self._command("SET", key, owner, "NX", "PX", ttl_ms) == "OK" else await self.get(key)
+        return holder
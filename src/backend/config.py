@@ -1,7 +1,18 @@
 import os
-from typing import Dict, Any
+import socket
+from typing import Dict, Any, Optional
 from pydantic import BaseModel
 
+def parse_provider_limits(value: str) -> Dict[str, int]:
+    """Parse per-provider limits written as "anthropic=4,openai=8"."""
+    limits = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        provider, _, limit = item.partition("=")
+        limits[provider.strip()] = int(limit)
+    return limits
+
 class BackendConfig(BaseModel):
     """Configuration for the FastAPI backend."""
     
@@ -15,7 +26,30 @@ class BackendConfig(BaseModel):
     
     # Game settings
     default_max_steps: int = 30
-    max_concurrent_games: int = 10
+    max_concurrent_games: int = 10  # Games running at once; more are queued
+    provider_game_limits: Dict[str, int] = {}  # Games running at once per model provider, e.g. {"anthropic": 4}
+    task_pool_size: int = 5  # Pre-warmed random tasks; 0 disables the pool
+    initial_solve_wait_ms: Optional[int] = 500  # Max wait for the initial solve before games start; None waits for it
+    corpus_dir: str = "database"  # Task corpora (<name>.tsv) the corpus strategy can draw from
+    
+    # Storage settings
+    storage_fsync: str = "batch"  # never, batch (every group commit) or interval (at most every second)
+    storage_batch_size: int = 64  # Most games written in one group commit
+    
+    # Event bus settings
+    event_bus_queued: bool = True  # Per-handler queues so games never wait on slow handlers
+    event_queue_size: int = 1000
+    shutdown_drain_s: float = 10.0  # How long shutdown waits to store ended games still queued
+    
+    # Instrumentation
+    span_sample_rate: float = 1.0  # Share of hot-path spans timed for /metrics (0 disables them)
+    loop_lag_interval_ms: int = 100  # Event loop lag sampling period; 0 disables the monitor
+    admin_token: Optional[str] = None  # Required as X-Admin-Token by /api/admin
+    admin_endpoints_open: bool = False  # Serve /api/admin without a token when admin_token is unset (local use)
+    
+    # Multi-worker settings
+    broker_url: Optional[str] = None  # e.g. redis://localhost:6379/0; None runs as a single worker
+    worker_id: str = f"{socket.gethostname()}-{os.getpid()}"
     
     # MCP server settings - reuse from existing config
     mcp_server_name: str = "stdio_mcp_server"
@@ -23,13 +57,30 @@ class BackendConfig(BaseModel):
     @classmethod
     def from_env(cls) -> "BackendConfig":
         """Create config from environment variables."""
+        # A negative INITIAL_SOLVE_WAIT_MS waits for the solve however long it takes
+        initial_solve_wait_ms = int(os.getenv("INITIAL_SOLVE_WAIT_MS", "500"))
         return cls(
             host=os.getenv("BACKEND_HOST", "0.0.0.0"),
             port=int(os.getenv("BACKEND_PORT", "8000")),
             debug=os.getenv("BACKEND_DEBUG", "false").lower() == "true",
             cors_origins=os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173").split(","),
             default_max_steps=int(os.getenv("DEFAULT_MAX_STEPS", "30")),
-            max_concurrent_games=int(os.getenv("MAX_CONCURRENT_GAMES", "10"))
+            max_concurrent_games=int(os.getenv("MAX_CONCURRENT_GAMES", "10")),
+            provider_game_limits=parse_provider_limits(os.getenv("PROVIDER_GAME_LIMITS", "")),
+            task_pool_size=int(os.getenv("TASK_POOL_SIZE", "5")),
+            initial_solve_wait_ms=initial_solve_wait_ms if initial_solve_wait_ms >= 0 else None,
+            corpus_dir=os.getenv("TASK_CORPUS_DIR", "database"),
+            storage_fsync=os.getenv("STORAGE_FSYNC", "batch"),
+            storage_batch_size=int(os.getenv("STORAGE_BATCH_SIZE", "64")),
+            event_bus_queued=os.getenv("EVENT_BUS_QUEUED", "true").lower() == "true",
+            event_queue_size=int(os.getenv("EVENT_QUEUE_SIZE", "1000")),
+            shutdown_drain_s=float(os.getenv("SHUTDOWN_DRAIN_S", "10")),
+            span_sample_rate=float(os.getenv("SPAN_SAMPLE_RATE", "1.0")),
+            loop_lag_interval_ms=int(os.getenv("LOOP_LAG_INTERVAL_MS", "100")),
+            admin_token=os.getenv("ADMIN_TOKEN") or None,
+            admin_endpoints_open=os.getenv("ADMIN_ENDPOINTS_OPEN", "false").lower() == "true",
+            broker_url=os.getenv("BROKER_URL") or None,
+            worker_id=os.getenv("WORKER_ID") or f"{socket.gethostname()}-{os.getpid()}"
         )
 
 # Global config instance
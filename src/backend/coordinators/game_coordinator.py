@@ -6,10 +6,12 @@ from datetime import datetime
 from wiki_arena import EventBus, GameEvent
 from wiki_arena.game import Game
 from wiki_arena.models import GameConfig, GameState, GameStatus, Task, Page
-from wiki_arena.language_models import create_model
+from wiki_arena.language_models import create_scheduled_model
 from wiki_arena.tools import get_tools
 from wiki_arena.wikipedia import LiveWikiService
 from backend.exceptions import InvalidModelNameException
+from backend.models.api_models import GamePriority
+from backend.coordinators.game_scheduler import GameScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,7 @@ class GameCoordinator:
     Responsibilities:
     - Initialize individual games
     - Manage game execution and background tasks
+    - Admit games for execution within the concurrency limits (via GameScheduler)
     - Handle game-level events
     - Clean up game resources
     
@@ -30,9 +33,10 @@ class GameCoordinator:
     - Storage (handled by StorageHandler)
     """
     
-    def __init__(self, event_bus: EventBus, wiki_service: LiveWikiService):
+    def __init__(self, event_bus: EventBus, wiki_service: LiveWikiService, scheduler: Optional[GameScheduler] = None):
         self.event_bus = event_bus
         self.wiki_service = wiki_service
+        self.scheduler = scheduler or GameScheduler()  # no limits unless configured
         self.active_games: Dict[str, Game] = {} # { game_id: Game }
         # background was because we thought we would support an interactive mode (viewer can step through)
         # TODO(hunter): refactor this as everything is background now
@@ -44,7 +48,7 @@ class GameCoordinator:
         
         # Create model configuration
         try:
-            language_model = create_model(model_name)
+            language_model = create_scheduled_model(model_name)
         except ValueError as e:
             raise InvalidModelNameException(str(e))
 
@@ -56,7 +60,7 @@ class GameCoordinator:
             model=language_model.model_config
         )
         
-        tools = get_tools()
+        tools = get_tools(game_config.link_format)
 
         try:
             game = Game(
@@ -86,30 +90,43 @@ class GameCoordinator:
         logger.info(f"Game {game.id} initialized successfully")
         return game.id
     
-    async def start_game_execution(self, game_id: str, background: bool = True) -> bool:
-        """Start execution for an initialized game."""
-        if game_id not in self.active_games:
+    async def start_game_execution(
+        self, game_id: str, background: bool = True, priority: GamePriority = GamePriority.INTERACTIVE
+    ) -> bool:
+        """Start execution for an initialized game, or queue it until the scheduler admits it."""
+        game = self.active_games.get(game_id)
+        if not game:
             logger.error(f"Cannot start execution for unknown game: {game_id}")
             return False
         
         if background:
-            # Start background execution
-            background_task = asyncio.create_task(self._run_game_background(game_id))
-            self.background_tasks[game_id] = background_task
-            logger.info(f"Started background execution for game {game_id}")
+            self.scheduler.submit(
+                game_id,
+                provider=game.config.model.provider,
+                launch=lambda: self._launch_background(game_id),
+                priority=priority,
+            )
         
         return True
     
-    async def start_games(self, game_ids: list[str], background: bool = True) -> int:
-        """Start execution for multiple games. Returns number of successfully started games."""
+    async def start_games(
+        self, game_ids: list[str], background: bool = True, priority: GamePriority = GamePriority.INTERACTIVE
+    ) -> int:
+        """Start (or queue) execution for multiple games. Returns number of successfully submitted games."""
         started_count = 0
         for game_id in game_ids:
-            if await self.start_game_execution(game_id, background):
+            if await self.start_game_execution(game_id, background, priority):
                 started_count += 1
         
-        logger.info(f"Started execution for {started_count}/{len(game_ids)} games")
+        logger.info(f"Submitted execution for {started_count}/{len(game_ids)} games")
         return started_count
     
+    def _launch_background(self, game_id: str):
+        """Start background execution of an admitted game."""
+        background_task = asyncio.create_task(self._run_game_background(game_id), name=f"game:{game_id}")
+        self.background_tasks[game_id] = background_task
+        logger.info(f"Started background execution for game {game_id}")
+    
     async def get_game_state(self, game_id: str) -> Optional[GameState]:
         """Get current state of a game."""
         game = self.active_games.get(game_id)
@@ -127,9 +144,13 @@ class GameCoordinator:
         await self._cleanup_game(game_id)
     
     def get_active_games(self) -> Dict[str, str]:
-        """List all active games and their execution mode."""
+        """List all active games and their execution mode ("background", "queued" or "inactive")."""
         return {
-            game_id: "background" if game_id in self.background_tasks else "inactive"
+            game_id: (
+                "background" if game_id in self.background_tasks
+                else "queued" if self.scheduler.is_queued(game_id)
+                else "inactive"
+            )
             for game_id in self.active_games.keys()
         }
     
@@ -137,15 +158,20 @@ class GameCoordinator:
         """Gracefully shutdown all games and background tasks."""
         logger.info("Shutting down GameCoordinator...")
         
-        # Cancel all background tasks
-        for task in self.background_tasks.values():
-            task.cancel()
+        # Stop admitting queued games first, so cancelled games don't launch the next ones
+        self.scheduler.close()
         
-        # Wait for tasks to complete
-        if self.background_tasks:
-            await asyncio.gather(*self.background_tasks.values(), return_exceptions=True)
+        # Cancel all background tasks, until none is left
+        while self.background_tasks:
+            tasks = list(self.background_tasks.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for game_id in [game_id for game_id, task in self.background_tasks.items() if task.done()]:
+                del self.background_tasks[game_id]
         
         # Clear everything
+        self.scheduler.clear()
         self.active_games.clear()
         self.background_tasks.clear()
         
@@ -168,13 +194,17 @@ class GameCoordinator:
         except Exception as e:
             logger.error(f"Error in background game {game_id}: {e}", exc_info=True)
         finally:
-            # Game finished or errored, clean up
+            # Game finished or errored, clean up and admit the next queued game
+            self.scheduler.release(game_id)
             self.background_tasks.pop(game_id, None)
             self.active_games.pop(game_id, None)
             logger.debug(f"Cleaned up game {game_id}")
     
     async def _cleanup_game(self, game_id: str):
         """Clean up a completed or terminated game."""
+        # Drop it from the queue, or free its slot
+        self.scheduler.release(game_id)
+        
         # Cancel background task if running
         if game_id in self.background_tasks:
             self.background_tasks[game_id].cancel()
@@ -0,0 +1,189 @@
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from backend.models.api_models import GamePriority
+
+logger = logging.getLogger(__name__)
+
+# Lower ranks are admitted first
+PRIORITY_RANK = {GamePriority.INTERACTIVE: 0, GamePriority.BATCH: 1}
+
+@dataclass
+class QueuedGame:
+    """A game waiting for a slot."""
+    game_id: str
+    provider: str
+    priority: GamePriority
+    launch: Callable[[], None]
+    seq: int
+    queued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def sort_key(self):
+        return (PRIORITY_RANK[self.priority], self.seq)
+
+class GameScheduler:
+    """
+    Admission control for game execution.
+
+    Games are queued until a slot is free under both the global limit and the
+    limit of their model's provider. Interactive games are admitted before batch
+    games, and games of the same priority in the order they were submitted; a
+    game whose provider is at its limit does not hold up games of other
+    providers behind it.
+
+    Everything runs on the event loop without awaiting, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        provider_limits: Optional[Dict[str, int]] = None,
+        wait_history: int = 1000,
+    ):
+        """
+        Args:
+            max_concurrent: Maximum games running at once; None for no limit.
+            provider_limits: Maximum games running at once per provider (e.g.
+                {"anthropic": 4}); providers not listed are only bound by max_concurrent.
+            wait_history: How many recent queue waits to keep per priority for the stats.
+        """
+        self.max_concurrent = max_concurrent
+        self.provider_limits = dict(provider_limits or {})
+        self._queued: Dict[str, QueuedGame] = {}  # game_id -> QueuedGame
+        self._running: Dict[str, str] = {}  # game_id -> provider
+        self._provider_running: Dict[str, int] = {}  # provider -> running games
+        self._seq = 0
+        self._waits_ms: Dict[GamePriority, Deque[float]] = {
+            priority: deque(maxlen=wait_history) for priority in GamePriority
+        }
+        self.admitted_count = 0
+        self.closed = False
+
+    def submit(
+        self,
+        game_id: str,
+        provider: str,
+        launch: Callable[[], None],
+        priority: GamePriority = GamePriority.INTERACTIVE,
+    ):
+        """Queue a game; `launch` is called once it is admitted (possibly right away)."""
+        if self.closed:
+            logger.warning(f"Scheduler is closed, not starting game {game_id}")
+            return
+        if game_id in self._queued or game_id in self._running:
+            logger.warning(f"Game {game_id} is already scheduled")
+            return
+        self._seq += 1
+        queued = QueuedGame(game_id, provider, GamePriority(priority), launch, self._seq)
+        self._queued[game_id] = queued
+        self._dispatch()
+        if game_id in self._queued:
+            logger.info(
+                f"Game {game_id} queued ({queued.priority.value}, {provider}): "
+                f"{len(self._running)} running, {len(self._queued)} queued"
+            )
+
+    def release(self, game_id: str):
+        """Free the slot of a finished game, or drop a game that is still queued."""
+        if self._queued.pop(game_id, None):
+            logger.info(f"Game {game_id} removed from the queue")
+            return
+        provider = self._running.pop(game_id, None)
+        if provider is None:
+            return
+        self._provider_running[provider] -= 1
+        if not self._provider_running[provider]:
+            del self._provider_running[provider]
+        self._dispatch()
+
+    def close(self):
+        """Stop admitting games (on shutdown): queued games are dropped and released slots are not reused."""
+        self.closed = True
+        self._queued.clear()
+
+    def clear(self):
+        """Forget every queued and running game (on shutdown)."""
+        self._queued.clear()
+        self._running.clear()
+        self._provider_running.clear()
+
+    def _provider_has_slot(self, provider: str) -> bool:
+        limit = self.provider_limits.get(provider)
+        return limit is None or self._provider_running.get(provider, 0) < limit
+
+    def _dispatch(self):
+        """Admit queued games in priority order while there are free slots."""
+        if self.closed:
+            return
+        for queued in sorted(self._queued.values(), key=lambda q: q.sort_key):
+            if self.max_concurrent is not None and len(self._running) >= self.max_concurrent:
+                break
+            if queued.game_id not in self._queued or not self._provider_has_slot(queued.provider):
+                continue
+            self._admit(queued)
+
+    def _admit(self, queued: QueuedGame):
+        del self._queued[queued.game_id]
+        self._running[queued.game_id] = queued.provider
+        self._provider_running[queued.provider] = self._provider_running.get(queued.provider, 0) + 1
+        waited_ms = (time.monotonic() - queued.queued_at) * 1000
+        self._waits_ms[queued.priority].append(waited_ms)
+        self.admitted_count += 1
+        if waited_ms >= 1:
+            logger.info(f"Game {queued.game_id} admitted after {waited_ms:.0f}ms in the queue")
+        try:
+            queued.launch()
+        except Exception as e:
+            logger.error(f"Failed to launch game {queued.game_id}: {e}", exc_info=True)
+            self.release(queued.game_id)
+
+    def is_queued(self, game_id: str) -> bool:
+        return game_id in self._queued
+
+    def is_running(self, game_id: str) -> bool:
+        return game_id in self._running
+
+    def get_queue(self) -> Dict[str, Dict[str, Any]]:
+        """Queued games in admission order, with their position and time waited so far."""
+        now = time.monotonic()
+        ordered = sorted(self._queued.values(), key=lambda q: q.sort_key)
+        return {
+            queued.game_id: {
+                "position": position,
+                "priority": queued.priority.value,
+                "provider": queued.provider,
+                "waited_ms": round((now - queued.queued_at) * 1000, 1),
+            }
+            for position, queued in enumerate(ordered, start=1)
+        }
+
+    @staticmethod
+    def _summarize(waits: List[float]) -> Dict[str, Any]:
+        if not waits:
+            return {"count": 0}
+        ordered = sorted(waits)
+        return {
+            "count": len(ordered),
+            "mean_ms": round(sum(ordered) / len(ordered), 1),
+            "p50_ms": round(ordered[len(ordered) // 2], 1),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+            "max_ms": round(ordered[-1], 1),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limits, current load and queue wait of recently admitted games, per priority."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "provider_limits": self.provider_limits,
+            "running": len(self._running),
+            "running_by_provider": dict(self._provider_running),
+            "queued": len(self._queued),
+            "admitted": self.admitted_count,
+            "queue_wait": {
+                priority.value: self._summarize(list(waits)) for priority, waits in self._waits_ms.items()
+            },
+        }
@@ -1,23 +1,26 @@
+import asyncio
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from wiki_arena import EventBus, GameEvent
-from wiki_arena.models import Task
+from wiki_arena.models import Page, Task
 
-from backend.models.api_models import CreateTaskRequest, CreateTaskResponse
+from backend.models.api_models import CreateTaskRequest, CreateTaskResponse, GamePriority
 from backend.coordinators.game_coordinator import GameCoordinator
 from backend.services.task_selector_service import task_selector_service
+from backend.services.task_pool import TaskPool
 from backend.exceptions import PageNotFoundException, WikiServiceUnavailableException
 
 logger = logging.getLogger(__name__)
 
 class TaskData:
     """Internal representation of a task with its associated games."""
-    def __init__(self, task_id: str, task: Task, game_ids: List[str]):
+    def __init__(self, task_id: str, task: Task, game_ids: List[str], priority: GamePriority = GamePriority.INTERACTIVE):
         self.task_id = task_id
         self.task = task
         self.game_ids = game_ids
+        self.priority = priority
         self.created_at = datetime.now()
 
 class TaskCoordinator:
@@ -31,11 +34,27 @@ class TaskCoordinator:
     - Task-level event handling
     """
     
-    def __init__(self, event_bus: EventBus, game_coordinator: GameCoordinator):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        game_coordinator: GameCoordinator,
+        task_pool: Optional[TaskPool] = None,
+        solve_wait_ms: Optional[float] = None,
+    ):
+        """
+        Args:
+            solve_wait_ms: How long games wait for the initial solve before starting
+                anyway (the optimal paths are sent to clients whenever they arrive).
+                None waits for the solve however long it takes, 0 starts immediately.
+        """
         self.event_bus = event_bus
         self.game_coordinator = game_coordinator
+        self.task_pool = task_pool
+        self.solve_wait_ms = solve_wait_ms
         self.active_tasks: Dict[str, TaskData] = {}  # task_id -> TaskData
         self.game_to_task: Dict[str, str] = {}  # game_id -> task_id
+        self._task_solved: Dict[str, asyncio.Event] = {}  # task_id -> set once solved (or failed)
+        self._game_starts: Dict[str, asyncio.Task] = {}  # task_id -> pending game start
         
     # NOTE: tasks already have an id but it doesn't have timestamp info
     def _generate_task_id(self, start_page: str, target_page: str) -> str:
@@ -51,27 +70,22 @@ class TaskCoordinator:
         start_time = datetime.now()
         logger.info(f"Creating task with strategy: {request.task_strategy.type}, {len(request.model_names)} games")
         
-        # Select task using the specified strategy
-        task = await task_selector_service.select_task(request.task_strategy)
-        if not task:
-            raise ValueError("Failed to select a valid task")
+        # Random tasks come pre-selected, pre-fetched and pre-solved from the pool when possible
+        prepared = None
+        if self.task_pool and self.task_pool.serves(request.task_strategy):
+            prepared = self.task_pool.take()
         
-        logger.info(f"Selected task: {task.start_page_title} -> {task.target_page_title}")
-        
-        # Fetch the start page once to be used by all games
-        try:
-            start_page = await self.game_coordinator.wiki_service.get_page(task.start_page_title)
-        except ValueError as e:
-            # occurs if the page title is invalid or the page does not exist.
-            raise PageNotFoundException(str(e))
-        except ConnectionError as e:
-            # occurs if the Wikipedia API is unreachable.
-            raise WikiServiceUnavailableException(str(e))
+        if prepared:
+            task, start_page, solver_result = prepared.task, prepared.start_page, prepared.solver_result
+            logger.info(f"Selected pooled task: {task.start_page_title} -> {task.target_page_title}")
+        else:
+            task, start_page = await self._select_task(request)
+            solver_result = None
         
         # Generate task ID
         task_id = self._generate_task_id(task.start_page_title, task.target_page_title)
         
-        # setup games for this task (execution won't start until task_solved event)
+        # setup games for this task (execution starts after the initial solve or the solve wait)
         game_ids = []
         for i, model_name in enumerate(request.model_names, start=1):
             try:
@@ -100,9 +114,12 @@ class TaskCoordinator:
                 raise ValueError(f"Failed to setup game {i}: {str(e)}")
         
         # Store task data
-        task_data = TaskData(task_id, task, game_ids)
+        task_data = TaskData(task_id, task, game_ids, request.priority)
         self.active_tasks[task_id] = task_data
         
+        # Games start once the task is solved or the solve wait runs out, whichever is first
+        self._task_solved[task_id] = asyncio.Event()
+        
         # Emit task_selected event
         await self.event_bus.publish(GameEvent(
             type="task_selected",
@@ -110,10 +127,15 @@ class TaskCoordinator:
             data={
                 "task_id": task_id,
                 "task": task,
-                "game_ids": game_ids
+                "game_ids": game_ids,
+                "solver_result": solver_result,  # set when the pool already solved the task
             }
         ))
         
+        start = asyncio.create_task(self._start_games_after_solve(task_id), name=f"task-start:{task_id}")
+        self._game_starts[task_id] = start
+        start.add_done_callback(lambda _: self._game_starts.pop(task_id, None))
+        
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         logger.info(f"Task {task_id} created successfully with {len(game_ids)} games in {duration:.2f}s")
@@ -125,6 +147,27 @@ class TaskCoordinator:
             game_ids=game_ids
         )
     
+    async def _select_task(self, request: CreateTaskRequest) -> Tuple[Task, Page]:
+        """Select a task with the requested strategy and fetch its start page."""
+        # Select task using the specified strategy
+        task = await task_selector_service.select_task(request.task_strategy)
+        if not task:
+            raise ValueError("Failed to select a valid task")
+        
+        logger.info(f"Selected task: {task.start_page_title} -> {task.target_page_title}")
+        
+        # Fetch the start page once to be used by all games
+        try:
+            start_page = await self.game_coordinator.wiki_service.get_page(task.start_page_title)
+        except ValueError as e:
+            # occurs if the page title is invalid or the page does not exist.
+            raise PageNotFoundException(str(e))
+        except ConnectionError as e:
+            # occurs if the Wikipedia API is unreachable.
+            raise WikiServiceUnavailableException(str(e))
+        
+        return task, start_page
+    
     async def get_task_info(self, task_id: str) -> Optional[Dict]:
         """Get basic task information."""
         task_data = self.active_tasks.get(task_id)
@@ -136,6 +179,7 @@ class TaskCoordinator:
             "start_page": task_data.task.start_page_title,
             "target_page": task_data.task.target_page_title,
             "game_ids": task_data.game_ids,
+            "priority": task_data.priority.value,
             "created_at": task_data.created_at.isoformat()
         }
     
@@ -155,27 +199,59 @@ class TaskCoordinator:
             for task_id, task_data in self.active_tasks.items()
         }
     
-    # TODO(hunter): don' start game until all games are initialized
-    # should we wait for websocket connection? and task solve?
-    async def handle_task_solved(self, event: GameEvent):
-        """Handle task_solved events to start execution of all games in the task."""
-        task_id = event.data.get("task_id")
-        game_ids = event.data.get("game_ids", [])
+    async def _start_games_after_solve(self, task_id: str):
+        """Start all games of a task once it is solved or `solve_wait_ms` has passed."""
+        solved = self._task_solved[task_id]
+        wait_start = datetime.now()
+        try:
+            if self.solve_wait_ms is None:
+                await solved.wait()
+            elif self.solve_wait_ms > 0:
+                await asyncio.wait_for(solved.wait(), self.solve_wait_ms / 1000)
+        except asyncio.TimeoutError:
+            logger.info(f"Task {task_id} not solved within {self.solve_wait_ms:.0f}ms, starting games without optimal paths")
+        finally:
+            self._task_solved.pop(task_id, None)
         
-        if not task_id:
-            logger.warning("Received task_solved event without task_id")
+        task_data = self.active_tasks.get(task_id)
+        if not task_data:
             return
         
-        logger.info(f"Task {task_id} solved, starting execution for {len(game_ids)} games")
+        waited_ms = (datetime.now() - wait_start).total_seconds() * 1000
+        game_ids = list(task_data.game_ids)
+        logger.info(f"Starting execution for {len(game_ids)} games of task {task_id} (waited {waited_ms:.0f}ms for solve)")
         
-        # Start execution for all games in this task
-        started_count = await self.game_coordinator.start_games(game_ids, background=True)
+        # Start execution for all games in this task (queued if the server is at capacity)
+        started_count = await self.game_coordinator.start_games(game_ids, background=True, priority=task_data.priority)
         
         if started_count == len(game_ids):
             logger.info(f"Successfully started all {started_count} games for task {task_id}")
         else:
             logger.warning(f"Only started {started_count}/{len(game_ids)} games for task {task_id}")
     
+    async def handle_task_solved(self, event: GameEvent):
+        """Handle task_solved events by releasing the task's games if they are still waiting."""
+        task_id = event.data.get("task_id")
+        
+        if not task_id:
+            logger.warning("Received task_solved event without task_id")
+            return
+        
+        solved = self._task_solved.get(task_id)
+        if solved:
+            logger.info(f"Task {task_id} solved before its games started")
+            solved.set()
+        else:
+            logger.info(f"Task {task_id} solved after its games started")
+    
+    async def handle_task_solve_failed(self, event: GameEvent):
+        """Handle task_solve_failed events by starting the task's games without optimal paths."""
+        task_id = event.data.get("task_id")
+        solved = self._task_solved.get(task_id) if task_id else None
+        if solved:
+            logger.warning(f"Initial solve failed for task {task_id}, starting games without optimal paths")
+            solved.set()
+    
     async def cleanup_completed_games(self):
         """Clean up references to completed games and empty tasks."""
         completed_tasks = []
@@ -252,6 +328,12 @@ class TaskCoordinator:
         """Gracefully shutdown TaskCoordinator."""
         logger.info("Shutting down TaskCoordinator...")
         
+        # Cancel games still waiting for their initial solve
+        for start in list(self._game_starts.values()):
+            start.cancel()
+        self._game_starts.clear()
+        self._task_solved.clear()
+        
         # Clear all mappings
         self.active_tasks.clear()
         self.game_to_task.clear()
@@ -1,9 +1,11 @@
+from typing import Optional
 from fastapi import Request
 from wiki_arena import EventBus
 from backend.coordinators.task_coordinator import TaskCoordinator
 from backend.coordinators.game_coordinator import GameCoordinator
 from wiki_arena.solver import WikiTaskSolver
 from wiki_arena.wikipedia import LiveWikiService
+from backend.services.worker_affinity import WorkerAffinity
 
 async def get_event_bus(request: Request) -> EventBus:
     """Dependency provider to get the shared EventBus instance."""
@@ -23,4 +25,8 @@ async def get_solver(request: Request) -> WikiTaskSolver:
 
 async def get_wiki_service(request: Request) -> LiveWikiService:
     """Dependency provider to get the shared LiveWikiService instance."""
-    return request.app.state.wiki_service
\ No newline at end of file
+    return request.app.state.wiki_service
+
+async def get_worker_affinity(request: Request) -> Optional[WorkerAffinity]:
+    """Dependency provider to get the WorkerAffinity (None when running as a single worker)."""
+    return getattr(request.app.state, "worker_affinity", None)
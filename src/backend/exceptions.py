@@ -18,4 +18,8 @@ class InvalidModelNameException(WikiArenaException):
 
 class WikiServiceUnavailableException(WikiArenaException):
     """Raised when the Wikipedia API is unreachable or returns an error."""
-    pass 
\ No newline at end of file
+    pass 
+
+class BrokerException(WikiArenaException):
+    """Raised when the event broker is unreachable or rejects a command."""
+    pass
@@ -1,6 +1,7 @@
 import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Set
 from datetime import datetime
 
 from wiki_arena import GameEvent, EventBus
@@ -13,7 +14,10 @@ class SolverHandler:
     Handles task solver in response to game events.
     
     This handler triggers task solver in parallel (non-blocking) when moves
-    are completed and publishes the results as new events.
+    are completed and publishes the results as new events. A game's cached
+    results are dropped when it ends (and a task's when the task ends, for
+    solves that finished after its games); `shutdown` cancels the solves
+    still running.
     """
     
     def __init__(self, event_bus: EventBus, solver: WikiTaskSolver): 
@@ -22,7 +26,14 @@ class SolverHandler:
         # Cache for solver results per game and page
         # Structure: Dict[game_id, Dict[from_page_title, solver_result]]
         self.cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
-        # TODO(hunter): clear the cache when the game is over, need an handle_game_ended()
+        # In-flight initial solves per task_id, and the games each task solve caches results for
+        self.task_solves: Dict[str, asyncio.Task] = {}
+        self.task_games: Dict[str, List[str]] = {}
+        # In-flight move solves per game_id
+        self.move_solves: Dict[str, Set[asyncio.Task]] = {}
+        # Recently ended games, so moves queued behind their end don't start solves again
+        self.ended_games: "OrderedDict[str, None]" = OrderedDict()
+        self.max_ended_games = 1000
     
     def get_cached_results(self, game_id: str) -> List[Dict[str, Any]]:
         """Get all cached solver results for a game in frontend-compatible format."""
@@ -54,17 +65,71 @@ class SolverHandler:
         if not game_state or not move:
             logger.warning(f"Missing game_state or move data in event for game {event.game_id}")
             return
+        if event.game_id in self.ended_games:
+            logger.debug(f"Game {event.game_id} already ended, not solving its move")
+            return
         
         # Start task solver in background (non-blocking)
-        asyncio.create_task(self._find_shortest_paths(
+        solve = asyncio.create_task(self._find_shortest_paths(
             event.game_id,
             game_state.current_page.title,
             game_state.config.target_page_title,
-        ))
+        ), name=f"solve-move:{event.game_id}")
+        self.move_solves.setdefault(event.game_id, set()).add(solve)
+        solve.add_done_callback(lambda _: self._move_solve_done(event.game_id, solve))
+
+    def _move_solve_done(self, game_id: str, solve: asyncio.Task):
+        solves = self.move_solves.get(game_id)
+        if solves is not None:
+            solves.discard(solve)
+            if not solves:
+                del self.move_solves[game_id]
+
+    async def handle_game_ended(self, event: GameEvent):
+        """Cancel the game's move solves and drop its cached results."""
+        self.ended_games[event.game_id] = None
+        if len(self.ended_games) > self.max_ended_games:
+            self.ended_games.popitem(last=False)
+        for solve in self.move_solves.pop(event.game_id, set()):
+            solve.cancel()
+        self.cache.pop(event.game_id, None)
+
+    async def handle_task_ended(self, event: GameEvent):
+        """Cancel the task's solve if it is still running and drop what it cached for the task's games."""
+        task_id = event.data.get("task_id", event.game_id)
+        solve = self.task_solves.get(task_id)
+        if solve:
+            solve.cancel()
+        for game_id in self.task_games.pop(task_id, []):
+            self.cache.pop(game_id, None)
+
+    async def shutdown(self):
+        """Cancel the solves still running and wait for them to finish."""
+        solves = [*self.task_solves.values(), *(solve for solves in self.move_solves.values() for solve in solves)]
+        for solve in solves:
+            solve.cancel()
+        await asyncio.gather(*solves, return_exceptions=True)
+        self.cache.clear()
+        self.task_games.clear()
+        if solves:
+            logger.info(f"Cancelled {len(solves)} solves still running")
     
     
     async def handle_task_selected(self, event: GameEvent):
-        """Handle task_selected events by solving the task once for all games."""
+        """
+        Handle task_selected events by solving the task once for all games.
+        
+        The solve runs in the background so publishing task_selected doesn't wait
+        on the BFS; task_solved (or task_solve_failed) is emitted when it finishes.
+        """
+        task_id = event.data.get("task_id")
+        solve = asyncio.create_task(self._solve_task(event), name=f"solve-task:{task_id}")
+        if task_id:
+            self.task_solves[task_id] = solve
+            self.task_games[task_id] = list(event.data.get("game_ids", []))
+            solve.add_done_callback(lambda _: self.task_solves.pop(task_id, None))
+    
+    async def _solve_task(self, event: GameEvent):
         # TODO(hunter): we may need to change GameEvent
         logger.debug(f"Solving task for task_id: {event.game_id}")  # game_id is actually task_id for task events
         
@@ -76,14 +141,15 @@ class SolverHandler:
             logger.warning(f"Missing task data in task_selected event")
             return
         
-        # Solve the task once
+        # Solve the task once (pooled tasks arrive already solved)
         try:
-            logger.info(f"Solving task {task_id}: {task.start_page_title} -> {task.target_page_title}")
-            
-            solver_result = await self.solver.find_shortest_path(
-                task.start_page_title, 
-                task.target_page_title
-            )
+            solver_result = event.data.get("solver_result")
+            if solver_result is None:
+                logger.info(f"Solving task {task_id}: {task.start_page_title} -> {task.target_page_title}")
+                solver_result = await self.solver.find_shortest_path(
+                    task.start_page_title, 
+                    task.target_page_title
+                )
             
             # Cache results for all games in this task
             cache_data = {
@@ -153,6 +219,8 @@ class SolverHandler:
             logger.debug(f"Analyzing path: {from_page} -> {to_page} for game {game_id}")
             
             solver_result = await self.solver.find_shortest_path(from_page, to_page)
+            if game_id in self.ended_games:
+                return
             
             # Cache the results
             if game_id not in self.cache:
@@ -1,9 +1,11 @@
+import asyncio
 import logging
-from typing import Optional
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
 
 from wiki_arena import GameEvent
 from wiki_arena.models import GameResult, GameState
-from wiki_arena.storage import GameStorageService, StorageConfig
+from wiki_arena.storage import FsyncPolicy, GameStorageService, GameStorageWriter, StorageConfig
 
 logger = logging.getLogger(__name__)
 
@@ -12,11 +14,19 @@ class StorageHandler:
     Handles game result storage in response to game events.
     
     This handler is stateless and reactive - it receives game_ended events
-    and persists the game results to storage.
+    and hands the game results to a GameStorageWriter, which writes them on
+    its own thread so file IO never blocks the event loop.
     """
     
-    def __init__(self, storage_config: Optional[StorageConfig] = None):
+    def __init__(
+        self,
+        storage_config: Optional[StorageConfig] = None,
+        fsync: FsyncPolicy = FsyncPolicy.BATCH,
+        max_batch_size: int = 64,
+    ):
         self.storage_service = GameStorageService(storage_config or StorageConfig())
+        self.writer = GameStorageWriter(self.storage_service, fsync=fsync, max_batch_size=max_batch_size)
+        self.writer.start()
         self.enabled = True  # Can be configured to disable storage
         logger.info(f"StorageHandler initialized with storage path: {self.storage_service.config.storage_path}")
     
@@ -38,17 +48,33 @@ class StorageHandler:
             # Convert GameState to GameResult
             game_result = GameResult.from_game_state(game_state)
             
-            # Store the game result
-            success = self.storage_service.store_game(game_result)
-            
-            if success:
-                logger.info(f"Successfully stored game {event.game_id} ({game_result.status.value})")
+            # Queue the game result; the writer reports how the write went. When its
+            # queue is full, wait for room on a thread so the event loop keeps running
+            if self.writer.is_full():
+                stored = await asyncio.to_thread(self.writer.submit, game_result)
             else:
-                logger.warning(f"Failed to store game {event.game_id}")
+                stored = self.writer.submit(game_result)
+            stored.add_done_callback(
+                lambda future: self._log_stored(future, event.game_id, game_result.status.value)
+            )
                 
         except Exception as e:
             logger.error(f"Error storing game result for {event.game_id}: {e}", exc_info=True)
     
+    @staticmethod
+    def _log_stored(future: Future, game_id: str, status: str):
+        if future.result():
+            logger.info(f"Successfully stored game {game_id} ({status})")
+        else:
+            logger.warning(f"Failed to store game {game_id}")
+    
+    async def shutdown(self):
+        """Write the games still queued and stop the writer."""
+        await asyncio.to_thread(self.writer.close)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return self.writer.get_stats()
+    
     def enable_storage(self):
         """Enable storage operations."""
         self.enabled = True
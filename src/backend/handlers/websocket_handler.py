@@ -4,6 +4,7 @@ from typing import Dict, Any
 from wiki_arena import GameEvent
 from wiki_arena.models import GameState, Move
 from backend.websockets.game_hub import websocket_manager
+from backend.websockets.game_sync import compact_page
 
 logger = logging.getLogger(__name__)
 
@@ -15,28 +16,33 @@ class WebSocketHandler:
     and broadcasts them to connected WebSocket clients.
     """
 
+    async def handle_task_selected(self, event: GameEvent):
+        """Handle task_selected events by routing the task's games to its task channel."""
+        task_id = event.data.get("task_id")
+        await websocket_manager.announce_task(task_id, list(event.data.get("game_ids", [])))
+        logger.debug(f"Registered task channel for task {task_id}")
+
     async def handle_task_solved(self, event: GameEvent):
-        """Handle task_solved events by broadcasting optimal path update for each game's WebSocket clients."""
-        logger.debug(f"Broadcasting task_solved for game {event.game_id}")
+        """Handle task_solved events by broadcasting the optimal paths once to the task's channels."""
+        task_id = event.data.get("task_id")
+        logger.debug(f"Broadcasting task_solved for task {task_id}")
         
-        optimal_paths = event.data.get("shortest_paths", [])
-        optimal_path_length = event.data.get("shortest_path_length", -1)
-        from_page_title = event.data.get("from_page_title")
-        to_page_title = event.data.get("to_page_title")
-
-        # broadcast same event to all games 
-        for game_id in event.data.get("game_ids", []):
-            message = {
-                "type": "OPTIMAL_PATHS_UPDATED",
-                "game_id": game_id,
-                "optimal_paths": optimal_paths,
-                "optimal_path_length": optimal_path_length,
-                "from_page_title": from_page_title,
-                "to_page_title": to_page_title,
-            }
-            
-            await websocket_manager.broadcast_to_game(game_id, message)
-            logger.debug(f"Broadcasted task solver to clients for game {game_id}")
+        game_ids = list(event.data.get("game_ids", []))
+        # Already registered by task_selected, which the task's lane handles first; registering again is a no-op
+        websocket_manager.register_task(task_id, game_ids)
+        
+        message = {
+            "type": "OPTIMAL_PATHS_UPDATED",
+            "task_id": task_id,
+            "game_ids": game_ids,
+            "optimal_paths": event.data.get("shortest_paths", []),
+            "optimal_path_length": event.data.get("shortest_path_length", -1),
+            "from_page_title": event.data.get("from_page_title"),
+            "to_page_title": event.data.get("to_page_title"),
+        }
+        
+        await websocket_manager.broadcast_to_task(task_id, message)
+        logger.debug(f"Broadcasted task solver to clients for task {task_id}")
     
     async def handle_shortest_paths_found(self, event: GameEvent):
         """Handle task solver completion by broadcasting updated optimal paths."""
@@ -72,7 +78,7 @@ class WebSocketHandler:
                 "to_page_title": move.to_page_title,
                 "timestamp": None,  # Move model doesn't have timestamp (MoveMetrics does tho)
             },
-            "current_page": game_state.current_page,
+            "current_page": compact_page(game_state.current_page),
             "steps": game_state.steps,
             "status": game_state.status.value
         }
@@ -106,17 +112,20 @@ class WebSocketHandler:
         
         game_state: GameState = event.data.get("game_state")
         
+        # Clients already have the moves from earlier deltas
         message = {
             "type": "GAME_ENDED",
             "game_id": event.game_id,
-            "state": game_state.model_dump()
+            "final_status": game_state.status.value,
+            "total_steps": game_state.steps,
+            "error_message": game_state.error_message,
         }
         
         await websocket_manager.broadcast_to_game(event.game_id, message)
         logger.info(f"Broadcasted game_ended to clients for game {event.game_id}")
 
     async def handle_task_ended(self, event: GameEvent):
-        """Handle task_ended events by broadcasting task completion to all WebSocket clients."""
+        """Handle task_ended events by broadcasting task completion to the task's WebSocket clients."""
         logger.debug(f"Broadcasting task_ended for task {event.game_id}")
         
         task_id = event.data.get("task_id")
@@ -130,10 +139,6 @@ class WebSocketHandler:
             "target_page": target_page,
         }
         
-        # Broadcast to all games in the system since we don't have game IDs anymore
-        # Note: This could be optimized to only broadcast to games that were part of this task
-        active_games = websocket_manager.get_all_games()
-        for game_id in active_games:
-            await websocket_manager.broadcast_to_game(game_id, message)
+        await websocket_manager.broadcast_to_task(task_id, message)
         
-        logger.info(f"Broadcasted task_ended to {len(active_games)} game channels for task {task_id}")
+        logger.info(f"Broadcasted task_ended to clients for task {task_id}")
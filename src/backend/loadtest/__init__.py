@@ -0,0 +1,14 @@
+"""Load test harness: a fake Wikipedia, a fake model and a driver for one backend instance."""
+
+from .fake_wiki import FakeWikiGraph
+from .harness import LoadTestConfig, LoadTestReport, LevelResult, compare_to_baseline, find_ceiling, run_load_test
+
+__all__ = [
+    "FakeWikiGraph",
+    "LoadTestConfig",
+    "LoadTestReport",
+    "LevelResult",
+    "compare_to_baseline",
+    "find_ceiling",
+    "run_load_test",
+]
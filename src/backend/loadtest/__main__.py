@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+CLI to load test one backend instance with a fake model and a fake Wikipedia.
+
+Example:
+    PYTHONPATH=src python -m backend.loadtest --levels 1,2,4,8 --duration 20 \
+        --compare src/backend/loadtest/baseline.json
+
+    Record a new baseline with --output src/backend/loadtest/baseline.json --summary.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from backend.loadtest.harness import LoadTestConfig, LoadTestReport, compare_to_baseline, run_load_test
+
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    levels: str = typer.Option("1,2,4,8,16", "--levels", help="Comma separated concurrent task workers per level."),
+    duration: float = typer.Option(20.0, "--duration", help="Seconds each level starts new tasks for."),
+    models_per_task: int = typer.Option(2, "--models-per-task", min=1),
+    spectators: int = typer.Option(3, "--spectators", min=1, help="WebSocket spectators per game."),
+    max_steps: int = typer.Option(10, "--max-steps", min=1),
+    llm_latency_ms: float = typer.Option(200.0, "--llm-latency-ms"),
+    llm_jitter_ms: float = typer.Option(100.0, "--llm-jitter-ms"),
+    wiki_latency_ms: float = typer.Option(20.0, "--wiki-latency-ms"),
+    seed: int = typer.Option(0, "--seed"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write the report as JSON here."),
+    summary: bool = typer.Option(False, "--summary", help="Leave the per second timelines out of the saved report (for baselines)."),
+    compare: Optional[Path] = typer.Option(None, "--compare", help="Baseline report to compare against; exits 1 on regressions."),
+    tolerance: float = typer.Option(0.2, "--tolerance", help="Allowed relative throughput/latency change before a regression."),
+    workdir: Optional[Path] = typer.Option(None, "--workdir", file_okay=False, help="Keep the backend logs and models.json here."),
+):
+    """
+    Run each concurrency level against a fresh local backend and print
+    tasks/sec, move latency, loop lag and memory per level.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    config = LoadTestConfig(
+        concurrency_levels=[int(level) for level in levels.split(",")],
+        level_duration_s=duration,
+        models_per_task=models_per_task,
+        spectators_per_game=spectators,
+        max_steps=max_steps,
+        llm_latency_ms=llm_latency_ms,
+        llm_jitter_ms=llm_jitter_ms,
+        wiki_latency_ms=wiki_latency_ms,
+        seed=seed,
+    )
+    if workdir:
+        workdir.mkdir(parents=True, exist_ok=True)
+    report = asyncio.run(run_load_test(config, workdir=workdir))
+
+    typer.echo(
+        f"{'workers':>7} {'tasks/s':>8} {'moves/s':>8} {'move p50':>9} {'move p95':>9} {'move p99':>9} "
+        f"{'lag p99<=':>9} {'RSS peak':>9} {'errors':>6}"
+    )
+    for level in report.levels:
+        move = level.move_latency_ms
+        typer.echo(
+            f"{level.concurrency:>7} {level.tasks_per_s:>8.2f} {level.moves_per_s:>8.1f} "
+            f"{move.get('p50') or 0:>7.0f}ms {move.get('p95') or 0:>7.0f}ms {move.get('p99') or 0:>7.0f}ms "
+            f"{level.loop_lag_ms.get('p99') or 0:>7.0f}ms {level.rss_mb_peak or 0:>7.0f}MB {level.errors:>6}"
+        )
+    typer.echo(f"Ceiling: {report.ceiling} concurrent task workers")
+
+    if output:
+        report.save(output, summary=summary)
+        typer.echo(f"Report: {output}")
+
+    if compare:
+        regressions = compare_to_baseline(report, LoadTestReport.load(compare), tolerance=tolerance)
+        for regression in regressions:
+            typer.echo(f"REGRESSION: {regression}", err=True)
+        if regressions:
+            raise typer.Exit(1)
+        typer.echo(f"No regressions against {compare}")
+
+
+if __name__ == "__main__":
+    app()
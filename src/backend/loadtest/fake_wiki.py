@@ -0,0 +1,185 @@
+"""
+A local fake of the MediaWiki query API, serving a synthetic link graph.
+
+It answers the queries LiveWikiService makes (page links with continuation,
+random pages, links/linkshere existence checks, backlinks), so the backend can
+run games without network access. The graph is generated from a seed: page
+"Page <i>" links to `links_per_page` other pages. The same graph can be
+written as a wiki_graph.sqlite for the solver.
+
+    python -m backend.loadtest.fake_wiki --port 8900 --pages 5000
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+MAX_LIMIT = 500
+
+
+class FakeWikiGraph:
+    """Deterministic synthetic link graph."""
+
+    def __init__(self, num_pages: int = 5000, links_per_page: int = 50, seed: int = 0):
+        if num_pages <= links_per_page:
+            raise ValueError("num_pages must be larger than links_per_page")
+        self.num_pages = num_pages
+        self.titles = [f"Page {i}" for i in range(num_pages)]
+        self.ids = {title: i for i, title in enumerate(self.titles)}
+        self.links: List[List[int]] = []
+        self.backlinks: List[List[int]] = [[] for _ in range(num_pages)]
+        for page in range(num_pages):
+            rng = random.Random(seed * 1_000_003 + page)
+            targets = sorted(rng.sample([other for other in range(num_pages) if other != page], links_per_page))
+            self.links.append(targets)
+            for target in targets:
+                self.backlinks[target].append(page)
+
+    def page_id(self, title: str) -> Optional[int]:
+        return self.ids.get(title.replace("_", " "))
+
+    def title(self, page_id: int) -> str:
+        return self.titles[page_id]
+
+    def write_sqlite(self, path: Path):
+        """Write the graph in the wiki_graph.sqlite schema read by StaticSolverDB (page ids start at 1)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(path) as db:
+            db.execute("CREATE TABLE pages (id INTEGER PRIMARY KEY, namespace INTEGER, title TEXT, is_redirect INTEGER)")
+            db.execute(
+                "CREATE TABLE links (id INTEGER PRIMARY KEY, outgoing_links_count INTEGER, incoming_links_count INTEGER, "
+                "outgoing_links TEXT, incoming_links TEXT)"
+            )
+            db.execute("CREATE TABLE redirects (source_id INTEGER PRIMARY KEY, target_id INTEGER)")
+            db.executemany(
+                "INSERT INTO pages VALUES (?, 0, ?, 0)",
+                ((page + 1, title.replace(" ", "_")) for page, title in enumerate(self.titles)),
+            )
+            db.executemany(
+                "INSERT INTO links VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        page + 1, len(self.links[page]), len(self.backlinks[page]),
+                        "|".join(str(other + 1) for other in self.links[page]),
+                        "|".join(str(other + 1) for other in self.backlinks[page]),
+                    )
+                    for page in range(self.num_pages)
+                ),
+            )
+
+
+def _limit(value: Optional[str]) -> int:
+    if not value or value == "max":
+        return MAX_LIMIT
+    return max(1, min(MAX_LIMIT, int(value)))
+
+
+def _page_entry(graph: FakeWikiGraph, title: str, page_id: Optional[int], params) -> Dict[str, Any]:
+    if page_id is None:
+        return {"ns": 0, "title": title, "missing": True}
+    entry: Dict[str, Any] = {"pageid": page_id + 1, "ns": 0, "title": graph.title(page_id)}
+    if "url" in params.get("inprop", ""):
+        entry["fullurl"] = f"http://fake.wiki/wiki/{graph.title(page_id).replace(' ', '_')}"
+    return entry
+
+
+def query(graph: FakeWikiGraph, params, rng: random.Random) -> Dict[str, Any]:
+    """Answer one action=query request."""
+    result: Dict[str, Any] = {"batchcomplete": True}
+    query_result: Dict[str, Any] = {}
+
+    if params.get("list") == "random":
+        count = _limit(params.get("rnlimit"))
+        query_result["random"] = [
+            {"id": page_id + 1, "ns": 0, "title": graph.title(page_id)}
+            for page_id in rng.sample(range(graph.num_pages), min(count, graph.num_pages))
+        ]
+    elif params.get("list") == "backlinks":
+        page_id = graph.page_id(params.get("bltitle", ""))
+        backlinks = graph.backlinks[page_id] if page_id is not None else []
+        query_result["backlinks"] = [
+            {"pageid": source + 1, "ns": 0, "title": graph.title(source)}
+            for source in backlinks[:_limit(params.get("bllimit"))]
+        ]
+
+    titles = [title for title in params.get("titles", "").split("|") if title]
+    props = set(params.get("prop", "").split("|"))
+    if titles:
+        pages = []
+        for title in titles:
+            page_id = graph.page_id(title)
+            entry = _page_entry(graph, title, page_id, params)
+            if page_id is not None:
+                for prop, prefix, neighbours in (
+                    ("links", "pl", graph.links[page_id]),
+                    ("linkshere", "lh", graph.backlinks[page_id]),
+                ):
+                    if prop not in props:
+                        continue
+                    if len(titles) == 1:
+                        # One page: page through all of its links
+                        offset = int(params.get(f"{prefix}continue", "0|0").split("|")[1])
+                        end = offset + _limit(params.get(f"{prefix}limit"))
+                        if end < len(neighbours):
+                            result["continue"] = {f"{prefix}continue": f"{page_id + 1}|{end}", "continue": "||"}
+                        shown = neighbours[offset:end]
+                    else:
+                        # Several pages share the limit; one link each is enough to show they have links
+                        shown = neighbours[:1]
+                    entry[prop] = [{"ns": 0, "title": graph.title(other)} for other in shown]
+            pages.append(entry)
+        if params.get("formatversion") == "2":
+            query_result["pages"] = pages
+        else:
+            query_result["pages"] = {str(page.get("pageid", -1 - i)): page for i, page in enumerate(pages)}
+
+    result["query"] = query_result
+    return result
+
+
+def create_app(graph: FakeWikiGraph, latency_ms: float = 0.0, seed: int = 0) -> web.Application:
+    """An aiohttp app serving the graph at /w/api.php, each response delayed by latency_ms."""
+    rng = random.Random(seed)
+    app = web.Application()
+    counts = {"requests": 0}
+
+    async def api(request: web.Request) -> web.Response:
+        counts["requests"] += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        if request.query.get("action") != "query":
+            return web.json_response({"error": {"code": "badvalue", "info": "Only action=query is supported"}})
+        return web.json_response(query(graph, request.query, rng))
+
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response({"requests": counts["requests"], "pages": graph.num_pages})
+
+    app.router.add_get("/w/api.php", api)
+    app.router.add_get("/stats", stats)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic MediaWiki query API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--pages", type=int, default=5000, help="Number of pages in the graph")
+    parser.add_argument("--links-per-page", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = FakeWikiGraph(args.pages, args.links_per_page, args.seed)
+    web.run_app(
+        create_app(graph, latency_ms=args.latency_ms, seed=args.seed),
+        host=args.host, port=args.port, print=None, access_log=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+"""
+Load test for one backend instance.
+
+The backend (`backend.main:app` under uvicorn) runs as a subprocess with a
+fake language model (see wiki_arena.language_models.FakeModel) and a local
+fake MediaWiki API (see backend.loadtest.fake_wiki), so only the backend's own
+overhead is measured. For each concurrency level, that many workers create
+tasks through `POST /api/tasks` back to back and follow every game with N
+WebSocket spectators until it ends.
+
+Per level the report has tasks/sec, move latency percentiles (time between
+GAME_MOVE_COMPLETED frames as seen by a spectator), event loop lag, memory
+over time and errors. The ceiling is the highest level that still meets the
+SLOs; reports are saved as JSON baselines and later runs compared to them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+import psutil
+from pydantic import BaseModel, Field
+
+from backend.loadtest.fake_wiki import FakeWikiGraph
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = Path(__file__).resolve().parent.parent.parent
+ENDED_STATUSES = {"won", "lost_max_steps", "lost_invalid_move", "error"}
+
+
+class LoadTestConfig(BaseModel):
+    """What to run and the SLOs that define the ceiling."""
+    concurrency_levels: List[int] = Field(default=[1, 2, 4, 8, 16], description="Concurrent task workers per level")
+    level_duration_s: float = Field(20.0, gt=0, description="Workers start new tasks for this long per level")
+    models_per_task: int = Field(2, ge=1, description="Games per task")
+    spectators_per_game: int = Field(3, ge=1, description="WebSocket clients following each game")
+    max_steps: int = Field(10, ge=1)
+    llm_latency_ms: float = Field(200.0, ge=0, description="Fake model latency per call")
+    llm_jitter_ms: float = Field(100.0, ge=0, description="Extra uniform random latency per call")
+    wiki_latency_ms: float = Field(20.0, ge=0, description="Fake Wikipedia latency per request")
+    wiki_pages: int = Field(5000, gt=1)
+    links_per_page: int = Field(40, ge=1)
+    lag_slo_ms: float = Field(100.0, description="Highest acceptable event loop lag p99")
+    max_slowdown: float = Field(0.5, description="Highest acceptable move latency p95 increase over the first level")
+    game_timeout_s: float = Field(120.0, description="A game not ended after this long counts as an error")
+    seed: int = 0
+
+
+class TimelinePoint(BaseModel):
+    t_s: float
+    rss_mb: float
+    loop_lag_ms: Optional[float] = None
+    active_games: Optional[int] = None
+
+
+class LevelResult(BaseModel):
+    """Measurements of one concurrency level."""
+    concurrency: int
+    elapsed_s: float
+    tasks_completed: int = 0
+    games_completed: int = 0
+    moves: int = 0
+    tasks_per_s: float = 0.0
+    moves_per_s: float = 0.0
+    move_latency_ms: Dict[str, Optional[float]] = {}
+    task_duration_ms: Dict[str, Optional[float]] = {}
+    loop_lag_ms: Dict[str, Optional[float]] = {}
+    rss_mb_start: Optional[float] = None
+    rss_mb_peak: Optional[float] = None
+    timeline: List[TimelinePoint] = []
+    errors: int = 0
+    error_samples: List[str] = []
+
+
+class LoadTestReport(BaseModel):
+    config: LoadTestConfig
+    environment: Dict[str, Any] = {}
+    levels: List[LevelResult] = []
+    ceiling: Optional[int] = None
+
+    def save(self, path: Path, summary: bool = False):
+        """Write the report as JSON; `summary` leaves out the per second timelines (as for baselines)."""
+        exclude = {"levels": {"__all__": {"timeline"}}} if summary else None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.model_dump_json(indent=2, exclude=exclude) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> "LoadTestReport":
+        return cls.model_validate_json(path.read_text())
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99 and max of values (None when empty)."""
+    ordered = sorted(values)
+
+    def pick(q: float) -> Optional[float]:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2) if ordered else None
+
+    return {"p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 2) if ordered else None}
+
+
+def find_ceiling(levels: List[LevelResult], config: LoadTestConfig) -> Optional[int]:
+    """
+    The highest concurrency meeting the SLOs: no errors, loop lag p99 within
+    lag_slo_ms and move latency p95 within max_slowdown of the first level's.
+    """
+    if not levels:
+        return None
+    reference = levels[0].move_latency_ms.get("p95")
+    ceiling = None
+    for level in levels:
+        lag = level.loop_lag_ms.get("p99")
+        move_p95 = level.move_latency_ms.get("p95")
+        if level.errors or not level.moves:
+            continue
+        if lag is not None and lag > config.lag_slo_ms:
+            continue
+        if reference and move_p95 is not None and move_p95 > reference * (1 + config.max_slowdown):
+            continue
+        ceiling = level.concurrency
+    return ceiling
+
+
+def compare_to_baseline(report: LoadTestReport, baseline: LoadTestReport, tolerance: float = 0.2) -> List[str]:
+    """
+    Regressions of report against baseline: a lower ceiling, or at a level both
+    ran, throughput down or move latency p95 up by more than tolerance.
+    """
+    regressions = []
+    if baseline.ceiling is not None and (report.ceiling or 0) < baseline.ceiling:
+        regressions.append(f"ceiling dropped from {baseline.ceiling} to {report.ceiling}")
+
+    baseline_levels = {level.concurrency: level for level in baseline.levels}
+    for level in report.levels:
+        before = baseline_levels.get(level.concurrency)
+        if before is None:
+            continue
+        if before.tasks_per_s and level.tasks_per_s < before.tasks_per_s * (1 - tolerance):
+            regressions.append(
+                f"concurrency {level.concurrency}: tasks/sec {level.tasks_per_s:.2f} < baseline {before.tasks_per_s:.2f}"
+            )
+        p95, before_p95 = level.move_latency_ms.get("p95"), before.move_latency_ms.get("p95")
+        if p95 is not None and before_p95 and p95 > before_p95 * (1 + tolerance):
+            regressions.append(
+                f"concurrency {level.concurrency}: move p95 {p95:.0f}ms > baseline {before_p95:.0f}ms"
+            )
+    return regressions
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "memory_gb": round(psutil.virtual_memory().total / 2**30, 1),
+        "git_commit": _git_commit(),
+    }
+
+
+class LocalBackend:
+    """
+    The fake wiki and the backend as subprocesses, in a scratch directory
+    holding the models.json of the fake models and the fake graph as
+    database/wiki_graph.sqlite for the solver (stored games land there too).
+    """
+
+    def __init__(
+        self,
+        config: LoadTestConfig,
+        graph: FakeWikiGraph,
+        max_concurrent_games: int,
+        workdir: Optional[Path] = None,
+    ):
+        self.config = config
+        self.graph = graph
+        self.max_concurrent_games = max_concurrent_games
+        self._tempdir = None if workdir else tempfile.TemporaryDirectory(prefix="wiki-arena-loadtest-")
+        self.workdir = workdir or Path(self._tempdir.name)
+        self.model_names = [f"fake-model-{i}" for i in range(1, config.models_per_task + 1)]
+        self.base_url = ""
+        # The sampler reads the admin endpoints with it
+        self.admin_headers = {"X-Admin-Token": secrets.token_hex(16)}
+        self.processes: List[subprocess.Popen] = []
+        self.backend: Optional[psutil.Process] = None
+
+    def _write_models(self):
+        models = {
+            name: {
+                "provider": "fake",
+                "input_cost_per_1m_tokens": 0.0,
+                "output_cost_per_1m_tokens": 0.0,
+                "default_settings": {
+                    "latency_ms": self.config.llm_latency_ms,
+                    "jitter_ms": self.config.llm_jitter_ms,
+                    "seed": f"{self.config.seed}:{name}",
+                    "input_tokens": 1000,
+                    "output_tokens": 50,
+                },
+            }
+            for name in self.model_names
+        }
+        (self.workdir / "models.json").write_text(json.dumps(models, indent=2))
+
+    def _spawn(self, args: List[str], env: Dict[str, str], log_name: str) -> subprocess.Popen:
+        log = open(self.workdir / log_name, "w")
+        process = subprocess.Popen(args, cwd=self.workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+        log.close()
+        self.processes.append(process)
+        return process
+
+    async def start(self):
+        self._write_models()
+        database = self.workdir / "database" / "wiki_graph.sqlite"
+        database.unlink(missing_ok=True)
+        self.graph.write_sqlite(database)
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), os.getenv("PYTHONPATH")]))}
+
+        wiki_port = _free_port()
+        self._spawn([
+            sys.executable, "-m", "backend.loadtest.fake_wiki", "--port", str(wiki_port),
+            "--pages", str(self.config.wiki_pages), "--links-per-page", str(self.config.links_per_page),
+            "--latency-ms", str(self.config.wiki_latency_ms), "--seed", str(self.config.seed),
+        ], env, "fake_wiki.log")
+
+        backend_port = _free_port()
+        backend_env = {
+            **env,
+            "WIKIPEDIA_API_URL": f"http://127.0.0.1:{wiki_port}/w/api.php",
+            "MAX_CONCURRENT_GAMES": str(self.max_concurrent_games),
+            "TASK_POOL_SIZE": "0",
+            "WIKI_ARENA_STORAGE_DIR": str(self.workdir / "game_results"),
+            "LOOP_LAG_INTERVAL_MS": "50",
+            "SPAN_SAMPLE_RATE": "1.0",
+            "ADMIN_TOKEN": self.admin_headers["X-Admin-Token"],
+        }
+        backend = self._spawn([
+            sys.executable, "-m", "uvicorn", "backend.main:app",
+            "--host", "127.0.0.1", "--port", str(backend_port), "--log-level", "warning",
+        ], backend_env, "backend.log")
+        self.backend = psutil.Process(backend.pid)
+        self.base_url = f"http://127.0.0.1:{backend_port}"
+
+        await self._wait_ready(f"http://127.0.0.1:{wiki_port}/stats")
+        await self._wait_ready(f"{self.base_url}/health")
+        logger.info(f"Backend ready at {self.base_url} (logs in {self.workdir})")
+
+    async def _wait_ready(self, url: str, timeout_s: float = 60.0):
+        deadline = time.monotonic() + timeout_s
+        async with aiohttp.ClientSession() as session:
+            while time.monotonic() < deadline:
+                if any(process.poll() is not None for process in self.processes):
+                    raise RuntimeError(f"A load test process exited during startup, see the logs in {self.workdir}")
+                try:
+                    async with session.get(url) as response:
+                        if response.status == 200:
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise TimeoutError(f"{url} not ready after {timeout_s}s")
+
+    def rss_mb(self) -> float:
+        return self.backend.memory_info().rss / 2**20 if self.backend else 0.0
+
+    def stop(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.processes = []
+        if self._tempdir:
+            self._tempdir.cleanup()
+
+    async def __aenter__(self) -> "LocalBackend":
+        try:
+            await self.start()
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.stop()
+
+
+class LevelRun:
+    """State of one concurrency level while it runs."""
+
+    def __init__(self, concurrency: int, config: LoadTestConfig, backend: LocalBackend, graph: FakeWikiGraph):
+        self.concurrency = concurrency
+        self.config = config
+        self.backend = backend
+        self.graph = graph
+        self.rng = random.Random(f"{config.seed}:{concurrency}")
+        self.move_latencies_ms: List[float] = []
+        self.task_durations_ms: List[float] = []
+        self.tasks_completed = 0
+        self.games_completed = 0
+        self.errors: List[str] = []
+        self.timeline: List[TimelinePoint] = []
+
+    def error(self, message: str):
+        self.errors.append(message)
+        logger.warning(f"[concurrency {self.concurrency}] {message}")
+
+    async def run(self, session: aiohttp.ClientSession) -> LevelResult:
+        base_url = self.backend.base_url
+        async with session.put(
+            f"{base_url}/api/admin/span-sample-rate", params={"rate": "1.0", "reset": "true"}, headers=self.backend.admin_headers
+        ) as response:
+            response.raise_for_status()
+
+        rss_start = self.backend.rss_mb()
+        start = time.monotonic()
+        deadline = start + self.config.level_duration_s
+        sampler = asyncio.create_task(self._sample(session, start))
+        try:
+            await asyncio.gather(*[self._worker(session, deadline) for _ in range(self.concurrency)])
+        finally:
+            sampler.cancel()
+            await asyncio.gather(sampler, return_exceptions=True)
+        elapsed = time.monotonic() - start
+
+        async with session.get(f"{base_url}/stats") as response:
+            stats = await response.json()
+        lag = next((span for span in stats.get("spans", []) if span["span"] == "event_loop.lag"), None)
+
+        return LevelResult(
+            concurrency=self.concurrency,
+            elapsed_s=round(elapsed, 2),
+            tasks_completed=self.tasks_completed,
+            games_completed=self.games_completed,
+            moves=len(self.move_latencies_ms),
+            tasks_per_s=round(self.tasks_completed / elapsed, 3),
+            moves_per_s=round(len(self.move_latencies_ms) / elapsed, 2),
+            move_latency_ms=percentiles(self.move_latencies_ms),
+            task_duration_ms=percentiles(self.task_durations_ms),
+            # Bucket upper bounds from the backend's span histogram, so they only cover this level
+            loop_lag_ms={
+                "avg": round(lag["avg_ms"], 2) if lag else None,
+                "p50": lag["p50_ms_le"] if lag else None,
+                "p99": lag["p99_ms_le"] if lag else None,
+                "max": round(max((point.loop_lag_ms or 0.0 for point in self.timeline)), 2) if self.timeline else None,
+            },
+            rss_mb_start=round(rss_start, 1),
+            rss_mb_peak=round(max([rss_start] + [point.rss_mb for point in self.timeline]), 1),
+            timeline=self.timeline,
+            errors=len(self.errors),
+            error_samples=self.errors[:10],
+        )
+
+    async def _sample(self, session: aiohttp.ClientSession, start: float):
+        """Backend memory, loop lag and running games once a second."""
+        while True:
+            point = TimelinePoint(t_s=round(time.monotonic() - start, 1), rss_mb=round(self.backend.rss_mb(), 1))
+            try:
+                headers = self.backend.admin_headers
+                async with session.get(f"{self.backend.base_url}/api/admin/loop-lag", headers=headers) as response:
+                    if response.status == 200:
+                        window_max_ms = (await response.json()).get("window_max_ms")
+                        point.loop_lag_ms = round(window_max_ms, 2) if window_max_ms is not None else None
+                async with session.get(f"{self.backend.base_url}/api/admin/tasks", params={"limit": 1}, headers=headers) as response:
+                    if response.status == 200:
+                        point.active_games = (await response.json())["by_name_prefix"].get("game", 0)
+            except aiohttp.ClientError:
+                pass
+            self.timeline.append(point)
+            await asyncio.sleep(1.0)
+
+    async def _worker(self, session: aiohttp.ClientSession, deadline: float):
+        while time.monotonic() < deadline:
+            start_page, target_page = self.rng.sample(self.graph.titles, 2)
+            started = time.monotonic()
+            try:
+                async with session.post(f"{self.backend.base_url}/api/tasks", json={
+                    "task_strategy": {"type": "custom", "start_page": start_page, "target_page": target_page},
+                    "model_names": self.backend.model_names,
+                    "max_steps": self.config.max_steps,
+                    "priority": "batch",
+                }) as response:
+                    if response.status != 200:
+                        self.error(f"POST /api/tasks returned {response.status}: {(await response.text())[:200]}")
+                        await asyncio.sleep(1.0)
+                        continue
+                    task = await response.json()
+            except aiohttp.ClientError as e:
+                self.error(f"POST /api/tasks failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            spectators = [
+                self._spectate(session, game_id, primary=index == 0)
+                for game_id in task["game_ids"]
+                for index in range(self.config.spectators_per_game)
+            ]
+            results = await asyncio.gather(*spectators)
+            if all(results):
+                self.tasks_completed += 1
+                self.task_durations_ms.append((time.monotonic() - started) * 1000)
+
+    async def _spectate(self, session: aiohttp.ClientSession, game_id: str, primary: bool) -> bool:
+        """Follow a game until it ends; the primary spectator records move latencies."""
+        url = self.backend.base_url.replace("http", "ws", 1) + f"/api/games/{game_id}/ws"
+        last_move = time.monotonic()
+        try:
+            async with asyncio.timeout(self.config.game_timeout_s):
+                async with session.ws_connect(url, params={"since_seq": "0"}) as websocket:
+                    async for frame in websocket:
+                        if frame.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        message = json.loads(frame.data)
+                        if message["type"] == "GAME_MOVE_COMPLETED" and primary:
+                            now = time.monotonic()
+                            self.move_latencies_ms.append((now - last_move) * 1000)
+                            last_move = now
+                        elif message["type"] == "CONNECTION_ESTABLISHED":
+                            game = (message.get("complete_state") or {}).get("game") or {}
+                            if game.get("status") in ENDED_STATUSES:
+                                break
+                        elif message["type"] == "GAME_ENDED":
+                            if primary:
+                                self.games_completed += 1
+                                if message.get("final_status") == "error":
+                                    self.error(f"Game {game_id} ended with an error: {message.get('error_message')}")
+                            break
+                    else:
+                        self.error(f"WebSocket for game {game_id} closed before the game ended")
+                        return False
+            return True
+        except (aiohttp.ClientError, TimeoutError) as e:
+            self.error(f"Spectating game {game_id} failed: {type(e).__name__} {e}")
+            return False
+
+
+async def run_load_test(config: LoadTestConfig, workdir: Optional[Path] = None) -> LoadTestReport:
+    """Start a local backend and run every concurrency level against it."""
+    graph = FakeWikiGraph(config.wiki_pages, config.links_per_page, config.seed)
+    max_games = max(config.concurrency_levels) * config.models_per_task
+    report = LoadTestReport(config=config, environment=environment())
+
+    async with LocalBackend(config, graph, max_concurrent_games=max_games, workdir=workdir) as backend:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None)) as session:
+            for concurrency in config.concurrency_levels:
+                logger.info(f"Running concurrency {concurrency} for {config.level_duration_s}s")
+                level = await LevelRun(concurrency, config, backend, graph).run(session)
+                logger.info(
+                    f"Concurrency {concurrency}: {level.tasks_per_s:.2f} tasks/s, "
+                    f"move p95 {level.move_latency_ms.get('p95')}ms, loop lag p99 <= {level.loop_lag_ms.get('p99')}ms, "
+                    f"peak RSS {level.rss_mb_peak}MB, {level.errors} errors"
+                )
+                report.levels.append(level)
+
+    report.ceiling = find_ceiling(report.levels, config)
+    return report
@@ -1,17 +1,26 @@
+import asyncio
 import logging
 import uvicorn
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from backend.config import config
 from backend.api.games import router as games_router
 from backend.api.tasks import router as tasks_router
+from backend.api.admin import router as admin_router
 from backend.websockets.game_hub import websocket_manager
 from backend.coordinators.game_coordinator import GameCoordinator
+from backend.coordinators.game_scheduler import GameScheduler
 from backend.coordinators.task_coordinator import TaskCoordinator
-from wiki_arena import EventBus
+from backend.services.task_pool import TaskPool
+from backend.services.leaderboard_service import LeaderboardService
+from backend.services.worker_affinity import WorkerAffinity, WORKER_HEADER
+from backend.broker import create_broker
+from backend.utils.profiling import LoopLagMonitor, TaskAgeTracker
+from wiki_arena import EventBus, OverflowPolicy, spans
+from wiki_arena.link_store import link_store
 from wiki_arena.wikipedia import LiveWikiService
 
 # Configure unified logging to match wiki_arena style
@@ -24,9 +33,18 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Handle application startup and shutdown events."""
     logger.info("Starting Wiki Arena API...")
+    spans.sample_rate = config.span_sample_rate
+    
+    # Record task creation times (for /api/admin/tasks) before anything starts tasks
+    task_tracker = TaskAgeTracker()
+    task_tracker.install()
+    loop_lag_monitor = None
+    if config.loop_lag_interval_ms > 0:
+        loop_lag_monitor = LoopLagMonitor(interval_s=config.loop_lag_interval_ms / 1000)
+        loop_lag_monitor.start()
     
     # Create event bus
-    event_bus = EventBus()
+    event_bus = EventBus(queued=config.event_bus_queued, queue_size=config.event_queue_size)
     
     # Initialize core services
     wiki_service = LiveWikiService()
@@ -39,9 +57,20 @@ async def lifespan(app: FastAPI):
     solver = WikiTaskSolver(db=static_solver_db)
     logger.info("WikiTaskSolver created")
     
+    # Create the pool of pre-warmed random tasks (with its own solver, see TaskPool)
+    task_pool = None
+    if config.task_pool_size > 0:
+        task_pool = TaskPool(wiki_service, WikiTaskSolver(db=static_solver_db), size=config.task_pool_size)
+    
     # Create coordinators
-    game_coordinator = GameCoordinator(event_bus, wiki_service)
-    task_coordinator = TaskCoordinator(event_bus, game_coordinator)
+    game_scheduler = GameScheduler(
+        max_concurrent=config.max_concurrent_games,
+        provider_limits=config.provider_game_limits,
+    )
+    game_coordinator = GameCoordinator(event_bus, wiki_service, game_scheduler)
+    task_coordinator = TaskCoordinator(
+        event_bus, game_coordinator, task_pool, solve_wait_ms=config.initial_solve_wait_ms
+    )
     
     # Create event handlers with dependencies
     from backend.handlers.websocket_handler import WebSocketHandler
@@ -51,27 +80,46 @@ async def lifespan(app: FastAPI):
     
     websocket_handler = WebSocketHandler()
     solver_handler = SolverHandler(event_bus, solver)
-    storage_handler = StorageHandler()
+    storage_handler = StorageHandler(fsync=config.storage_fsync, max_batch_size=config.storage_batch_size)
+    leaderboard_service = LeaderboardService()
     
     # Create state collector and wire it to websocket manager
     state_collector = StateCollector(game_coordinator, solver_handler)
     websocket_manager.state_collector = state_collector
     
-    # Register event handlers
+    # Share WebSocket fan-out and game ownership with other workers
+    broker = None
+    worker_affinity = None
+    if config.broker_url:
+        broker = create_broker(config.broker_url)
+        await broker.start()
+        await websocket_manager.attach_broker(broker, config.worker_id)
+        worker_affinity = WorkerAffinity(broker, config.worker_id)
+        await worker_affinity.start()
+    
+    # Register event handlers; WebSocket messages share a lane so clients get each game's messages in the order they happened
     event_bus.subscribe("task_selected", solver_handler.handle_task_selected) # start solving task
-    event_bus.subscribe("task_solved", task_coordinator.handle_task_solved) # start games (old handle_initial_paths_ready)
-    event_bus.subscribe("task_solved", websocket_handler.handle_task_solved) # send shortest paths to frontend for all games under that task
+    event_bus.subscribe("task_selected", websocket_handler.handle_task_selected, lane="websocket") # route the task's games to its task channel
+    event_bus.subscribe("task_solved", task_coordinator.handle_task_solved) # start games if still waiting for the solve
+    event_bus.subscribe("task_solve_failed", task_coordinator.handle_task_solve_failed) # start games without optimal paths
+    event_bus.subscribe("task_solved", websocket_handler.handle_task_solved, lane="websocket") # send shortest paths to frontend for all games under that task
 
-    event_bus.subscribe("move_completed", websocket_handler.handle_move_completed) # broadcast move to all clients
-    event_bus.subscribe("move_completed", solver_handler.handle_move_completed) # solve new subtask
-    event_bus.subscribe("shortest_paths_found", websocket_handler.handle_shortest_paths_found) # broadcast optimal paths to all clients
-    event_bus.subscribe("game_ended", websocket_handler.handle_game_ended) # broadcast game ended to all clients
+    event_bus.subscribe("move_completed", websocket_handler.handle_move_completed, lane="websocket") # broadcast move to all clients
+    event_bus.subscribe("move_completed", solver_handler.handle_move_completed, overflow=OverflowPolicy.COALESCE) # solve new subtask (only the latest page per game matters)
+    event_bus.subscribe("shortest_paths_found", websocket_handler.handle_shortest_paths_found, lane="websocket") # broadcast optimal paths to all clients
+    event_bus.subscribe("game_ended", websocket_handler.handle_game_ended, lane="websocket") # broadcast game ended to all clients
     event_bus.subscribe("game_ended", storage_handler.handle_game_ended) # store game in database# NOTE: task_solved is similar to initial_paths_ready
+    event_bus.subscribe("game_ended", leaderboard_service.handle_game_ended) # add game to the leaderboard, refresh ratings
     event_bus.subscribe("game_ended", task_coordinator.handle_game_ended) # mark game as ended, broadcast task_ended if all games have ended 
+    event_bus.subscribe("game_ended", solver_handler.handle_game_ended) # cancel the game's solves, drop its cached paths
     
-    event_bus.subscribe("task_ended", websocket_handler.handle_task_ended) # broadcast task ended to all clients
+    event_bus.subscribe("task_ended", websocket_handler.handle_task_ended, lane="websocket") # broadcast task ended to all clients
+    if worker_affinity:
+        event_bus.subscribe("task_selected", worker_affinity.handle_task_selected) # claim the task and its games for this worker
+        event_bus.subscribe("game_ended", worker_affinity.handle_game_ended) # release finished games
+        event_bus.subscribe("task_ended", worker_affinity.handle_task_ended) # release finished tasks
     # TODO(hunter): make solver cache per target page (more than one task at a time)
-    # event_bus.subscribe("task_ended", solver_handler.handle_task_ended) # clear solver cache for this target page
+    event_bus.subscribe("task_ended", solver_handler.handle_task_ended) # drop paths cached after the task's games ended
     
     logger.info("Event handlers registered")
     
@@ -81,6 +129,17 @@ async def lifespan(app: FastAPI):
     app.state.task_coordinator = task_coordinator
     app.state.wiki_service = wiki_service
     app.state.solver = solver
+    app.state.task_pool = task_pool
+    app.state.worker_affinity = worker_affinity
+    app.state.storage_handler = storage_handler
+    app.state.leaderboard_service = leaderboard_service
+    app.state.task_tracker = task_tracker
+    app.state.loop_lag_monitor = loop_lag_monitor
+    
+    if task_pool:
+        await task_pool.start()
+    # Load stored games in the background; /leaderboard serves what is loaded so far
+    leaderboard_load = asyncio.create_task(leaderboard_service.start())
     
     logger.info("Wiki Arena API startup complete")
     
@@ -88,8 +147,31 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Wiki Arena API...")
+    if task_pool:
+        await task_pool.stop()
     await game_coordinator.shutdown()
     await task_coordinator.shutdown()
+    await solver_handler.shutdown()
+    # Ended games still queued for storage and the leaderboard are kept; WebSocket and solver events are dropped
+    try:
+        await asyncio.wait_for(
+            event_bus.drain([storage_handler.handle_game_ended, leaderboard_service.handle_game_ended]),
+            timeout=config.shutdown_drain_s,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Ended games still queued for storage after {config.shutdown_drain_s}s; dropping them")
+    await event_bus.shutdown(drain=False)
+    await storage_handler.shutdown()
+    leaderboard_load.cancel()
+    await leaderboard_service.shutdown()
+    if worker_affinity:
+        await worker_affinity.stop()
+    if broker:
+        await websocket_manager.flush_snapshots()
+        await broker.stop()
+    if loop_lag_monitor:
+        await loop_lag_monitor.stop()
+    task_tracker.uninstall()
     logger.info("Wiki Arena API shutdown complete")
 
 # Create FastAPI app
@@ -104,6 +186,7 @@ app = FastAPI(
 # Routers and Middleware
 app.include_router(games_router)
 app.include_router(tasks_router)
+app.include_router(admin_router)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=config.cors_origins,
@@ -112,6 +195,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if config.broker_url:
+    @app.middleware("http")
+    async def add_worker_header(request: Request, call_next):
+        """Name the worker in every response so a load balancer can keep clients on it."""
+        response = await call_next(request)
+        response.headers[WORKER_HEADER] = config.worker_id
+        return response
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -128,7 +219,9 @@ async def root():
         "docs": "/docs",
         "health": "/health",
         "websocket_example": "ws://localhost:8000/api/games/{game_id}/ws",
-        "task_api": "/api/tasks"
+        "task_api": "/api/tasks",
+        "leaderboard": "/leaderboard",
+        "metrics": "/metrics"
     }
 
 @app.get("/health")
@@ -168,13 +261,37 @@ async def get_stats():
                 game_id: websocket_manager.get_connection_count(game_id)
                 for game_id in active_games
             },
-            "task_details": active_tasks
+            "task_details": active_tasks,
+            "tasks_with_connections": {
+                task_id: websocket_manager.get_task_connection_count(task_id)
+                for task_id in websocket_manager.get_all_tasks()
+            },
+            "game_scheduler": app.state.game_coordinator.scheduler.get_stats(),
+            "storage": app.state.storage_handler.get_stats(),
+            "leaderboard": app.state.leaderboard_service.get_stats(),
+            "task_pool": task_coordinator.task_pool.get_stats() if task_coordinator.task_pool else None,
+            "websocket_sync": websocket_manager.sync_log.get_stats(),
+            "worker": app.state.worker_affinity.get_stats() if app.state.worker_affinity else {"worker_id": config.worker_id},
+            "event_handlers": app.state.event_bus.get_stats(),
+            "spans": spans.get_stats(),
+            "link_store": link_store.get_stats(),
+            "event_loop": app.state.loop_lag_monitor.get_stats() if app.state.loop_lag_monitor else None
         }
     except Exception as e:
         return {
             "error": f"Failed to get stats: {str(e)}"
         }
 
+@app.get("/leaderboard")
+async def get_leaderboard():
+    """Model ratings from all stored and finished games (cached, refreshed as games end)."""
+    return app.state.leaderboard_service.get_leaderboard()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Hot-path span latency histograms in the Prometheus text format."""
+    return PlainTextResponse(spans.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler for unhandled errors."""
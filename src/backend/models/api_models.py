@@ -7,6 +7,7 @@ class TaskStrategyType(str, Enum):
     """Types of task selection strategies."""
     RANDOM = "random"
     CUSTOM = "custom"
+    CORPUS = "corpus"       # Drawn from a precomputed task corpus
     RANKED = "ranked"       # Future: based on player skill
     THEMED = "themed"       # Future: within specific categories
     CAMPAIGN = "campaign"   # Future: sequential difficulty
@@ -41,6 +42,15 @@ class CustomTaskStrategy(BaseModel):
             raise ValueError("Page titles must be non-empty if provided")
         return v.strip() if v else None
 
+class CorpusTaskStrategy(BaseModel):
+    """Strategy for tasks drawn from a precomputed corpus (see wiki_arena.cli.generate_task_corpus)."""
+    type: Literal[TaskStrategyType.CORPUS]
+    corpus: str = Field(
+        "task_corpus", pattern=r"^[A-Za-z0-9_-]+$",
+        description="Name of a corpus in the server's corpus directory (the file <name>.tsv)"
+    )
+    path_length: Optional[int] = Field(None, ge=1, description="Shortest path length of the task (optional - any length if not provided)")
+
 # class RankedTaskStrategy(BaseModel):
 #     """Strategy for skill-based task selection (future implementation)."""
 #     type: TaskStrategyType = TaskStrategyType.RANKED
@@ -54,17 +64,26 @@ class CustomTaskStrategy(BaseModel):
 #     difficulty: str = Field("any", description="Difficulty preference")
 
 # Union type for all task strategies  
+# CorpusTaskStrategy comes first: its required literal type keeps it from matching
+# other strategies, while the others would accept {"type": "corpus"} as well
 TaskStrategy = Union[
+    CorpusTaskStrategy,
     RandomTaskStrategy,
     CustomTaskStrategy,
 ]
 
+class GamePriority(str, Enum):
+    """Scheduling priority of a task's games when the server is at capacity."""
+    INTERACTIVE = "interactive"  # Someone is watching: admitted first
+    BATCH = "batch"              # Bulk runs: admitted when no interactive game is waiting
+
 # Game Configuration Models
 class CreateTaskRequest(BaseModel):
     """Request to create a new task with multiple competing games."""
     task_strategy: TaskStrategy = Field(..., description="How to select the start/target pages")
     model_names: List[str] = Field(..., description="A list of model names to compete in the task")
     max_steps: int = Field(30, description="Maximum number of steps allowed per game")
+    priority: GamePriority = Field(GamePriority.INTERACTIVE, description="Scheduling priority of the games when the server is at capacity")
 
 class CreateTaskResponse(BaseModel):
     """Response when creating a new task."""
@@ -0,0 +1,109 @@
+"""
+Leaderboard Service for Backend API
+
+Keeps model ratings current as games end, so serving the leaderboard never
+reloads stored games or refits from scratch.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from wiki_arena import GameEvent
+from wiki_arena.ratings import IncrementalLeaderboard
+from wiki_arena.storage import GameRepository, GameSummary, StorageConfig
+
+logger = logging.getLogger(__name__)
+
+class LeaderboardService:
+    """
+    Incremental leaderboard fed by game_ended events.
+
+    On start, the stored games are loaded once (off the event loop). Every
+    ended game then adds its comparisons to the leaderboard, and a refresh is
+    scheduled `refresh_delay_ms` later, so a task ending many games at once
+    causes a single warm-started refit. Refits run in a thread; the ratings
+    served are those of the last completed refresh.
+    """
+
+    def __init__(
+        self,
+        storage_config: Optional[StorageConfig] = None,
+        leaderboard: Optional[IncrementalLeaderboard] = None,
+        refresh_delay_ms: float = 100.0,
+    ):
+        self.storage_config = storage_config or StorageConfig()
+        self.leaderboard = leaderboard or IncrementalLeaderboard()
+        self.refresh_delay_ms = refresh_delay_ms
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loaded = False
+
+    async def start(self):
+        """Load the stored games and compute the initial ratings."""
+        summaries = await asyncio.to_thread(self._load_stored_summaries)
+        added = self.leaderboard.add_games(summaries)
+        await asyncio.to_thread(self.leaderboard.refresh)
+        self._loaded = True
+        logger.info(f"Leaderboard loaded {added} stored games ({len(self.leaderboard.ratings)} models)")
+
+    def _load_stored_summaries(self):
+        try:
+            return GameRepository(self.storage_config).get_summaries()
+        except Exception as e:
+            logger.error(f"Failed to load stored games for the leaderboard: {e}", exc_info=True)
+            return []
+
+    async def handle_game_ended(self, event: GameEvent):
+        """Add the ended game to the leaderboard and schedule a refresh."""
+        game_state = event.data.get("game_state")
+        if not game_state:
+            logger.error(f"No game_state found in game_ended event for game {event.game_id}")
+            return
+
+        # Only games the storage keeps, so the ratings match those rebuilt from storage on restart
+        error_types = (move.error.type for move in game_state.move_history if move.error)
+        if not self.storage_config.accepts(game_state.status, error_types):
+            logger.debug(f"Game {event.game_id} is not stored ({game_state.status.value}), leaving it off the leaderboard")
+            return
+
+        if self.leaderboard.add_game(GameSummary.from_game_state(game_state)):
+            self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if self._refresh_task and not self._refresh_task.done():
+            return  # the pending refresh will include this game
+        self._refresh_task = asyncio.create_task(self._refresh_soon(), name="leaderboard-refresh")
+
+    async def _refresh_soon(self):
+        await asyncio.sleep(self.refresh_delay_ms / 1000)
+        try:
+            while self.leaderboard.stale:
+                await asyncio.to_thread(self.leaderboard.refresh)
+        except Exception as e:
+            logger.error(f"Failed to refresh the leaderboard: {e}", exc_info=True)
+
+    async def refresh(self):
+        """Refresh the ratings now (e.g. before serving them in tests or scripts)."""
+        await asyncio.to_thread(self.leaderboard.refresh)
+
+    def get_leaderboard(self) -> Dict[str, Any]:
+        """The cached ratings, best first."""
+        updated_at = self.leaderboard.updated_at
+        return {
+            "ratings": self.leaderboard.get_leaderboard(),
+            "updated_at": updated_at.isoformat() if updated_at else None,
+            "loaded": self._loaded,
+            "pending_games": self.leaderboard.stale,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.leaderboard.get_stats()
+
+    async def shutdown(self):
+        """Cancel a scheduled refresh."""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,166 @@
+"""
+Task Pool Service for Backend API
+
+Keeps a few random tasks ready so task creation doesn't wait on task selection,
+the start page fetch and the initial solve.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+from wiki_arena.models import Page, Task
+from wiki_arena.solver import SolverResponse, WikiTaskSolver
+from wiki_arena.wikipedia import LiveWikiService
+from backend.models.api_models import RandomTaskStrategy
+from backend.services.task_selector_service import task_selector_service
+
+logger = logging.getLogger(__name__)
+
+class PreparedTask:
+    """A selected task with its start page fetched and (if possible) solved."""
+    def __init__(self, task: Task, start_page: Page, solver_result: Optional[SolverResponse] = None):
+        self.task = task
+        self.start_page = start_page
+        self.solver_result = solver_result
+        self.prepared_at = time.monotonic()
+
+class TaskPool:
+    """
+    Pool of pre-warmed random tasks, replenished in the background.
+
+    Every draw schedules a refill, so the pool climbs back to `size` without the
+    request ever waiting. Failed refills back off before retrying so an outage of
+    the Wikipedia API doesn't turn into a request storm.
+    """
+
+    def __init__(
+        self,
+        wiki_service: LiveWikiService,
+        solver: Optional[WikiTaskSolver] = None,
+        strategy: Optional[RandomTaskStrategy] = None,
+        size: int = 5,
+        max_concurrent_refills: int = 2,
+        retry_delay_s: float = 5.0,
+    ):
+        self.wiki_service = wiki_service
+        # The solver keeps per-target BFS state, so the pool uses its own instance
+        # rather than the one solving live games
+        self.solver = solver
+        self.strategy = strategy or RandomTaskStrategy()
+        self.size = size
+        self.max_concurrent_refills = max_concurrent_refills
+        self.retry_delay_s = retry_delay_s
+
+        self._ready: Deque[PreparedTask] = deque()
+        self._refills: Set[asyncio.Task] = set()
+        self._running = False
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.refills_completed = 0
+        self.refills_failed = 0
+        self.total_refill_latency_ms = 0.0
+        self.last_refill_latency_ms: Optional[float] = None
+
+    def serves(self, strategy: Any) -> bool:
+        """Whether a task request with this strategy can be served from the pool."""
+        return isinstance(strategy, RandomTaskStrategy) and strategy == self.strategy
+
+    async def start(self):
+        """Start filling the pool in the background."""
+        self._running = True
+        logger.info(f"Starting task pool (size {self.size})")
+        self._schedule_refills()
+
+    async def stop(self):
+        """Cancel pending refills and drop prepared tasks."""
+        self._running = False
+        for refill in list(self._refills):
+            refill.cancel()
+        await asyncio.gather(*self._refills, return_exceptions=True)
+        self._refills.clear()
+        self._ready.clear()
+        logger.info("Task pool stopped")
+
+    def take(self) -> Optional[PreparedTask]:
+        """Take a prepared task if one is ready, and schedule a refill."""
+        prepared = self._ready.popleft() if self._ready else None
+        if prepared:
+            self.hits += 1
+        else:
+            self.misses += 1
+            logger.info("Task pool empty, falling back to on-demand task selection")
+        self._schedule_refills()
+        return prepared
+
+    def _schedule_refills(self):
+        if not self._running:
+            return
+        while len(self._ready) + len(self._refills) < self.size and len(self._refills) < self.max_concurrent_refills:
+            refill = asyncio.create_task(self._refill(), name="task-pool-refill")
+            self._refills.add(refill)
+            refill.add_done_callback(self._on_refill_done)
+
+    def _on_refill_done(self, refill: asyncio.Task):
+        self._refills.discard(refill)
+        self._schedule_refills()
+
+    async def _refill(self):
+        start_time = time.monotonic()
+        try:
+            prepared = await self._prepare_task()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.refills_failed += 1
+            logger.warning(f"Task pool refill failed: {e}")
+            await asyncio.sleep(self.retry_delay_s)
+        else:
+            latency_ms = (time.monotonic() - start_time) * 1000
+            self.refills_completed += 1
+            self.total_refill_latency_ms += latency_ms
+            self.last_refill_latency_ms = latency_ms
+            self._ready.append(prepared)
+            logger.debug(
+                f"Task pool refilled with {prepared.task.start_page_title} -> {prepared.task.target_page_title} "
+                f"in {latency_ms:.0f}ms ({len(self._ready)}/{self.size} ready)"
+            )
+
+    async def _prepare_task(self) -> PreparedTask:
+        task = await task_selector_service.select_task(self.strategy)
+        if not task:
+            raise ValueError("Failed to select a valid task")
+
+        start_page = await self.wiki_service.get_page(task.start_page_title)
+
+        solver_result = None
+        if self.solver:
+            try:
+                solver_result = await self.solver.find_shortest_path(task.start_page_title, task.target_page_title)
+            except Exception as e:
+                # The task is still playable; it will be solved when it is created
+                logger.warning(f"Initial solve failed for pooled task {task.start_page_title} -> {task.target_page_title}: {e}")
+
+        return PreparedTask(task, start_page, solver_result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, hit rate and refill latency for /stats."""
+        draws = self.hits + self.misses
+        return {
+            "ready": len(self._ready),
+            "target_size": self.size,
+            "refills_in_flight": len(self._refills),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / draws if draws else None,
+            "refills_completed": self.refills_completed,
+            "refills_failed": self.refills_failed,
+            "avg_refill_latency_ms": (
+                self.total_refill_latency_ms / self.refills_completed if self.refills_completed else None
+            ),
+            "last_refill_latency_ms": self.last_refill_latency_ms,
+        }
@@ -6,18 +6,23 @@ integrating the existing wiki_arena task selection infrastructure.
 """
 
 import logging
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
 from abc import ABC, abstractmethod
 
 from wiki_arena.models import Task
 from wiki_arena.wikipedia.task_selector import get_random_task_async
 from wiki_arena.wikipedia.live_service import LiveWikiService
 from wiki_arena.wikipedia.task_selector import WikipediaTaskSelector
+from wiki_arena.solver.task_corpus import TaskCorpus
+from backend.config import config
 from backend.models.api_models import (
     TaskStrategy,
     TaskStrategyType,
     RandomTaskStrategy,
     CustomTaskStrategy,
+    CorpusTaskStrategy,
 )
 
 logger = logging.getLogger(__name__)
@@ -89,60 +94,56 @@ class CustomTaskSelector(TaskSelector):
             logger.error(f"Error validating page '{page_title}': {e}")
             return False
     
-    async def _find_random_start_page(self, exclude_page: Optional[str] = None) -> Optional[str]:
-        """Find a random page that can serve as a valid start page (has outgoing links)."""
-        selector = WikipediaTaskSelector(
+    def _task_selector(self) -> WikipediaTaskSelector:
+        return WikipediaTaskSelector(
             live_wiki_service=self.wiki,
             max_retries=self.strategy.max_retries
         )
-        
+    
+    async def _find_random_page(self, find_valid_page, selector: WikipediaTaskSelector, exclude_page: Optional[str]) -> Optional[str]:
+        """Draw batches of random pages and validate each batch at once with `find_valid_page`."""
         for attempt in range(self.strategy.max_retries):
             try:
-                # Get random pages and find a valid start page
                 random_pages = await self.wiki.get_random_pages(count=20)
                 valid_pages = [
                     page for page in random_pages 
                     if selector._is_valid_page_title(page) and page != exclude_page
                 ]
                 
-                start_page = await selector._find_valid_start_page(valid_pages)
-                if start_page:
-                    return start_page
+                page = await find_valid_page(valid_pages)
+                if page:
+                    return page
                     
             except Exception as e:
-                logger.warning(f"Error in attempt {attempt + 1} to find random start page: {e}")
+                logger.warning(f"Error in attempt {attempt + 1} to find random page: {e}")
         
         return None
     
+    async def _find_random_start_page(self, exclude_page: Optional[str] = None) -> Optional[str]:
+        """Find a random page that can serve as a valid start page (has outgoing links)."""
+        selector = self._task_selector()
+        return await self._find_random_page(selector._find_valid_start_page, selector, exclude_page)
+    
     async def _find_random_target_page(self, exclude_page: Optional[str] = None) -> Optional[str]:
         """Find a random page that can serve as a valid target page (has incoming links)."""
-        selector = WikipediaTaskSelector(
-            live_wiki_service=self.wiki,
-            max_retries=self.strategy.max_retries
+        selector = self._task_selector()
+        return await self._find_random_page(
+            lambda pages: selector._find_valid_target_page(pages, exclude_page=exclude_page or ""),
+            selector,
+            exclude_page,
         )
-        
-        for attempt in range(self.strategy.max_retries):
-            try:
-                # Get random pages and find a valid target page
-                random_pages = await self.wiki.get_random_pages(count=20)
-                valid_pages = [
-                    page for page in random_pages 
-                    if selector._is_valid_page_title(page) and page != exclude_page
-                ]
-                
-                target_page = await selector._find_valid_target_page(valid_pages, exclude_page=exclude_page or "")
-                if target_page:
-                    return target_page
-                    
-            except Exception as e:
-                logger.warning(f"Error in attempt {attempt + 1} to find random target page: {e}")
-        
-        return None
     
     async def select_task(self) -> Optional[Task]:
         """Create a task from user-specified pages, with validation and random fallback."""
         logger.info(f"Creating custom task: {self.strategy.start_page} → {self.strategy.target_page}")
         
+        # Nothing specified: both pages come from one validated random batch
+        if not self.strategy.start_page and not self.strategy.target_page:
+            task = await self._task_selector().select_task_async()
+            if not task:
+                logger.error("Failed to find suitable random start and target pages")
+            return task
+        
         # Handle start page - validate if provided, otherwise find random
         if self.strategy.start_page:
             if not await self._validate_page_exists(self.strategy.start_page):
@@ -210,6 +211,53 @@ class CustomTaskSelector(TaskSelector):
             
         return info
 
+class CorpusTaskSelector(TaskSelector):
+    """
+    Selector for tasks drawn from a precomputed task corpus.
+
+    Clients name a corpus; only <name>.tsv files in the corpus directory
+    (TASK_CORPUS_DIR) can be read.
+    """
+
+    # The most recently used corpora, loaded once and shared by all selectors
+    MAX_CACHED_CORPORA = 4
+    _corpora: "OrderedDict[Path, TaskCorpus]" = OrderedDict()
+
+    def __init__(self, strategy: CorpusTaskStrategy, corpus_dir: Optional[Union[str, Path]] = None):
+        self.strategy = strategy
+        self.path = Path(corpus_dir or config.corpus_dir) / f"{strategy.corpus}.tsv"
+
+    def _get_corpus(self) -> TaskCorpus:
+        corpus = self._corpora.get(self.path)
+        if corpus is None:
+            corpus = TaskCorpus.load(self.path)
+            logger.info(f"Loaded task corpus {self.path}: {len(corpus)} tasks, path lengths {corpus.path_lengths}")
+            self._corpora[self.path] = corpus
+            while len(self._corpora) > self.MAX_CACHED_CORPORA:
+                self._corpora.popitem(last=False)
+        else:
+            self._corpora.move_to_end(self.path)
+        return corpus
+
+    async def select_task(self) -> Optional[Task]:
+        """Draw a task from the corpus without any Wikipedia API calls."""
+        try:
+            task = self._get_corpus().draw(self.strategy.path_length)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to draw task from corpus '{self.strategy.corpus}': {e}")
+            return None
+
+        logger.info(f"Selected corpus task: {task.start_page_title} → {task.target_page_title}")
+        return task
+
+    def get_strategy_info(self) -> Dict[str, str]:
+        return {
+            "strategy": "corpus",
+            "corpus": self.strategy.corpus,
+            "path_length": str(self.strategy.path_length) if self.strategy.path_length else "any",
+            "description": "Drawn from a precomputed corpus of solved tasks"
+        }
+
 class TaskSelectorService:
     """Main service for task selection."""
     
@@ -217,6 +265,7 @@ class TaskSelectorService:
         self.selectors = {
             TaskStrategyType.RANDOM: RandomTaskSelector,
             TaskStrategyType.CUSTOM: CustomTaskSelector,
+            TaskStrategyType.CORPUS: CorpusTaskSelector,
         }
     
     async def select_task(self, strategy: TaskStrategy) -> Optional[Task]:
@@ -0,0 +1,117 @@
+"""
+Worker Affinity Service for Backend API
+
+Records which worker runs each task and game, so requests that land on another
+worker can be pointed at the right one.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+from fastapi import HTTPException
+
+from wiki_arena import GameEvent
+from backend.broker import Broker
+
+logger = logging.getLogger(__name__)
+
+# Response header naming the worker that runs a game, for sticky routing
+WORKER_HEADER = "X-Wiki-Arena-Worker"
+
+class WorkerAffinity:
+    """
+    Claims tasks and games for this worker in the broker.
+
+    A task and its games stay on the worker that created them (their state and
+    the running game loops live there). Claims expire unless renewed, so the
+    games of a worker that dies are no longer attributed to it.
+    """
+
+    def __init__(self, broker: Broker, worker_id: str, ttl_s: float = 30.0):
+        self.broker = broker
+        self.worker_id = worker_id
+        self.ttl_s = ttl_s
+        self._owned: Set[str] = set()
+        self._renewer: Optional[asyncio.Task] = None
+        self.claims_lost = 0
+
+    @staticmethod
+    def _key(kind: str, item_id: str) -> str:
+        return f"owner:{kind}:{item_id}"
+
+    async def start(self):
+        self._renewer = asyncio.create_task(self._renew_claims(), name="worker-affinity-renewer")
+
+    async def stop(self):
+        """Stop renewing and give up every claim."""
+        if self._renewer:
+            self._renewer.cancel()
+            await asyncio.gather(self._renewer, return_exceptions=True)
+            self._renewer = None
+        for key in list(self._owned):
+            await self._release(key)
+
+    async def _claim(self, key: str):
+        holder = await self.broker.claim(key, self.worker_id, self.ttl_s)
+        if holder == self.worker_id:
+            self._owned.add(key)
+        else:
+            self._owned.discard(key)
+            self.claims_lost += 1
+            logger.warning(f"{key} is held by worker {holder}, not {self.worker_id}")
+
+    async def _release(self, key: str):
+        self._owned.discard(key)
+        try:
+            if await self.broker.get(key) == self.worker_id:
+                await self.broker.delete(key)
+        except Exception as e:
+            logger.warning(f"Failed to release {key}: {e}")
+
+    async def _renew_claims(self):
+        while True:
+            await asyncio.sleep(self.ttl_s / 3)
+            for key in list(self._owned):
+                try:
+                    await self._claim(key)
+                except Exception as e:
+                    logger.warning(f"Failed to renew {key}: {e}")
+
+    async def owner_of(self, kind: str, item_id: str) -> Optional[str]:
+        """Worker running a "game" or "task", if any worker claims it."""
+        return await self.broker.get(self._key(kind, item_id))
+
+    async def misdirected(self, kind: str, item_id: str) -> Optional[HTTPException]:
+        """A 421 pointing at the worker running a game or task that isn't here, else None."""
+        try:
+            owner = await self.owner_of(kind, item_id)
+        except Exception as e:
+            logger.warning(f"Failed to look up the owner of {kind} {item_id}: {e}")
+            return None
+        if not owner or owner == self.worker_id:
+            return None
+        return HTTPException(
+            status_code=421,
+            detail=f"{kind.capitalize()} {item_id} is running on worker {owner}",
+            headers={WORKER_HEADER: owner},
+        )
+
+    async def handle_task_selected(self, event: GameEvent):
+        """Claim a new task and its games for this worker."""
+        task_id = event.data.get("task_id")
+        keys = [self._key("task", task_id)] + [self._key("game", game_id) for game_id in event.data.get("game_ids", [])]
+        await asyncio.gather(*[self._claim(key) for key in keys])
+
+    async def handle_game_ended(self, event: GameEvent):
+        await self._release(self._key("game", event.game_id))
+
+    async def handle_task_ended(self, event: GameEvent):
+        await self._release(self._key("task", event.data.get("task_id")))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "owned": len(self._owned),
+            "claims_lost": self.claims_lost,
+        }
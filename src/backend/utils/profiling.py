@@ -0,0 +1,263 @@
+"""
+Runtime diagnostics for a running backend: a sampling profiler, an event loop
+lag monitor and the ages of pending asyncio tasks.
+
+None of them needs a restart or an extra dependency, so they can be turned on
+when a production worker slows down to catch blocking calls in the act.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from wiki_arena.telemetry import spans
+
+logger = logging.getLogger(__name__)
+
+Frame = Tuple[str, str, int]  # (function, file, first line)
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of running threads from a background thread.
+
+    Every `interval_s` the stack of the target thread (by default the one
+    running the event loop) is recorded; identical stacks are counted. The
+    profile is returned in the collapsed format (`a;b;c count` per line, for
+    flamegraph.pl or speedscope) or as a speedscope JSON document.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval_s: float = 0.005, all_threads: bool = False):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval_s = interval_s
+        self.all_threads = all_threads
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.elapsed_s = 0.0
+
+    def run(self, duration_s: float):
+        """Sample for duration_s seconds (blocks the calling thread, which is never sampled)."""
+        own_id = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        start = time.perf_counter()
+        deadline = start + duration_s
+        while time.perf_counter() < deadline:
+            frames = sys._current_frames()
+            if self.all_threads:
+                targets = [(ident, frame) for ident, frame in frames.items() if ident != own_id]
+            else:
+                frame = frames.get(self.thread_id)
+                targets = [(self.thread_id, frame)] if frame is not None else []
+            for ident, frame in targets:
+                stack = self._stack(frame)
+                if self.all_threads:
+                    stack = ((f"thread:{thread_names.get(ident, ident)}", "", 0),) + stack
+                self.stacks[stack] += 1
+            self.samples += 1
+            time.sleep(self.interval_s)
+        self.elapsed_s = time.perf_counter() - start
+
+    @staticmethod
+    def _stack(frame) -> Tuple[Frame, ...]:
+        """The frame's stack, outermost call first; frames are keyed by function so lines aggregate."""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    @staticmethod
+    def _frame_name(frame: Frame) -> str:
+        function, filename, line = frame
+        return f"{function} ({filename}:{line})" if filename else function
+
+    def collapsed(self) -> str:
+        """One `frame;frame;frame count` line per distinct stack, most frequent first."""
+        return "".join(
+            ";".join(self._frame_name(frame).replace(";", ":") for frame in stack) + f" {count}\n"
+            for stack, count in self.stacks.most_common()
+        )
+
+    def speedscope(self, name: str = "wiki-arena") -> Dict[str, Any]:
+        """The samples as a speedscope sampled profile (weights in seconds)."""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict[str, Any]] = []
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self.stacks.most_common():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    function, filename, line = frame
+                    frames.append({"name": function, "file": filename, "line": line} if filename else {"name": function})
+                indices.append(frame_index[frame])
+            samples.append(indices)
+            weights.append(count * self.interval_s)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "wiki-arena",
+            "name": name,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop lag as timer drift.
+
+    A task sleeps `interval_s` in a loop; how much later than requested it
+    wakes up is the time the loop spent running something else without
+    yielding. Lags are kept for the last `window` wakeups and also observed
+    as the `event_loop.lag` span.
+    """
+
+    def __init__(self, interval_s: float = 0.1, window: int = 600, stall_threshold_s: float = 0.1):
+        self.interval_s = interval_s
+        self.stall_threshold_s = stall_threshold_s
+        self.lags: deque = deque(maxlen=window)
+        self.max_lag_s = 0.0
+        self.stalls = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            self.record(max(0.0, loop.time() - expected))
+
+    def record(self, lag_s: float):
+        self.lags.append(lag_s)
+        if lag_s > self.max_lag_s:
+            self.max_lag_s = lag_s
+        if lag_s >= self.stall_threshold_s:
+            self.stalls += 1
+            logger.warning(f"Event loop blocked for {lag_s * 1000:.0f}ms")
+        spans.observe("event_loop.lag", lag_s)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lags = sorted(self.lags)
+
+        def percentile(q: float) -> Optional[float]:
+            return lags[min(len(lags) - 1, int(q * len(lags)))] * 1000 if lags else None
+
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_ms": self.interval_s * 1000,
+            "last_ms": self.lags[-1] * 1000 if self.lags else None,
+            "p50_ms": percentile(0.5),
+            "p99_ms": percentile(0.99),
+            "window_max_ms": lags[-1] * 1000 if lags else None,
+            "max_ms": self.max_lag_s * 1000,
+            "stalls": self.stalls,
+        }
+
+
+def innermost_frame(coro: Any) -> Any:
+    """
+    Frame a coroutine is suspended at, following its awaits down to the innermost coroutine.
+
+    Task.get_stack() only shows the task's own coroutine, which for most tasks
+    is a wrapper awaiting the code that actually waits.
+    """
+    frame = None
+    while coro is not None:
+        inner = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if inner is None:
+            # A future, or a coroutine that is running or done
+            break
+        frame = inner
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return frame
+
+
+class TaskAgeTracker:
+    """
+    Records when each asyncio task is created, through the loop's task factory.
+
+    asyncio does not keep task creation times; with the tracker installed,
+    `pending_tasks` can list the oldest pending tasks with where they are
+    suspended. Tasks created before installation have no age.
+    """
+
+    def __init__(self):
+        self.created: "weakref.WeakKeyDictionary[asyncio.Task, float]" = weakref.WeakKeyDictionary()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._previous_factory = None
+
+    def install(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop or asyncio.get_running_loop()
+        self._previous_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._factory)
+
+    def uninstall(self):
+        if self._loop is not None and self._loop.get_task_factory() == self._factory:
+            self._loop.set_task_factory(self._previous_factory)
+        self._loop = None
+
+    def _factory(self, loop, coro, **kwargs):
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        self.created[task] = time.monotonic()
+        return task
+
+    def pending_tasks(self, limit: int = 50, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Pending tasks of the running loop, oldest first, with the line each one is suspended at."""
+        now = time.monotonic()
+        tasks = [task for task in asyncio.all_tasks() if not task.done()]
+        if prefix:
+            tasks = [task for task in tasks if task.get_name().startswith(prefix)]
+        # Tasks without a recorded creation time sort last
+        tasks.sort(key=lambda task: self.created.get(task, now))
+
+        described = []
+        for task in tasks[:limit]:
+            created = self.created.get(task)
+            frame = innermost_frame(task.get_coro())
+            described.append({
+                "name": task.get_name(),
+                "age_s": round(now - created, 3) if created is not None else None,
+                "coro": getattr(task.get_coro(), "__qualname__", repr(task.get_coro())),
+                "waiting_at": f"{frame.f_code.co_filename}:{frame.f_lineno}" if frame else None,
+            })
+        return described
+
+    def get_stats(self) -> Dict[str, Any]:
+        pending = [task for task in asyncio.all_tasks() if not task.done()]
+        # Named tasks are grouped by the part before ':' (game:<id> -> game); asyncio's default names are Task-<n>
+        by_kind = Counter(
+            "unnamed" if task.get_name().startswith("Task-") else task.get_name().split(":", 1)[0]
+            for task in pending
+        )
+        return {"pending": len(pending), "by_name_prefix": dict(by_kind.most_common(20))}
@@ -4,6 +4,7 @@ import logging
 
 from backend.coordinators.game_coordinator import GameCoordinator
 from backend.handlers.solver_handler import SolverHandler
+from backend.websockets.game_sync import compact_game_state
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,7 @@ class StateCollector:
         
         Returns:
             Dict containing:
-            - game: Core game state (if available)
+            - game: Compact game snapshot without model context or page contents (if available)
             - solver: Cached solver results (if available) 
         """
         logger.debug(f"Collecting complete state for game {game_id}")
@@ -38,7 +39,7 @@ class StateCollector:
         solver_results = self.solver_handler.get_cached_results(game_id)
         
         complete_state = {
-            "game": game_state.model_dump() if game_state else None,
+            "game": compact_game_state(game_state) if game_state else None,
             "solver_results": solver_results,
         }
         
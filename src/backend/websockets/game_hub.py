@@ -1,30 +1,129 @@
 import asyncio
 import json
 import logging
-from typing import Dict, Set, List, Optional, Any, TYPE_CHECKING
+from collections import OrderedDict
+from typing import Dict, Set, List, Optional, Tuple, Any, TYPE_CHECKING
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 from pydantic import BaseModel
 
+from backend.websockets.game_sync import GameSyncLog
+from wiki_arena.telemetry import spans
+
 if TYPE_CHECKING:
+    from backend.broker import Broker
     from backend.utils.state_collector import StateCollector
 
 logger = logging.getLogger(__name__)
 
+def _to_jsonable(obj: Any) -> Any:
+    """Encoder hook for objects the JSON encoder doesn't handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, 'value'):
+        return obj.value
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def task_channel(task_id: str) -> str:
+    """Sync log key of a task channel (game channels use the game_id)."""
+    return f"task:{task_id}"
+
+# Broker channels: deltas go to DELTA_PREFIX + channel, task registrations to CONTROL_CHANNEL.
+# Messages are "<origin worker>\n<payload>" so workers skip their own.
+DELTA_PREFIX = "ws."
+CONTROL_CHANNEL = "ws-control"
+
+# Close codes for dropped clients: sending failed, or the client was too slow to take a frame
+CLOSE_INTERNAL_ERROR = 1011
+CLOSE_TRY_AGAIN_LATER = 1013
+
 class GameWebSocketManager:
-    """Manages WebSocket connections for real-time game updates."""
+    """
+    Manages WebSocket connections for real-time game updates.
+
+    Clients subscribe to one channel: a single game, or a whole task (every game
+    of a race over one socket). Game messages reach the game's subscribers and
+    the subscribers of its task; task messages reach the task's subscribers and
+    the subscribers of its games. Each channel numbers its own deltas.
+
+    With a broker attached, every delta is also published to the other workers,
+    which deliver the same frame to their own subscribers, so a client can
+    watch a game on any worker. The worker running a game stores its snapshot
+    in the broker for clients connecting elsewhere, in the background and at
+    most once per snapshot interval.
+    """
     
-    def __init__(self):
+    def __init__(self, send_timeout_s: float = 5.0, sync_history_size: int = 256, max_tasks: int = 1000):
         # game_id -> set of websockets
         self.game_connections: Dict[str, Set[WebSocket]] = {}
         # websocket -> game_id for cleanup
         self.connection_games: Dict[WebSocket, str] = {}
+        # task_id -> set of websockets, and websocket -> task_id
+        self.task_connections: Dict[str, Set[WebSocket]] = {}
+        self.connection_tasks: Dict[WebSocket, str] = {}
+        # task_id -> game_ids and game_id -> task_id, oldest task first
+        self.task_games: OrderedDict[str, Set[str]] = OrderedDict()
+        self.game_tasks: Dict[str, str] = {}
+        self.max_tasks = max_tasks
         self.lock = asyncio.Lock()
         # StateCollector will be injected
         self.state_collector: Optional[StateCollector] = None
+        # A client that can't take a frame within this time is dropped
+        self.send_timeout_s = send_timeout_s
+        # Sequence numbers and recent deltas per channel, for resuming clients
+        self.sync_log = GameSyncLog(history_size=sync_history_size, is_watched=self._has_connections)
+        # websocket -> live (seq, frame)s held back until its initial frames are sent
+        self._pending: Dict[WebSocket, List[Tuple[int, str]]] = {}
+        # Set by attach_broker() when running with several workers
+        self.broker: Optional[Broker] = None
+        self.worker_id: Optional[str] = None
+        self.snapshot_ttl_s = 3600.0
+        self.snapshot_interval_s = 0.5
+        # game_id -> scheduled snapshot write
+        self._snapshot_writes: Dict[str, asyncio.Task] = {}
+    
+    async def attach_broker(self, broker: "Broker", worker_id: str, snapshot_ttl_s: float = 3600.0, snapshot_interval_s: float = 0.5):
+        """Share deltas and task registrations with the other workers through a broker."""
+        self.broker = broker
+        self.worker_id = worker_id
+        self.snapshot_ttl_s = snapshot_ttl_s
+        self.snapshot_interval_s = snapshot_interval_s
+        await broker.subscribe(f"{DELTA_PREFIX}*", self._on_broker_delta)
+        await broker.subscribe(CONTROL_CHANNEL, self._on_broker_control)
+        logger.info(f"WebSocket fan-out shared through broker as worker {worker_id}")
+    
+    async def announce_task(self, task_id: str, game_ids: List[str]):
+        """Register a task here and, with a broker, on every other worker."""
+        self.register_task(task_id, game_ids)
+        if self.broker:
+            payload = json.dumps({"task_id": task_id, "game_ids": list(game_ids)})
+            await self.broker.publish(CONTROL_CHANNEL, f"{self.worker_id}\n{payload}")
+    
+    def register_task(self, task_id: str, game_ids: List[str]):
+        """Route the messages of these games to the task's channel as well."""
+        games = self.task_games.setdefault(task_id, set())
+        games.update(game_ids)
+        for game_id in game_ids:
+            self.game_tasks[game_id] = task_id
+        
+        # Tasks stay registered after they end so late game_ended messages still reach the task channel
+        while len(self.task_games) > self.max_tasks:
+            _, evicted_games = self.task_games.popitem(last=False)
+            for game_id in evicted_games:
+                self.game_tasks.pop(game_id, None)
     
-    async def connect(self, websocket: WebSocket, game_id: str):
-        """Connect a WebSocket to a specific game."""
+    async def connect(self, websocket: WebSocket, game_id: str, since_seq: Optional[int] = None):
+        """
+        Connect a WebSocket to a specific game.
+
+        A client reconnecting with the last seq it applied gets the deltas it
+        missed; otherwise (or if those are no longer buffered) it gets a snapshot.
+        Deltas broadcast meanwhile are held back and sent after it.
+        """
         await websocket.accept()
         
         async with self.lock:
@@ -33,76 +132,298 @@ class GameWebSocketManager:
             
             self.game_connections[game_id].add(websocket)
             self.connection_games[websocket] = game_id
+            self._pending[websocket] = []
         
         logger.info(f"WebSocket connected to game {game_id}. Total connections: {len(self.game_connections[game_id])}")
         
-        # Get complete state if state collector is available
-        complete_state = None
-        if self.state_collector:
-            try:
-                complete_state = await self.state_collector.get_complete_state(game_id)
-            except Exception as e:
-                logger.warning(f"Failed to get complete state for game {game_id}: {e}")
-        
-        # Send enhanced connection confirmation with complete state
-        await self._send_to_websocket(websocket, {
-            "type": "CONNECTION_ESTABLISHED",
-            "complete_state": complete_state,
-            # TODO(hunter): nothing uses these and game_id is already in the URL
-            # "game_id": game_id,
-            # "timestamp": datetime.now().isoformat(),
-        })
+        try:
+            seq = await self._resume(websocket, game_id, since_seq) if since_seq is not None else None
+            if seq is None:
+                complete_state = await self._get_complete_state(game_id)
+                # Read once the state is collected, so deltas recorded meanwhile aren't sent again
+                seq = self.sync_log.current_seq(game_id)
+                
+                # Games running on another worker
+                if not (complete_state and complete_state.get("game")):
+                    stored = await self._get_stored_snapshot(game_id)
+                    if stored:
+                        seq, complete_state = stored["seq"], stored["complete_state"]
+                
+                # Send enhanced connection confirmation with complete state
+                await self._send_to_websocket(websocket, {
+                    "type": "CONNECTION_ESTABLISHED",
+                    "seq": seq,
+                    "complete_state": complete_state,
+                    # TODO(hunter): nothing uses these and game_id is already in the URL
+                    # "game_id": game_id,
+                    # "timestamp": datetime.now().isoformat(),
+                })
+            await self._release(websocket, seq)
+        except Exception:
+            await self.disconnect(websocket)
+            raise
+    
+    async def connect_task(self, websocket: WebSocket, task_id: str, since_seq: Optional[int] = None):
+        """Connect a WebSocket to every game of a task. Resumes like connect()."""
+        await websocket.accept()
+        
+        async with self.lock:
+            if task_id not in self.task_connections:
+                self.task_connections[task_id] = set()
+            
+            self.task_connections[task_id].add(websocket)
+            self.connection_tasks[websocket] = task_id
+            self._pending[websocket] = []
+        
+        logger.info(f"WebSocket connected to task {task_id}. Total connections: {len(self.task_connections[task_id])}")
+        
+        channel = task_channel(task_id)
+        try:
+            seq = await self._resume(websocket, channel, since_seq, {"task_id": task_id}) if since_seq is not None else None
+            if seq is None:
+                game_ids = sorted(self.task_games.get(task_id, ()))
+                states = await asyncio.gather(*[self._get_any_complete_state(game_id) for game_id in game_ids])
+                seq = self.sync_log.current_seq(channel)
+                
+                await self._send_to_websocket(websocket, {
+                    "type": "CONNECTION_ESTABLISHED",
+                    "task_id": task_id,
+                    "seq": seq,
+                    "complete_state": {"games": dict(zip(game_ids, states))},
+                })
+            await self._release(websocket, seq)
+        except Exception:
+            await self.disconnect(websocket)
+            raise
+    
+    async def _resume(self, websocket: WebSocket, channel: str, since_seq: int, extra: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """
+        Send the deltas a reconnecting client missed, if they are still buffered.
+
+        Returns:
+            The seq the client is at afterwards, or None if it needs a snapshot.
+        """
+        missed = self.sync_log.deltas_since(channel, since_seq)
+        if missed is None:
+            logger.info(f"Cannot resume {channel} from seq {since_seq}, sending snapshot")
+            return None
+        
+        logger.debug(f"Resuming {channel} from seq {since_seq} with {len(missed)} deltas")
+        await self._send_to_websocket(websocket, {"type": "CONNECTION_RESUMED", **(extra or {}), "seq": since_seq})
+        for delta in missed:
+            await self._send_to_websocket(websocket, delta)
+        return missed[-1]["seq"] if missed else since_seq
+    
+    async def _release(self, websocket: WebSocket, seq: int):
+        """Send the deltas held back while a client got its initial frames, then let it receive live."""
+        while True:
+            held = self._pending.get(websocket)
+            if not held:
+                # Nothing was broadcast since the last await, so no delta can slip in between
+                self._pending.pop(websocket, None)
+                return
+            self._pending[websocket] = []
+            for frame_seq, frame in held:
+                # Older ones are in the snapshot or were resent
+                if frame_seq > seq:
+                    await self._send_frame(websocket, frame)
+                    seq = frame_seq
+    
+    async def _get_complete_state(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """Get complete state if state collector is available."""
+        if not self.state_collector:
+            return None
+        try:
+            return await self.state_collector.get_complete_state(game_id)
+        except Exception as e:
+            logger.warning(f"Failed to get complete state for game {game_id}: {e}")
+            return None
+    
+    async def _get_any_complete_state(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """Complete state of a game run here, or the snapshot stored by the worker running it."""
+        complete_state = await self._get_complete_state(game_id)
+        if complete_state and complete_state.get("game"):
+            return complete_state
+        stored = await self._get_stored_snapshot(game_id)
+        return stored["complete_state"] if stored else complete_state
     
     async def disconnect(self, websocket: WebSocket):
         """Disconnect a WebSocket and clean up."""
         async with self.lock:
-            game_id = self.connection_games.get(websocket)
-            if game_id and game_id in self.game_connections:
-                self.game_connections[game_id].discard(websocket)
-                
-                # Clean up empty game connection sets
-                if not self.game_connections[game_id]:
-                    del self.game_connections[game_id]
-                
-                logger.info(f"WebSocket disconnected from game {game_id}")
+            self._remove(websocket)
+    
+    def _remove(self, websocket: WebSocket):
+        """Drop a WebSocket from its channel. Call with the lock held."""
+        self._pending.pop(websocket, None)
+        game_id = self.connection_games.pop(websocket, None)
+        if game_id and game_id in self.game_connections:
+            self.game_connections[game_id].discard(websocket)
             
-            self.connection_games.pop(websocket, None)
+            # Clean up empty game connection sets
+            if not self.game_connections[game_id]:
+                del self.game_connections[game_id]
+            
+            logger.info(f"WebSocket disconnected from game {game_id}")
+        
+        task_id = self.connection_tasks.pop(websocket, None)
+        if task_id and task_id in self.task_connections:
+            self.task_connections[task_id].discard(websocket)
+            if not self.task_connections[task_id]:
+                del self.task_connections[task_id]
+            
+            logger.info(f"WebSocket disconnected from task {task_id}")
     
     async def broadcast_to_game(self, game_id: str, message: Dict[str, Any]):
-        """Broadcast a message to all WebSockets connected to a specific game."""
-        if game_id not in self.game_connections:
-            logger.debug(f"No WebSocket connections for game {game_id}")
-            return
-        
+        """Broadcast a message as the next delta of a game (and of its task, if registered)."""
         # Add metadata to message # TODO(hunter): nothing uses the game_id or timestamp
         # message.update({
         #     "game_id": game_id,
         #     "timestamp": datetime.now().isoformat()
         # })
         
+        with spans.span("websocket.broadcast", message_type=message.get("type", "unknown")):
+            publishes = [self._publish(game_id, message, self.game_connections.get(game_id))]
+            task_id = self.game_tasks.get(game_id)
+            if task_id:
+                publishes.append(self._publish(task_channel(task_id), message, self.task_connections.get(task_id)))
+            await asyncio.gather(*publishes)
+    
+    async def broadcast_to_task(self, task_id: str, message: Dict[str, Any]):
+        """Broadcast a message to a task's subscribers and to the subscribers of each of its games."""
+        publishes = [self._publish(task_channel(task_id), message, self.task_connections.get(task_id))]
+        for game_id in self.task_games.get(task_id, ()):
+            publishes.append(self._publish(game_id, message, self.game_connections.get(game_id)))
+        await asyncio.gather(*publishes)
+    
+    def _connections_for(self, channel: str) -> Optional[Set[WebSocket]]:
+        if channel.startswith("task:"):
+            return self.task_connections.get(channel[len("task:"):])
+        return self.game_connections.get(channel)
+    
+    def _has_connections(self, channel: str) -> bool:
+        return bool(self._connections_for(channel))
+    
+    async def _publish(self, channel: str, message: Dict[str, Any], connections: Optional[Set[WebSocket]]):
+        """Record a message as the channel's next delta and send it to the channel's connections."""
+        # Deltas are recorded even without listeners so clients can resume
+        message = self.sync_log.record(channel, message)
+        
         # Get connections (copy to avoid modification during iteration)
-        connections = list(self.game_connections[game_id])
+        connections = list(connections or ())
+        if not connections and not self.broker:
+            logger.debug(f"No WebSocket connections for {channel}")
+            return
         
+        logger.debug(f"Broadcasting to {len(connections)} connections for {channel}: {message.get('type', 'unknown')}")
+        
+        # Encode once and send the same frame to every connection (and worker)
+        with spans.span("websocket.encode"):
+            frame = self._encode_message(message)
+        await self._deliver(channel, message["seq"], frame, connections)
+        
+        if self.broker:
+            await self._share_delta(channel, message, frame)
+    
+    async def _deliver(self, channel: str, seq: int, frame: str, connections: List[WebSocket]):
+        """Send a frame to connections concurrently, dropping failed and timed-out ones."""
+        # Clients still getting their initial frames get this one after them
+        live = []
+        for websocket in connections:
+            held = self._pending.get(websocket)
+            if held is None:
+                live.append(websocket)
+            else:
+                held.append((seq, frame))
+        connections = live
         if not connections:
             return
+        results = await asyncio.gather(
+            *[self._send_frame(websocket, frame) for websocket in connections],
+            return_exceptions=True
+        )
         
-        logger.debug(f"Broadcasting to {len(connections)} connections for game {game_id}: {message.get('type', 'unknown')}")
-        
-        # Send to all connections, removing failed ones
+        # Clean up failed and timed-out connections
         failed_connections = []
-        for websocket in connections:
-            try:
-                await self._send_to_websocket(websocket, message)
-            except Exception as e:
-                logger.warning(f"Failed to send message to WebSocket: {e}")
-                failed_connections.append(websocket)
+        for websocket, result in zip(connections, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"WebSocket for {channel} did not accept a frame within {self.send_timeout_s}s, dropping it")
+                failed_connections.append((websocket, CLOSE_TRY_AGAIN_LATER))
+            elif isinstance(result, Exception):
+                logger.warning(f"Failed to send message to WebSocket: {result}")
+                failed_connections.append((websocket, CLOSE_INTERNAL_ERROR))
         
-        # Clean up failed connections
         if failed_connections:
             async with self.lock:
-                for websocket in failed_connections:
-                    self.game_connections[game_id].discard(websocket)
-                    self.connection_games.pop(websocket, None)
+                for websocket, _ in failed_connections:
+                    self._remove(websocket)
+            # Closing makes the endpoint's receive loop end, and a slow client reconnect
+            await asyncio.gather(*[self._close(websocket, code) for websocket, code in failed_connections])
+    
+    async def _close(self, websocket: WebSocket, code: int):
+        """Close a dropped WebSocket, ignoring errors (it is often already broken)."""
+        try:
+            await asyncio.wait_for(websocket.close(code=code), timeout=self.send_timeout_s)
+        except Exception as e:
+            logger.debug(f"Error closing dropped WebSocket: {e}")
+    
+    async def _share_delta(self, channel: str, delta: Dict[str, Any], frame: str):
+        """Publish a delta to the other workers and schedule a snapshot write for games run here."""
+        try:
+            await self.broker.publish(f"{DELTA_PREFIX}{channel}", f"{self.worker_id}\n{frame}")
+        except Exception as e:
+            logger.error(f"Failed to share {delta.get('type')} for {channel} through the broker: {e}")
+        
+        # Deltas arriving before the write starts are covered by it
+        if not channel.startswith("task:") and self.state_collector and channel not in self._snapshot_writes:
+            self._snapshot_writes[channel] = asyncio.create_task(
+                self._store_snapshot(channel), name=f"ws-snapshot:{channel}"
+            )
+    
+    async def _store_snapshot(self, game_id: str):
+        """Store the snapshot of a game run here for clients connecting to other workers."""
+        try:
+            await asyncio.sleep(self.snapshot_interval_s)
+        finally:
+            # Deltas from here on schedule the next write
+            self._snapshot_writes.pop(game_id, None)
+        try:
+            complete_state = await self._get_complete_state(game_id)
+            if complete_state and complete_state.get("game"):
+                snapshot = self._encode_message({"seq": self.sync_log.current_seq(game_id), "complete_state": complete_state})
+                await self.broker.set(f"snapshot:game:{game_id}", snapshot, self.snapshot_ttl_s)
+        except Exception as e:
+            logger.error(f"Failed to store the snapshot of game {game_id} in the broker: {e}")
+    
+    async def flush_snapshots(self):
+        """Wait for the scheduled snapshot writes (e.g. before stopping the broker)."""
+        await asyncio.gather(*list(self._snapshot_writes.values()), return_exceptions=True)
+    
+    async def _on_broker_delta(self, broker_channel: str, payload: str):
+        origin, frame = payload.split("\n", 1)
+        if origin == self.worker_id:
+            return
+        channel = broker_channel[len(DELTA_PREFIX):]
+        delta = json.loads(frame)
+        self.sync_log.ingest(channel, delta)
+        await self._deliver(channel, delta["seq"], frame, list(self._connections_for(channel) or ()))
+    
+    async def _on_broker_control(self, broker_channel: str, payload: str):
+        origin, body = payload.split("\n", 1)
+        if origin == self.worker_id:
+            return
+        registration = json.loads(body)
+        self.register_task(registration["task_id"], registration["game_ids"])
+    
+    async def _get_stored_snapshot(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot stored by the worker running a game, if any."""
+        if not self.broker:
+            return None
+        try:
+            stored = await self.broker.get(f"snapshot:game:{game_id}")
+        except Exception as e:
+            logger.warning(f"Failed to get stored snapshot for game {game_id}: {e}")
+            return None
+        return json.loads(stored) if stored else None
     
     def _serialize_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Convert message to a JSON-serializable format."""
@@ -126,26 +447,25 @@ class GameWebSocketManager:
         
         return convert_value(message)
 
-    async def _send_to_websocket(self, websocket: WebSocket, message: Dict[str, Any]):
-        """Send a message to a specific WebSocket."""
+    def _encode_message(self, message: Dict[str, Any]) -> str:
+        """Encode a message to the JSON text sent over the WebSocket."""
         try:
-            # Convert message to JSON-serializable format
-            serializable_message = self._serialize_message(message)
-            json_str = json.dumps(serializable_message)
-            await websocket.send_text(json_str)
+            return json.dumps(self._serialize_message(message), default=_to_jsonable)
         except TypeError as e:
             # Detailed error for JSON serialization issues
             logger.error(f"JSON serialization error in WebSocket message: {e}")
             logger.error(f"Message keys: {list(message.keys())}")
             logger.error(f"Message types: {[(k, type(v).__name__) for k, v in message.items()]}")
-            
-            # Try to identify the problematic object
-            for key, value in message.items():
-                try:
-                    json.dumps(value)
-                except TypeError:
-                    logger.error(f"Non-serializable object in key '{key}': {type(value).__name__} = {value}")
             raise
+
+    async def _send_frame(self, websocket: WebSocket, frame: str):
+        """Send an encoded message, giving up after the send timeout."""
+        await asyncio.wait_for(websocket.send_text(frame), timeout=self.send_timeout_s)
+
+    async def _send_to_websocket(self, websocket: WebSocket, message: Dict[str, Any]):
+        """Send a message to a specific WebSocket."""
+        try:
+            await self._send_frame(websocket, self._encode_message(message))
         except Exception as e:
             logger.error(f"Error sending WebSocket message: {e}")
             raise
@@ -157,6 +477,14 @@ class GameWebSocketManager:
     def get_all_games(self) -> List[str]:
         """Get list of all games with active connections."""
         return list(self.game_connections.keys())
+    
+    def get_task_connection_count(self, task_id: str) -> int:
+        """Get the number of active task-level connections for a task."""
+        return len(self.task_connections.get(task_id, set()))
+    
+    def get_all_tasks(self) -> List[str]:
+        """Get list of all tasks with active task-level connections."""
+        return list(self.task_connections.keys())
 
 # Global WebSocket manager instance
 websocket_manager = GameWebSocketManager() 
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Versioned state sync for game WebSocket clients.
+
+Every message broadcast for a game is a delta stamped with the game's next
+sequence number. New clients get a compact snapshot tagged with the sequence
+number it reflects; reconnecting clients pass the last sequence number they
+applied and get only the deltas they missed, as long as those are still in the
+game's ring buffer. Clients ignore any delta whose seq is not above the last
+one they applied.
+
+A channel's log is kept while its game or task runs (and while clients watch
+it); only ended channels are evicted, so a running game never restarts its
+numbering at 1.
+"""
+
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from wiki_arena.models import GameState, Page
+
+logger = logging.getLogger(__name__)
+
+def compact_page(page: Optional[Page]) -> Optional[Dict[str, Any]]:
+    """A page without its text and link list."""
+    if page is None:
+        return None
+    return {"title": page.title, "url": page.url}
+
+def compact_game_state(game_state: GameState) -> Dict[str, Any]:
+    """A game snapshot without the model context and page contents."""
+    config = game_state.config
+    return {
+        "game_id": game_state.game_id,
+        "config": {
+            "start_page_title": config.start_page_title,
+            "target_page_title": config.target_page_title,
+            "max_steps": config.max_steps,
+            "model": {"provider": config.model.provider, "model_name": config.model.model_name},
+        },
+        "status": game_state.status.value,
+        "steps": game_state.steps,
+        "current_page": compact_page(game_state.current_page),
+        "move_history": [move.model_dump(mode="json") for move in game_state.move_history],
+        "start_timestamp": game_state.start_timestamp.isoformat(),
+        "error_message": game_state.error_message,
+    }
+
+def is_end_delta(channel: str, delta: Dict[str, Any]) -> bool:
+    """Whether a delta is the last one of its channel's game or task."""
+    return delta.get("type") == ("TASK_ENDED" if channel.startswith("task:") else "GAME_ENDED")
+
+class GameSyncLog:
+    """
+    Per-channel sequence numbers and a bounded ring buffer of recent deltas (keyed by game_id or task channel).
+
+    Beyond max_games channels, the least recently updated ended channels that
+    is_watched() doesn't claim are evicted; channels still running are never
+    evicted, so the log may hold more than max_games of them.
+    """
+
+    def __init__(self, history_size: int = 256, max_games: int = 1000, is_watched: Optional[Callable[[str], bool]] = None):
+        self.history_size = history_size
+        self.max_games = max_games
+        self.is_watched = is_watched
+        # game_id -> (last seq, recent deltas), least recently updated first
+        self._games: OrderedDict[str, Tuple[int, Deque[Dict[str, Any]]]] = OrderedDict()
+        # Channels whose game or task has ended, the only ones evicted
+        self._ended: Set[str] = set()
+
+    def record(self, game_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp a message with the game's next sequence number and keep it for resumes."""
+        delta = {**message, "seq": self.current_seq(game_id) + 1}
+        self.ingest(game_id, delta)
+        return delta
+
+    def ingest(self, game_id: str, delta: Dict[str, Any]):
+        """Keep a delta that was already stamped (by the worker owning the game)."""
+        seq = delta["seq"]
+        current, deltas = self._games.pop(game_id, (0, None))
+        if deltas is None:
+            deltas = deque(maxlen=self.history_size)
+        elif seq != current + 1:
+            # Missed deltas in between; nobody can resume across the gap
+            deltas.clear()
+        deltas.append(delta)
+        self._games[game_id] = (seq, deltas)
+        if is_end_delta(game_id, delta):
+            self._ended.add(game_id)
+
+        if len(self._games) > self.max_games:
+            self._evict()
+
+    def _evict(self):
+        """Drop the least recently updated ended, unwatched channels down to max_games."""
+        excess = len(self._games) - self.max_games
+        evicted = []
+        for game_id in self._games:
+            if len(evicted) == excess:
+                break
+            if game_id in self._ended and not (self.is_watched and self.is_watched(game_id)):
+                evicted.append(game_id)
+        for game_id in evicted:
+            del self._games[game_id]
+            self._ended.discard(game_id)
+            logger.debug(f"Evicted sync log for game {game_id}")
+
+    def current_seq(self, game_id: str) -> int:
+        """Sequence number of the latest delta for a game (0 if none)."""
+        return self._games.get(game_id, (0, None))[0]
+
+    def deltas_since(self, game_id: str, seq: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Deltas after `seq`, or None if the client can't resume from it.
+
+        That is the case when the deltas it missed already fell out of the ring
+        buffer, or when `seq` is ahead of the server (e.g. after a restart).
+        """
+        current, deltas = self._games.get(game_id, (0, None))
+        if seq > current or seq < 0:
+            return None
+        if seq == current:
+            return []
+        if deltas[0]["seq"] > seq + 1:
+            return None
+        return [delta for delta in deltas if delta["seq"] > seq]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "games": len(self._games),
+            "ended_games": len(self._ended),
+            "buffered_deltas": sum(len(deltas) for _, deltas in self._games.values()),
+            "history_size": self.history_size,
+        }
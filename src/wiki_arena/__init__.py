@@ -5,6 +5,7 @@ A standalone Python package containing all the logic required to run and analyze
 a Wikipedia navigation game.
 """
 
-from .events import EventBus, GameEvent
+from .events import EventBus, GameEvent, OverflowPolicy
+from .telemetry import SpanRecorder, spans
 
-__all__ = ['EventBus', 'GameEvent']
+__all__ = ['EventBus', 'GameEvent', 'OverflowPolicy', 'SpanRecorder', 'spans']
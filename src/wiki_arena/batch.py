@@ -0,0 +1,238 @@
+# Batch Runner
+# Runs many games concurrently for evaluations and leaderboards
+
+import asyncio
+import csv
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from wiki_arena.game import Game
+from wiki_arena.language_models import create_scheduled_model
+from wiki_arena.models import GameConfig, GameResult, LinkFormat, Page, Task
+from wiki_arena.storage import GameStorageService
+from wiki_arena.tools import get_tools
+from wiki_arena.wikipedia import LiveWikiService
+
+logger = logging.getLogger(__name__)
+
+
+def load_task_corpus(path: Path) -> List[Task]:
+    """
+    Load tasks from a corpus file.
+
+    Supported formats:
+    - .jsonl: one {"start_page_title": ..., "target_page_title": ...} object per line
+    - .tsv/.txt: start title and target title separated by a tab, one task per line;
+      extra columns are ignored and lines starting with '#' are comments
+    """
+    path = Path(path)
+    tasks = []
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    tasks.append(Task.model_validate_json(line))
+        else:
+            for row in csv.reader(f, delimiter="\t"):
+                if not row or row[0].startswith("#"):
+                    continue
+                tasks.append(Task(start_page_title=row[0], target_page_title=row[1]))
+    return tasks
+
+
+class BatchJob(BaseModel):
+    """One game to play: a task, a model and a repetition number."""
+    task: Task
+    model_key: str
+    repeat: int = 0
+
+    @property
+    def game_id(self) -> str:
+        """Deterministic game id so interrupted batches can resume."""
+        return f"{self.model_key}__{self.task.task_id}__{self.repeat}"
+
+
+class BatchStats(BaseModel):
+    """Progress of a batch run."""
+    total: int = Field(0, description="Jobs in the batch, including already stored ones")
+    skipped: int = Field(0, description="Jobs skipped because their game_id was already stored")
+    completed: int = Field(0, description="Games played to completion in this run")
+    failed: int = Field(0, description="Games that could not be set up or crashed")
+    status_counts: Dict[str, int] = Field(default_factory=dict, description="Completed games by final status")
+    total_cost_usd: float = Field(0.0, description="Estimated API cost of games completed in this run")
+    elapsed_s: float = Field(0.0, description="Wall clock time of the run in seconds")
+
+    @property
+    def games_per_minute(self) -> float:
+        return self.completed / self.elapsed_s * 60 if self.elapsed_s > 0 else 0.0
+
+
+class BatchRunner:
+    """
+    Runs a corpus of tasks against a list of models concurrently.
+
+    Concurrency is bounded globally and per provider. Results are written to
+    storage as soon as each game ends, and jobs whose game_id is already stored
+    are skipped, so a batch can be interrupted and restarted.
+    """
+
+    def __init__(
+        self,
+        storage_service: GameStorageService,
+        wiki_service: Optional[LiveWikiService] = None,
+        max_concurrency: int = 8,
+        provider_concurrency: Optional[Dict[str, int]] = None,
+        max_steps: int = 30,
+        link_format: LinkFormat = LinkFormat.LIST,
+        history_window: Optional[int] = None,
+        compact_history: bool = False,
+    ):
+        self.storage_service = storage_service
+        self.wiki_service = wiki_service or LiveWikiService()
+        self.max_concurrency = max_concurrency
+        self.provider_concurrency = provider_concurrency or {}
+        self.max_steps = max_steps
+        self.link_format = link_format
+        self.history_window = history_window
+        self.compact_history = compact_history
+
+        self._global_semaphore = asyncio.Semaphore(max_concurrency)
+        self._provider_semaphores: Dict[str, asyncio.Semaphore] = {
+            provider: asyncio.Semaphore(limit) for provider, limit in self.provider_concurrency.items()
+        }
+        # Start pages are fetched once and shared by every job starting there,
+        # then dropped when the last of those jobs has started
+        self._start_pages: Dict[str, asyncio.Task] = {}
+        self._start_page_users: Counter = Counter()
+        self.stats = BatchStats()
+
+    @staticmethod
+    def build_jobs(tasks: List[Task], model_keys: List[str], repeats: int = 1) -> List[BatchJob]:
+        """Every model plays every task `repeats` times, interleaved by task."""
+        return [
+            BatchJob(task=task, model_key=model_key, repeat=repeat)
+            for repeat in range(repeats)
+            for task in tasks
+            for model_key in model_keys
+        ]
+
+    def filter_pending(self, jobs: List[BatchJob]) -> List[BatchJob]:
+        """Drop jobs whose game is already stored."""
+        stored_ids = self.storage_service.get_stored_game_ids()
+        return [job for job in jobs if job.game_id not in stored_ids]
+
+    async def run(
+        self,
+        jobs: List[BatchJob],
+        on_progress: Optional[Callable[[BatchStats, Optional[GameResult]], None]] = None,
+    ) -> BatchStats:
+        """
+        Run all jobs not already stored.
+
+        Args:
+            jobs: Jobs to run.
+            on_progress: Called after each finished job with the current stats and
+                the game result (None for failed jobs).
+        """
+        pending = self.filter_pending(jobs)
+
+        self.stats = BatchStats(total=len(jobs), skipped=len(jobs) - len(pending))
+        self._start_page_users = Counter(job.task.start_page_title for job in pending)
+        logger.info(
+            f"Batch: {len(jobs)} games, {self.stats.skipped} already stored, {len(pending)} to run "
+            f"(concurrency {self.max_concurrency}, provider caps {self.provider_concurrency or 'none'})"
+        )
+
+        start = time.monotonic()
+
+        async def run_and_report(job: BatchJob):
+            result = await self._run_job(job)
+            self.stats.elapsed_s = time.monotonic() - start
+            if on_progress:
+                on_progress(self.stats, result)
+
+        await asyncio.gather(*[run_and_report(job) for job in pending])
+        self.stats.elapsed_s = time.monotonic() - start
+        return self.stats
+
+    async def _run_job(self, job: BatchJob) -> Optional[GameResult]:
+        try:
+            language_model = create_scheduled_model(job.model_key)
+        except Exception as e:  # unknown model key or missing provider credentials
+            logger.error(f"Game {job.game_id}: could not create model: {e}")
+            self._release_start_page(job.task)
+            self.stats.failed += 1
+            return None
+
+        provider_semaphore = self._provider_semaphores.get(language_model.model_config.provider)
+        # Wait for the provider first so queued jobs don't hold global slots
+        if provider_semaphore:
+            await provider_semaphore.acquire()
+        try:
+            async with self._global_semaphore:
+                return await self._play(job, language_model)
+        finally:
+            if provider_semaphore:
+                provider_semaphore.release()
+
+    async def _play(self, job: BatchJob, language_model) -> Optional[GameResult]:
+        try:
+            start_page = await self._get_start_page(job.task)
+            game_config = GameConfig(
+                start_page_title=job.task.start_page_title,
+                target_page_title=job.task.target_page_title,
+                max_steps=self.max_steps,
+                model=language_model.model_config,
+                link_format=self.link_format,
+                history_window=self.history_window,
+                compact_history=self.compact_history,
+            )
+            game = Game(
+                config=game_config,
+                wiki_service=self.wiki_service,
+                language_model=language_model,
+                start_page=start_page,
+                tools=get_tools(game_config.link_format),
+                game_id=job.game_id,
+            )
+            await game.run()
+        except Exception as e:
+            logger.error(f"Game {job.game_id} failed: {e}", exc_info=True)
+            self.stats.failed += 1
+            return None
+
+        game_result = GameResult.from_game_state(game.state)
+        self.storage_service.store_game(game_result)
+
+        self.stats.completed += 1
+        status = game_result.status.value
+        self.stats.status_counts[status] = self.stats.status_counts.get(status, 0) + 1
+        self.stats.total_cost_usd += game_result.total_estimated_cost_usd
+        return game_result
+
+    async def _get_start_page(self, task: Task) -> Page:
+        key = task.start_page_title
+        if key not in self._start_pages:
+            self._start_pages[key] = asyncio.create_task(self.wiki_service.get_page(key))
+        fetch = self._start_pages[key]
+        try:
+            return await asyncio.shield(fetch)
+        except Exception:
+            # Let a later job retry the fetch
+            if self._start_pages.get(key) is fetch:
+                del self._start_pages[key]
+            raise
+        finally:
+            self._release_start_page(task)
+
+    def _release_start_page(self, task: Task):
+        key = task.start_page_title
+        self._start_page_users[key] -= 1
+        if self._start_page_users[key] <= 0:
+            self._start_page_users.pop(key, None)
+            self._start_pages.pop(key, None)
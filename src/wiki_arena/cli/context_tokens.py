@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+CLI tool to compare model context sizes across link formats.
+
+Replays a path of Wikipedia pages through each context strategy and reports the
+estimated input tokens of the final turn and across the whole game.
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Dict, List, Optional
+
+from wiki_arena.context_builder import ContextBuilder
+from wiki_arena.models import (
+    AssistantMessage,
+    AssistantToolCall,
+    ContextMessage,
+    DEFAULT_SYSTEM_PROMPT_TEMPLATE,
+    LinkFormat,
+    Page,
+    SystemMessage,
+    ToolResultMessage,
+)
+from wiki_arena.utils.tokens import estimate_context_tokens
+
+
+def simulate_game_context(builder: ContextBuilder, pages: List[Page], target_page_title: str) -> List[int]:
+    """
+    Build the transcript a game visiting `pages` in order would produce.
+
+    Returns:
+        Estimated input tokens sent to the model on each turn.
+    """
+    context: List[ContextMessage] = [SystemMessage(content=DEFAULT_SYSTEM_PROMPT_TEMPLATE.format(
+        start_page_title=pages[0].title,
+        target_page_title=target_page_title,
+    ))]
+    context.append(builder.page_message(pages[0], initial=True))
+
+    turn_tokens = []
+    for step, page in enumerate(pages[1:], start=1):
+        turn_tokens.append(estimate_context_tokens(builder.build(context)))
+        if builder.link_format == LinkFormat.NUMBERED:
+            previous_links = pages[step - 1].links
+            link_index = previous_links.index(page.title) + 1 if page.title in previous_links else 1
+            arguments = {"link_index": link_index}
+        else:
+            arguments = {"to_page_title": page.title}
+        tool_call = AssistantToolCall(id=f"call_{step}", name=builder.get_tools()[0]["name"], arguments=arguments)
+        context.append(AssistantMessage(tool_calls=[tool_call]))
+        context.append(ToolResultMessage(tool_call_id=tool_call.id, content=builder.tool_result(page)))
+        context.append(builder.page_message(page))
+    turn_tokens.append(estimate_context_tokens(builder.build(context)))
+    return turn_tokens
+
+
+def compare_link_formats(pages: List[Page], history_window: Optional[int] = None) -> Dict[str, List[int]]:
+    """Per-turn token estimates for every link format, alone, compacted and with the rolling window if given."""
+    results = {}
+    for link_format in LinkFormat:
+        builder = ContextBuilder(link_format=link_format)
+        results[link_format.value] = simulate_game_context(builder, pages, pages[-1].title)
+        if history_window:
+            windowed = ContextBuilder(link_format=link_format, history_window=history_window)
+            results[f"{link_format.value}+window{history_window}"] = simulate_game_context(windowed, pages, pages[-1].title)
+        compact = ContextBuilder(link_format=link_format, compact_history=True)
+        results[f"{link_format.value}+compact"] = simulate_game_context(compact, pages, pages[-1].title)
+    return results
+
+
+async def fetch_pages(titles: List[str], language: str) -> List[Page]:
+    from wiki_arena.wikipedia import LiveWikiService
+
+    wiki_service = LiveWikiService(language=language)
+    return [await wiki_service.get_page(title) for title in titles]
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare estimated model context tokens across link formats",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s "Philosophy" "Science" "Physics"
+  %(prog)s "Philosophy" "Science" "Physics" --history-window 1
+        """
+    )
+    parser.add_argument("pages", nargs="+", help="Page titles visited in order (first is the start page)")
+    parser.add_argument("--history-window", type=int, help="Also report each format with a rolling window of N page listings")
+    parser.add_argument("--language", default="en", help="Wikipedia language (default: en)")
+    args = parser.parse_args()
+
+    try:
+        pages = asyncio.run(fetch_pages(args.pages, args.language))
+    except Exception as e:
+        print(f"Error fetching pages: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    results = compare_link_formats(pages, args.history_window)
+    baseline_total = sum(results[LinkFormat.LIST.value])
+
+    print(f"{'strategy':<24} {'last turn':>10} {'game total':>11} {'vs list':>8}")
+    for strategy, turn_tokens in results.items():
+        total = sum(turn_tokens)
+        change = (total - baseline_total) / baseline_total * 100 if baseline_total else 0.0
+        print(f"{strategy:<24} {turn_tokens[-1]:>10} {total:>11} {change:>+7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+CLI to export stored games to partitioned Parquet datasets for analytics.
+
+Example:
+    python -m wiki_arena.cli.export_columnar game_results/columnar --compact
+"""
+
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from wiki_arena.storage import StorageConfig
+from wiki_arena.storage.columnar import ColumnarExporter
+
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    export_dir: Path = typer.Argument(..., file_okay=False, help="Root directory of the exported datasets."),
+    storage_dir: Optional[str] = typer.Option(None, "--storage-dir", help="Where results are stored (default: StorageConfig)."),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Export every game again instead of only new ones."),
+    compact: bool = typer.Option(False, "--compact", help="Merge the files of each partition after exporting."),
+    batch_size: int = typer.Option(10000, "--batch-size", min=1, help="Games held in memory before they are written out."),
+):
+    """
+    Export the games stored since the last export. Run it again at any time
+    to add new games; --compact keeps the number of files small.
+    """
+    storage_config = StorageConfig(storage_dir=storage_dir) if storage_dir else StorageConfig()
+    exporter = ColumnarExporter(storage_config, export_dir, batch_size=batch_size)
+
+    start = time.perf_counter()
+    counts = exporter.export(rebuild=rebuild)
+    typer.echo(f"Exported {counts['games']} games and {counts['moves']} moves in {time.perf_counter() - start:.1f}s")
+
+    if compact:
+        start = time.perf_counter()
+        removed = exporter.compact()
+        typer.echo(f"Compacted away {removed} files in {time.perf_counter() - start:.1f}s")
+    typer.echo(f"Datasets: {export_dir / 'games'}, {export_dir / 'moves'}")
+
+
+if __name__ == "__main__":
+    app()
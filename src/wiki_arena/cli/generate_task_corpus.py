@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+CLI tool to generate a task corpus from the static wiki graph.
+
+Samples (start, target) pairs from wiki_graph.sqlite, solves them and keeps
+a fixed number of tasks for each shortest path length.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from wiki_arena.solver import StaticSolverDB, TaskCorpusGenerator
+
+
+async def generate(args) -> int:
+    if not Path(args.db).exists():
+        print(f"Database not found: {args.db}", file=sys.stderr)
+        return 1
+
+    generator = TaskCorpusGenerator(
+        db=StaticSolverDB(args.db),
+        min_outgoing_links=args.min_outgoing_links,
+        min_incoming_links=args.min_incoming_links,
+        seed=args.seed,
+    )
+    per_length = {path_length: args.per_length for path_length in args.lengths}
+
+    def report(corpus, attempts):
+        if attempts % 100 == 0:
+            counts = ", ".join(f"{length}: {corpus.count(length)}" for length in args.lengths)
+            print(f"  {attempts} pairs solved ({counts})", file=sys.stderr)
+
+    corpus = await generator.generate(
+        per_length,
+        max_attempts=args.max_attempts,
+        starts_per_target=args.starts_per_target,
+        on_progress=report,
+    )
+    corpus.save(Path(args.output))
+
+    print(f"Wrote {len(corpus)} tasks to {args.output}")
+    for path_length in args.lengths:
+        print(f"  path length {path_length}: {corpus.count(path_length)}/{args.per_length}")
+    return 0
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Generate a task corpus stratified by shortest path length",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s --output database/task_corpus.tsv
+  %(prog)s --lengths 2 3 --per-length 500 --min-incoming-links 20 --seed 0
+        """
+    )
+    parser.add_argument("--db", default="database/wiki_graph.sqlite", help="Path to wiki_graph.sqlite")
+    parser.add_argument("--output", "-o", default="database/task_corpus.tsv", help="Corpus file to write")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[2, 3, 4, 5], help="Shortest path lengths to sample (default: 2 3 4 5)")
+    parser.add_argument("--per-length", type=int, default=100, help="Tasks per path length (default: 100)")
+    parser.add_argument("--min-outgoing-links", type=int, default=1, help="Minimum outgoing links of start pages")
+    parser.add_argument("--min-incoming-links", type=int, default=1, help="Minimum incoming links of target pages")
+    parser.add_argument("--starts-per-target", type=int, default=4, help="Start pages solved against each sampled target")
+    parser.add_argument("--max-attempts", type=int, help="Give up after solving this many pairs")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible corpora")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(generate(args)))
+
+
+if __name__ == "__main__":
+    main()
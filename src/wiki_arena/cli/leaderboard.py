@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+CLI to print the leaderboard with bootstrapped rating intervals and rank ranges.
+
+Example:
+    python -m wiki_arena.cli.leaderboard --samples 2000 --workers 8
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from wiki_arena.ratings import LeaderboardBootstrap, LeaderboardGenerator
+from wiki_arena.storage import GameRepository, StorageConfig
+from wiki_arena.storage.columnar import ColumnarGames
+
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    storage_dir: Optional[str] = typer.Option(None, "--storage-dir", help="Where results are stored (default: StorageConfig)."),
+    columnar_dir: Optional[Path] = typer.Option(None, "--columnar-dir", help="Rank from a columnar export instead of the stored games."),
+    samples: int = typer.Option(1000, "--samples", min=0, help="Task resamples for the intervals (0 skips them)."),
+    workers: Optional[int] = typer.Option(None, "--workers", min=1, help="Worker processes (default: one per CPU core)."),
+    confidence: float = typer.Option(0.95, "--confidence", min=0.5, max=0.999, help="Coverage of the intervals."),
+    prior: float = typer.Option(0.0, "--prior", min=0.0, help="Virtual ties between opponents, keeps undefeated models finite."),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Seed for the resampling."),
+):
+    """
+    Rate the models from stored games and bootstrap the ratings over tasks.
+    """
+    if columnar_dir:
+        source = ColumnarGames(columnar_dir)
+    else:
+        source = GameRepository(StorageConfig(storage_dir=storage_dir) if storage_dir else StorageConfig())
+    result = LeaderboardBootstrap(LeaderboardGenerator(source)).run(
+        num_samples=samples, confidence=confidence, workers=workers, seed=seed, prior=prior
+    )
+
+    typer.echo(f"{'rank':>4}  {'model':<40} {'elo':>6}  {'interval':>13}  {'ranks':>7}")
+    ranked = sorted(result.ratings.items(), key=lambda item: item[1], reverse=True)
+    for rank, (model, elo) in enumerate(ranked, start=1):
+        if model in result.intervals and result.num_samples:
+            low, high = result.intervals[model]
+            best, worst = result.rank_interval(model, confidence)
+            typer.echo(f"{rank:>4}  {model:<40} {elo:>6}  {f'[{low}, {high}]':>13}  {f'{best}-{worst}':>7}")
+        else:
+            typer.echo(f"{rank:>4}  {model:<40} {elo:>6}")
+    typer.echo(
+        f"{result.num_samples} resamples of {result.num_tasks} tasks in {result.elapsed_s:.2f}s "
+        f"({result.fit_s:.2f}s fitting on {result.workers} workers)"
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+CLI to score the moves of stored games by their distance to the target.
+
+Example:
+    python -m wiki_arena.cli.path_quality game_results/path_quality --max-distance 8
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from wiki_arena.solver import PathQualityAnalyzer, StaticSolverDB
+from wiki_arena.storage import GameRepository, StorageConfig
+
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    output_dir: Path = typer.Argument(..., file_okay=False, help="Where moves.csv and games.csv are written."),
+    storage_dir: Optional[str] = typer.Option(None, "--storage-dir", help="Where results are stored (default: StorageConfig)."),
+    db: Path = typer.Option(Path("database/wiki_graph.sqlite"), "--db", help="Path to wiki_graph.sqlite."),
+    model: Optional[str] = typer.Option(None, "--model", help="Only score the games of this model."),
+    max_distance: Optional[int] = typer.Option(None, "--max-distance", min=1, help="Stop each reverse BFS at this distance."),
+):
+    """
+    Compute per move distance deltas (-1 is an optimal move) with one reverse
+    BFS per distinct target, and print a per model summary.
+    """
+    if not db.exists():
+        typer.echo(f"Database not found: {db}", err=True)
+        raise typer.Exit(1)
+
+    repository = GameRepository(StorageConfig(storage_dir=storage_dir) if storage_dir else StorageConfig())
+    # Stream the games; only the per move rows are kept, not every parsed game
+    games = repository.get_games_by_model(model) if model else repository.iter_games()
+    analyzer = PathQualityAnalyzer(db=StaticSolverDB(str(db)), max_distance=max_distance)
+    report = asyncio.run(analyzer.analyze(games))
+    report.write_csv(output_dir / "moves.csv", output_dir / "games.csv")
+
+    typer.echo(
+        f"Scored {len(report.moves)} moves of {len(report.games)} games against {report.targets} targets "
+        f"in {report.elapsed_s:.1f}s"
+    )
+    typer.echo(f"{'model':<40} {'moves':>7} {'mean delta':>11} {'optimal':>8}")
+    for model_name, summary in report.model_summary().items():
+        typer.echo(
+            f"{model_name:<40} {summary['moves']:>7} {summary['mean_distance_delta']:>11.3f} "
+            f"{summary['optimal_move_rate']:>8.1%}"
+        )
+    typer.echo(f"Rows: {output_dir / 'moves.csv'}, {output_dir / 'games.csv'}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+CLI to run a task corpus against a list of models concurrently.
+
+Example:
+    python -m wiki_arena.cli.run_batch tasks.tsv -m claude-3-5-haiku-20241022 -m gpt-4o-mini-2024-07-18 \
+        --concurrency 16 --provider-limit anthropic=4 --provider-limit openai=8
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+from tqdm import tqdm
+
+from wiki_arena.batch import BatchRunner, BatchStats, load_task_corpus
+from wiki_arena.models import GameResult, LinkFormat
+from wiki_arena.storage import GameStorageService, StorageConfig
+
+
+app = typer.Typer()
+
+
+def parse_provider_limits(values: List[str]) -> Dict[str, int]:
+    """Parse repeated 'provider=N' options."""
+    limits = {}
+    for value in values:
+        provider, sep, limit = value.partition("=")
+        if not sep or not limit.isdigit() or int(limit) < 1:
+            raise typer.BadParameter(f"Expected provider=N with N >= 1, got '{value}'")
+        limits[provider] = int(limit)
+    return limits
+
+
+@app.command()
+def main(
+    corpus: Path = typer.Argument(..., exists=True, dir_okay=False, help="Task corpus (.tsv or .jsonl)."),
+    models: List[str] = typer.Option(..., "--model", "-m", help="Model key to evaluate (repeatable)."),
+    concurrency: int = typer.Option(8, "--concurrency", "-c", min=1, help="Maximum games running at once."),
+    provider_limit: List[str] = typer.Option([], "--provider-limit", help="Per-provider cap as provider=N (repeatable)."),
+    repeats: int = typer.Option(1, "--repeats", "-r", min=1, help="Games per task and model."),
+    max_steps: int = typer.Option(30, "--max-steps", "-s", help="The maximum number of steps allowed in each game."),
+    limit: Optional[int] = typer.Option(None, "--limit", help="Only use the first N tasks of the corpus."),
+    storage_dir: Optional[str] = typer.Option(None, "--storage-dir", help="Where results are stored (default: StorageConfig)."),
+    link_format: LinkFormat = typer.Option(LinkFormat.LIST, "--link-format", help="How page links are shown to the model."),
+    history_window: Optional[int] = typer.Option(None, "--history-window", help="Keep only the N most recent page link listings."),
+    compact_history: bool = typer.Option(False, "--compact-history", help="Replace earlier turns with a summary of visited pages."),
+):
+    """
+    Run every model on every task in a corpus. Games already stored are skipped,
+    so an interrupted batch resumes where it left off.
+    """
+    from wiki_arena.logging_config import setup_logging
+
+    # Keep the console for the progress bar
+    setup_logging(level="WARNING")
+
+    tasks = load_task_corpus(corpus)
+    if limit is not None:
+        tasks = tasks[:limit]
+
+    storage_config = StorageConfig(storage_dir=storage_dir) if storage_dir else StorageConfig()
+    runner = BatchRunner(
+        storage_service=GameStorageService(storage_config),
+        max_concurrency=concurrency,
+        provider_concurrency=parse_provider_limits(provider_limit),
+        max_steps=max_steps,
+        link_format=link_format,
+        history_window=history_window,
+        compact_history=compact_history,
+    )
+    jobs = BatchRunner.build_jobs(tasks, models, repeats)
+    pending = runner.filter_pending(jobs)
+    typer.echo(f"{len(jobs)} games in batch, {len(jobs) - len(pending)} already stored, {len(pending)} to run")
+
+    stats = asyncio.run(run_with_progress(runner, pending))
+
+    typer.echo(
+        f"Done: {stats.completed} played, {stats.failed} failed "
+        f"in {stats.elapsed_s:.0f}s ({stats.games_per_minute:.1f} games/min, ${stats.total_cost_usd:.2f})"
+    )
+    for status, count in sorted(stats.status_counts.items()):
+        typer.echo(f"  {status}: {count}")
+    typer.echo(f"Results: {storage_config.jsonl_path}")
+
+
+async def run_with_progress(runner: BatchRunner, jobs) -> BatchStats:
+    progress = tqdm(total=len(jobs), unit="game", dynamic_ncols=True)
+
+    def on_progress(stats: BatchStats, result: Optional[GameResult]):
+        progress.update(1)
+        progress.set_postfix(
+            won=stats.status_counts.get("won", 0),
+            failed=stats.failed,
+            rate=f"{stats.games_per_minute:.1f}/min",
+            cost=f"${stats.total_cost_usd:.2f}",
+        )
+
+    try:
+        return await runner.run(jobs, on_progress=on_progress)
+    finally:
+        progress.close()
+
+
+if __name__ == "__main__":
+    app()
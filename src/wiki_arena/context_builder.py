@@ -0,0 +1,161 @@
+# Context Builder
+# Decides how pages and their links are rendered into the model context
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from wiki_arena.models import (
+    AssistantToolCall,
+    ContextMessage,
+    GameConfig,
+    LinkFormat,
+    Page,
+    PageMessage,
+    SystemMessage,
+)
+from wiki_arena.link_store import LinkStore, link_store
+from wiki_arena.tools import get_tools
+from wiki_arena.utils.tokens import estimate_context_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class ContextBuilder:
+    """
+    Renders page link listings and assembles the context sent to the model.
+
+    Strategies:
+    - link_format: LIST (python list repr, the original format), NEWLINE (one
+      title per line) or NUMBERED (numbered titles, navigated by index with the
+      navigate_by_index tool).
+    - history_window: keep only the N most recent page listings in full; older
+      listings are replaced by a one-line stub in the context sent to the model.
+    - compact_history: drop earlier turns entirely and send a summary of the
+      visited pages together with the current page listing.
+
+    The game state keeps the full transcript either way, its page listings
+    referencing links interned in a LinkStore instead of holding their text.
+    `stable_prefix_length` tells providers with prompt caching how much of the
+    built context will be sent unchanged next turn, so cache breakpoints land
+    on reusable content.
+    """
+
+    def __init__(
+        self,
+        link_format: LinkFormat = LinkFormat.LIST,
+        history_window: Optional[int] = None,
+        compact_history: bool = False,
+        store: Optional[LinkStore] = None,
+    ):
+        self.link_format = LinkFormat(link_format)
+        self.history_window = history_window
+        self.compact_history = compact_history
+        self.store = store or link_store
+
+    @classmethod
+    def from_config(cls, config: GameConfig) -> "ContextBuilder":
+        return cls(
+            link_format=config.link_format,
+            history_window=config.history_window,
+            compact_history=config.compact_history,
+        )
+
+    def get_tools(self) -> List[Dict[str, Any]]:
+        """Tool schemas matching this builder's link format."""
+        return get_tools(self.link_format)
+
+    def format_links(self, links: List[str]) -> str:
+        """Render a page's links in the configured format."""
+        return self.link_format.render(links)
+
+    def page_message(self, page: Page, initial: bool = False) -> PageMessage:
+        """Build the message telling the model which page it is on and where it can go."""
+        location = "You are currently on the page" if initial else "You are now on the page"
+        return PageMessage.listing(
+            f"{location} '{page.title}'.", self.store.intern(page.title, page.links), self.link_format
+        )
+
+    def tool_result(self, page: Page) -> str:
+        """Content of the tool result after a successful navigation."""
+        if self.link_format == LinkFormat.LIST:
+            return f"Successfully navigated to '{page.title}'. It has {len(page.links)} links."
+        # The link count is redundant with the page listing that follows
+        return f"Successfully navigated to '{page.title}'."
+
+    def resolve_page_title(self, tool_call: AssistantToolCall, page: Page) -> str:
+        """
+        Get the page title a navigation tool call points at.
+
+        Raises:
+            ValueError: If a link index is not a valid position on the page.
+        """
+        arguments = tool_call.arguments or {}
+        if "link_index" not in arguments:
+            return arguments["to_page_title"]
+
+        try:
+            link_index = int(arguments["link_index"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Link index '{arguments['link_index']}' is not a number")
+        if not 1 <= link_index <= len(page.links):
+            raise ValueError(
+                f"Link index {link_index} is out of range for '{page.title}' (1-{len(page.links)})"
+            )
+        return page.links[link_index - 1]
+
+    def build(self, context: List[ContextMessage]) -> List[ContextMessage]:
+        """Assemble the context sent to the model from the full transcript."""
+        if self.compact_history:
+            return self._build_compact(context)
+        if self.history_window is None:
+            return context
+
+        page_indices = [i for i, message in enumerate(context) if isinstance(message, PageMessage)]
+        stale = set(page_indices[:-self.history_window])
+        if not stale:
+            return context
+
+        return [
+            PageMessage(content=f"You were on the page '{message.page_title}'.", page_title=message.page_title)
+            if i in stale else message
+            for i, message in enumerate(context)
+        ]
+
+    def _build_compact(self, context: List[ContextMessage]) -> List[ContextMessage]:
+        """System prompt, then one message summarizing the path plus the current page."""
+        page_indices = [i for i, message in enumerate(context) if isinstance(message, PageMessage)]
+        if len(page_indices) < 2:
+            return context
+
+        current = page_indices[-1]
+        visited = " -> ".join(context[i].page_title for i in page_indices[:-1])
+        summary = PageMessage(
+            content=f"Pages visited so far: {visited}\n{context[current].content}",
+            page_title=context[current].page_title,
+        )
+        prefix = [message for message in context[:page_indices[0]] if isinstance(message, SystemMessage)]
+        # Messages after the current listing are this turn's failed attempts
+        return prefix + [summary] + context[current + 1:]
+
+    def stable_prefix_length(self, built_context: List[ContextMessage]) -> int:
+        """
+        Number of leading messages of a built context that will be sent unchanged next turn.
+
+        Full transcripts only ever grow, so all of it is stable. With a history
+        window, the oldest listing still shown in full gets stubbed once a new page
+        arrives, so the stable prefix ends right before it. Compacted contexts
+        rewrite everything after the system prompt every turn.
+        """
+        if self.compact_history:
+            return sum(1 for message in built_context[:1] if isinstance(message, SystemMessage))
+        if self.history_window is None:
+            return len(built_context)
+
+        page_indices = [i for i, message in enumerate(built_context) if isinstance(message, PageMessage)]
+        if len(page_indices) < self.history_window:
+            return len(built_context)
+        return page_indices[-self.history_window]
+
+    def estimate_tokens(self, context: List[ContextMessage]) -> int:
+        """Estimated input tokens of the context as it will be sent to the model."""
+        return estimate_context_tokens(self.build(context))
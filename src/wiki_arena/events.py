@@ -1,68 +1,363 @@
 import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, List, Callable, Awaitable, Any, Optional
+import time
 from collections import defaultdict
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
 
-class GameEvent(BaseModel):
+from .telemetry import spans
+
+@dataclass(slots=True)
+class GameEvent:
     """Event emitted during game execution."""
-    type: str = Field(..., min_length=1, description="Event type identifier (e.g., 'move_completed', 'game_ended')")
-    game_id: str = Field(..., min_length=1, description="Unique identifier for the game")
-    data: Dict[str, Any] = Field(..., description="Event payload containing relevant event data")
-    timestamp: datetime = Field(default_factory=datetime.now, description="When the event was created")
-    
-    class Config:
-        # Allow arbitrary types in data field (for Move, GameState objects)
-        arbitrary_types_allowed = True
-        # Use enum values for serialization
-        use_enum_values = True
+    type: str  # Event type identifier (e.g., 'move_completed', 'game_ended')
+    game_id: str  # Unique identifier for the game
+    data: Dict[str, Any]  # Event payload containing relevant event data (Move, GameState objects, ...)
+    timestamp: datetime = field(default_factory=datetime.now)  # When the event was created
+
+    def __post_init__(self):
+        if not self.type or not self.game_id:
+            raise ValueError("GameEvent type and game_id must be non-empty")
+
+EventHandler = Callable[[GameEvent], Awaitable[None]]
+
+class OverflowPolicy(str, Enum):
+    """
+    How a queued subscription handles a new event.
+
+    COALESCE applies to every event: one that has the same key as an event still
+    waiting in the queue replaces it. BLOCK and DROP, and COALESCE for a new key,
+    only come into play when the queue is full.
+    """
+    BLOCK = "block"        # The publisher waits for space
+    DROP = "drop"          # The new event is dropped
+    COALESCE = "coalesce"  # A pending event with the same key is replaced; a new key blocks when full
+
+def default_coalesce_key(event: GameEvent) -> Hashable:
+    return (event.type, event.game_id)
+
+class LanePartition:
+    """The queue and worker of one game in a lane."""
+    __slots__ = ("queue", "worker", "pending", "waiting")
+
+    def __init__(self, queue_size: int):
+        # Items are (subscription, event) or, when coalescing, (subscription, key)
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.worker: Optional[asyncio.Task] = None
+        self.pending: Dict[Hashable, GameEvent] = {}
+        self.waiting = 0  # Publishers blocked on a full queue
+
+class Lane:
+    """
+    Ordered delivery shared by several subscriptions (queued mode), partitioned by game.
+
+    The events of one game (by game_id) are handled one at a time in publish order,
+    so e.g. a game's last move and its end go out in that order even if they are
+    handled by different handlers. Each game has its own queue and worker, so a
+    slow game does not hold up the others; a worker exits once its queue is empty.
+    A full queue is handled with the overflow policy of the event's subscription.
+    """
+    __slots__ = ("name", "queue_size", "partitions")
+
+    def __init__(self, name: str, queue_size: int):
+        self.name = name
+        self.queue_size = queue_size
+        self.partitions: Dict[str, LanePartition] = {}
+
+    def qsize(self) -> int:
+        return sum(partition.queue.qsize() for partition in self.partitions.values())
+
+    async def enqueue(self, subscription: "Subscription", event: GameEvent):
+        partition = self.partitions.get(event.game_id)
+        if partition is None:
+            partition = self.partitions[event.game_id] = LanePartition(self.queue_size)
+            partition.worker = asyncio.create_task(
+                self._run(event.game_id, partition), name=f"event-worker:lane:{self.name}:{event.game_id}"
+            )
+
+        item = (subscription, event)
+        if subscription.overflow == OverflowPolicy.COALESCE:
+            key = (subscription, subscription.coalesce_key(event))
+            if key in partition.pending:
+                partition.pending[key] = event
+                subscription.coalesced += 1
+                return
+            partition.pending[key] = event
+            item = (subscription, key)
+        elif subscription.overflow == OverflowPolicy.DROP and partition.queue.full():
+            subscription.dropped += 1
+            return
+
+        partition.waiting += 1
+        try:
+            await partition.queue.put(item)
+        finally:
+            partition.waiting -= 1
+
+    async def _run(self, game_id: str, partition: LanePartition):
+        logger = logging.getLogger(__name__)
+        while not partition.queue.empty() or partition.waiting:
+            subscription, item = await partition.queue.get()
+            event = partition.pending.pop(item) if subscription.overflow == OverflowPolicy.COALESCE else item
+            try:
+                await subscription.handle(event)
+            except Exception as e:
+                logger.error(f"Handler {subscription.name} failed for {event.type}: {e}", exc_info=True)
+            finally:
+                partition.queue.task_done()
+        del self.partitions[game_id]
+
+    async def join(self):
+        """Wait until the events queued so far have been handled."""
+        for partition in list(self.partitions.values()):
+            await partition.queue.join()
+
+    async def stop(self):
+        """Cancel the workers, dropping the events they still hold."""
+        partitions = list(self.partitions.values())
+        self.partitions.clear()
+        for partition in partitions:
+            partition.worker.cancel()
+        await asyncio.gather(*(partition.worker for partition in partitions), return_exceptions=True)
+
+class Subscription:
+    """A handler subscribed to one event type, with its queue or lane (in queued mode) and stats."""
+    __slots__ = (
+        "event_type", "handler", "name", "overflow", "coalesce_key", "queue", "worker", "lane",
+        "_pending", "handled", "errors", "dropped", "coalesced", "total_latency_s", "max_latency_s",
+    )
+
+    def __init__(
+        self,
+        event_type: str,
+        handler: EventHandler,
+        queue_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        coalesce_key: Callable[[GameEvent], Hashable] = default_coalesce_key,
+        lane: Optional[Lane] = None,
+    ):
+        self.event_type = event_type
+        self.handler = handler
+        self.name = getattr(handler, "__qualname__", repr(handler))
+        self.overflow = overflow
+        self.coalesce_key = coalesce_key
+        # With coalescing the queue holds keys and _pending the latest event per key
+        self.queue: Optional[asyncio.Queue] = asyncio.Queue(queue_size) if queue_size is not None and lane is None else None
+        self.worker: Optional[asyncio.Task] = None
+        self.lane = lane
+        self._pending: Dict[Hashable, GameEvent] = {}
+
+        self.handled = 0
+        self.errors = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.total_latency_s = 0.0
+        self.max_latency_s = 0.0
+
+    async def handle(self, event: GameEvent):
+        """Run the handler, recording its latency. Exceptions propagate."""
+        start = time.perf_counter()
+        try:
+            await self.handler(event)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            self.handled += 1
+            self.total_latency_s += latency
+            if latency > self.max_latency_s:
+                self.max_latency_s = latency
+            spans.observe("event.handler", latency, event_type=self.event_type, handler=self.name)
+
+    async def enqueue(self, event: GameEvent):
+        if self.lane is not None:
+            await self.lane.enqueue(self, event)
+            return
+        if self.worker is None:
+            self.worker = asyncio.create_task(self._run(), name=f"event-worker:{self.event_type}:{self.name}")
+
+        if self.overflow == OverflowPolicy.COALESCE:
+            key = self.coalesce_key(event)
+            if key in self._pending:
+                self._pending[key] = event
+                self.coalesced += 1
+                return
+            self._pending[key] = event
+            await self.queue.put(key)
+        elif self.overflow == OverflowPolicy.DROP and self.queue.full():
+            self.dropped += 1
+        else:
+            await self.queue.put(event)
+
+    async def _run(self):
+        logger = logging.getLogger(__name__)
+        while True:
+            item = await self.queue.get()
+            event = self._pending.pop(item) if self.overflow == OverflowPolicy.COALESCE else item
+            try:
+                await self.handle(event)
+            except Exception as e:
+                logger.error(f"Handler {self.name} failed for {event.type}: {e}", exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "event_type": self.event_type,
+            "handler": self.name,
+            "queue_depth": self.lane.qsize() if self.lane else self.queue.qsize() if self.queue else None,
+            "lane": self.lane.name if self.lane else None,
+            "handled": self.handled,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "avg_latency_ms": self.total_latency_s / self.handled * 1000 if self.handled else 0.0,
+            "max_latency_ms": self.max_latency_s * 1000,
+        }
 
 class EventBus:
     """
     Simple event bus for coordinating between game execution and backend services.
-    
+
     Supports async event handlers with error isolation - if one handler fails,
     others continue to run.
+
+    By default publish() runs all handlers concurrently and waits for them. In queued
+    mode each subscription gets its own bounded queue and worker task, so publish()
+    only waits to enqueue (and only under the BLOCK/COALESCE policies with a full
+    queue); a slow consumer then no longer holds up the publishing game.
+    Handlers that must see a game's events in the order they were published, even
+    across event types, share a lane: one queue and worker per game for all of them.
     """
-    
-    def __init__(self):
-        self._subscribers: Dict[str, List[Callable[[GameEvent], Awaitable[None]]]] = defaultdict(list)
+
+    def __init__(
+        self,
+        queued: bool = False,
+        queue_size: int = 1000,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+    ):
+        self.queued = queued
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self._subscribers: Dict[str, List[Subscription]] = defaultdict(list)
+        self._lanes: Dict[str, Lane] = {}
         self.logger = logging.getLogger(__name__)
-    
-    def subscribe(self, event_type: str, handler: Callable[[GameEvent], Awaitable[None]]):
-        """Subscribe a handler to an event type."""
-        self._subscribers[event_type].append(handler)
+
+    def subscribe(
+        self,
+        event_type: str,
+        handler: EventHandler,
+        queue_size: Optional[int] = None,
+        overflow: Optional[OverflowPolicy] = None,
+        coalesce_key: Callable[[GameEvent], Hashable] = default_coalesce_key,
+        lane: Optional[str] = None,
+    ):
+        """
+        Subscribe a handler to an event type.
+
+        queue_size, overflow and coalesce_key override the bus defaults for this
+        handler and only apply in queued mode. Handlers subscribed with the same
+        lane handle each game's events in publish order (queued mode); overflow
+        still applies when the game's lane queue is full, and queue_size is the
+        bus default.
+        """
+        if lane is not None and self.queued and lane not in self._lanes:
+            self._lanes[lane] = Lane(lane, self.queue_size)
+        subscription = Subscription(
+            event_type,
+            handler,
+            queue_size=(queue_size or self.queue_size) if self.queued else None,
+            overflow=overflow or self.overflow,
+            coalesce_key=coalesce_key,
+            lane=self._lanes.get(lane) if lane is not None else None,
+        )
+        self._subscribers[event_type].append(subscription)
         self.logger.debug(f"Subscribed handler to {event_type}")
-    
+
     async def publish(self, event: GameEvent):
         """Publish an event to all subscribers."""
-        handlers = self._subscribers[event.type]
-        if not handlers:
+        subscriptions = self._subscribers.get(event.type)
+        if not subscriptions:
             self.logger.debug(f"No subscribers for event type: {event.type}")
             return
-            
-        self.logger.debug(f"Publishing {event.type} to {len(handlers)} handlers")
-        
+
+        if self.queued:
+            for subscription in subscriptions:
+                await subscription.enqueue(event)
+            return
+
+        self.logger.debug(f"Publishing {event.type} to {len(subscriptions)} handlers")
+
         # Run all handlers concurrently with error isolation
         results = await asyncio.gather(
-            *[self._safe_handle(handler, event) for handler in handlers],
+            *[self._safe_handle(subscription, event) for subscription in subscriptions],
             return_exceptions=True
         )
-        
+
         # Log any errors but don't fail the publish operation
         for i, result in enumerate(results):
             if isinstance(result, Exception):
                 self.logger.error(f"Event handler {i} failed for {event.type}: {result}")
-    
-    async def _safe_handle(self, handler: Callable, event: GameEvent):
+
+    async def _safe_handle(self, subscription: Subscription, event: GameEvent):
         """Run a handler with error isolation."""
         try:
-            await handler(event)
+            await subscription.handle(event)
         except Exception as e:
-            self.logger.error(f"Handler {handler.__name__} failed: {e}", exc_info=True)
+            self.logger.error(f"Handler {subscription.name} failed: {e}", exc_info=True)
             raise  # Re-raise so gather() can catch it as exception
-    
+
+    async def drain(self, handlers: Optional[List[EventHandler]] = None):
+        """
+        Wait until every queued event has been handled (queued mode).
+
+        With handlers, only wait for the queues of those handlers' subscriptions
+        (and the lanes they are in).
+        """
+        subscriptions = [
+            subscription
+            for subscriptions in list(self._subscribers.values())
+            for subscription in subscriptions
+            if handlers is None or subscription.handler in handlers
+        ]
+        for subscription in subscriptions:
+            if subscription.queue is not None:
+                await subscription.queue.join()
+        lanes = {subscription.lane.name for subscription in subscriptions if subscription.lane is not None}
+        for name, lane in list(self._lanes.items()):
+            if handlers is None or name in lanes:
+                await lane.join()
+
+    async def shutdown(self, drain: bool = True):
+        """Stop the queue workers, optionally handling queued events first."""
+        if drain:
+            await self.drain()
+        workers = [
+            subscription.worker
+            for subscriptions in self._subscribers.values()
+            for subscription in subscriptions
+            if subscription.worker is not None
+        ]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.worker = None
+        for lane in self._lanes.values():
+            await lane.stop()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Per-handler latency, error counts and queue depth."""
+        return [
+            subscription.get_stats()
+            for subscriptions in self._subscribers.values()
+            for subscription in subscriptions
+        ]
+
     def get_subscriber_count(self, event_type: str) -> int:
         """Get number of subscribers for an event type (useful for testing)."""
-        return len(self._subscribers[event_type]) 
\ No newline at end of file
+        return len(self._subscribers[event_type])
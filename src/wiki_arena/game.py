@@ -20,10 +20,18 @@ from wiki_arena.models import (
     ToolResultMessage,
     AssistantToolCall,
 )
+from wiki_arena.context_builder import ContextBuilder
 from wiki_arena.events import EventBus, GameEvent
+from wiki_arena.telemetry import spans
 from wiki_arena.wikipedia import LiveWikiService
-from wiki_arena.language_models import LanguageModel, LLMProviderError
+from wiki_arena.language_models import (
+    LanguageModel,
+    LLMProviderError,
+    LLMRateLimitError,
+    LLMTimeoutError,
+)
 from wiki_arena.tools import get_tool_by_name
+from wiki_arena.utils.tokens import estimate_context_tokens
 
 
 logger = logging.getLogger(__name__)
@@ -38,15 +46,22 @@ class Game:
         start_page: Page,
         tools: List[dict],
         event_bus: Optional[EventBus] = None,
+        game_id: Optional[str] = None,
     ):
-        """Initialize the game with all dependencies and a starting page."""
+        """
+        Initialize the game with all dependencies and a starting page.
+
+        A game_id can be given for reproducible ids (e.g. batch runs that resume);
+        otherwise one is generated from the model name and time.
+        """
         self.config = config
         self.wiki_service = wiki_service
         self.language_model = language_model
         self.tools = tools
         self.event_bus = event_bus
+        self.context_builder = ContextBuilder.from_config(config)
 
-        self.id = self._generate_game_id(config.model)
+        self.id = game_id or self._generate_game_id(config.model)
 
         self.state = GameState(
             game_id=self.id,
@@ -83,11 +98,7 @@ class Game:
         self.state.context.append(SystemMessage(content=system_prompt))
 
         # Initial User Message (contains the first page's content)
-        initial_user_message = (
-            f"You are currently on the page '{self.state.current_page.title}'.\n"
-            f"Here are the available links:\n{self.state.current_page.links}"
-        )
-        self.state.context.append(UserMessage(content=initial_user_message))
+        self.state.context.append(self.context_builder.page_message(self.state.current_page, initial=True))
 
     async def run(self):
         """Run the game until completion."""
@@ -99,7 +110,8 @@ class Game:
         while self.state.status == GameStatus.IN_PROGRESS:
             # Small delay between moves to avoid overwhelming services and to allow for observation.
             # await asyncio.sleep(1.0)
-            await self._play_turn()
+            with spans.span("game.turn"):
+                await self._play_turn()
 
         logger.info(f"Game {self.id} completed with status: {self.state.status.value}")
 
@@ -123,12 +135,28 @@ class Game:
         for attempt in range(MAX_ATTEMPTS):
             # 1. Get model response
             try:
-                assistant_message = await self.language_model.generate_response(
-                    tools=self.tools,
-                        context=self.state.context,
+                with spans.span("game.context_format"):
+                    model_context = self.context_builder.build(self.state.context)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Game {self.id} step {current_step}: sending ~{estimate_context_tokens(model_context)} "
+                        f"context tokens ({self.context_builder.link_format.value} links)"
+                    )
+                with spans.span("game.llm_wait", provider=self.config.model.provider):
+                    assistant_message = await self.language_model.generate_response(
+                        tools=self.tools,
+                        context=model_context,
                         game_state=self.state,
                     )
                 self.state.context.append(assistant_message)
+            except LLMRateLimitError as e:
+                logger.error(f"Attempt {attempt + 1}: Model provider rate limit exhausted retries: {e}", exc_info=True)
+                last_error = GameError(type=ErrorType.PROVIDER_RATE_LIMIT, message=str(e) or "Provider rate limit exceeded")
+                break # retries already happened in the scheduler
+            except LLMTimeoutError as e:
+                logger.error(f"Attempt {attempt + 1}: Model provider timed out: {e}", exc_info=True)
+                last_error = GameError(type=ErrorType.PROVIDER_TIMEOUT, message=str(e) or "Provider request timed out")
+                break
             except LLMProviderError as e:
                 logger.error(f"Attempt {attempt + 1}: Model provider error: {e}", exc_info=True)
                 last_error = GameError(type=ErrorType.PROVIDER_API_ERROR, message=str(e))
@@ -187,8 +215,30 @@ class Game:
                 )
                 continue
 
-            to_page_title = tool_call.arguments["to_page_title"]
-            # 5. Validate link is on the current page
+            # 5. Resolve the requested page and validate link is on the current page
+            try:
+                to_page_title = self.context_builder.resolve_page_title(tool_call, self.state.current_page)
+            except ValueError as e:
+                logger.warning(f"Attempt {attempt + 1}: Model chose an invalid link index. {e}")
+                error_message = f"Error: {e}"
+                self.state.context.append(
+                    ToolResultMessage(
+                        tool_call_id=tool_call.id,
+                        content=error_message,
+                        is_error=True
+                    )
+                )
+                last_error = GameError(
+                    type=ErrorType.MODEL_INVALID_LINK,
+                    message=error_message,
+                    metadata={
+                        "current_page": self.state.current_page.title,
+                        "requested_index": tool_call.arguments.get("link_index"),
+                        "available_links_count": len(self.state.current_page.links),
+                    }
+                )
+                continue
+
             if to_page_title not in self.state.current_page.links:
                 is_target_page = to_page_title == self.state.config.target_page_title
                 logger.warning(f"Attempt {attempt + 1}: Model chose a link '{to_page_title}' that is not on the current page.")
@@ -215,12 +265,10 @@ class Game:
             # 6. Execute tool and handle results
             try:
                 # TODO(hunter): passing the wiki_service feels wrong here. guess we go back to mcp client
-                next_page = await tool_implementation(wiki_service=self.wiki_service, **tool_call.arguments)
+                with spans.span("game.tool_execution", tool=tool_call.name):
+                    next_page = await tool_implementation(wiki_service=self.wiki_service, to_page_title=to_page_title)
                 # TODO(hunter): model needs to know if the link redirected so they don't get confused
-                tool_result_message = (
-                    f"Successfully navigated to '{next_page.title}'. "
-                    f"It has {len(next_page.links)} links."
-                )
+                tool_result_message = self.context_builder.tool_result(next_page)
                 self.state.context.append(
                     ToolResultMessage(tool_call_id=tool_call.id, content=tool_result_message, is_error=False)
                 )
@@ -285,24 +333,24 @@ class Game:
         # Provide the context for the next turn if the game is still in progress
         # TODO(hunter): I am pretty sure this is redundant with tool call result. we need one or the other
         if not game_over:
-            new_user_message = (
-                f"You are now on the page '{self.state.current_page.title}'.\n"
-                f"Here are the available links:\n{self.state.current_page.links}"
-            )
-            self.state.context.append(UserMessage(content=new_user_message))
+            self.state.context.append(self.context_builder.page_message(self.state.current_page))
 
         # Emit event if event bus is available
         if self.event_bus:
-            await self.event_bus.publish(GameEvent(
-                type="move_completed",
-                game_id=self.id,
-                data={
-                    "move": move,
-                    "game_state": self.state,
-                    "from_page": from_page,
-                    "to_page": new_page.title
-                }
-            ))
+            with spans.span("game.event_publish", event_type="move_completed"):
+                await self.event_bus.publish(GameEvent(
+                    type="move_completed",
+                    game_id=self.id,
+                    data={
+                        "move": move,
+                        # Queued subscribers may handle this after later moves. The game
+                        # replaces rather than mutates the page, steps and status, so a
+                        # shallow copy without the growing lists is a snapshot of them
+                        "game_state": self.state.model_copy(update={"context": [], "move_history": []}),
+                        "from_page": from_page,
+                        "to_page": new_page.title
+                    }
+                ))
 
             if game_over:
                 await self._emit_game_ended_event()
@@ -310,11 +358,12 @@ class Game:
     async def _emit_game_ended_event(self):
         """Helper method to emit game_ended event."""
         if self.event_bus:
-            await self.event_bus.publish(GameEvent(
-                type="game_ended",
-                game_id=self.id,
-                data={"game_state": self.state}
-            ))
+            with spans.span("game.event_publish", event_type="game_ended"):
+                await self.event_bus.publish(GameEvent(
+                    type="game_ended",
+                    game_id=self.id,
+                    data={"game_state": self.state}
+                ))
 
     def _create_error_move(self, step: int, from_page: str, error: GameError):
         """Create a move record for an error case."""
@@ -10,15 +10,24 @@ from .language_model import (
     LLMTimeoutError,
 )
 from .random_model import RandomModel
+from .fake_model import FakeModel
 from .anthropic_model import AnthropicModel
 from .openai_model import OpenAIModel
+from .scheduler import (
+    ModelCallScheduler,
+    RateLimit,
+    RetryPolicy,
+    ScheduledLanguageModel,
+    model_call_scheduler,
+)
 from wiki_arena.models import ModelConfig
 
 # Simple provider mapping
 PROVIDERS: Dict[str, Type[LanguageModel]] = {
     "anthropic": AnthropicModel,
     "openai": OpenAIModel,
-    "random": RandomModel
+    "random": RandomModel,
+    "fake": FakeModel,
 }
 
 def _load_models_config() -> Dict[str, Any]:
@@ -83,6 +92,31 @@ def create_model(model_key: str, **overrides) -> LanguageModel:
     provider_class = PROVIDERS[provider]
     return provider_class(model_config)
 
+def create_scheduled_model(
+    model_key: str,
+    scheduler: Optional[ModelCallScheduler] = None,
+    **overrides,
+) -> ScheduledLanguageModel:
+    """
+    Create a language model whose calls go through a rate limiting scheduler.
+
+    The model's `rate_limits` entry in models.json (requests_per_minute,
+    tokens_per_minute) is registered with the scheduler.
+
+    Args:
+        model_key: Key in models.json
+        scheduler: Scheduler to use (defaults to the process-wide scheduler)
+        **overrides: Optional setting overrides passed to create_model
+    """
+    model = create_model(model_key, **overrides)
+    scheduler = scheduler or model_call_scheduler
+
+    rate_limits = _load_models_config()[model_key].get("rate_limits")
+    if rate_limits:
+        scheduler.set_model_limit(model_key, RateLimit(**rate_limits))
+
+    return ScheduledLanguageModel(model, scheduler)
+
 def list_available_models() -> Dict[str, Dict[str, Any]]:
     """List all available models from models.json."""
     return _load_models_config()
@@ -111,9 +145,16 @@ __all__ = [
     "LLMRateLimitError",
     "LLMTimeoutError",
     "RandomModel",
+    "FakeModel",
     "AnthropicModel", 
     "OpenAIModel",
     "create_model",
+    "create_scheduled_model",
+    "ModelCallScheduler",
+    "RateLimit",
+    "RetryPolicy",
+    "ScheduledLanguageModel",
+    "model_call_scheduler",
     "list_available_models",
     "get_model_info",
     "PROVIDERS"
@@ -9,6 +9,7 @@ from anthropic import (
     RateLimitError,
     APITimeoutError,
 )
+from wiki_arena.context_builder import ContextBuilder
 from wiki_arena.models import (
     AssistantMessage,
     AssistantToolCall,
@@ -16,6 +17,7 @@ from wiki_arena.models import (
     ModelCallMetrics,
     ModelConfig,
     GameState,
+    PageMessage,
     ToolResultMessage,
     UserMessage,
 )
@@ -76,10 +78,26 @@ class AnthropicModel(LanguageModel):
             })
         return formatted_tools
 
-    def _format_context(self, context: List[ContextMessage]) -> tuple[Optional[List[Dict[str, Any]]], List[Dict[str, Any]]]:
-        """Converts the universal context to Anthropic's format."""
+    def _format_context(
+        self,
+        context: List[ContextMessage],
+        stable_prefix_length: Optional[int] = None,
+    ) -> tuple[Optional[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        Converts the universal context to Anthropic's format.
+
+        Args:
+            context: The context to send.
+            stable_prefix_length: How many leading context messages will be sent
+                unchanged next turn (see ContextBuilder.stable_prefix_length).
+                The message cache breakpoint goes on the last of them, so the
+                cached prefix is one the next request can actually reuse.
+                Defaults to the whole context.
+        """
         system_prompt_blocks: Optional[List[Dict[str, Any]]] = None
         messages: List[Dict[str, Any]] = []
+        if stable_prefix_length is None:
+            stable_prefix_length = len(context)
         
         # Extract the system prompt first.
         if context and context[0].role == "system":
@@ -87,9 +105,10 @@ class AnthropicModel(LanguageModel):
             # Add cache control to the system prompt's content block.
             system_prompt_blocks[0]["cache_control"] = {"type": "ephemeral"}
             context = context[1:]
+            stable_prefix_length -= 1
 
         for turn in context:
-            if isinstance(turn, (UserMessage, ToolResultMessage)):
+            if isinstance(turn, (UserMessage, PageMessage, ToolResultMessage)):
                 # Anthropic uses 'user' role for both user and tool result messages. 
                 # For simplicity here, we assume a back-and-forth conversation.
                 if isinstance(turn, ToolResultMessage):
@@ -102,7 +121,7 @@ class AnthropicModel(LanguageModel):
                             "is_error": turn.is_error,
                         }]
                     })
-                else: # UserMessage
+                else: # UserMessage or PageMessage (rendered here)
                     content = turn.content
                     if not isinstance(content, list):
                         content = [{"type": "text", "text": content}]
@@ -121,11 +140,12 @@ class AnthropicModel(LanguageModel):
                         })
                 messages.append({"role": "assistant", "content": content})
         
-        # Add cache control to the last content block of the last message
-        if messages:
-            last_message_content = messages[-1]["content"]
-            if last_message_content:
-                last_message_content[-1]["cache_control"] = {"type": "ephemeral"}
+        # Add cache control to the last content block of the last stable message
+        # (each context message maps to exactly one Anthropic message)
+        if messages and stable_prefix_length > 0:
+            breakpoint_content = messages[min(stable_prefix_length, len(messages)) - 1]["content"]
+            if breakpoint_content:
+                breakpoint_content[-1]["cache_control"] = {"type": "ephemeral"}
 
         return system_prompt_blocks, messages
 
@@ -136,7 +156,10 @@ class AnthropicModel(LanguageModel):
         game_state: GameState,
     ) -> AssistantMessage:
         
-        system_prompt_blocks, messages = self._format_context(context)
+        context_builder = ContextBuilder.from_config(game_state.config)
+        system_prompt_blocks, messages = self._format_context(
+            context, stable_prefix_length=context_builder.stable_prefix_length(context)
+        )
         formatted_tools = self._format_tools(tools)
         
         logger.debug(f"Sending request to Anthropic with system prompt: {system_prompt_blocks}")
@@ -0,0 +1,93 @@
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from wiki_arena.models import (
+    AssistantMessage,
+    AssistantToolCall,
+    ContextMessage,
+    GameState,
+    ModelCallMetrics,
+    ModelConfig,
+)
+from .language_model import LanguageModel
+
+
+class FakeModel(LanguageModel):
+    """
+    A deterministic stand-in for a real provider, for load tests.
+
+    It waits `latency_ms` (plus up to `jitter_ms`) like an API call would, then
+    navigates to the target if it is linked and otherwise to a link chosen
+    from (seed, game, step), so the same games replay the same way. It reports
+    `input_tokens`/`output_tokens` per call so token accounting is exercised.
+
+    Settings: latency_ms (default 500), jitter_ms (0), seed (0),
+    input_tokens (0), output_tokens (0).
+    """
+
+    def __init__(self, model_config: ModelConfig):
+        super().__init__(model_config)
+        settings = model_config.settings
+        self.latency_ms = float(settings.get("latency_ms", 500))
+        self.jitter_ms = float(settings.get("jitter_ms", 0))
+        self.seed = settings.get("seed", 0)
+        self.input_tokens = int(settings.get("input_tokens", 0))
+        self.output_tokens = int(settings.get("output_tokens", 0))
+
+    def _calculate_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cache_creation_tokens: int = 0,
+        cache_read_tokens: int = 0,
+    ) -> float:
+        """FakeModel has no cost."""
+        return 0.0
+
+    def _format_tools(self, mcp_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """No-op for FakeModel."""
+        return mcp_tools
+
+    def _format_context(self, context: List[ContextMessage]) -> Any:
+        """No-op for FakeModel."""
+        return None
+
+    async def generate_response(
+        self,
+        tools: List[Dict[str, Any]],
+        context: List[ContextMessage],
+        game_state: GameState,
+    ) -> AssistantMessage:
+        """Waits the configured latency, then navigates deterministically."""
+        start_time = time.time()
+        rng = random.Random(f"{self.seed}:{game_state.game_id}:{game_state.steps}")
+        await asyncio.sleep((self.latency_ms + rng.uniform(0, self.jitter_ms)) / 1000)
+
+        metrics = ModelCallMetrics(
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            total_tokens=self.input_tokens + self.output_tokens,
+            response_time_ms=(time.time() - start_time) * 1000,
+            request_timestamp=datetime.now(),
+        )
+
+        links = game_state.current_page.links
+        tool_names = {tool["name"] for tool in tools}
+        if not links or not tool_names & {"navigate", "navigate_by_index"}:
+            return AssistantMessage(content="No link to follow.", metrics=metrics)
+
+        target = game_state.config.target_page_title
+        link_index = links.index(target) if target in links else rng.randrange(len(links))
+        if "navigate" in tool_names:
+            name, arguments = "navigate", {"to_page_title": links[link_index]}
+        else:
+            name, arguments = "navigate_by_index", {"link_index": link_index + 1}
+        return AssistantMessage(
+            content=f"Following link: {links[link_index]}",
+            tool_calls=[AssistantToolCall(id=f"tool_{uuid.uuid4().hex[:10]}", name=name, arguments=arguments)],
+            metrics=metrics,
+        )
@@ -42,7 +42,9 @@ class OpenAIModel(LanguageModel):
         """Calculate cost based on OpenAI's pricing and token usage, including caching."""
         input_cost = (input_tokens / 1_000_000) * self.model_config.input_cost_per_1m_tokens
         output_cost = (output_tokens / 1_000_000) * self.model_config.output_cost_per_1m_tokens
-        return input_cost + output_cost
+        # OpenAI caches automatically: no write premium, cached input is billed at half price
+        cache_read_cost = (cache_read_tokens / 1_000_000) * self.model_config.input_cost_per_1m_tokens * 0.5
+        return input_cost + output_cost + cache_read_cost
 
     def _format_tools(self, mcp_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         # OpenAI uses a format that is very similar to MCP, but it's called 'function'
@@ -99,25 +101,33 @@ class OpenAIModel(LanguageModel):
             logger.debug(f"API response received: {response}")
 
             # Calculate metrics for logging
-            input_tokens = response.usage.prompt_tokens
+            # prompt_tokens includes cached tokens; split them out like Anthropic reports them
+            prompt_tokens_details = getattr(response.usage, "prompt_tokens_details", None)
+            cache_read_tokens = getattr(prompt_tokens_details, "cached_tokens", 0) or 0
+            input_tokens = response.usage.prompt_tokens - cache_read_tokens
             output_tokens = response.usage.completion_tokens
             total_tokens = response.usage.total_tokens
-            cost = self._calculate_cost(input_tokens, output_tokens)
+            cost = self._calculate_cost(input_tokens, output_tokens, cache_read_tokens=cache_read_tokens)
             duration_ms = (datetime.now() - start_time).total_seconds() * 1000
 
             log_parts = [
                 f"Input: {input_tokens}",
                 f"Output: {output_tokens}",
+            ]
+            if cache_read_tokens > 0:
+                log_parts.append(f"Cache Read: {cache_read_tokens}")
+            log_parts.extend([
                 f"Total: {total_tokens}",
                 f"Cost: ${cost:.4f}",
                 f"Duration: {duration_ms:.1f}ms"
-            ]
+            ])
             logger.info(f"Response Tokens: {' | '.join(log_parts)}")
 
             metrics = ModelCallMetrics(
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 total_tokens=total_tokens,
+                cache_read_input_tokens=cache_read_tokens,
                 estimated_cost_usd=cost,
                 response_time_ms=duration_ms,
                 request_timestamp=start_time,
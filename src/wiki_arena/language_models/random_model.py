@@ -68,25 +68,29 @@ class RandomModel(LanguageModel):
                 metrics=metrics
             )
 
-        # Find the navigate tool (assuming it exists)
-        navigate_tool = None
-        for tool in tools:
-            if tool["name"] == "navigate":
-                navigate_tool = tool
-                break
-        
-        if not navigate_tool:
+        # Find a navigation tool (by title or by link index)
+        tool_names = {tool["name"] for tool in tools}
+        if "navigate" in tool_names:
+            tool_name = "navigate"
+        elif "navigate_by_index" in tool_names:
+            tool_name = "navigate_by_index"
+        else:
             return AssistantMessage(
                 content="No navigate tool available.",
                 metrics=metrics
             )
         
         # 4. Randomly select a link and create a tool call
-        selected_link = random.choice(game_state.current_page.links)
+        link_index = random.randrange(len(game_state.current_page.links))
+        selected_link = game_state.current_page.links[link_index]
+        if tool_name == "navigate":
+            arguments = {"to_page_title": selected_link}
+        else:
+            arguments = {"link_index": link_index + 1}
         tool_call = AssistantToolCall(
             id=f"tool_{uuid.uuid4().hex[:10]}",
-            name="navigate",
-            arguments={"to_page_title": selected_link}
+            name=tool_name,
+            arguments=arguments
         )
         # 5. Return the AssistantMessage
         return AssistantMessage(
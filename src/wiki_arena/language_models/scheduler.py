@@ -0,0 +1,339 @@
+"""
+Rate limiting and retry scheduling for language model calls.
+
+`ScheduledLanguageModel` sits between `Game` and a concrete `LanguageModel`.
+Every call first waits for capacity in the provider and model token buckets
+(requests/min and tokens/min), then throttled or timed out calls are retried
+with jittered exponential backoff. Waiters are served round-robin per game so a
+single busy game cannot starve the others sharing a provider.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from wiki_arena.models import AssistantMessage, ContextMessage, GameState, ModelCallMetrics, ModelConfig
+from wiki_arena.utils.tokens import estimate_context_tokens
+from .language_model import LanguageModel, LLMRateLimitError, LLMTimeoutError
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimit(BaseModel):
+    """Request and token budgets for a provider or a single model."""
+    requests_per_minute: Optional[float] = Field(None, gt=0, description="Maximum requests per minute (None = unlimited)")
+    tokens_per_minute: Optional[float] = Field(None, gt=0, description="Maximum input + output tokens per minute (None = unlimited)")
+
+
+class RetryPolicy(BaseModel):
+    """How throttled and timed out calls are retried."""
+    max_retries: int = Field(4, ge=0, description="Retries after the first attempt before giving up")
+    base_delay_s: float = Field(1.0, gt=0, description="Backoff ceiling for the first retry")
+    max_delay_s: float = Field(60.0, gt=0, description="Upper bound for any single backoff")
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for a 0-based retry attempt."""
+        ceiling = min(self.max_delay_s, self.base_delay_s * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class FairTokenBucket:
+    """
+    Token bucket whose waiters are served round-robin by client.
+
+    Each client (a game) has its own FIFO of pending acquisitions and clients take
+    turns at the head of the line, so one game issuing many calls cannot starve
+    the others.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(rate_per_minute)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._waiters: Dict[str, Deque[Tuple[float, asyncio.Future]]] = {}
+        self._turn_order: Deque[str] = deque()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (may be negative after a usage correction)."""
+        self._refill()
+        return self._tokens
+
+    @property
+    def waiting(self) -> int:
+        """Number of acquisitions still waiting for capacity."""
+        return sum(1 for queue in self._waiters.values() for _, future in queue if not future.done())
+
+    async def acquire(self, amount: float, client_id: str = "default") -> None:
+        """Wait until `amount` tokens can be taken, in fair order across clients."""
+        # A single request larger than the bucket must still be grantable eventually
+        amount = min(amount, self.capacity)
+        future = asyncio.get_running_loop().create_future()
+        if client_id not in self._waiters:
+            self._waiters[client_id] = deque()
+            self._turn_order.append(client_id)
+        self._waiters[client_id].append((amount, future))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just before the caller was cancelled: give the tokens back
+            if future.done() and not future.cancelled():
+                self._tokens += amount
+                self._dispatch()
+            raise
+
+    def adjust(self, delta: float) -> None:
+        """Correct the balance once real usage is known (negative = consumed more)."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + delta)
+        self._dispatch()
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the provider reports we are over its limit."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+        self._last_refill = now
+
+    def _dispatch(self):
+        """Grant as many head-of-line waiters as the balance allows."""
+        self._refill()
+        while self._turn_order:
+            client_id = self._turn_order[0]
+            queue = self._waiters[client_id]
+            while queue and queue[0][1].done():  # cancelled waiters
+                queue.popleft()
+            if not queue:
+                self._turn_order.popleft()
+                del self._waiters[client_id]
+                continue
+
+            amount, future = queue[0]
+            if self._tokens < amount:
+                self._schedule_wakeup((amount - self._tokens) / self.rate_per_second)
+                return
+
+            self._tokens -= amount
+            queue.popleft()
+            future.set_result(None)
+            # Next client's turn
+            self._turn_order.rotate(-1)
+
+    def _schedule_wakeup(self, delay: float):
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._dispatch()
+
+
+class ModelCallScheduler:
+    """
+    Admits language model calls against provider and model rate limits.
+
+    Provider limits are shared by every model of that provider; model limits come
+    from the `rate_limits` entry of a model in models.json. Buckets are created
+    lazily per limit, so unlimited providers/models cost nothing.
+    """
+
+    def __init__(
+        self,
+        provider_limits: Optional[Dict[str, RateLimit]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        self.provider_limits: Dict[str, RateLimit] = dict(provider_limits or {})
+        self.model_limits: Dict[str, RateLimit] = {}
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._buckets: Dict[Tuple[str, str, str], FairTokenBucket] = {}
+
+    def set_provider_limit(self, provider: str, limit: RateLimit):
+        """Set the limits shared by all models of a provider."""
+        self.provider_limits[provider] = limit
+        self._drop_buckets("provider", provider)
+
+    def set_model_limit(self, model_name: str, limit: RateLimit):
+        """Set the limits of a single model."""
+        if self.model_limits.get(model_name) == limit:
+            return
+        self.model_limits[model_name] = limit
+        self._drop_buckets("model", model_name)
+
+    def _drop_buckets(self, scope: str, key: str):
+        for bucket_key in [k for k in self._buckets if k[0] == scope and k[1] == key]:
+            del self._buckets[bucket_key]
+
+    def _buckets_for(self, model_config: ModelConfig) -> Tuple[List[FairTokenBucket], List[FairTokenBucket]]:
+        """Return the (request, token) buckets that apply to a model."""
+        request_buckets: List[FairTokenBucket] = []
+        token_buckets: List[FairTokenBucket] = []
+        scopes = [
+            ("provider", model_config.provider, self.provider_limits.get(model_config.provider)),
+            ("model", model_config.model_name, self.model_limits.get(model_config.model_name)),
+        ]
+        for scope, key, limit in scopes:
+            if limit is None:
+                continue
+            if limit.requests_per_minute:
+                request_buckets.append(self._get_bucket(scope, key, "requests", limit.requests_per_minute))
+            if limit.tokens_per_minute:
+                token_buckets.append(self._get_bucket(scope, key, "tokens", limit.tokens_per_minute))
+        return request_buckets, token_buckets
+
+    def _get_bucket(self, scope: str, key: str, kind: str, rate_per_minute: float) -> FairTokenBucket:
+        bucket_key = (scope, key, kind)
+        if bucket_key not in self._buckets:
+            self._buckets[bucket_key] = FairTokenBucket(rate_per_minute)
+        return self._buckets[bucket_key]
+
+    async def acquire(self, model_config: ModelConfig, client_id: str, estimated_tokens: int) -> float:
+        """
+        Wait for capacity to make one call.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        request_buckets, token_buckets = self._buckets_for(model_config)
+        if not request_buckets and not token_buckets:
+            return 0.0
+
+        start = time.monotonic()
+        for bucket in request_buckets:
+            await bucket.acquire(1, client_id)
+        for bucket in token_buckets:
+            await bucket.acquire(estimated_tokens, client_id)
+        return time.monotonic() - start
+
+    def record_usage(self, model_config: ModelConfig, estimated_tokens: int, actual_tokens: int):
+        """Reconcile token buckets with the usage reported by the provider."""
+        _, token_buckets = self._buckets_for(model_config)
+        for bucket in token_buckets:
+            bucket.adjust(estimated_tokens - actual_tokens)
+
+    def record_rate_limited(self, model_config: ModelConfig):
+        """The provider throttled us: pause everyone sharing its request buckets."""
+        request_buckets, _ = self._buckets_for(model_config)
+        for bucket in request_buckets:
+            bucket.drain()
+
+    async def call(
+        self,
+        language_model: LanguageModel,
+        tools: List[Dict[str, Any]],
+        context: List[ContextMessage],
+        game_state: GameState,
+    ) -> AssistantMessage:
+        """
+        Make a rate-limited call, retrying throttled and timed out attempts.
+
+        Raises:
+            LLMRateLimitError, LLMTimeoutError: When retries are exhausted.
+            LLMProviderError: Other provider errors are not retried.
+        """
+        model_config = language_model.model_config
+        client_id = game_state.game_id
+        estimated_tokens = estimate_context_tokens(context) + model_config.settings.get("max_tokens", 0)
+        queue_wait_s = 0.0
+        attempt = 0
+
+        while True:
+            queue_wait_s += await self.acquire(model_config, client_id, estimated_tokens)
+            try:
+                message = await language_model.generate_response(tools, context, game_state)
+                break
+            except (LLMRateLimitError, LLMTimeoutError) as e:
+                if isinstance(e, LLMRateLimitError):
+                    self.record_rate_limited(model_config)
+                if attempt >= self.retry_policy.max_retries:
+                    logger.error(
+                        f"Giving up on {model_config.model_name} for game {client_id} "
+                        f"after {attempt + 1} attempts: {type(e).__name__}"
+                    )
+                    raise
+
+                delay = self.retry_policy.backoff_delay(attempt)
+                retry_after = _retry_after_seconds(e)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                logger.warning(
+                    f"{type(e).__name__} from {model_config.model_name} for game {client_id}, "
+                    f"retrying in {delay:.2f}s (attempt {attempt + 1}/{self.retry_policy.max_retries})"
+                )
+                await asyncio.sleep(delay)
+                queue_wait_s += delay
+                attempt += 1
+
+        if message.metrics is None:
+            message.metrics = ModelCallMetrics()
+        else:
+            self.record_usage(model_config, estimated_tokens, message.metrics.total_tokens)
+        message.metrics.queue_wait_ms = queue_wait_s * 1000
+        message.metrics.retries = attempt
+        return message
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read a Retry-After header from the provider exception wrapped by an LLM error."""
+    response = getattr(error.__cause__, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ScheduledLanguageModel(LanguageModel):
+    """
+    Wraps a LanguageModel so every call goes through a ModelCallScheduler.
+    """
+
+    def __init__(self, language_model: LanguageModel, scheduler: ModelCallScheduler):
+        super().__init__(language_model.model_config)
+        self.language_model = language_model
+        self.scheduler = scheduler
+
+    def _calculate_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cache_creation_tokens: int = 0,
+        cache_read_tokens: int = 0,
+    ) -> float:
+        return self.language_model._calculate_cost(
+            input_tokens, output_tokens, cache_creation_tokens, cache_read_tokens
+        )
+
+    def _format_tools(self, mcp_tools: List[Dict[str, Any]]) -> Any:
+        return self.language_model._format_tools(mcp_tools)
+
+    def _format_context(self, context: List[ContextMessage]) -> Any:
+        return self.language_model._format_context(context)
+
+    async def generate_response(
+        self,
+        tools: List[Dict[str, Any]],
+        context: List[ContextMessage],
+        game_state: GameState,
+    ) -> AssistantMessage:
+        return await self.scheduler.call(self.language_model, tools, context, game_state)
+
+
+# Global scheduler shared by all games in this process
+model_call_scheduler = ModelCallScheduler()
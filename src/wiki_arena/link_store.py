@@ -0,0 +1,142 @@
+"""
+Interned page link lists, shared by every game in the process.
+
+A page listing used to be stored in each game's context as its rendered text,
+so a game held steps x links-per-page characters, and games of the same task
+(which all start on the same page) or crossing popular pages held the same
+listing many times. Listings now reference one PageLinks per page and render
+their text only when a provider formats a request (see models.PageMessage).
+"""
+
+import sys
+import threading
+import weakref
+from typing import Any, Dict, Iterable, Sequence, Set
+
+from pydantic import BaseModel
+
+from wiki_arena.models import GameState, PageLinks, PageMessage
+
+
+class LinkStore:
+    """
+    Interns PageLinks by page title.
+
+    Entries are weak: a page's links stay interned while some message or
+    game still references them. A page fetched again with different links
+    (the article was edited) replaces the entry; messages keep the links they
+    were built with.
+    """
+
+    def __init__(self):
+        self._pages: "weakref.WeakValueDictionary[str, PageLinks]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, title: str, links: Sequence[str]) -> PageLinks:
+        """The shared PageLinks of a page, created if it is new or its links changed."""
+        page_links = PageLinks(title, links)
+        with self._lock:
+            existing = self._pages.get(title)
+            if existing is not None and existing.count == page_links.count and existing.text == page_links.text:
+                self.hits += 1
+                return existing
+            self._pages[title] = page_links
+            self.misses += 1
+            return page_links
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pages = list(self._pages.values())
+            hits, misses = self.hits, self.misses
+        return {
+            "pages": len(pages),
+            "links": sum(page.count for page in pages),
+            "bytes": sum(page_links_size(page) for page in pages),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+
+# Process-wide store used by ContextBuilder
+link_store = LinkStore()
+
+
+def page_links_size(page_links: PageLinks) -> int:
+    """Bytes of a PageLinks with its text."""
+    return sys.getsizeof(page_links) + sys.getsizeof(page_links.text)
+
+
+def _deep_size(obj: Any, seen: Set[int], shared: Dict[int, PageLinks]) -> int:
+    """Bytes reachable from obj, not counting objects in seen; PageLinks are collected in shared instead."""
+    if id(obj) in seen:
+        return 0
+    if isinstance(obj, PageLinks):
+        shared[id(obj)] = obj
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, BaseModel):
+        size += _deep_size(obj.__dict__, seen, shared)
+        if obj.__pydantic_private__:
+            size += _deep_size(obj.__pydantic_private__, seen, shared)
+    elif isinstance(obj, dict):
+        size += sum(_deep_size(key, seen, shared) + _deep_size(value, seen, shared) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen, shared) for item in obj)
+    return size
+
+
+def game_memory(state: GameState) -> Dict[str, Any]:
+    """
+    Approximate memory held by a game state.
+
+    own_bytes is reachable only through this game (context, current page,
+    moves); shared_bytes are the interned page links its listings reference,
+    which other games may reference too. rendered_bytes is the size the
+    listings would take stored as text, i.e. what the context cost before
+    interning.
+    """
+    seen: Set[int] = set()
+    shared: Dict[int, PageLinks] = {}
+    context_bytes = _deep_size(state.context, seen, shared)
+    own_bytes = context_bytes + _deep_size(state.current_page, seen, shared) + _deep_size(state.move_history, seen, shared)
+
+    listings = [message for message in state.context if isinstance(message, PageMessage) and message.links is not None]
+    return {
+        "game_id": state.game_id,
+        "steps": state.steps,
+        "context_messages": len(state.context),
+        "listings": len(listings),
+        "own_bytes": own_bytes,
+        "context_bytes": context_bytes,
+        "shared_bytes": sum(page_links_size(page) for page in shared.values()),
+        "shared_pages": len(shared),
+        "rendered_bytes": sum(sys.getsizeof(message.content) for message in listings),
+    }
+
+
+def games_memory(states: Iterable[GameState]) -> Dict[str, Any]:
+    """game_memory of each game, largest first, with totals; shared links are counted once in the total."""
+    games = []
+    shared: Dict[int, PageLinks] = {}
+    for state in states:
+        games.append(game_memory(state))
+        for message in state.context:
+            if isinstance(message, PageMessage) and message.links is not None:
+                shared[id(message.links)] = message.links
+    games.sort(key=lambda game: game["own_bytes"], reverse=True)
+    return {
+        "games": games,
+        "total_own_bytes": sum(game["own_bytes"] for game in games),
+        "total_shared_bytes": sum(page_links_size(page) for page in shared.values()),
+        "total_rendered_bytes": sum(game["rendered_bytes"] for game in games),
+    }
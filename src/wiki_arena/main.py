@@ -7,10 +7,10 @@ from typing import Optional
 import typer
 
 from wiki_arena.game import Game
-from wiki_arena.models import GameConfig, GameResult
+from wiki_arena.models import GameConfig, GameResult, LinkFormat
 from wiki_arena.storage import GameStorageService, StorageConfig
 from wiki_arena.tools import get_tools
-from wiki_arena.language_models import create_model
+from wiki_arena.language_models import create_scheduled_model
 from wiki_arena.wikipedia import LiveWikiService
 from wiki_arena.wikipedia.task_selector import get_random_task_async
 
@@ -32,14 +32,41 @@ def main(
         "-s",
         help="The maximum number of steps allowed in the game.",
     ),
+    link_format: LinkFormat = typer.Option(
+        LinkFormat.LIST,
+        "--link-format",
+        help="How page links are shown to the model.",
+    ),
+    history_window: Optional[int] = typer.Option(
+        None,
+        "--history-window",
+        help="Keep only the N most recent page link listings in the model context.",
+    ),
+    compact_history: bool = typer.Option(
+        False,
+        "--compact-history",
+        help="Replace earlier turns with a summary of visited pages in the model context.",
+    ),
 ):
     """
     Run a Wiki Arena game from the command line.
     """
-    asyncio.run(run_game_async(model_key=model_key, max_steps=max_steps))
-
-
-async def run_game_async(model_key: str, max_steps: int):
+    asyncio.run(run_game_async(
+        model_key=model_key,
+        max_steps=max_steps,
+        link_format=link_format,
+        history_window=history_window,
+        compact_history=compact_history,
+    ))
+
+
+async def run_game_async(
+    model_key: str,
+    max_steps: int,
+    link_format: LinkFormat = LinkFormat.LIST,
+    history_window: Optional[int] = None,
+    compact_history: bool = False,
+):
     # Configure unified logging
     from wiki_arena.logging_config import setup_logging
 
@@ -59,7 +86,7 @@ async def run_game_async(model_key: str, max_steps: int):
 
         # 5. Create game configuration from the task
         # Create model using simplified system (no config needed!)
-        model = create_model(model_key)
+        model = create_scheduled_model(model_key)
 
         logger.info(
             f"Using model: {model.model_config.model_name} ({model.model_config.provider})"
@@ -70,6 +97,9 @@ async def run_game_async(model_key: str, max_steps: int):
             target_page_title=task.target_page_title,
             max_steps=max_steps,
             model=model.model_config,  # Use the model config
+            link_format=link_format,
+            history_window=history_window,
+            compact_history=compact_history,
         )
 
         # 5.5. Initialize game storage service
@@ -79,7 +109,7 @@ async def run_game_async(model_key: str, max_steps: int):
 
         # Fetch the start page and tools needed to initialize the game
         start_page = await wiki_service.get_page(game_config.start_page_title)
-        tools = get_tools()
+        tools = get_tools(game_config.link_format)
 
         # 6. Create and start game
         game = Game(
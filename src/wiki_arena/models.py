@@ -1,7 +1,10 @@
-from typing import List, Dict, Any, Optional, Type, Union
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Type, Union
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field, field_validator, ValidationInfo
+from pydantic import (
+    BaseModel, ConfigDict, Field, PrivateAttr, SerializationInfo, SerializerFunctionWrapHandler,
+    field_validator, model_serializer, ValidationInfo,
+)
 
 from wiki_arena.utils.wiki_helpers import get_sanitized_page_title
 
@@ -34,6 +37,21 @@ class ErrorType(Enum):
     APP_NAVIGATION_ERROR = "app_navigation_error"
     APP_UNKNOWN_ERROR = "app_unknown_error"
 
+class LinkFormat(str, Enum):
+    """How the links of a page are rendered into the model context."""
+    LIST = "list"  # Python list repr (original format)
+    NEWLINE = "newline"  # One title per line
+    NUMBERED = "numbered"  # Numbered titles, navigated by index
+
+    def render(self, links: Sequence[str]) -> str:
+        """The links as they appear in a page listing message."""
+        if self == LinkFormat.NEWLINE:
+            return "Here are the available links (one per line):\n" + "\n".join(links)
+        if self == LinkFormat.NUMBERED:
+            numbered = "\n".join(f"{i}. {link}" for i, link in enumerate(links, start=1))
+            return f"Here are the available links. Navigate by passing the link number:\n{numbered}"
+        return f"Here are the available links:\n{list(links)}"
+
 # --- Context Models ---
 
 class ModelCallMetrics(BaseModel):
@@ -46,6 +64,8 @@ class ModelCallMetrics(BaseModel):
     estimated_cost_usd: Optional[float] = Field(0.0, description="Estimated cost for this API call in USD")
     response_time_ms: float = Field(0.0, description="API response time in milliseconds")
     request_timestamp: datetime = Field(default_factory=datetime.now, description="When this API call was made")
+    queue_wait_ms: float = Field(0.0, description="Time spent waiting for rate limit capacity and retry backoff in milliseconds")
+    retries: int = Field(0, description="Number of throttled or timed out attempts retried before this response")
 
 class MessageRole(str, Enum):
     """Represents the role of the author of a message."""
@@ -79,13 +99,103 @@ class UserMessage(BaseModel):
     role: MessageRole = Field(MessageRole.USER, frozen=True)
     content: str
 
+class PageLinks:
+    """
+    The links of one page, immutable and shared by every message listing them
+    (see wiki_arena.link_store, which interns them across games). They are kept
+    as one newline separated string, about the size of a rendered listing,
+    rather than a string object per link.
+    """
+    __slots__ = ("title", "text", "count", "__weakref__")
+
+    def __init__(self, title: str, links: Sequence[str]):
+        self.title = title
+        self.text = "\n".join(links)  # titles never contain newlines
+        self.count = len(links)
+
+    @property
+    def links(self) -> Tuple[str, ...]:
+        return tuple(self.text.split("\n")) if self.count else ()
+
+    def __len__(self) -> int:
+        return self.count
+
+    # Immutable: copies of a game state keep sharing the interned links
+    def __copy__(self) -> "PageLinks":
+        return self
+
+    def __deepcopy__(self, memo) -> "PageLinks":
+        return self
+
+def _page_message_schema(schema: Dict[str, Any], model: Type[BaseModel]) -> None:
+    """Describe a PageMessage as it is written and read: a UserMessage with a page_title."""
+    properties = schema["properties"]
+    schema["properties"] = {
+        "role": properties["role"],
+        "content": {"title": "Content", "type": "string"},
+        "page_title": properties["page_title"],
+    }
+    schema["required"] = ["content", "page_title"]
+
+class PageMessage(BaseModel):
+    """
+    A user message listing the links of the page the model is on.
+
+    Listings made by ContextBuilder.page_message only keep their first line and
+    a reference to the page's interned PageLinks; `content` renders the full
+    text when read, which providers do while formatting a request. Messages
+    created with an explicit content (history stubs, summaries, parsed API
+    output) keep it as is. Either way it serializes, and has the JSON schema
+    of, a UserMessage with a page_title.
+    """
+    model_config = ConfigDict(json_schema_extra=_page_message_schema)
+
+    role: MessageRole = Field(MessageRole.USER, frozen=True)
+    # Explicit contents are passed as `content`, like for any other message
+    text: Optional[str] = Field(None, validation_alias="content", exclude=True, repr=False, description="Explicit content, None when rendered from the page links.")
+    page_title: str = Field(..., description="The page whose links this message lists.")
+    _heading: str = PrivateAttr("")
+    _links: Optional[PageLinks] = PrivateAttr(None)
+    _link_format: LinkFormat = PrivateAttr(LinkFormat.LIST)
+
+    @classmethod
+    def listing(cls, heading: str, links: PageLinks, link_format: LinkFormat) -> "PageMessage":
+        """A listing rendered from shared page links: heading, newline, then the links in link_format."""
+        message = cls(page_title=links.title)
+        message._heading = heading
+        message._links = links
+        message._link_format = LinkFormat(link_format)
+        return message
+
+    @property
+    def links(self) -> Optional[PageLinks]:
+        """The shared links this message renders, None for messages with an explicit content."""
+        return self._links if self.text is None else None
+
+    @property
+    def content(self) -> str:
+        if self.text is not None or self._links is None:
+            return self.text or ""
+        return f"{self._heading}\n{self._link_format.render(self._links.links)}"
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler: SerializerFunctionWrapHandler, info: SerializationInfo):
+        # Not annotated, so the serialization schema stays the model's. The handler applies
+        # include/exclude to the stored fields; content is added in its UserMessage place.
+        fields = handler(self)
+        data = {"role": fields.pop("role")} if "role" in fields else {}
+        if (info.include is None or "content" in info.include) and "content" not in (info.exclude or ()):
+            data["content"] = self.content
+        data.update(fields)
+        return data
+
 class SystemMessage(BaseModel):
     """A system message to set the context for the assistant."""
     role: MessageRole = Field(MessageRole.SYSTEM, frozen=True)
     content: str
 
 # A concrete message in the context.
-ContextMessage = Union[SystemMessage, UserMessage, AssistantMessage, ToolResultMessage]
+ContextMessage = Union[SystemMessage, PageMessage, UserMessage, AssistantMessage, ToolResultMessage]
 
 # --- Data Models ---
 
@@ -147,6 +257,9 @@ class GameConfig(BaseModel):
     max_steps: int = Field(30, description="The maximum number of steps allowed for the game.")
     model: ModelConfig = Field(..., description="Language model configuration.")
     system_prompt_template: Optional[str] = Field(DEFAULT_SYSTEM_PROMPT_TEMPLATE, description="The system prompt for the language model.")
+    link_format: LinkFormat = Field(LinkFormat.LIST, description="How page links are rendered into the model context.")
+    history_window: Optional[int] = Field(None, ge=1, description="Number of most recent page link listings kept in the context (None = keep all).")
+    compact_history: bool = Field(False, description="Replace earlier turns with a summary of visited pages in the model context.")
     # what should be in settings?
     # - system prompt? (or should this be in model settings so we can have multiple models with different system prompts?)
     #  - exact or template. if template should we have an id?
@@ -192,6 +305,11 @@ class GameResult(BaseModel):
     total_estimated_cost_usd: float = Field(0.0, description="Total estimated cost for all API calls in USD")
     total_api_time_ms: float = Field(0.0, description="Total time spent in API calls in milliseconds")
     average_response_time_ms: float = Field(0.0, description="Average API response time in milliseconds")
+    total_queue_wait_ms: float = Field(0.0, description="Total time spent waiting on rate limits and retry backoff in milliseconds")
+    total_cache_creation_input_tokens: int = Field(0, description="Total input tokens written to the provider prompt cache")
+    total_cache_read_input_tokens: int = Field(0, description="Total input tokens read from the provider prompt cache")
+    cache_hit_rate: float = Field(0.0, description="Share of all input tokens served from the prompt cache")
+    cache_read_to_creation_ratio: Optional[float] = Field(None, description="Cache read tokens per cache creation token (None if nothing was written)")
     api_call_count: int = Field(0, description="Number of successful API calls made during the game")
     
     # Add metadata for analysis
@@ -220,6 +338,9 @@ class GameResult(BaseModel):
         total_tokens = 0
         total_estimated_cost_usd = 0.0
         total_api_time_ms = 0.0
+        total_queue_wait_ms = 0.0
+        total_cache_creation_input_tokens = 0
+        total_cache_read_input_tokens = 0
         api_call_count = 0
         
         for message in game_state.context:
@@ -229,9 +350,20 @@ class GameResult(BaseModel):
                 total_tokens += message.metrics.total_tokens
                 total_estimated_cost_usd += message.metrics.estimated_cost_usd
                 total_api_time_ms += message.metrics.response_time_ms
+                total_queue_wait_ms += message.metrics.queue_wait_ms
+                total_cache_creation_input_tokens += message.metrics.cache_creation_input_tokens or 0
+                total_cache_read_input_tokens += message.metrics.cache_read_input_tokens or 0
                 api_call_count += 1
         
         average_response_time_ms = total_api_time_ms / api_call_count if api_call_count > 0 else 0.0
+
+        # input_tokens excludes cached tokens, so all input = uncached + written + read
+        all_input_tokens = total_input_tokens + total_cache_creation_input_tokens + total_cache_read_input_tokens
+        cache_hit_rate = total_cache_read_input_tokens / all_input_tokens if all_input_tokens > 0 else 0.0
+        cache_read_to_creation_ratio = (
+            total_cache_read_input_tokens / total_cache_creation_input_tokens
+            if total_cache_creation_input_tokens > 0 else None
+        )
         
         # Generate analysis metadata
         metadata = {
@@ -263,6 +395,11 @@ class GameResult(BaseModel):
             total_estimated_cost_usd=total_estimated_cost_usd,
             total_api_time_ms=total_api_time_ms,
             average_response_time_ms=average_response_time_ms,
+            total_queue_wait_ms=total_queue_wait_ms,
+            total_cache_creation_input_tokens=total_cache_creation_input_tokens,
+            total_cache_read_input_tokens=total_cache_read_input_tokens,
+            cache_hit_rate=cache_hit_rate,
+            cache_read_to_creation_ratio=cache_read_to_creation_ratio,
             api_call_count=api_call_count,
             metadata=metadata
         )
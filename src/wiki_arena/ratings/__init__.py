@@ -1,4 +1,6 @@
 from .leaderboard_generator import LeaderboardGenerator
 from .bradley_terry import BradleyTerryModel
+from .incremental_leaderboard import IncrementalLeaderboard
+from .bootstrap import BootstrapResult, LeaderboardBootstrap
 
-__all__ = ["LeaderboardGenerator", "BradleyTerryModel"]
\ No newline at end of file
+__all__ = ["LeaderboardGenerator", "BradleyTerryModel", "IncrementalLeaderboard", "BootstrapResult", "LeaderboardBootstrap"]
\ No newline at end of file
@@ -0,0 +1,309 @@
+"""
+Bootstrapped confidence intervals and rank stability for the leaderboard.
+
+Resamples tasks (with replacement) rather than single comparisons, since
+the games on a task are not independent of each other. The outcomes of
+every task are kept once, sparsely, in shared memory; worker processes
+draw task counts, sum the outcomes of the drawn tasks into win matrices
+and fit a stack of them at once.
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from wiki_arena.storage import GameSummary
+from .bradley_terry import BOOTSTRAP_CHUNK_CELLS, BradleyTerryModel
+from .leaderboard_generator import LeaderboardGenerator
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class TaskOutcomes:
+    """
+    Pairwise outcomes of every task, as a sparse (task, winner, loser) tensor.
+
+    Entry k says task `task[k]` gave `value[k]` wins (0.5 for a tie) to the
+    model in row `cell[k] // num_models` against the one in column
+    `cell[k] % num_models`.
+    """
+    models: List[str]
+    num_tasks: int
+    task: np.ndarray   # int64
+    cell: np.ndarray   # int64
+    value: np.ndarray  # float64
+
+    @classmethod
+    def from_games(cls, games_by_task: Dict[str, List[GameSummary]]) -> "TaskOutcomes":
+        index: Dict[str, int] = {}
+        tasks, cells, values = [], [], []
+        task_number = 0
+        for games in games_by_task.values():
+            if len({game.model_name for game in games}) < 2:
+                continue  # nothing to compare
+            models = np.array([index.setdefault(game.model_name, len(index)) for game in games], dtype=np.int64)
+            steps = np.array([game.steps for game in games])
+            first, second = np.triu_indices(len(games), k=1)
+            keep = models[first] != models[second]
+            first, second = first[keep], second[keep]
+            a, b = models[first], models[second]
+            a_steps, b_steps = steps[first], steps[second]
+            tied = a_steps == b_steps
+            winner = np.where(a_steps < b_steps, a, b)
+            loser = np.where(a_steps < b_steps, b, a)
+            # A tie is half a win each way: one entry as winner/loser, a second one reversed
+            rows = np.concatenate([winner, loser[tied]])
+            columns = np.concatenate([loser, winner[tied]])
+            cells.append(np.stack([rows, columns]))
+            values.append(np.concatenate([np.where(tied, 0.5, 1.0), np.full(tied.sum(), 0.5)]))
+            tasks.append(np.full(len(rows), task_number, dtype=np.int64))
+            task_number += 1
+
+        size = len(index)
+        if not cells:
+            empty = np.zeros(0, dtype=np.int64)
+            return cls(list(index), 0, empty, empty, np.zeros(0))
+        rows, columns = np.concatenate(cells, axis=1)
+        return cls(
+            models=list(index),
+            num_tasks=task_number,
+            task=np.concatenate(tasks),
+            cell=rows * size + columns,
+            value=np.concatenate(values),
+        )
+
+    def win_matrices(self, task_counts: np.ndarray) -> np.ndarray:
+        """Win matrices (ties counting half) of task resamples, given how often each task was drawn."""
+        samples = task_counts.shape[0]
+        size = len(self.models)
+        weights = task_counts[:, self.task] * self.value  # (samples, entries)
+        offsets = (np.arange(samples) * size * size)[:, None]
+        matrices = np.bincount(
+            (self.cell[None, :] + offsets).ravel(), weights=weights.ravel(), minlength=samples * size * size
+        )
+        return matrices.reshape(samples, size, size)
+
+@dataclass
+class BootstrapResult:
+    """Ratings, their bootstrap intervals and how stable the ranking is."""
+    models: List[str]
+    ratings: Dict[str, int]
+    intervals: Dict[str, Tuple[int, int]]
+    rank_probabilities: np.ndarray  # [model, rank]: share of the samples with the model (in `models` order) in which it had that rank (0 = best)
+    num_samples: int
+    num_tasks: int
+    workers: int
+    elapsed_s: float  # wall-clock time of the whole bootstrap
+    fit_s: float      # of which fitting the samples
+
+    def rank_probability(self, model: str) -> Dict[int, float]:
+        """Probability of each rank (1 = best) for a model, leaving out ranks it never had."""
+        row = self.rank_probabilities[self.models.index(model)]
+        return {rank + 1: float(p) for rank, p in enumerate(row) if p > 0}
+
+    def rank_interval(self, model: str, confidence: float = 0.95) -> Tuple[int, int]:
+        """The ranks (1 = best) a model falls between in `confidence` of the samples."""
+        cumulative = np.cumsum(self.rank_probabilities[self.models.index(model)])
+        tail = (1 - confidence) / 2
+        return int(np.searchsorted(cumulative, tail, side="right")) + 1, int(np.searchsorted(cumulative, 1 - tail)) + 1
+
+def _fit_resamples(
+    shared: Dict[str, Tuple[str, int, str]],
+    models: List[str],
+    num_tasks: int,
+    num_samples: int,
+    seed: np.random.SeedSequence,
+    initial: np.ndarray,
+    iterations: int,
+    tolerance: float,
+    prior: float,
+    base_elo: int,
+) -> np.ndarray:
+    """Worker: fit `num_samples` task resamples; returns their Elo ratings, shape (num_samples, models)."""
+    with ExitStack() as stack:
+        arrays = {}
+        for name, (shm_name, length, dtype) in shared.items():
+            shm = SharedMemory(name=shm_name)
+            stack.callback(shm.close)
+            arrays[name] = np.ndarray((length,), dtype=dtype, buffer=shm.buf)
+        outcomes = TaskOutcomes(models, num_tasks, arrays["task"], arrays["cell"], arrays["value"])
+        elos = _fit_outcome_resamples(outcomes, num_samples, seed, initial, iterations, tolerance, prior, base_elo)
+        del outcomes, arrays  # release the views before the shared memory is closed
+    return elos
+
+def _fit_outcome_resamples(
+    outcomes: TaskOutcomes,
+    num_samples: int,
+    seed: np.random.SeedSequence,
+    initial: np.ndarray,
+    iterations: int,
+    tolerance: float,
+    prior: float,
+    base_elo: int,
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    size = len(outcomes.models)
+    chunk_size = max(1, BOOTSTRAP_CHUNK_CELLS // max(size * size, len(outcomes.cell)))
+    elos = []
+    for start in range(0, num_samples, chunk_size):
+        samples = min(chunk_size, num_samples - start)
+        task_counts = rng.multinomial(
+            outcomes.num_tasks, np.full(outcomes.num_tasks, 1 / outcomes.num_tasks), size=samples
+        ).astype(float)
+        wins = outcomes.win_matrices(task_counts)
+        strengths, _ = BradleyTerryModel._fit(
+            wins, np.broadcast_to(initial, (samples, size)), iterations, tolerance, prior
+        )
+        sample_elos = base_elo + 400 * np.log10(np.maximum(strengths, 1e-9))
+        # A model none of whose tasks was drawn has no rating in the sample
+        played = (wins.sum(axis=2) + wins.sum(axis=1)) > 0
+        elos.append(np.where(played, sample_elos, np.nan))
+    return np.concatenate(elos)
+
+class LeaderboardBootstrap:
+    """
+    Bootstraps the leaderboard of a LeaderboardGenerator over tasks.
+
+    Each sample draws as many tasks as there are, with replacement, and
+    refits the ratings on the games of the drawn tasks. Samples are fitted
+    by a pool of worker processes (`workers=1` fits them in this process)
+    that read the task outcomes from shared memory instead of receiving a
+    copy each.
+    """
+
+    def __init__(self, generator: LeaderboardGenerator):
+        self.generator = generator
+
+    def run(
+        self,
+        num_samples: int = 1000,
+        confidence: float = 0.95,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        base_elo: int = 1200,
+        iterations: int = 100,
+        tolerance: float = 1e-6,
+        prior: float = 0.0,
+        samples_per_job: Optional[int] = None,
+    ) -> BootstrapResult:
+        """
+        Bootstrap the ratings.
+
+        Args:
+            num_samples: Number of task resamples.
+            confidence: Coverage of the rating intervals.
+            workers: Worker processes (default: one per CPU core).
+            seed: Seed for the resampling; the result does not depend on `workers`.
+            base_elo: The base Elo to use for converting strengths.
+            iterations: Maximum number of updates per fit.
+            tolerance: Convergence tolerance per fit.
+            prior: Virtual ties between opponents (see BradleyTerryModel.calculate_strengths).
+            samples_per_job: Samples per job handed to a worker (default: about four jobs per worker).
+        """
+        start = time.perf_counter()
+        ratings = self.generator.generate_elo_ratings(
+            bt_iterations=iterations, base_elo=base_elo, tolerance=tolerance, prior=prior
+        )
+        outcomes = TaskOutcomes.from_games(self.generator._fetch_and_group_games_by_task())
+        models = outcomes.models
+        workers = max(1, workers or os.cpu_count() or 1)
+
+        if not models or outcomes.num_tasks == 0 or num_samples <= 0:
+            return BootstrapResult(
+                models=models,
+                ratings=ratings,
+                intervals={model: (ratings.get(model, base_elo),) * 2 for model in models},
+                rank_probabilities=np.zeros((len(models), len(models))),
+                num_samples=0,
+                num_tasks=outcomes.num_tasks,
+                workers=workers,
+                elapsed_s=time.perf_counter() - start,
+                fit_s=0.0,
+            )
+
+        initial = np.array([self.generator.strengths.get(model, 1.0) for model in models])
+        samples_per_job = samples_per_job or max(1, math.ceil(num_samples / (workers * 4)))
+        jobs = [min(samples_per_job, num_samples - job) for job in range(0, num_samples, samples_per_job)]
+        seeds = np.random.SeedSequence(seed).spawn(len(jobs))
+        fit_options = dict(initial=initial, iterations=iterations, tolerance=tolerance, prior=prior, base_elo=base_elo)
+
+        fit_start = time.perf_counter()
+        if workers == 1 or len(jobs) == 1:
+            elos = [
+                _fit_outcome_resamples(outcomes, job, job_seed, **fit_options)
+                for job, job_seed in zip(jobs, seeds)
+            ]
+        else:
+            elos = self._fit_in_pool(outcomes, jobs, seeds, workers, fit_options)
+        elos = np.concatenate(elos)
+        fit_s = time.perf_counter() - fit_start
+
+        tail = (1 - confidence) / 2 * 100
+        lower, upper = np.nanpercentile(elos, [tail, 100 - tail], axis=0)
+        # Rank 0 is the highest rating in a sample; models missing from a sample rank after the others
+        # there, and each model's rank probabilities only count the samples it is in
+        ranks = np.argsort(np.argsort(np.where(np.isnan(elos), np.inf, -elos), axis=1, kind="stable"), axis=1)
+        present = ~np.isnan(elos)
+        rank_probabilities = np.zeros((len(models), len(models)))
+        model_rows = np.broadcast_to(np.arange(len(models)), ranks.shape)
+        np.add.at(rank_probabilities, (model_rows[present], ranks[present]), 1.0)
+        rank_probabilities /= np.maximum(present.sum(axis=0), 1)[:, None]
+
+        elapsed_s = time.perf_counter() - start
+        logger.info(
+            f"Bootstrapped {len(elos)} samples of {outcomes.num_tasks} tasks and {len(models)} models "
+            f"in {elapsed_s:.2f}s ({fit_s:.2f}s fitting on {workers} workers)"
+        )
+        return BootstrapResult(
+            models=models,
+            ratings=ratings,
+            intervals={
+                model: (round(float(low)), round(float(high)))
+                for model, low, high in zip(models, lower, upper)
+            },
+            rank_probabilities=rank_probabilities,
+            num_samples=len(elos),
+            num_tasks=outcomes.num_tasks,
+            workers=workers,
+            elapsed_s=elapsed_s,
+            fit_s=fit_s,
+        )
+
+    @staticmethod
+    def _fit_in_pool(
+        outcomes: TaskOutcomes,
+        jobs: Sequence[int],
+        seeds: Sequence[np.random.SeedSequence],
+        workers: int,
+        fit_options: dict,
+    ) -> List[np.ndarray]:
+        with ExitStack() as stack:
+            shared = {}
+            for name in ("task", "cell", "value"):
+                array = getattr(outcomes, name)
+                shm = SharedMemory(create=True, size=max(1, array.nbytes))
+                stack.callback(shm.unlink)
+                stack.callback(shm.close)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+                shared[name] = (shm.name, len(array), array.dtype.str)
+
+            # Workers are spawned rather than forked: the server calling this runs threads
+            pool = stack.enter_context(ProcessPoolExecutor(
+                max_workers=min(workers, len(jobs)), mp_context=multiprocessing.get_context("spawn")
+            ))
+            futures = [
+                pool.submit(
+                    _fit_resamples, shared, outcomes.models, outcomes.num_tasks, job, job_seed, **fit_options
+                )
+                for job, job_seed in zip(jobs, seeds)
+            ]
+            return [future.result() for future in futures]
@@ -1,23 +1,48 @@
 import math
-from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Bootstrap samples are fitted in chunks so that the stacked (samples, models, models) matrices stay below this many cells
+BOOTSTRAP_CHUNK_CELLS = 4_000_000
 
 class BradleyTerryModel:
     """Calculates Bradley-Terry ratings from pairwise game comparisons.
 
-    This calculator expects individual pairwise outcomes to be added. 
-    The logic for generating these pairs from a broader dataset of games 
+    This calculator expects individual pairwise outcomes to be added.
+    The logic for generating these pairs from a broader dataset of games
     (e.g., all games for a specific task) should be handled externally.
+
+    Outcomes are counted in two matrices indexed by model: `wins[i, j]` is how
+    often model i beat model j, `ties[i, j]` (symmetric) how often they tied.
+    Strengths are fitted with minorization-maximization updates on the whole
+    matrix at once.
     """
-    
+
     def __init__(self):
-        self.win_matrix = defaultdict(lambda: defaultdict(float))
-        self.models = set() # Stores unique model keys
+        self._index: Dict[str, int] = {}  # model key -> row/column in the matrices
+        self._wins = np.zeros((0, 0))
+        self._ties = np.zeros((0, 0))
+        self.last_iterations = 0  # updates the last fit ran before converging (or giving up)
+
+    def _model_indices(self, model_keys: Sequence[str]) -> np.ndarray:
+        """Row indices of models, adding the ones not seen yet (growing the matrices as needed)."""
+        for key in model_keys:
+            if key not in self._index:
+                self._index[key] = len(self._index)
+        size = len(self._index)
+        capacity = self._wins.shape[0]
+        if size > capacity:
+            new_capacity = max(size, 2 * capacity, 8)
+            pad = ((0, new_capacity - capacity), (0, new_capacity - capacity))
+            self._wins = np.pad(self._wins, pad)
+            self._ties = np.pad(self._ties, pad)
+        return np.array([self._index[key] for key in model_keys], dtype=np.intp)
 
-    def add_pairwise_comparison(self, 
-                                model_a_key: str, 
-                                model_b_key: str, 
-                                model_a_steps: int, 
+    def add_pairwise_comparison(self,
+                                model_a_key: str,
+                                model_b_key: str,
+                                model_a_steps: int,
                                 model_b_steps: int):
         """Adds a single pairwise comparison result between two models for a task.
 
@@ -32,86 +57,249 @@ class BradleyTerryModel:
             # Cannot compare a model against itself in a meaningful way for BT.
             return
 
-        self.models.add(model_a_key)
-        self.models.add(model_b_key)
-        
+        a, b = self._model_indices([model_a_key, model_b_key])
         if model_a_steps < model_b_steps: # model_a wins
-            self.win_matrix[model_a_key][model_b_key] += 1.0
+            self._wins[a, b] += 1.0
         elif model_b_steps < model_a_steps: # model_b wins
-            self.win_matrix[model_b_key][model_a_key] += 1.0
+            self._wins[b, a] += 1.0
         else: # tie
-            self.win_matrix[model_a_key][model_b_key] += 0.5
-            self.win_matrix[model_b_key][model_a_key] += 0.5
-    
-    def calculate_strengths(self, iterations: int = 20) -> Dict[str, float]:
-        """Calculate Bradley-Terry strengths using an iterative algorithm.
-
-        The calculation is based on the formula:
-            strength_i = W_i / sum(N_ij / (strength_i + strength_j) * strength_i for j!=i)
-        where W_i is total wins for model i, N_ij is total games between i and j.
+            self._ties[a, b] += 1.0
+            self._ties[b, a] += 1.0
+
+    def add_task_results(self, model_keys: Sequence[str], steps: Sequence[int]):
+        """Adds the comparisons between every pair of games played on one task.
+
+        Equivalent to calling `add_pairwise_comparison` for each pair of games
+        (pairs of the same model are skipped), done on arrays.
+
+        Args:
+            model_keys: Model of each game.
+            steps: Steps each game took, in the same order.
+        """
+        if len(model_keys) < 2:
+            return
+        first, second = np.triu_indices(len(model_keys), k=1)
+        steps = np.asarray(steps)
+        self._add_comparisons(self._model_indices(model_keys), first, second, steps)
+
+    def add_game_results(self, model_key: str, steps: int, opponent_keys: Sequence[str], opponent_steps: Sequence[int]):
+        """Adds the comparisons of one new game with the games already played on its task.
+
+        Args:
+            model_key: Model of the new game.
+            steps: Steps the new game took.
+            opponent_keys: Models of the other games on the task.
+            opponent_steps: Steps those games took, in the same order.
+        """
+        if not opponent_keys:
+            return
+        models = self._model_indices([model_key, *opponent_keys])
+        second = np.arange(1, len(models))
+        self._add_comparisons(models, np.zeros_like(second), second, np.asarray([steps, *opponent_steps]))
+
+    def _add_comparisons(self, models: np.ndarray, first: np.ndarray, second: np.ndarray, steps: np.ndarray):
+        """Count the outcomes of the games at positions `first` against those at `second`."""
+        keep = models[first] != models[second]
+        first, second = first[keep], second[keep]
+        a, b = models[first], models[second]
+        a_steps, b_steps = steps[first], steps[second]
+
+        a_wins = a_steps < b_steps
+        b_wins = b_steps < a_steps
+        tied = ~(a_wins | b_wins)
+        np.add.at(self._wins, (a[a_wins], b[a_wins]), 1.0)
+        np.add.at(self._wins, (b[b_wins], a[b_wins]), 1.0)
+        np.add.at(self._ties, (a[tied], b[tied]), 1.0)
+        np.add.at(self._ties, (b[tied], a[tied]), 1.0)
+
+    def copy(self) -> "BradleyTerryModel":
+        """A copy of the counted comparisons, e.g. to fit while more are added to this one."""
+        model = BradleyTerryModel()
+        model._index = dict(self._index)
+        model._wins = self._wins.copy()
+        model._ties = self._ties.copy()
+        return model
+
+    @property
+    def win_matrix(self) -> np.ndarray:
+        """Wins of each model (row) against each other model (column), ties counting half."""
+        size = len(self._index)
+        return self._wins[:size, :size] + 0.5 * self._ties[:size, :size]
+
+    @staticmethod
+    def _components(games: np.ndarray) -> np.ndarray:
+        """Label the connected components of the comparison graphs, shape (samples, models)."""
+        samples, size, _ = games.shape
+        connected = games > 0
+        labels = np.broadcast_to(np.arange(size), (samples, size)).copy()
+        while True:
+            # Each model takes the smallest label among itself and its opponents until nothing changes
+            neighbour_labels = np.where(connected, labels[:, None, :], size).min(axis=2)
+            new_labels = np.minimum(labels, neighbour_labels)
+            if np.array_equal(new_labels, labels):
+                return labels
+            labels = new_labels
+
+    @staticmethod
+    def _normalize(strengths: np.ndarray, labels: np.ndarray) -> np.ndarray:
+        """Scale strengths to an average of 1.0 within each connected component."""
+        samples, size = strengths.shape
+        offsets = (np.arange(samples) * size)[:, None]
+        groups = (labels + offsets).ravel()
+        totals = np.bincount(groups, weights=strengths.ravel(), minlength=samples * size)
+        counts = np.bincount(groups, minlength=samples * size)
+        means = totals[groups].reshape(samples, size) / counts[groups].reshape(samples, size)
+        return np.divide(strengths, means, out=np.ones_like(strengths), where=means > 0)
+
+    @classmethod
+    def _fit(cls,
+             wins: np.ndarray,
+             initial: np.ndarray,
+             iterations: int,
+             tolerance: float,
+             prior: float = 0.0) -> Tuple[np.ndarray, int]:
+        """Fit strengths for a stack of win matrices at once.
+
+        Args:
+            wins: Win matrices (ties counting half), shape (samples, models, models).
+            initial: Starting strengths, shape (samples, models).
+            iterations: Maximum number of updates.
+            tolerance: Stop once no strength changes by more than this (relative).
+            prior: Virtual ties added between every pair of models that played each other.
+
+        Returns:
+            The strengths, shape (samples, models), and the number of updates run.
+        """
+        games = wins + wins.transpose(0, 2, 1)
+        if prior > 0:
+            wins = wins + prior / 2 * (games > 0)
+            games = wins + wins.transpose(0, 2, 1)
+        total_wins = wins.sum(axis=2)
+        labels = cls._components(games)
+        strengths = cls._normalize(np.where(initial > 0, initial, 1.0), labels)
+
+        iteration = 0
+        for iteration in range(1, iterations + 1):
+            # MM update (Hunter 2004): p_i = W_i / sum_j N_ij / (p_i + p_j)
+            pair_strengths = strengths[:, :, None] + strengths[:, None, :]
+            rates = np.divide(games, pair_strengths, out=np.zeros_like(games), where=(games > 0) & (pair_strengths > 0))
+            denominator = rates.sum(axis=2)
+            # A model without games in a sample keeps its strength
+            new_strengths = np.divide(total_wins, denominator, out=strengths.copy(), where=denominator > 0)
+            new_strengths = cls._normalize(new_strengths, labels)
+
+            change = np.abs(new_strengths - strengths) / np.maximum(strengths, 1e-12)
+            strengths = new_strengths
+            if change.max(initial=0.0) < tolerance:
+                break
+        return strengths, iteration
+
+    def calculate_strengths(self,
+                            iterations: int = 100,
+                            tolerance: float = 1e-6,
+                            initial_strengths: Optional[Dict[str, float]] = None,
+                            prior: float = 0.0) -> Dict[str, float]:
+        """Calculate Bradley-Terry strengths with minorization-maximization updates.
+
+        Each update sets
+            strength_i = W_i / sum(N_ij / (strength_i + strength_j) for j != i)
+        for all models at once, where W_i is total wins for model i (ties count
+        half) and N_ij is total games between i and j, until no strength
+        changes by more than `tolerance`. Strengths are normalized to an average of 1.0
+        within each connected group of models; models that never played each
+        other, directly or through common opponents, cannot be compared, so
+        each group is rated around the base Elo on its own.
+
+        Args:
+            iterations: Maximum number of updates.
+            tolerance: Stop early once no strength changes by more than this fraction.
+            initial_strengths: Strengths to start from (e.g. the previous fit);
+                models missing from it start at 1.0.
+            prior: Number of virtual ties added between every pair of models
+                that played each other. Without it, a model that never lost
+                has no finite strength (the fit runs until `iterations`) and
+                one that never won gets 0; a small prior keeps both finite.
         """
-        if not self.models:
+        if not self._index:
             return {}
 
-        strengths = {model: 1.0 for model in self.models}
-        
-        for _ in range(iterations):
-            new_strengths = {}
-            for model_i in self.models:
-                # Total wins for model_i, including 0.5 for ties
-                wins_i = sum(self.win_matrix[model_i].values())
-                
-                expected_denominator_sum = 0
-                for model_j in self.models:
-                    if model_i == model_j:
-                        continue
-                    
-                    # Total games played between model_i and model_j
-                    # N_ij = win_matrix[i][j] (i beat j) + win_matrix[j][i] (j beat i)
-                    # This correctly accounts for ties if they are stored as 0.5 in both directions.
-                    games_ij = self.win_matrix[model_i][model_j] + self.win_matrix[model_j][model_i]
-                    
-                    if games_ij > 0:
-                        # Contribution to expected wins for model_i from games against model_j
-                        # This is games_ij * (strength_i / (strength_i + strength_j))
-                        # The formula for the denominator sum in BT is Sum_j!=i [ N_ij / (strength_i + strength_j) ]
-                        # So, new_strength_i = wins_i / Sum_j!=i [ N_ij / (strength_i + strength_j) ]
-                        # This part was: expected += games * (strengths[model] / (strengths[model] + strengths[opponent]))
-                        # which is the sum of W_ij * P(i beats j).
-                        # Let's re-check standard BT update.
-                        # A common iterative update is:
-                        # p_i = sum_j(wins_ij) / sum_j( (wins_ij + wins_ji) / (p_i + p_j) )
-                        # where p_i is strength of model i. wins_ij is times i beat j.
-
-                        expected_denominator_sum += games_ij / (strengths[model_i] + strengths[model_j])
-                
-                if expected_denominator_sum > 0:
-                    new_strengths[model_i] = wins_i / expected_denominator_sum
-                else:
-                    # If a model has no games or only games against itself (filtered out),
-                    # or if all opponents have zero strength and it also has zero strength
-                    # leading to division by zero in expected_denominator_sum.
-                    # Assign a base strength. If it has wins, it might be non-zero.
-                    # If wins_i is also 0, it remains 1.0 (or could be lower if preferred).
-                    new_strengths[model_i] = strengths[model_i] if wins_i == 0 else 1.0
-
-
-            if not new_strengths: # Should not happen if self.models is not empty
-                return strengths
-
-            # Normalize strengths to have an average of 1.0 (or geometric mean of 1.0)
-            # Using arithmetic mean for normalization:
-            total_strength_sum = sum(new_strengths.values())
-            num_models = len(new_strengths)
-            if num_models > 0 and total_strength_sum > 0:
-                avg_strength = total_strength_sum / num_models
-                strengths = {m: s / avg_strength for m, s in new_strengths.items()}
-            else: # All strengths might be zero if no games or wins
-                strengths = new_strengths
-        
-        return strengths
-    
-    def strengths_to_elo(self, strengths: Dict[str, float], 
+        keys = self.get_models()
+        initial = np.ones(len(keys))
+        if initial_strengths:
+            initial = np.array([initial_strengths.get(key, 1.0) for key in keys], dtype=float)
+        strengths, self.last_iterations = self._fit(self.win_matrix[None], initial[None], iterations, tolerance, prior)
+        return dict(zip(keys, strengths[0].tolist()))
+
+    def bootstrap_elo_intervals(self,
+                                num_samples: int = 1000,
+                                confidence: float = 0.95,
+                                base_elo: int = 1200,
+                                iterations: int = 100,
+                                tolerance: float = 1e-6,
+                                initial_strengths: Optional[Dict[str, float]] = None,
+                                prior: float = 0.0,
+                                seed: Optional[int] = None) -> Dict[str, Tuple[int, int]]:
+        """Bootstrap confidence intervals of the Elo ratings.
+
+        Each sample redraws as many comparisons as were added, with
+        replacement, from the observed outcomes (wins of each model over each
+        other and ties of each pair), and all samples are fitted together.
+
+        Args:
+            num_samples: Number of bootstrap samples.
+            confidence: Coverage of the intervals.
+            base_elo: The base Elo to use for converting strengths.
+            iterations: Maximum number of updates per fit.
+            tolerance: Convergence tolerance per fit.
+            initial_strengths: Strengths to start every sample from; the
+                point estimate makes the fits converge in a few updates.
+            prior: Virtual ties between opponents, as in `calculate_strengths`.
+            seed: Seed for the resampling.
+
+        Returns:
+            A dictionary mapping model keys to (lower, upper) Elo bounds.
+        """
+        if not self._index:
+            return {}
+
+        keys = self.get_models()
+        size = len(keys)
+        wins = self._wins[:size, :size]
+        upper = np.triu_indices(size, k=1)
+        outcomes = np.concatenate([wins.ravel(), self._ties[:size, :size][upper]])
+        total = int(round(outcomes.sum()))
+        if total == 0:
+            return {key: (base_elo, base_elo) for key in keys}
+
+        rng = np.random.default_rng(seed)
+        initial = np.ones(size)
+        if initial_strengths:
+            initial = np.array([initial_strengths.get(key, 1.0) for key in keys], dtype=float)
+        chunk_size = max(1, BOOTSTRAP_CHUNK_CELLS // (size * size))
+
+        elos = []
+        for start in range(0, num_samples, chunk_size):
+            samples = min(chunk_size, num_samples - start)
+            counts = rng.multinomial(total, outcomes / outcomes.sum(), size=samples).astype(float)
+            sample_wins = counts[:, :size * size].reshape(samples, size, size)
+            sample_ties = np.zeros_like(sample_wins)
+            sample_ties[:, upper[0], upper[1]] = counts[:, size * size:]
+            sample_wins += 0.5 * (sample_ties + sample_ties.transpose(0, 2, 1))
+
+            strengths, _ = self._fit(
+                sample_wins, np.broadcast_to(initial, (samples, size)), iterations, tolerance, prior
+            )
+            elos.append(base_elo + 400 * np.log10(np.maximum(strengths, 1e-9)))
+
+        elos = np.concatenate(elos)
+        tail = (1 - confidence) / 2 * 100
+        lower, upper_bound = np.percentile(elos, [tail, 100 - tail], axis=0)
+        return {
+            key: (round(float(low)), round(float(high)))
+            for key, low, high in zip(keys, lower, upper_bound)
+        }
+
+    def strengths_to_elo(self, strengths: Dict[str, float],
                          base_elo: int = 1200) -> Dict[str, int]:
         """Convert Bradley-Terry strengths to Elo ratings.
         A common formula is Elo = BaseElo + 400 * log10(strength).
@@ -132,8 +320,13 @@ class BradleyTerryModel:
 
     def get_win_matrix_readable(self) -> Dict[str, Dict[str, float]]:
         """Returns a copy of the win matrix for inspection."""
-        return {model: dict(opponents) for model, opponents in self.win_matrix.items()}
+        keys = self.get_models()
+        matrix = self.win_matrix
+        return {
+            model: {keys[j]: float(matrix[i, j]) for j in np.flatnonzero(matrix[i])}
+            for i, model in enumerate(keys)
+        }
 
     def get_models(self) -> List[str]:
         """Returns a list of unique model keys that have participated."""
-        return list(self.models)
\ No newline at end of file
+        return list(self._index)
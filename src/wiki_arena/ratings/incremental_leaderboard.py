@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from wiki_arena.storage import GameSummary
+from .bradley_terry import BradleyTerryModel
+
+logger = logging.getLogger(__name__)
+
+class IncrementalLeaderboard:
+    """
+    Leaderboard ratings kept up to date one game at a time.
+
+    Games are grouped by task as they arrive, and each new game is compared
+    only with the games already played on its task, so the win matrix is
+    never rebuilt. `refresh` refits the strengths starting from the previous
+    ones, which takes a few iterations when only a few games were added.
+    The ratings are the same as LeaderboardGenerator's for the same games.
+
+    Adding games and refreshing may happen on different threads: the fit
+    runs on a copy of the win matrix, so games keep being added meanwhile.
+    """
+
+    def __init__(
+        self,
+        base_elo: int = 1200,
+        iterations: int = 100,
+        tolerance: float = 1e-6,
+        prior: float = 0.0,
+    ):
+        self.base_elo = base_elo
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.prior = prior
+
+        self.bt_model = BradleyTerryModel()
+        self._lock = threading.Lock()
+        self._game_ids = set()
+        self._tasks: Dict[str, List[Tuple[str, int]]] = defaultdict(list)  # task_id -> (model_name, steps) per game
+        self._games_per_model: Dict[str, int] = defaultdict(int)
+        self._version = 0  # games added so far; a refresh is current if it saw them all
+        self._refreshed_version = 0
+
+        self.strengths: Dict[str, float] = {}
+        self.ratings: Dict[str, int] = {}
+        self.updated_at: Optional[datetime] = None
+        self.refresh_count = 0
+        self.last_iterations = 0
+        self.last_refresh_ms: Optional[float] = None
+
+    def add_game(self, game: GameSummary) -> bool:
+        """Add a finished game's comparisons with the other games on its task; False if it was already added."""
+        with self._lock:
+            if game.game_id in self._game_ids:
+                return False
+            self._game_ids.add(game.game_id)
+            opponents = self._tasks[game.task_id]
+            self.bt_model.add_game_results(
+                game.model_name,
+                game.steps,
+                [model_name for model_name, _ in opponents],
+                [steps for _, steps in opponents],
+            )
+            opponents.append((game.model_name, game.steps))
+            self._games_per_model[game.model_name] += 1
+            self._version += 1
+            return True
+
+    def add_games(self, games: Iterable[GameSummary]) -> int:
+        """Add several games; returns how many were new."""
+        return sum(self.add_game(game) for game in games)
+
+    @property
+    def stale(self) -> bool:
+        """Whether games were added since the last refresh."""
+        return self._version != self._refreshed_version
+
+    def refresh(self) -> Dict[str, int]:
+        """Refit the strengths if games were added, starting from the previous ones; returns the ratings."""
+        with self._lock:
+            if not self.stale:
+                return self.ratings
+            version = self._version
+            model = self.bt_model.copy()
+
+        start = time.perf_counter()
+        strengths = model.calculate_strengths(
+            iterations=self.iterations,
+            tolerance=self.tolerance,
+            initial_strengths=self.strengths,
+            prior=self.prior,
+        )
+        ratings = model.strengths_to_elo(strengths, base_elo=self.base_elo)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self.strengths = strengths
+            self.ratings = ratings
+            self._refreshed_version = version
+            self.updated_at = datetime.now()
+            self.refresh_count += 1
+            self.last_iterations = model.last_iterations
+            self.last_refresh_ms = elapsed_ms
+        logger.debug(f"Refreshed {len(ratings)} ratings in {elapsed_ms:.1f}ms ({model.last_iterations} iterations)")
+        return ratings
+
+    def get_leaderboard(self) -> List[Dict[str, Any]]:
+        """The ratings of the last refresh, best first."""
+        ranked = sorted(self.ratings.items(), key=lambda item: item[1], reverse=True)
+        return [
+            {
+                "rank": rank,
+                "model_name": model_name,
+                "elo": elo,
+                "games": self._games_per_model.get(model_name, 0),
+            }
+            for rank, (model_name, elo) in enumerate(ranked, start=1)
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "games": len(self._game_ids),
+            "tasks": len(self._tasks),
+            "models": len(self._games_per_model),
+            "stale": self.stale,
+            "refreshes": self.refresh_count,
+            "last_iterations": self.last_iterations,
+            "last_refresh_ms": round(self.last_refresh_ms, 2) if self.last_refresh_ms is not None else None,
+        }
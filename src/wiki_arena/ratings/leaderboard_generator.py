@@ -1,75 +1,63 @@
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
 
-from wiki_arena.storage import GameRepository
-from wiki_arena.models import GameResult, Task
+from wiki_arena.storage import GameRepository, GameSummary
+from wiki_arena.storage.columnar import ColumnarGames
 from .bradley_terry import BradleyTerryModel
 
 class LeaderboardGenerator:
     """Orchestrates the generation of leaderboard ratings from game results."""
 
-    def __init__(self, game_repository: GameRepository):
+    def __init__(self, game_repository: Union[GameRepository, ColumnarGames]):
         """
         Initializes the LeaderboardGenerator.
 
         Args:
-            game_repository: An instance of GameRepository to fetch game data.
+            game_repository: Where to read games from: a GameRepository, or
+                ColumnarGames to rank from a columnar export.
         """
         self.game_repository = game_repository
         # Initialize bt_model here or in generate_elo_ratings for fresh run
         self.bt_model = BradleyTerryModel()
+        # Strengths of the last run; the next run starts from them
+        self.strengths: Dict[str, float] = {}
+        self.prior = 0.0
 
-    def _fetch_and_group_games_by_task(self) -> Dict[str, List[GameResult]]:
-        """Fetches all games and groups them by task ID."""
-        all_games = self.game_repository.get_all_games()
-        games_by_task: Dict[str, List[GameResult]] = defaultdict(list)
+    def _fetch_and_group_games_by_task(self) -> Dict[str, List[GameSummary]]:
+        """Fetches all game summaries (model, steps and task are all the ratings need) and groups them by task ID."""
+        games_by_task: Dict[str, List[GameSummary]] = defaultdict(list)
 
-        for game in all_games:
-            # Create a Task object from the game's config to get its canonical task_id
-            task_obj = Task(
-                start_page_title=game.config.start_page_title,
-                target_page_title=game.config.target_page_title
-            )
-            task_id = task_obj.task_id # Uses get_sanitized_page_title internally
-            games_by_task[task_id].append(game)
+        for game in self.game_repository.get_summaries():
+            games_by_task[game.task_id].append(game)
         
         return games_by_task
 
-    def _populate_bradley_terry_comparisons(self, games_by_task: Dict[str, List[GameResult]]):
+    def _populate_bradley_terry_comparisons(self, games_by_task: Dict[str, List[GameSummary]]):
         """Populates the BradleyTerryModel with pairwise comparisons from grouped games."""
         for task_id, games_on_task in games_by_task.items():
-            # Ensure there are at least two games to make a pair for comparison
-            if len(games_on_task) < 2:
-                continue
-
-            for i in range(len(games_on_task)):
-                for j in range(i + 1, len(games_on_task)):
-                    game_a = games_on_task[i]
-                    game_b = games_on_task[j]
-                    
-                    model_a_key = game_a.config.model.model_name
-                    model_b_key = game_b.config.model.model_name
-                    
-                    # Avoid comparing a model against itself if the same model_key 
-                    # appears multiple times for a task due to multiple runs being stored.
-                    if model_a_key == model_b_key:
-                        continue
-                        
-                    self.bt_model.add_pairwise_comparison(
-                        model_a_key=model_a_key,
-                        model_b_key=model_b_key,
-                        model_a_steps=game_a.steps,
-                        model_b_steps=game_b.steps
-                    )
+            # Every pair of games on the task is compared; pairs of the same model
+            # (multiple runs stored for a task) are skipped by the model.
+            self.bt_model.add_task_results(
+                model_keys=[game.model_name for game in games_on_task],
+                steps=[game.steps for game in games_on_task],
+            )
 
-    def generate_elo_ratings(self, bt_iterations: int = 20, base_elo: int = 1200) -> Dict[str, int]:
+    def generate_elo_ratings(self,
+                             bt_iterations: int = 100,
+                             base_elo: int = 1200,
+                             tolerance: float = 1e-6,
+                             prior: float = 0.0) -> Dict[str, int]:
         """
         Generates Elo ratings for all models based on the game results.
-        This method re-initializes the BradleyTerryModel for a fresh calculation run.
+        This method re-initializes the BradleyTerryModel for a fresh calculation run,
+        starting the fit from the strengths of the previous run.
 
         Args:
-            bt_iterations: Number of iterations for the Bradley-Terry strength calculation.
+            bt_iterations: Maximum number of iterations for the Bradley-Terry strength calculation.
             base_elo: The base Elo to use for converting strengths.
+            tolerance: Convergence tolerance for the strength calculation.
+            prior: Virtual ties between every pair of models that played each other
+                (see BradleyTerryModel.calculate_strengths).
 
         Returns:
             A dictionary mapping model keys to their Elo ratings.
@@ -80,11 +68,38 @@ class LeaderboardGenerator:
         games_by_task = self._fetch_and_group_games_by_task()
         self._populate_bradley_terry_comparisons(games_by_task)
         
-        strengths = self.bt_model.calculate_strengths(iterations=bt_iterations)
+        strengths = self.bt_model.calculate_strengths(
+            iterations=bt_iterations,
+            tolerance=tolerance,
+            initial_strengths=self.strengths,
+            prior=prior,
+        )
+        self.strengths = strengths
+        self.prior = prior
         elo_ratings = self.bt_model.strengths_to_elo(strengths, base_elo=base_elo)
         
         return elo_ratings
 
+    def generate_confidence_intervals(self,
+                                      num_samples: int = 1000,
+                                      confidence: float = 0.95,
+                                      base_elo: int = 1200,
+                                      seed: Optional[int] = None) -> Dict[str, Tuple[int, int]]:
+        """
+        Bootstrap confidence intervals for the ratings of the last generate_elo_ratings call.
+
+        Returns:
+            A dictionary mapping model keys to (lower, upper) Elo bounds.
+        """
+        return self.bt_model.bootstrap_elo_intervals(
+            num_samples=num_samples,
+            confidence=confidence,
+            base_elo=base_elo,
+            initial_strengths=self.strengths,
+            prior=self.prior,
+            seed=seed,
+        )
+
     def get_current_win_matrix(self) -> Dict[str, Dict[str, float]]:
         """
         Returns the win matrix from the BradleyTerryModel instance.
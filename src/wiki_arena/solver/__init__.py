@@ -3,6 +3,8 @@
 from .static_db import StaticSolverDB, static_solver_db
 from .solver import WikiTaskSolver, wiki_task_solver
 from .models import SolverRequest, SolverResponse
+from .task_corpus import TaskCorpus, TaskCorpusGenerator
+from .path_quality import GameQuality, MoveQuality, PathQualityAnalyzer, PathQualityReport
 
 __all__ = [
     "StaticSolverDB", 
@@ -10,5 +12,11 @@ __all__ = [
     "WikiTaskSolver",
     "wiki_task_solver", 
     "SolverRequest",
-    "SolverResponse"
+    "SolverResponse",
+    "TaskCorpus",
+    "TaskCorpusGenerator",
+    "PathQualityAnalyzer",
+    "PathQualityReport",
+    "MoveQuality",
+    "GameQuality",
 ] 
\ No newline at end of file
@@ -0,0 +1,284 @@
+"""
+Path quality metrics for stored games, computed against the static wiki graph.
+
+Solving every move of every game with the bidirectional solver would cost one
+search per visited page. Instead games are grouped by target page and a single
+reverse BFS (following incoming links, one batched query per level) gives the
+distance to the target of every page visited in all of that target's games.
+
+Each move gets a distance delta: distance after minus distance before, so -1
+is an optimal move, 0 a sideways move and positive values lose ground.
+"""
+
+import csv
+import logging
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from wiki_arena.models import GameResult, GameStatus, Task
+
+from .static_db import StaticSolverDB
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MoveQuality:
+    """Distance to the target before and after one move (None if unknown or unreachable)."""
+    game_id: str
+    task_id: str
+    model_name: str
+    step: int
+    from_page_title: str
+    to_page_title: str
+    distance_before: Optional[int]
+    distance_after: Optional[int]
+
+    @property
+    def distance_delta(self) -> Optional[int]:
+        if self.distance_before is None or self.distance_after is None:
+            return None
+        return self.distance_after - self.distance_before
+
+    @property
+    def optimal(self) -> bool:
+        return self.distance_delta == -1
+
+    def to_row(self) -> Dict:
+        return {**asdict(self), "distance_delta": self.distance_delta, "optimal": self.optimal}
+
+
+@dataclass
+class GameQuality:
+    """Per game aggregates of its move distances."""
+    game_id: str
+    task_id: str
+    model_name: str
+    status: str
+    steps: int
+    start_distance: Optional[int]
+    final_distance: Optional[int]
+    moves_scored: int
+    optimal_moves: int
+    regressions: int
+
+    @property
+    def optimal_move_rate(self) -> Optional[float]:
+        return self.optimal_moves / self.moves_scored if self.moves_scored else None
+
+    @property
+    def excess_steps(self) -> Optional[int]:
+        """Steps beyond the shortest path, for won games."""
+        if self.status != GameStatus.WON.value or self.start_distance is None:
+            return None
+        return self.steps - self.start_distance
+
+    def to_row(self) -> Dict:
+        return {**asdict(self), "optimal_move_rate": self.optimal_move_rate, "excess_steps": self.excess_steps}
+
+
+@dataclass
+class PathQualityReport:
+    moves: List[MoveQuality]
+    games: List[GameQuality]
+    targets: int
+    pages_visited_by_bfs: int
+    elapsed_s: float
+
+    def model_summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean distance delta and optimal move rate per model, over scored moves."""
+        deltas: Dict[str, List[int]] = defaultdict(list)
+        for move in self.moves:
+            if move.distance_delta is not None:
+                deltas[move.model_name].append(move.distance_delta)
+        return {
+            model_name: {
+                "moves": len(values),
+                "mean_distance_delta": sum(values) / len(values),
+                "optimal_move_rate": sum(1 for value in values if value == -1) / len(values),
+            }
+            for model_name, values in sorted(deltas.items())
+        }
+
+    def write_csv(self, moves_path: Path, games_path: Optional[Path] = None):
+        """Write the per move rows (and optionally the per game rows) as CSV."""
+        _write_rows(moves_path, MoveQuality, ["distance_delta", "optimal"], [move.to_row() for move in self.moves])
+        if games_path is not None:
+            _write_rows(
+                games_path, GameQuality, ["optimal_move_rate", "excess_steps"], [game.to_row() for game in self.games]
+            )
+
+
+def _write_rows(path: Path, row_type, derived: List[str], rows: List[Dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(row_type)] + derived)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class PathQualityAnalyzer:
+    """
+    Scores the moves of stored games by their distance to the target.
+
+    One reverse BFS runs per distinct target and stops as soon as every page
+    visited in that target's games has a distance (or at max_distance), so
+    targets whose games stay near them are cheap. Pages the BFS did not reach
+    (unreachable, or missing from the graph) get a distance of None.
+    """
+
+    def __init__(self, db: Optional[StaticSolverDB] = None, max_distance: Optional[int] = None):
+        if db is None:
+            from .static_db import static_solver_db
+            db = static_solver_db
+        self.db = db
+        self.max_distance = max_distance
+        self._page_ids: Dict[str, Optional[int]] = {}
+
+    async def _resolve(self, titles: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Page ids for titles (following redirects), cached across targets; one batched lookup for the new ones."""
+        uncached = [title for title in titles if title not in self._page_ids]
+        if uncached:
+            self._page_ids.update(await self.db.batch_get_page_ids(uncached))
+        return self._page_ids
+
+    async def distances_to(self, target_id: int, needed: Optional[Set[int]] = None) -> Dict[int, int]:
+        """
+        Reverse BFS from a target over incoming links.
+
+        Args:
+            target_id: Page id of the target.
+            needed: Stop once all of these page ids have a distance (default: explore everything reachable).
+
+        Returns:
+            Distance to the target for every page reached.
+        """
+        distances = {target_id: 0}
+        remaining = set(needed or ()) - {target_id}
+        frontier = [target_id]
+        level = 0
+        while frontier and (needed is None or remaining):
+            if self.max_distance is not None and level >= self.max_distance:
+                break
+            level += 1
+            incoming = await self.db.batch_get_incoming_links(frontier)
+            frontier = []
+            for sources in incoming.values():
+                for source_id in sources:
+                    if source_id not in distances:
+                        distances[source_id] = level
+                        frontier.append(source_id)
+                        remaining.discard(source_id)
+        return distances
+
+    async def analyze(self, games: Iterable[GameResult]) -> PathQualityReport:
+        """
+        Score every successful move of the games, grouped by target.
+
+        Games are consumed once and only their moves are kept, so `games` can
+        be a stream such as GameRepository.iter_games().
+        """
+        start = time.perf_counter()
+        games_by_target: Dict[str, List[_GameMoves]] = defaultdict(list)
+        for game in games:
+            games_by_target[game.config.target_page_title].append(_GameMoves.from_game(game))
+
+        moves: List[MoveQuality] = []
+        game_rows: List[GameQuality] = []
+        pages_visited = 0
+        for target_title, target_games in games_by_target.items():
+            titles = {target_title}
+            for game in target_games:
+                titles.update((game.start_page_title, game.final_page_title))
+                for _, from_page_title, to_page_title in game.moves:
+                    titles.update((from_page_title, to_page_title))
+            page_ids = await self._resolve(titles)
+
+            target_id = page_ids[target_title]
+            if target_id is None:
+                logger.warning(f"Target '{target_title}' is not in the graph; its {len(target_games)} games get no distances")
+                distances = {}
+            else:
+                needed = {page_ids[title] for title in titles if page_ids[title] is not None}
+                distances = await self.distances_to(target_id, needed)
+                pages_visited += len(distances)
+
+            def distance(title: str) -> Optional[int]:
+                page_id = page_ids.get(title)
+                return distances.get(page_id) if page_id is not None else None
+
+            for game in target_games:
+                game_moves = [
+                    MoveQuality(
+                        game_id=game.game_id,
+                        task_id=game.task_id,
+                        model_name=game.model_name,
+                        step=step,
+                        from_page_title=from_page_title,
+                        to_page_title=to_page_title,
+                        distance_before=distance(from_page_title),
+                        distance_after=distance(to_page_title),
+                    )
+                    for step, from_page_title, to_page_title in game.moves
+                ]
+                moves.extend(game_moves)
+                game_rows.append(_game_quality(game, game_moves, distance))
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Scored {len(moves):,} moves of {len(game_rows):,} games against {len(games_by_target)} targets "
+            f"({pages_visited:,} pages reached) in {elapsed:.1f}s"
+        )
+        return PathQualityReport(
+            moves=moves,
+            games=game_rows,
+            targets=len(games_by_target),
+            pages_visited_by_bfs=pages_visited,
+            elapsed_s=elapsed,
+        )
+
+
+@dataclass
+class _GameMoves:
+    """What scoring needs from a game: its successful moves and a few fields."""
+    game_id: str
+    task_id: str
+    model_name: str
+    status: str
+    steps: int
+    start_page_title: str
+    final_page_title: str
+    moves: List[Tuple[int, str, str]]  # step, from page, to page
+
+    @classmethod
+    def from_game(cls, game: GameResult) -> "_GameMoves":
+        task = Task(start_page_title=game.config.start_page_title, target_page_title=game.config.target_page_title)
+        return cls(
+            game_id=game.game_id,
+            task_id=task.task_id,
+            model_name=game.config.model.model_name,
+            status=game.status.value,
+            steps=game.steps,
+            start_page_title=game.config.start_page_title,
+            final_page_title=game.path_taken[-1] if game.path_taken else game.config.start_page_title,
+            moves=[(move.step, move.from_page_title, move.to_page_title) for move in game.moves if move.to_page_title],
+        )
+
+
+def _game_quality(game: _GameMoves, game_moves: List[MoveQuality], distance) -> GameQuality:
+    scored = [move.distance_delta for move in game_moves if move.distance_delta is not None]
+    return GameQuality(
+        game_id=game.game_id,
+        task_id=game.task_id,
+        model_name=game.model_name,
+        status=game.status,
+        steps=game.steps,
+        start_distance=distance(game.start_page_title),
+        final_distance=distance(game.final_page_title),
+        moves_scored=len(scored),
+        optimal_moves=sum(1 for delta in scored if delta == -1),
+        regressions=sum(1 for delta in scored if delta > 0),
+    )
@@ -11,6 +11,8 @@ import logging
 from typing import List, Dict, Set, Optional, Tuple
 from collections import deque
 
+from wiki_arena.telemetry import spans
+
 from .static_db import StaticSolverDB
 from .models import SolverResponse
 
@@ -230,6 +232,7 @@ class WikiTaskSolver:
             all_paths_as_titles.append(title_path)
         
         title_conversion_time = time.perf_counter() - title_conversion_start_time
+        spans.observe("solver.title_conversion", title_conversion_time)
         total_page_ids_converted = len(all_unique_page_ids)
         logger.debug(
             f"Title conversion: {total_page_ids_converted} unique page IDs converted "
@@ -240,6 +243,7 @@ class WikiTaskSolver:
              raise ValueError(f"Path IDs found but title conversion failed for '{start_page}' -> '{target_page}'.")
 
         actual_computation_time_ms = (time.time() - actual_computation_start_time) * 1000
+        spans.observe("solver.solve", actual_computation_time_ms / 1000)
         
         # Log comprehensive solve summary
         logger.info(
@@ -325,6 +329,7 @@ class WikiTaskSolver:
 
         bfs_level = 0
         while not final_paths and unvisited_forward and unvisited_backward:
+            level_start_time = time.perf_counter()
             
             # Choose direction based on frontier sizes vs expensive database queries
             direction_timing_start = time.perf_counter()
@@ -386,6 +391,7 @@ class WikiTaskSolver:
                 db_fetch_tasks = [self._get_outgoing_links(src_id) for src_id in source_page_ids_to_expand]
                 results_for_all_sources = await asyncio.gather(*db_fetch_tasks)
                 db_fetch_time = time.perf_counter() - db_start_time
+                spans.observe("solver.db_fetch", db_fetch_time, direction="forward")
                 
                 # Calculate metrics for this expansion
                 total_links_fetched = sum(len(links) for links in results_for_all_sources)
@@ -428,6 +434,7 @@ class WikiTaskSolver:
                 tasks = [self._get_incoming_links(target_id_val) for target_id_val in target_page_ids_to_expand]
                 results_for_all_targets = await asyncio.gather(*tasks)
                 db_fetch_time = time.perf_counter() - db_start_time
+                spans.observe("solver.db_fetch", db_fetch_time, direction="backward")
                 
                 # Calculate metrics for backward expansion
                 total_links_fetched = sum(len(links) for links in results_for_all_targets)
@@ -450,6 +457,11 @@ class WikiTaskSolver:
                 # Log expansion results for backward direction
                 logger.debug(f"  Backward expansion result: {len(newly_visited_this_level)} new pages discovered")
 
+            spans.observe(
+                "solver.bfs_level", time.perf_counter() - level_start_time,
+                direction="forward" if expand_forward else "backward",
+            )
+
             # Check for path completion (intersection)
             intersection_nodes = []
             if expand_forward:
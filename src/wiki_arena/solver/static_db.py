@@ -5,6 +5,8 @@ This service is used purely for analytical purposes and graph analysis.
 
 import sqlite3
 import logging
+import string
+from array import array
 from typing import List, Set, Optional, Tuple, Dict, Any
 from pathlib import Path
 import asyncio
@@ -22,6 +24,12 @@ from wiki_arena.utils.wiki_helpers import (
 
 logger = logging.getLogger(__name__)
 
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def _nocase(title: str) -> str:
+    """The key SQLite's NOCASE collation compares titles by."""
+    return title.translate(_ASCII_LOWER)
+
 class StaticSolverDB:
     """
     The sole gateway to the hyper-optimized wiki_graph.sqlite database.
@@ -184,7 +192,27 @@ class StaticSolverDB:
                 if row and row[0]:
                     return [int(source_id) for source_id in row[0].split('|') if source_id]
                 return []
-                
+
+    async def batch_get_incoming_links(self, page_ids: List[int]) -> Dict[int, List[int]]:
+        """Get the incoming links of many pages at once, one query per max_variables ids.
+        Pages without incoming links (or missing from the links table) are left out.
+        """
+        results: Dict[int, List[int]] = {}
+        if not page_ids:
+            return results
+
+        chunk_size = self.max_variables
+        async with aiosqlite.connect(self.db_path) as db:
+            for i in range(0, len(page_ids), chunk_size):
+                chunk = page_ids[i:i + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                query = f"SELECT id, incoming_links FROM links WHERE id IN ({placeholders})"
+                async with db.execute(query, chunk) as cursor:
+                    async for page_id, incoming_links in cursor:
+                        if incoming_links:
+                            results[page_id] = [int(source_id) for source_id in incoming_links.split('|') if source_id]
+        return results
+
     async def batch_get_page_titles(self, page_ids: List[int]) -> List[str]:
         """Get titles for multiple page IDs. Titles are returned in the same order as page_ids.
         Missing IDs will result in None at the corresponding position.
@@ -235,7 +263,10 @@ class StaticSolverDB:
         return results
     
     async def batch_get_page_ids(self, titles: List[str]) -> Dict[str, Optional[int]]:
-        """Get page IDs for multiple titles. Returns a dict mapping original title to page_id or None."""
+        """Get page IDs for multiple titles. Returns a dict mapping original title to page_id or None.
+        Titles resolve as with get_page_id (namespace 0), with one query per max_variables titles
+        and one for the redirects. Invalid titles map to None instead of raising.
+        """
         if not titles:
             return {}
         
@@ -244,9 +275,49 @@ class StaticSolverDB:
     async def _batch_get_page_ids_impl(self, titles: List[str]) -> Dict[str, Optional[int]]:
         """Internal implementation of batch_get_page_ids without caching."""
         results: Dict[str, Optional[int]] = {title: None for title in titles}
-        for title in titles:
-            page_id = await self.get_page_id(title)
-            results[title] = page_id
+        sanitized_titles: Dict[str, str] = {}
+        for title in results:
+            try:
+                validate_page_title(title)
+            except ValueError as e:
+                logger.warning(f"Invalid title {title!r}: {e}")
+                continue
+            sanitized_titles[title] = get_sanitized_page_title(title)
+
+        # Matching rows grouped like `title = ? COLLATE NOCASE` compares (NOCASE only folds ASCII)
+        keys = sorted({_nocase(sanitized) for sanitized in sanitized_titles.values()})
+        rows_by_key: Dict[str, List[Tuple[int, str, int]]] = {}
+        redirects: Dict[int, int] = {}
+        chunk_size = self.max_variables - 1
+        async with aiosqlite.connect(self.db_path) as db:
+            for i in range(0, len(keys), chunk_size):
+                chunk = keys[i:i + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                query = f"SELECT id, title, is_redirect FROM pages WHERE title COLLATE NOCASE IN ({placeholders}) AND namespace = ?"
+                async with db.execute(query, [*chunk, 0]) as cursor:
+                    async for row in cursor:
+                        rows_by_key.setdefault(_nocase(row[1]), []).append(row)
+
+            redirect_ids = sorted({rows[0][0] for rows in rows_by_key.values() if all(row[2] for row in rows)})
+            for i in range(0, len(redirect_ids), self.max_variables):
+                chunk = redirect_ids[i:i + self.max_variables]
+                placeholders = ",".join("?" * len(chunk))
+                query = f"SELECT source_id, target_id FROM redirects WHERE source_id IN ({placeholders})"
+                async with db.execute(query, chunk) as cursor:
+                    async for source_id, target_id in cursor:
+                        redirects[source_id] = target_id
+
+        for title, sanitized in sanitized_titles.items():
+            rows = rows_by_key.get(_nocase(sanitized))
+            if not rows:
+                continue
+            exact = [page_id for page_id, db_title, is_redirect in rows if db_title == sanitized and not is_redirect]
+            pages = [page_id for page_id, _, is_redirect in rows if not is_redirect]
+            results[title] = (exact or pages or [redirects.get(rows[0][0])])[0]
+
+        missing = sum(1 for page_id in results.values() if page_id is None)
+        if missing:
+            logger.warning(f"No page found for {missing} of {len(results)} titles")
         return results
 
     async def get_database_stats(self) -> Tuple[int, int]:
@@ -266,6 +337,29 @@ class StaticSolverDB:
                 
             return page_count, int(link_count)
     
+    async def get_page_degrees(self, namespace: int = 0) -> Tuple[array, array, array]:
+        """
+        Get the link degrees of every non-redirect page in a namespace.
+
+        Returns:
+            Parallel arrays (page_ids, outgoing_links_counts, incoming_links_counts).
+            Typed arrays keep this to a few bytes per page, so the whole graph fits
+            in memory for offline sampling.
+        """
+        page_ids, outgoing_counts, incoming_counts = array("q"), array("l"), array("l")
+        query = """
+            SELECT l.id, l.outgoing_links_count, l.incoming_links_count
+            FROM links l JOIN pages p ON p.id = l.id
+            WHERE p.namespace = ? AND p.is_redirect = 0
+        """
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(query, (namespace,)) as cursor:
+                async for page_id, outgoing_count, incoming_count in cursor:
+                    page_ids.append(page_id)
+                    outgoing_counts.append(outgoing_count or 0)
+                    incoming_counts.append(incoming_count or 0)
+        return page_ids, outgoing_counts, incoming_counts
+
     async def page_exists(self, title: str) -> bool:
         """Check if a page exists in the database (after handling redirects)."""
         page_id = await self.get_page_id(title)
@@ -0,0 +1,208 @@
+"""
+Task corpus generation from the static wiki graph.
+
+Live task selection samples random pages and checks their links with one API call
+per page, which takes seconds per task. Instead, (start, target) pairs are sampled
+offline from the degree arrays of wiki_graph.sqlite, solved, and bucketed by
+shortest path length. The resulting corpus file is loaded once and tasks of a
+chosen difficulty are drawn from it in O(1).
+"""
+
+import csv
+import logging
+import random
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from wiki_arena.models import Task
+
+from .solver import WikiTaskSolver
+from .static_db import StaticSolverDB
+
+logger = logging.getLogger(__name__)
+
+CORPUS_HEADER = "# start\ttarget\tpath_length"
+
+
+class TaskCorpus:
+    """
+    Solved tasks grouped by shortest path length.
+
+    Stored as a tab separated file (start, target, path_length) with a '#' header,
+    so it can also be passed to the batch runner as a task corpus.
+    """
+
+    def __init__(self, tasks_by_length: Optional[Dict[int, List[Tuple[str, str]]]] = None):
+        self.tasks_by_length: Dict[int, List[Tuple[str, str]]] = {}
+        self._all: List[Tuple[str, str]] = []
+        for path_length, pairs in (tasks_by_length or {}).items():
+            for start, target in pairs:
+                self.add(start, target, path_length)
+
+    def add(self, start_page_title: str, target_page_title: str, path_length: int):
+        pair = (start_page_title, target_page_title)
+        self.tasks_by_length.setdefault(path_length, []).append(pair)
+        self._all.append(pair)
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    @property
+    def path_lengths(self) -> List[int]:
+        return sorted(self.tasks_by_length)
+
+    def count(self, path_length: int) -> int:
+        return len(self.tasks_by_length.get(path_length, ()))
+
+    def draw(self, path_length: Optional[int] = None, rng: Optional[random.Random] = None) -> Task:
+        """
+        Draw a random task, optionally with a given shortest path length.
+
+        Raises:
+            ValueError: If the corpus has no task of that length.
+        """
+        pairs = self._all if path_length is None else self.tasks_by_length.get(path_length)
+        if not pairs:
+            raise ValueError(
+                f"No tasks with path length {path_length} in corpus (available: {self.path_lengths})"
+                if path_length is not None else "Task corpus is empty"
+            )
+        start, target = pairs[(rng or random).randrange(len(pairs))]
+        return Task(start_page_title=start, target_page_title=target)
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(CORPUS_HEADER + "\n")
+            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            for path_length in self.path_lengths:
+                for start, target in self.tasks_by_length[path_length]:
+                    writer.writerow([start, target, path_length])
+
+    @classmethod
+    def load(cls, path: Path) -> "TaskCorpus":
+        corpus = cls()
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.reader(f, delimiter="\t"):
+                if not row or row[0].startswith("#"):
+                    continue
+                corpus.add(row[0], row[1], int(row[2]))
+        return corpus
+
+
+class TaskCorpusGenerator:
+    """
+    Samples solvable tasks from the static graph, stratified by shortest path length.
+
+    Start pages are drawn from article pages with outgoing links and targets from
+    article pages with incoming links. Several starts are solved against each
+    target so the solver can reuse its cached backward search.
+    """
+
+    def __init__(
+        self,
+        db: Optional[StaticSolverDB] = None,
+        solver: Optional[WikiTaskSolver] = None,
+        min_outgoing_links: int = 1,
+        min_incoming_links: int = 1,
+        namespace: int = 0,
+        seed: Optional[int] = None,
+    ):
+        if db is None:
+            from .static_db import static_solver_db
+            db = static_solver_db
+        self.db = db
+        self.solver = solver or WikiTaskSolver(db)
+        self.min_outgoing_links = min_outgoing_links
+        self.min_incoming_links = min_incoming_links
+        self.namespace = namespace
+        self.rng = random.Random(seed)
+
+        self.start_candidates: Optional[array] = None
+        self.target_candidates: Optional[array] = None
+
+    async def load_candidates(self):
+        """Filter the degree arrays down to valid start and target page ids."""
+        page_ids, outgoing_counts, incoming_counts = await self.db.get_page_degrees(self.namespace)
+        self.start_candidates = array("q", (
+            page_id for page_id, count in zip(page_ids, outgoing_counts) if count >= self.min_outgoing_links
+        ))
+        self.target_candidates = array("q", (
+            page_id for page_id, count in zip(page_ids, incoming_counts) if count >= self.min_incoming_links
+        ))
+        logger.info(
+            f"Loaded {len(page_ids):,} pages: {len(self.start_candidates):,} start candidates, "
+            f"{len(self.target_candidates):,} target candidates"
+        )
+
+    async def generate(
+        self,
+        per_length: Dict[int, int],
+        max_attempts: Optional[int] = None,
+        starts_per_target: int = 4,
+        on_progress: Optional[Callable[[TaskCorpus, int], None]] = None,
+    ) -> TaskCorpus:
+        """
+        Sample and solve pairs until every path length bucket is full.
+
+        Args:
+            per_length: Number of tasks wanted for each shortest path length.
+            max_attempts: Give up after sampling this many pairs (default: 50 per task wanted).
+            starts_per_target: Start pages solved against each sampled target.
+            on_progress: Called after each solved pair with the corpus and attempt count.
+
+        Returns:
+            The corpus; buckets may be short if max_attempts ran out.
+        """
+        if self.start_candidates is None:
+            await self.load_candidates()
+        if not self.start_candidates or not self.target_candidates:
+            raise ValueError("No candidate pages match the degree filters")
+
+        wanted = sum(per_length.values())
+        max_attempts = max_attempts or 50 * wanted
+        corpus = TaskCorpus()
+        attempts = 0
+
+        def is_full() -> bool:
+            return all(corpus.count(length) >= count for length, count in per_length.items())
+
+        while attempts < max_attempts and not is_full():
+            target_id = self.rng.choice(self.target_candidates)
+            start_ids = [self.rng.choice(self.start_candidates) for _ in range(starts_per_target)]
+            start_ids = [start_id for start_id in start_ids if start_id != target_id]
+            if not start_ids:
+                # Every start drawn was the target; still an attempt, or a tiny graph never ends
+                attempts += 1
+                continue
+
+            titles = await self.db.batch_get_page_titles([target_id] + start_ids)
+            target_title, start_titles = titles[0], titles[1:]
+            if target_title is None:
+                attempts += len(start_ids)
+                continue
+
+            for start_title in start_titles:
+                if attempts >= max_attempts:
+                    break
+                attempts += 1
+                if start_title is None:
+                    continue
+                try:
+                    response = await self.solver.find_shortest_path(start_title, target_title)
+                except ValueError as e:
+                    logger.debug(f"Skipping pair: {e}")
+                    continue
+
+                path_length = response.path_length
+                if corpus.count(path_length) < per_length.get(path_length, 0):
+                    corpus.add(start_title, target_title, path_length)
+                if on_progress:
+                    on_progress(corpus, attempts)
+
+        if not is_full():
+            found = {length: corpus.count(length) for length in per_length}
+            logger.warning(f"Stopped after {attempts} attempts with {found} of {per_length} tasks")
+        return corpus
@@ -1,5 +1,15 @@
 from .game_storage import GameStorageService
 from .storage_config import StorageConfig
+from .game_index import GameIndex, GameSummary
 from .game_repository import GameRepository
+from .storage_writer import FsyncPolicy, GameStorageWriter
 
-__all__ = ["GameStorageService", "StorageConfig", "GameRepository"] 
\ No newline at end of file
+__all__ = [
+    "GameStorageService",
+    "StorageConfig",
+    "GameIndex",
+    "GameSummary",
+    "GameRepository",
+    "FsyncPolicy",
+    "GameStorageWriter",
+]
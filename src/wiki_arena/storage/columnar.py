@@ -0,0 +1,379 @@
+"""
+Columnar (Parquet) export of stored games for analytics.
+
+The JSONL file is exported to two Hive-partitioned Parquet datasets under the
+export directory, both partitioned by the game's start date and model:
+
+    games/date=2025-06-01/model=gpt-4o/part-<from>-<to>.parquet   one row per game
+    moves/date=2025-06-01/model=gpt-4o/part-<from>-<to>.parquet   one row per move
+
+Exports are incremental: each run only reads the JSONL bytes appended since
+the last one (part files are named by that byte range, so rerunning an
+interrupted export overwrites its files instead of duplicating rows). The
+state file also keeps a hash of the last exported line, so a replaced JSONL
+file is detected even when it is not smaller, and games already in the
+export are not appended again when stored twice.
+`compact` merges the small files that incremental exports leave behind.
+
+Requires pyarrow (`pip install wiki-arena[analytics]`).
+"""
+
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from wiki_arena.models import Task
+from .game_index import GameSummary
+from .storage_config import StorageConfig
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = "_export_state.json"
+TABLES = ("games", "moves")
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Columnar export requires pyarrow: pip install 'wiki-arena[analytics]'") from e
+    return pyarrow
+
+def _partition_value(value: str) -> str:
+    """A model name as a directory name (the exact name stays in the model_name column)."""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", value) or "_"
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+def _schemas():
+    pa = _require_pyarrow()
+    games = pa.schema([
+        ("game_id", pa.string()),
+        ("task_id", pa.string()),
+        ("start_page", pa.string()),
+        ("target_page", pa.string()),
+        ("model_provider", pa.string()),
+        ("model_name", pa.string()),
+        ("status", pa.string()),
+        ("steps", pa.int32()),
+        ("max_steps", pa.int32()),
+        ("path_length", pa.int32()),
+        ("path_taken", pa.list_(pa.string())),
+        ("start_timestamp", pa.timestamp("us")),
+        ("end_timestamp", pa.timestamp("us")),
+        ("error_message", pa.string()),
+        ("total_input_tokens", pa.int64()),
+        ("total_output_tokens", pa.int64()),
+        ("total_tokens", pa.int64()),
+        ("total_cache_creation_input_tokens", pa.int64()),
+        ("total_cache_read_input_tokens", pa.int64()),
+        ("total_estimated_cost_usd", pa.float64()),
+        ("total_api_time_ms", pa.float64()),
+        ("average_response_time_ms", pa.float64()),
+        ("total_queue_wait_ms", pa.float64()),
+        ("api_call_count", pa.int32()),
+    ])
+    moves = pa.schema([
+        ("game_id", pa.string()),
+        ("model_name", pa.string()),
+        ("step", pa.int32()),
+        ("from_page_title", pa.string()),
+        ("to_page_title", pa.string()),
+        ("error_type", pa.string()),
+        ("error_message", pa.string()),
+    ])
+    partitioning = pa.schema([("date", pa.string()), ("model", pa.string())])
+    return {"games": games, "moves": moves}, partitioning
+
+def game_rows(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a stored game (as parsed from its JSONL line) into its games row and moves rows."""
+    config = data["config"]
+    model = config["model"]
+    game = {
+        "game_id": data["game_id"],
+        "task_id": Task(
+            start_page_title=config["start_page_title"], target_page_title=config["target_page_title"]
+        ).task_id,
+        "start_page": config["start_page_title"],
+        "target_page": config["target_page_title"],
+        "model_provider": model["provider"],
+        "model_name": model["model_name"],
+        "status": data["status"],
+        "steps": data["steps"],
+        "max_steps": config.get("max_steps"),
+        "path_length": len(data.get("path_taken", [])),
+        "path_taken": data.get("path_taken", []),
+        "start_timestamp": _timestamp(data.get("start_timestamp")),
+        "end_timestamp": _timestamp(data.get("end_timestamp")),
+        "error_message": data.get("error_message"),
+        "total_input_tokens": data.get("total_input_tokens", 0),
+        "total_output_tokens": data.get("total_output_tokens", 0),
+        "total_tokens": data.get("total_tokens", 0),
+        "total_cache_creation_input_tokens": data.get("total_cache_creation_input_tokens", 0),
+        "total_cache_read_input_tokens": data.get("total_cache_read_input_tokens", 0),
+        "total_estimated_cost_usd": data.get("total_estimated_cost_usd", 0.0),
+        "total_api_time_ms": data.get("total_api_time_ms", 0.0),
+        "average_response_time_ms": data.get("average_response_time_ms", 0.0),
+        "total_queue_wait_ms": data.get("total_queue_wait_ms", 0.0),
+        "api_call_count": data.get("api_call_count", 0),
+    }
+    moves = [
+        {
+            "game_id": data["game_id"],
+            "model_name": model["model_name"],
+            "step": move["step"],
+            "from_page_title": move["from_page_title"],
+            "to_page_title": move.get("to_page_title"),
+            "error_type": (move.get("error") or {}).get("type"),
+            "error_message": (move.get("error") or {}).get("message"),
+        }
+        for move in data.get("moves", [])
+    ]
+    start = game["start_timestamp"]
+    partition = (start.date().isoformat() if start else "unknown", _partition_value(model["model_name"]))
+    return {"partition": partition, "games": [game], "moves": moves}
+
+class ColumnarExporter:
+    """Exports the games of a JSONL file to partitioned Parquet datasets, incrementally."""
+
+    def __init__(self, storage_config: StorageConfig, export_dir: Path, batch_size: int = 10000):
+        """
+        Args:
+            storage_config: Where the games are stored.
+            export_dir: Root of the exported datasets.
+            batch_size: Games held in memory before they are written out.
+        """
+        self.storage_config = storage_config
+        self.export_dir = Path(export_dir)
+        self.batch_size = batch_size
+
+    @property
+    def state_path(self) -> Path:
+        return self.export_dir / STATE_FILENAME
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not self.state_path.exists():
+            return {"exported_bytes": 0}
+        return json.loads(self.state_path.read_text())
+
+    def _save_state(self, state: Dict[str, Any]):
+        temp_path = self.state_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(state))
+        temp_path.replace(self.state_path)
+
+    @staticmethod
+    def _line_state(offset: int, line: bytes, game_id: str) -> Dict[str, Any]:
+        return {"offset": offset, "length": len(line), "sha256": hashlib.sha256(line).hexdigest(), "game_id": game_id}
+
+    @staticmethod
+    def _last_line_matches(jsonl_path: Path, last_line: Optional[Dict[str, Any]], size: int) -> bool:
+        """Whether the last exported line is still where the state says (the JSONL file may have been replaced)."""
+        if not last_line:
+            return True
+        if last_line["offset"] + last_line["length"] > size:
+            return False
+        with open(jsonl_path, "rb") as f:
+            f.seek(last_line["offset"])
+            data = f.read(last_line["length"])
+        return hashlib.sha256(data).hexdigest() == last_line["sha256"]
+
+    def _exported_game_ids(self) -> Set[str]:
+        if not any((self.export_dir / "games").glob("**/*.parquet")):
+            return set()
+        return set(ColumnarGames(self.export_dir).scan(columns=["game_id"]).column("game_id").to_pylist())
+
+    def _clear(self):
+        for table in TABLES:
+            for path in sorted((self.export_dir / table).glob("**/*.parquet*")):
+                path.unlink()
+        logger.info(f"Cleared the columnar export in {self.export_dir}")
+
+    @staticmethod
+    def _byte_range(path: Path) -> tuple:
+        _, start, end = path.name.split(".")[0].split("-")
+        return int(start), int(end)
+
+    def _live_parts(self, directory: Path) -> List[Path]:
+        """
+        The part files of a partition, removing leftovers of an interrupted
+        compaction (files whose byte range is covered by a merged file).
+        """
+        for leftover in directory.glob("*.parquet.tmp"):
+            leftover.unlink()
+        parts = sorted(directory.glob("part-*.parquet"), key=lambda path: (self._byte_range(path)[0], -self._byte_range(path)[1]))
+        live = []
+        for part in parts:
+            if live and self._byte_range(part)[1] <= self._byte_range(live[-1])[1]:
+                logger.info(f"Removing {part}, already merged into {live[-1].name}")
+                part.unlink()
+                continue
+            live.append(part)
+        return live
+
+    def export(self, rebuild: bool = False) -> Dict[str, int]:
+        """
+        Export the games stored since the last export (all of them with `rebuild`,
+        or when the JSONL file was replaced). Returns the number of games and moves exported.
+        """
+        _require_pyarrow()
+        jsonl_path = self.storage_config.jsonl_path
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        state = self._load_state()
+        size = jsonl_path.stat().st_size if jsonl_path.exists() else 0
+        replaced = size < state["exported_bytes"] or not self._last_line_matches(jsonl_path, state.get("last_line"), size)
+        if rebuild or replaced:
+            if not rebuild:
+                logger.warning(f"{jsonl_path} no longer starts with what was exported, rebuilding the export")
+            self._clear()
+            state = {"exported_bytes": 0}
+
+        counts = {"games": 0, "moves": 0}
+        position = state["exported_bytes"]
+        if position >= size:
+            return counts
+        exported_ids = self._exported_game_ids()
+        duplicates = 0
+
+        with open(jsonl_path, "rb") as f:
+            f.seek(position)
+            batch_start = position
+            partitions: Dict[tuple, Dict[str, List[Dict[str, Any]]]] = {}
+            batch_games = 0
+            while position < size:
+                line = f.readline(size - position)
+                if not line.endswith(b"\n"):
+                    break  # still being written
+                position += len(line)
+                if line.strip():
+                    try:
+                        rows = game_rows(json.loads(line))
+                    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                        logger.error(f"Skipping unreadable game at byte {position - len(line)} in {jsonl_path}: {e}")
+                        continue
+                    game_id = rows["games"][0]["game_id"]
+                    state["last_line"] = self._line_state(position - len(line), line, game_id)
+                    if game_id in exported_ids:
+                        duplicates += 1
+                        continue
+                    exported_ids.add(game_id)
+                    partition = partitions.setdefault(rows["partition"], {table: [] for table in TABLES})
+                    for table in TABLES:
+                        partition[table].extend(rows[table])
+                    batch_games += 1
+                if batch_games >= self.batch_size:
+                    self._write_batch(partitions, batch_start, position, counts)
+                    state["exported_bytes"] = batch_start = position
+                    self._save_state(state)
+                    partitions, batch_games = {}, 0
+            self._write_batch(partitions, batch_start, position, counts)
+            state["exported_bytes"] = position
+            self._save_state(state)
+
+        if duplicates:
+            logger.warning(f"Skipped {duplicates} games stored more than once in {jsonl_path}")
+        logger.info(f"Exported {counts['games']} games and {counts['moves']} moves to {self.export_dir}")
+        return counts
+
+    def _write_batch(self, partitions, start: int, end: int, counts: Dict[str, int]):
+        pa = _require_pyarrow()
+        schemas, _ = _schemas()
+        for (date, model), tables in partitions.items():
+            for table, rows in tables.items():
+                if not rows:
+                    continue
+                directory = self.export_dir / table / f"date={date}" / f"model={model}"
+                directory.mkdir(parents=True, exist_ok=True)
+                pa.parquet.write_table(
+                    pa.Table.from_pylist(rows, schema=schemas[table]),
+                    directory / f"part-{start:012d}-{end:012d}.parquet",
+                )
+                counts[table] += len(rows)
+
+    def compact(self, min_files: int = 2) -> int:
+        """Merge the files of every partition that has at least `min_files` of them. Returns the files removed."""
+        pa = _require_pyarrow()
+        removed = 0
+        for table in TABLES:
+            for directory in sorted({path.parent for path in (self.export_dir / table).glob("**/*.parquet")}):
+                parts = self._live_parts(directory)
+                if len(parts) < max(2, min_files):
+                    continue
+                merged = pa.concat_tables([pa.parquet.read_table(part) for part in parts])
+                # Named by the byte range it covers, so it supersedes the files it merges
+                start, end = self._byte_range(parts[0])[0], self._byte_range(parts[-1])[1]
+                temp_path = directory / f"part-{start:012d}-{end:012d}.parquet.tmp"
+                pa.parquet.write_table(merged, temp_path)
+                temp_path.replace(directory / f"part-{start:012d}-{end:012d}.parquet")
+                for part in parts:
+                    part.unlink()
+                removed += len(parts) - 1
+        logger.info(f"Compacted the columnar export in {self.export_dir}: {removed} files fewer")
+        return removed
+
+class ColumnarGames:
+    """
+    Reads the exported datasets, scanning only the columns and partitions asked for.
+
+    Also a game source for LeaderboardGenerator (see get_summaries).
+    """
+
+    def __init__(self, export_dir: Path):
+        self.export_dir = Path(export_dir)
+
+    def scan(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        table: str = "games",
+        models: Optional[Sequence[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        filter: Any = None,
+    ):
+        """
+        Read a table as a pyarrow Table.
+
+        Args:
+            columns: Columns to read (all if None); `date` and `model` are the partition columns.
+            table: "games" or "moves".
+            models: Only these model names.
+            since, until: Only games started on or after / on or before these dates (YYYY-MM-DD).
+            filter: Any further pyarrow.dataset expression.
+        """
+        pa = _require_pyarrow()
+        import pyarrow.dataset as ds
+
+        _, partitioning = _schemas()
+        path = self.export_dir / table
+        schema = _schemas()[0][table]
+        if not path.exists():
+            empty = pa.schema(list(schema) + list(partitioning))
+            return empty.empty_table().select(list(columns) if columns else empty.names)
+
+        dataset = ds.dataset(path, format="parquet", partitioning=ds.partitioning(partitioning, flavor="hive"))
+        expression = filter
+        conditions = []
+        if models:
+            conditions.append(ds.field("model").isin([_partition_value(model) for model in models]))
+            conditions.append(ds.field("model_name").isin(list(models)))
+        if since:
+            conditions.append(ds.field("date") >= since)
+        if until:
+            conditions.append(ds.field("date") <= until)
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+
+    def get_summaries(self, **scan_options) -> List[GameSummary]:
+        """Summaries of the exported games (they have no JSONL byte range: offset and length are 0)."""
+        columns = ["game_id", "task_id", "model_provider", "model_name", "status", "steps", "total_estimated_cost_usd"]
+        rows = self.scan(columns=columns, **scan_options).to_pydict()
+        return [
+            GameSummary(*values, offset=0, length=0)
+            for values in zip(*(rows[column] for column in columns))
+        ]
@@ -0,0 +1,232 @@
+import json
+import logging
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from wiki_arena.models import GameResult, GameState, Task
+
+logger = logging.getLogger(__name__)
+
+# File header of the index, followed by one record per stored game
+INDEX_MAGIC = b"WAIDX\x00\x01\n"
+# record size (excluding this field), offset and length of the JSONL line, steps, estimated cost
+RECORD_HEADER = struct.Struct("<IQIId")
+STRING_LENGTH = struct.Struct("<H")
+
+@dataclass(slots=True)
+class GameSummary:
+    """The fields of a stored game needed to find, group and rank it, and where its full result is."""
+    game_id: str
+    task_id: str
+    model_provider: str
+    model_name: str
+    status: str
+    steps: int
+    total_estimated_cost_usd: float
+    offset: int  # byte offset of the game's line in the JSONL file
+    length: int  # byte length of the line, including the newline
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+    @classmethod
+    def from_game_result(cls, game: GameResult, offset: int, length: int) -> "GameSummary":
+        return cls(
+            game_id=game.game_id,
+            task_id=Task(
+                start_page_title=game.config.start_page_title,
+                target_page_title=game.config.target_page_title,
+            ).task_id,
+            model_provider=game.config.model.provider,
+            model_name=game.config.model.model_name,
+            status=game.status.value,
+            steps=game.steps,
+            total_estimated_cost_usd=game.total_estimated_cost_usd,
+            offset=offset,
+            length=length,
+        )
+
+    @classmethod
+    def from_game_state(cls, game_state: GameState) -> "GameSummary":
+        """Summarize a finished game that is not stored (yet); it has no byte range."""
+        return cls(
+            game_id=game_state.game_id,
+            task_id=Task(
+                start_page_title=game_state.config.start_page_title,
+                target_page_title=game_state.config.target_page_title,
+            ).task_id,
+            model_provider=game_state.config.model.provider,
+            model_name=game_state.config.model.model_name,
+            status=game_state.status.value,
+            steps=game_state.steps,
+            total_estimated_cost_usd=0.0,  # only GameResult aggregates the cost
+            offset=0,
+            length=0,
+        )
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any], offset: int, length: int) -> "GameSummary":
+        """Summarize a parsed JSONL line without validating the whole game (moves and context are skipped)."""
+        config = data["config"]
+        return cls(
+            game_id=data["game_id"],
+            task_id=Task(
+                start_page_title=config["start_page_title"],
+                target_page_title=config["target_page_title"],
+            ).task_id,
+            model_provider=config["model"]["provider"],
+            model_name=config["model"]["model_name"],
+            status=data["status"],
+            steps=data["steps"],
+            total_estimated_cost_usd=data.get("total_estimated_cost_usd", 0.0),
+            offset=offset,
+            length=length,
+        )
+
+def encode_summary(summary: GameSummary) -> bytes:
+    strings = b"".join(
+        STRING_LENGTH.pack(len(data)) + data
+        for data in (
+            value.encode("utf-8")
+            for value in (summary.game_id, summary.task_id, summary.model_provider, summary.model_name, summary.status)
+        )
+    )
+    size = RECORD_HEADER.size - 4 + len(strings)
+    return RECORD_HEADER.pack(
+        size, summary.offset, summary.length, summary.steps, summary.total_estimated_cost_usd
+    ) + strings
+
+def decode_summaries(data: bytes) -> Tuple[List[GameSummary], int]:
+    """Decode index records; returns them and the number of bytes of complete records."""
+    summaries = []
+    position = 0
+    while position + RECORD_HEADER.size <= len(data):
+        size, offset, length, steps, cost = RECORD_HEADER.unpack_from(data, position)
+        end = position + 4 + size
+        if end > len(data):
+            break  # torn record from an interrupted append
+        cursor = position + RECORD_HEADER.size
+        strings = []
+        for _ in range(5):
+            (string_length,) = STRING_LENGTH.unpack_from(data, cursor)
+            cursor += STRING_LENGTH.size
+            strings.append(data[cursor:cursor + string_length].decode("utf-8"))
+            cursor += string_length
+        game_id, task_id, provider, model_name, status = strings
+        summaries.append(GameSummary(game_id, task_id, provider, model_name, status, steps, cost, offset, length))
+        position = end
+    return summaries, position
+
+class GameIndex:
+    """
+    Append-only binary index of the games in a JSONL file.
+
+    Each record holds a game's summary and the byte range of its line, so
+    readers can list, group and rank games without parsing the JSONL file, and
+    load single games by seeking to them. Records are only ever appended; an
+    interrupted append leaves a torn record at the end, which is ignored on
+    read and cut off before the next append.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._checked = False  # whether this instance has checked the end of the file for a torn record
+
+    def load(self, start: int = 0) -> Tuple[List[GameSummary], int]:
+        """
+        Read the records from a byte position in the index (0 for all of them).
+
+        Returns the records and the position after the last complete one, to
+        continue from once more records were appended.
+        """
+        if not self.path.exists():
+            return [], 0
+        with open(self.path, "rb") as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                logger.warning(f"Ignoring game index with an unknown format: {self.path}")
+                return [], 0
+            start = max(start, len(INDEX_MAGIC))
+            f.seek(start)
+            data = f.read()
+        summaries, complete = decode_summaries(data)
+        return summaries, start + complete
+
+    def append(self, summaries: List[GameSummary]):
+        if not summaries:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        records = b"".join(encode_summary(summary) for summary in summaries)
+        with open(self.path, "a+b") as f:
+            if not self._checked:
+                f.seek(0)
+                data = f.read()
+                if not data.startswith(INDEX_MAGIC):
+                    f.truncate(0)
+                    f.write(INDEX_MAGIC)
+                else:
+                    _, complete = decode_summaries(data[len(INDEX_MAGIC):])
+                    if len(INDEX_MAGIC) + complete < len(data):
+                        logger.warning(f"Cutting off a torn record at the end of {self.path}")
+                        f.truncate(len(INDEX_MAGIC) + complete)
+                self._checked = True
+            f.write(records)
+
+    def rewrite(self, summaries: List[GameSummary]):
+        """Replace the index with the given records."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(INDEX_MAGIC)
+            f.write(b"".join(encode_summary(summary) for summary in summaries))
+        temp_path.replace(self.path)
+        self._checked = True
+
+def index_matches(jsonl_path: Path, last: Optional[GameSummary], size: int) -> bool:
+    """Whether the last indexed line is where the index says (the JSONL file may have been replaced)."""
+    if last is None:
+        return True
+    if last.end > size:
+        return False
+    with open(jsonl_path, "rb") as f:
+        f.seek(max(0, last.offset - 1))
+        data = f.read(last.length + (1 if last.offset else 0))
+    if last.offset and not data.startswith(b"\n"):
+        return False
+    return data.endswith(b"\n") and json.dumps(last.game_id).encode() in data
+
+def covers(summaries: List[GameSummary], jsonl_path: Path) -> bool:
+    """Whether the records cover every line of the JSONL file, with no gaps, and still match it."""
+    size = jsonl_path.stat().st_size if jsonl_path.exists() else 0
+    position = 0
+    for summary in sorted(summaries, key=lambda summary: summary.offset):
+        if summary.offset != position:
+            return False
+        position = summary.end
+    last = max(summaries, key=lambda summary: summary.offset, default=None)
+    return position == size and index_matches(jsonl_path, last, size)
+
+def scan_jsonl(path: Path, start: int, end: int) -> Tuple[List[GameSummary], int]:
+    """
+    Summarize the complete lines of a JSONL file between two byte offsets.
+
+    Returns the summaries and the offset after the last complete line (a line
+    still being written is left for the next scan).
+    """
+    summaries = []
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline(end - position)
+            if not line.endswith(b"\n"):
+                break
+            if line.strip():
+                try:
+                    summaries.append(GameSummary.from_json(json.loads(line), position, len(line)))
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                    logger.error(f"Error indexing game data at byte {position} in {path}: {e}")
+            position += len(line)
+    return summaries, position
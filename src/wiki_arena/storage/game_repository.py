@@ -1,64 +1,244 @@
-import json
 import logging
-from pathlib import Path
-from typing import List, Dict, Optional
+from collections import OrderedDict, defaultdict
+from typing import BinaryIO, List, Dict, Iterator, Optional, Sequence, overload
 
-from wiki_arena.models import GameResult, Task
+from wiki_arena.models import GameResult
 from .storage_config import StorageConfig
+from .game_index import GameIndex, GameSummary, index_matches, scan_jsonl
 
 class GameRepository:
-    """Handles retrieving and caching game results from storage."""
+    """
+    Handles retrieving game results from storage.
 
-    def __init__(self, storage_config: StorageConfig):
+    Only game summaries are kept in memory, indexed by game, task and model;
+    full results are read from the JSONL file on demand (recently read ones are
+    cached). Summaries come from the binary index next to the JSONL file, and
+    lines the index does not cover yet are summarized and added to it, so the
+    JSONL file is not reparsed on every start.
+    """
+
+    def __init__(self, storage_config: StorageConfig, transcript_cache_size: int = 128):
         self.storage_config = storage_config
         self.logger = logging.getLogger(__name__)
-        self._cache: Dict[str, GameResult] = {}
+        self.transcript_cache_size = transcript_cache_size
+        self._index = GameIndex(storage_config.index_path)
+        self._summaries: Dict[str, GameSummary] = {}  # game_id -> GameSummary
+        self._by_task: Dict[str, List[str]] = defaultdict(list)  # task_id -> game_ids
+        self._by_model: Dict[str, List[str]] = defaultdict(list)  # model_name -> game_ids
+        self._indexed_bytes = 0  # JSONL bytes covered by the loaded summaries
+        self._index_position = 0  # index bytes read so far
+        self._last: Optional[GameSummary] = None  # summary of the last line loaded
+        self._transcripts: OrderedDict[str, GameResult] = OrderedDict()  # LRU of full results
         self._load_cache()
 
+    def _add_summary(self, summary: GameSummary):
+        previous = self._summaries.get(summary.game_id)
+        if previous is not None:
+            if previous.offset == summary.offset:
+                return
+            # Stored twice: the later line wins, as when the whole file was parsed
+            self._by_task[previous.task_id].remove(summary.game_id)
+            self._by_model[previous.model_name].remove(summary.game_id)
+            self._transcripts.pop(summary.game_id, None)
+        self._summaries[summary.game_id] = summary
+        self._by_task[summary.task_id].append(summary.game_id)
+        self._by_model[summary.model_name].append(summary.game_id)
+        if self._last is None or summary.offset > self._last.offset:
+            self._last = summary
+
+    def _clear(self):
+        self._summaries.clear()
+        self._by_task.clear()
+        self._by_model.clear()
+        self._transcripts.clear()
+        self._indexed_bytes = 0
+        self._index_position = 0
+        self._last = None
+
     def _load_cache(self):
-        """Load all games from the JSONL file into the in-memory cache."""
+        """Load game summaries from the index, indexing the JSONL lines it does not cover."""
         jsonl_file = self.storage_config.jsonl_path
         if not jsonl_file.exists():
             self.logger.info(f"Game data file not found: {jsonl_file}. Cache will be empty.")
             return
 
         try:
-            with open(jsonl_file, 'r', encoding='utf-8') as f:
-                for i, line in enumerate(f):
-                    try:
-                        game = GameResult.model_validate_json(line)
-                        self._cache[game.game_id] = game
-                    except json.JSONDecodeError as e:
-                        self.logger.error(f"Error decoding JSON on line {i+1} in {jsonl_file}: {e} - Line: '{line.strip()}'")
-                    except Exception as e: # Catch Pydantic validation errors or other issues
-                        self.logger.error(f"Error processing game data on line {i+1} in {jsonl_file}: {e} - Line: '{line.strip()}'")
-            self.logger.info(f"Successfully loaded {len(self._cache)} games into cache from {jsonl_file}.")
+            size = jsonl_file.stat().st_size
+            indexed, self._index_position = self._index.load()
+            last = max(indexed, key=lambda summary: summary.offset, default=None)
+            if index_matches(jsonl_file, last, size):
+                self._catch_up(indexed, size)
+            else:
+                self.logger.warning(f"Game index {self._index.path} does not match {jsonl_file}, rebuilding it")
+                summaries, self._indexed_bytes = scan_jsonl(jsonl_file, 0, size)
+                for summary in summaries:
+                    self._add_summary(summary)
+                try:
+                    self._index.rewrite(summaries)
+                    self._index_position = self._index.path.stat().st_size
+                except OSError as e:
+                    self.logger.warning(f"Could not rewrite the game index {self._index.path}: {e}")
+            self.logger.info(f"Successfully loaded {len(self._summaries)} game summaries from {jsonl_file}.")
         except Exception as e:
             self.logger.error(f"Failed to load game data from {jsonl_file}: {e}")
 
-    def get_all_games(self) -> List[GameResult]:
-        """Get all stored games from the cache."""
-        return list(self._cache.values())
+    def _catch_up(self, indexed: List[GameSummary], size: int):
+        """
+        Add index records for lines after the loaded ones, and index the lines
+        up to `size` that have no record (older files, or games stored without
+        updating the index).
+        """
+        jsonl_file = self.storage_config.jsonl_path
+        by_offset = {summary.offset: summary for summary in indexed if summary.offset >= self._indexed_bytes}
+        found = []
+        position = self._indexed_bytes
+        for offset in sorted(by_offset):
+            if offset > position:
+                found.extend(scan_jsonl(jsonl_file, position, offset)[0])
+            position = max(position, by_offset[offset].end)
+        tail, end = scan_jsonl(jsonl_file, position, size)
+        found.extend(tail)
+        self._indexed_bytes = max(position, end)
+
+        for summary in sorted([*by_offset.values(), *found], key=lambda summary: summary.offset):
+            self._add_summary(summary)
+        self._append_to_index(found)
+
+    def _append_to_index(self, summaries: List[GameSummary]):
+        if not summaries:
+            return
+        try:
+            self._index.append(summaries)
+            self.logger.info(f"Added {len(summaries)} games to the index {self._index.path}")
+        except OSError as e:
+            self.logger.warning(f"Could not update the game index {self._index.path}: {e}")
+
+    def _read_game(self, summary: GameSummary, f: Optional[BinaryIO] = None) -> Optional[GameResult]:
+        if f is None:
+            with open(self.storage_config.jsonl_path, "rb") as f:
+                return self._read_game(summary, f)
+        f.seek(summary.offset)
+        line = f.read(summary.length)
+        try:
+            return GameResult.model_validate_json(line)
+        except Exception as e:  # Catch Pydantic validation errors or other issues
+            self.logger.error(f"Error processing game {summary.game_id} at byte {summary.offset}: {e}")
+            return None
+
+    def _games(self, game_ids: List[str]) -> List[GameResult]:
+        games = (self.get_game_by_id(game_id) for game_id in game_ids)
+        return [game for game in games if game is not None]
+
+    def get_all_games(self) -> "StoredGames":
+        """Get all stored games in storage order; each is parsed only when it is read."""
+        return StoredGames(self, sorted(self._summaries.values(), key=lambda summary: summary.offset))
+
+    def iter_games(self) -> Iterator[GameResult]:
+        """Yield all stored games in storage order, without caching them."""
+        return self._iter_games(sorted(self._summaries.values(), key=lambda summary: summary.offset))
+
+    def _iter_games(self, summaries: List[GameSummary]) -> Iterator[GameResult]:
+        if not summaries:
+            return
+        with open(self.storage_config.jsonl_path, "rb") as f:
+            for summary in summaries:
+                game = self._transcripts.get(summary.game_id) or self._read_game(summary, f)
+                if game is not None:
+                    yield game
 
     def get_game_by_id(self, game_id: str) -> Optional[GameResult]:
-        """Get a specific game by its ID from the cache."""
-        return self._cache.get(game_id)
+        """Get a specific game by its ID, loading it from storage if it isn't cached."""
+        game = self._transcripts.get(game_id)
+        if game is not None:
+            self._transcripts.move_to_end(game_id)
+            return game
+        summary = self._summaries.get(game_id)
+        if summary is None:
+            return None
+        game = self._read_game(summary)
+        if game is not None and self.transcript_cache_size > 0:
+            self._transcripts[game_id] = game
+            if len(self._transcripts) > self.transcript_cache_size:
+                self._transcripts.popitem(last=False)
+        return game
 
     def get_games_by_task_id(self, task_id: str) -> List[GameResult]:
-        """Get all games for a specific task ID from the cache."""
-        matching_games = []
-        for game in self._cache.values():
-            # Create a Task object from the game's config to get its task_id
-            current_task = Task(
-                start_page_title=game.config.start_page_title,
-                target_page_title=game.config.target_page_title
-            )
-            if current_task.task_id == task_id:
-                matching_games.append(game)
-        return matching_games
-    
+        """Get all games for a specific task ID."""
+        return self._games(self._by_task.get(task_id, []))
+
+    def get_games_by_model(self, model_name: str) -> List[GameResult]:
+        """Get all games played by a model."""
+        return self._games(self._by_model.get(model_name, []))
+
+    def get_summaries(self) -> List[GameSummary]:
+        """Get the summaries of all stored games."""
+        return list(self._summaries.values())
+
+    def get_summary(self, game_id: str) -> Optional[GameSummary]:
+        return self._summaries.get(game_id)
+
+    def get_summaries_by_task_id(self, task_id: str) -> List[GameSummary]:
+        return [self._summaries[game_id] for game_id in self._by_task.get(task_id, [])]
+
+    def get_summaries_by_model(self, model_name: str) -> List[GameSummary]:
+        return [self._summaries[game_id] for game_id in self._by_model.get(model_name, [])]
+
+    def get_task_ids(self) -> List[str]:
+        return [task_id for task_id, game_ids in self._by_task.items() if game_ids]
+
+    def get_model_names(self) -> List[str]:
+        return [model_name for model_name, game_ids in self._by_model.items() if game_ids]
+
     def refresh_cache(self):
-        """Clears and reloads the cache from the storage file."""
-        self.logger.info("Refreshing game cache...")
-        self._cache.clear()
-        self._load_cache()
+        """Load the games appended to storage since the last load (all of them if the file was replaced)."""
+        jsonl_file = self.storage_config.jsonl_path
+        if not jsonl_file.exists():
+            self._clear()
+            return
+
+        size = jsonl_file.stat().st_size
+        if size < self._indexed_bytes or not index_matches(jsonl_file, self._last, size):
+            self.logger.info("Game data file was replaced, reloading game cache...")
+            self._clear()
+            self._load_cache()
+            return
+
+        count = len(self._summaries)
+        indexed, self._index_position = self._index.load(self._index_position)
+        self._catch_up(indexed, size)
+        self.logger.info(f"Loaded {len(self._summaries) - count} new games into cache from {jsonl_file}.")
+
+
+class StoredGames(Sequence[GameResult]):
+    """
+    Stored games in storage order, read from the JSONL file only when accessed.
+
+    The length is that of the summaries, so it is known without parsing. A
+    line that can no longer be parsed is skipped when iterating (as by
+    GameRepository.iter_games) and raises ValueError when indexed.
+    """
+
+    def __init__(self, repository: GameRepository, summaries: List[GameSummary]):
+        self._repository = repository
+        self._summaries = summaries
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    @overload
+    def __getitem__(self, index: int) -> GameResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "StoredGames": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return StoredGames(self._repository, self._summaries[index])
+        summary = self._summaries[index]
+        game = self._repository.get_game_by_id(summary.game_id)
+        if game is None:
+            raise ValueError(f"Stored game {summary.game_id} could not be read")
+        return game
+
+    def __iter__(self) -> Iterator[GameResult]:
+        return self._repository._iter_games(self._summaries)
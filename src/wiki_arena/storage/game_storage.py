@@ -1,12 +1,14 @@
-import json
 import csv
 import logging
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set
 from datetime import datetime
 
 from wiki_arena.models import GameResult, GameStatus
 from .storage_config import StorageConfig
+from .game_index import GameIndex, GameSummary, covers
+from .game_repository import GameRepository
 
 
 class GameStorageService:
@@ -15,24 +17,11 @@ class GameStorageService:
     def __init__(self, config: Optional[StorageConfig] = None):
         self.config = config or StorageConfig()
         self.logger = logging.getLogger(__name__)
+        self.index = GameIndex(self.config.index_path)
         
     def should_store_game(self, game_result: GameResult) -> bool:
         """Determine if a game should be stored based on configuration."""
-        # Check specific game outcomes
-        if game_result.status == GameStatus.WON and self.config.store_won_games:
-            return True
-        elif game_result.status == GameStatus.LOST_MAX_STEPS and self.config.store_lost_games:
-            return True
-        elif game_result.status in [GameStatus.ERROR, GameStatus.LOST_INVALID_MOVE] and self.config.store_error_games:
-            # Check for excluded error types
-            if game_result.moves:
-                game_error_types = {move.error.type for move in game_result.moves if move.error}
-                excluded_types = set(self.config.excluded_error_types)
-                if game_error_types.intersection(excluded_types):
-                    return False
-            return True
-            
-        return False
+        return self.config.accepts(game_result.status, (move.error.type for move in game_result.moves if move.error))
     
     def _ensure_storage_directory(self):
         """Create storage directory if it doesn't exist."""
@@ -41,7 +30,11 @@ class GameStorageService:
         
     def store_game_jsonl(self, game_result: GameResult) -> bool:
         """Store complete game result as a JSONL line."""
-        if not self.config.enable_jsonl:
+        return self.store_games_jsonl([game_result])
+    
+    def store_games_jsonl(self, game_results: List[GameResult], fsync: bool = False) -> bool:
+        """Store complete game results as JSONL lines with a single write (and fsync, if asked)."""
+        if not self.config.enable_jsonl or not game_results:
             return True
             
         try:
@@ -49,21 +42,76 @@ class GameStorageService:
             jsonl_path = self.config.jsonl_path
             
             # Convert to JSON and append to file
-            json_line = game_result.model_dump_json()
+            lines = [(game_result.model_dump_json() + '\n').encode('utf-8') for game_result in game_results]
             
-            with open(jsonl_path, 'a', encoding='utf-8') as f:
-                f.write(json_line + '\n')
+            with open(jsonl_path, 'ab') as f:
+                offset = f.tell()
+                f.write(b''.join(lines))
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            
+            # Index the lines so readers don't have to parse the JSONL file (they index it themselves if this fails)
+            summaries = []
+            for game_result, line in zip(game_results, lines):
+                summaries.append(GameSummary.from_game_result(game_result, offset, len(line)))
+                offset += len(line)
+            try:
+                self.index.append(summaries)
+            except OSError as e:
+                self.logger.warning(f"Failed to index {len(summaries)} games: {e}")
                 
-            self.logger.debug(f"Stored game {game_result.game_id} to JSONL: {jsonl_path}")
+            self.logger.debug(f"Stored {len(game_results)} games to JSONL: {jsonl_path}")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to store game {game_result.game_id} to JSONL: {e}")
+            game_ids = ', '.join(game_result.game_id for game_result in game_results)
+            self.logger.error(f"Failed to store games {game_ids} to JSONL: {e}")
             return False
     
     def store_game_csv_summary(self, game_result: GameResult) -> bool:
         """Store game summary as CSV row."""
-        if not self.config.enable_summary_csv:
+        return self.store_games_csv_summary([game_result])
+    
+    def _csv_row(self, game_result: GameResult) -> Dict[str, Any]:
+        """Summary of a game as a CSV row."""
+        return {
+            'game_id': game_result.game_id,
+            'start_timestamp': game_result.start_timestamp.isoformat(),
+            'end_timestamp': game_result.end_timestamp.isoformat(),
+            'status': game_result.status.value,
+            'steps': game_result.steps,
+            'model_provider': game_result.config.model.provider,
+            'model_name': game_result.config.model.model_name,
+            'start_page': game_result.config.start_page_title,
+            'target_page': game_result.config.target_page_title,
+            'max_steps': game_result.config.max_steps,
+            'path_length': len(game_result.path_taken),
+            'successful_moves': game_result.metadata.get('successful_moves', 0),
+            'failed_moves': game_result.metadata.get('failed_moves', 0),
+            'target_reached': game_result.metadata.get('target_reached', False),
+            'error_message': game_result.error_message or '',
+            'error_types': ','.join(game_result.metadata.get('error_types', [])),
+            'final_page_links': game_result.metadata.get('links_on_final_page', 0),
+            'path_taken': ' -> '.join(game_result.path_taken),
+            
+            # API metrics
+            'total_input_tokens': game_result.total_input_tokens,
+            'total_output_tokens': game_result.total_output_tokens,
+            'total_tokens': game_result.total_tokens,
+            'total_estimated_cost_usd': game_result.total_estimated_cost_usd,
+            'total_api_time_ms': game_result.total_api_time_ms,
+            'average_response_time_ms': game_result.average_response_time_ms,
+            'api_call_count': game_result.api_call_count,
+            
+            # Model pricing (for historical reference)
+            'input_cost_per_1m_tokens': game_result.config.model.input_cost_per_1m_tokens or 0,
+            'output_cost_per_1m_tokens': game_result.config.model.output_cost_per_1m_tokens or 0,
+        }
+    
+    def store_games_csv_summary(self, game_results: List[GameResult], fsync: bool = False) -> bool:
+        """Store game summaries as CSV rows with a single open (and fsync, if asked)."""
+        if not self.config.enable_summary_csv or not game_results:
             return True
             
         try:
@@ -73,55 +121,26 @@ class GameStorageService:
             # Check if file exists to determine if we need headers
             file_exists = csv_path.exists()
             
-            # Prepare summary data
-            summary_data = {
-                'game_id': game_result.game_id,
-                'start_timestamp': game_result.start_timestamp.isoformat(),
-                'end_timestamp': game_result.end_timestamp.isoformat(),
-                'status': game_result.status.value,
-                'steps': game_result.steps,
-                'model_provider': game_result.config.model.provider,
-                'model_name': game_result.config.model.model_name,
-                'start_page': game_result.config.start_page_title,
-                'target_page': game_result.config.target_page_title,
-                'max_steps': game_result.config.max_steps,
-                'path_length': len(game_result.path_taken),
-                'successful_moves': game_result.metadata.get('successful_moves', 0),
-                'failed_moves': game_result.metadata.get('failed_moves', 0),
-                'target_reached': game_result.metadata.get('target_reached', False),
-                'error_message': game_result.error_message or '',
-                'error_types': ','.join(game_result.metadata.get('error_types', [])),
-                'final_page_links': game_result.metadata.get('links_on_final_page', 0),
-                'path_taken': ' -> '.join(game_result.path_taken),
-                
-                # API metrics
-                'total_input_tokens': game_result.total_input_tokens,
-                'total_output_tokens': game_result.total_output_tokens,
-                'total_tokens': game_result.total_tokens,
-                'total_estimated_cost_usd': game_result.total_estimated_cost_usd,
-                'total_api_time_ms': game_result.total_api_time_ms,
-                'average_response_time_ms': game_result.average_response_time_ms,
-                'api_call_count': game_result.api_call_count,
-                
-                # Model pricing (for historical reference)
-                'input_cost_per_1m_tokens': game_result.config.model.input_cost_per_1m_tokens or 0,
-                'output_cost_per_1m_tokens': game_result.config.model.output_cost_per_1m_tokens or 0,
-            }
+            rows = [self._csv_row(game_result) for game_result in game_results]
             
             with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=summary_data.keys())
+                writer = csv.DictWriter(f, fieldnames=rows[0].keys())
                 
                 # Write header if file is new
                 if not file_exists:
                     writer.writeheader()
                     
-                writer.writerow(summary_data)
+                writer.writerows(rows)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
                 
-            self.logger.debug(f"Stored game {game_result.game_id} summary to CSV: {csv_path}")
+            self.logger.debug(f"Stored {len(rows)} game summaries to CSV: {csv_path}")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to store game {game_result.game_id} summary to CSV: {e}")
+            game_ids = ', '.join(game_result.game_id for game_result in game_results)
+            self.logger.error(f"Failed to store game summaries {game_ids} to CSV: {e}")
             return False
     
     def store_game(self, game_result: GameResult) -> bool:
@@ -140,4 +159,62 @@ class GameStorageService:
         else:
             self.logger.warning(f"Partial storage failure for game {game_result.game_id}")
             
-        return success 
+        return success
+
+    def store_games(self, game_results: List[GameResult], fsync: bool = False) -> bool:
+        """
+        Store several game results using all enabled formats, writing each file once.
+        
+        Used to group-commit games (see GameStorageWriter); with `fsync`, the
+        files are synced to disk before this returns.
+        """
+        to_store = [game_result for game_result in game_results if self.should_store_game(game_result)]
+        if len(to_store) < len(game_results):
+            self.logger.debug(f"{len(game_results) - len(to_store)} games filtered out by storage configuration")
+        
+        jsonl_success = self.store_games_jsonl(to_store, fsync)
+        csv_success = self.store_games_csv_summary(to_store, fsync)
+        
+        success = jsonl_success and csv_success
+        if to_store and not success:
+            self.logger.warning(f"Partial storage failure for {len(to_store)} games")
+        return success
+    
+    def recover(self):
+        """
+        Cut off a line left incomplete by a crash during a write, so the next
+        write doesn't append to it. Games already written are untouched.
+        """
+        for path in (self.config.jsonl_path, self.config.csv_path):
+            if not path.exists():
+                continue
+            with open(path, 'r+b') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0:
+                    continue
+                # Find the end of the last complete line
+                end = size
+                while end > 0:
+                    start = max(0, end - 65536)
+                    f.seek(start)
+                    newline = f.read(end - start).rfind(b'\n')
+                    if newline >= 0:
+                        end = start + newline + 1
+                        break
+                    end = start
+                if end < size:
+                    self.logger.warning(f"Removing {size - end} bytes of an incomplete write at the end of {path}")
+                    f.truncate(end)
+
+    def get_stored_game_ids(self) -> Set[str]:
+        """
+        Get the ids of all games already stored in the JSONL file.
+
+        Answered from the binary index alone when it covers the whole file;
+        otherwise a GameRepository indexes the lines it is missing (once, so
+        later calls only read the index).
+        """
+        summaries, _ = self.index.load()
+        if covers(summaries, self.config.jsonl_path):
+            return {summary.game_id for summary in summaries}
+        return {summary.game_id for summary in GameRepository(self.config).get_summaries()}
@@ -1,9 +1,9 @@
-from typing import List
+from typing import Iterable, List
 from pathlib import Path
 from pydantic import BaseModel, Field
 import os
 
-from wiki_arena.models import ErrorType
+from wiki_arena.models import ErrorType, GameStatus
 
 class StorageConfig(BaseModel):
     """Configuration for game result storage."""
@@ -32,7 +32,18 @@ class StorageConfig(BaseModel):
     # File naming
     jsonl_filename: str = Field("games.jsonl", description="Name of the JSONL file")
     csv_filename: str = Field("games_summary.csv", description="Name of the summary CSV file")
+    index_filename: str = Field("games.idx", description="Name of the binary index of the JSONL file")
     
+    def accepts(self, status: GameStatus, error_types: Iterable[ErrorType] = ()) -> bool:
+        """Whether a game that ended with this status and these move errors is stored."""
+        if status == GameStatus.WON:
+            return self.store_won_games
+        if status == GameStatus.LOST_MAX_STEPS:
+            return self.store_lost_games
+        if status in [GameStatus.ERROR, GameStatus.LOST_INVALID_MOVE] and self.store_error_games:
+            return not set(error_types).intersection(self.excluded_error_types)
+        return False
+
     @property
     def storage_path(self) -> Path:
         """Get the storage directory as a Path object."""
@@ -46,4 +57,9 @@ class StorageConfig(BaseModel):
     @property
     def csv_path(self) -> Path:
         """Get the full path to the summary CSV file."""
-        return self.storage_path / self.csv_filename 
\ No newline at end of file
+        return self.storage_path / self.csv_filename 
+
+    @property
+    def index_path(self) -> Path:
+        """Get the full path to the binary index of the JSONL file."""
+        return self.storage_path / self.index_filename
@@ -0,0 +1,186 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from wiki_arena.models import GameResult
+from .game_storage import GameStorageService
+
+logger = logging.getLogger(__name__)
+
+class FsyncPolicy(str, Enum):
+    """When the writer syncs stored games to disk."""
+    NEVER = "never"        # Leave it to the OS: fastest, games of the last seconds may be lost on power failure
+    BATCH = "batch"        # After every group commit, before its games are acknowledged
+    INTERVAL = "interval"  # At most every `fsync_interval_s`, on the first commit after it passed
+
+class GameStorageWriter:
+    """
+    Stores game results on a background thread, committing them in groups.
+
+    `submit` only queues a game, so callers on the event loop never wait for
+    file IO. When `queue_size` games are already waiting it blocks until there
+    is room, so callers on the event loop check `is_full` first and submit from
+    a thread then. The thread takes everything queued (up to `max_batch_size`, waiting
+    up to `max_batch_delay_ms` for more to arrive) and writes it with one append
+    per file and at most one fsync. On start, a line left incomplete by a crash
+    is cut off; games still queued on `close` are written before it returns.
+    """
+
+    def __init__(
+        self,
+        storage_service: GameStorageService,
+        fsync: FsyncPolicy = FsyncPolicy.BATCH,
+        max_batch_size: int = 64,
+        max_batch_delay_ms: float = 10.0,
+        fsync_interval_s: float = 1.0,
+        queue_size: int = 10000,
+    ):
+        self.storage_service = storage_service
+        self.fsync = FsyncPolicy(fsync)
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay_ms = max_batch_delay_ms
+        self.fsync_interval_s = fsync_interval_s
+        # (game, queued at, future) or None to stop; at most queue_size games wait
+        self._queue: "queue.Queue[Optional[Tuple[GameResult, float, Future]]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._last_fsync = 0.0
+
+        self.stored_count = 0
+        self.failed_count = 0
+        self.waited_count = 0  # Submits that found the queue full
+        self.batch_count = 0
+        self.fsync_count = 0
+        self._commit_ms: Deque[float] = deque(maxlen=1000)
+        self._latency_ms: Deque[float] = deque(maxlen=1000)  # from submit until written
+
+    def start(self):
+        """Recover from an interrupted write and start the writer thread."""
+        if self._thread:
+            return
+        try:
+            self.storage_service.recover()
+        except OSError as e:
+            logger.error(f"Failed to recover game storage: {e}")
+        self._thread = threading.Thread(target=self._run, name="game-storage-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"Game storage writer started (fsync={self.fsync.value}, max batch {self.max_batch_size})")
+
+    def submit(self, game_result: GameResult) -> Future:
+        """
+        Queue a game for storage, waiting for room if the queue is full.
+
+        The future resolves to whether the game was stored once it is written.
+        """
+        if not self._thread:
+            self.start()
+        future: Future = Future()
+        if self._queue.full():
+            self.waited_count += 1
+            logger.warning(
+                f"Storage queue is full ({self._queue.maxsize} games), waiting to queue game {game_result.game_id}"
+            )
+        self._queue.put((game_result, time.perf_counter(), future))
+        return future
+
+    def is_full(self) -> bool:
+        """Whether `submit` would wait for room."""
+        return self._queue.full()
+
+    def flush(self):
+        """Block until every game submitted so far is written."""
+        self._queue.join()
+
+    def close(self):
+        """Write the games still queued and stop the writer thread."""
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        logger.info(f"Game storage writer stopped after storing {self.stored_count} games")
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_batch_delay_ms / 1000
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stopping:
+                self._queue.task_done()
+                return
+
+    def _should_fsync(self) -> bool:
+        if self.fsync == FsyncPolicy.BATCH:
+            return True
+        if self.fsync == FsyncPolicy.INTERVAL:
+            return time.monotonic() - self._last_fsync >= self.fsync_interval_s
+        return False
+
+    def _commit(self, batch: List[Tuple[GameResult, float, Future]]):
+        start = time.perf_counter()
+        fsync = self._should_fsync()
+        try:
+            success = self.storage_service.store_games([game for game, _, _ in batch], fsync=fsync)
+        except Exception as e:
+            logger.error(f"Failed to store {len(batch)} games: {e}", exc_info=True)
+            success = False
+        done = time.perf_counter()
+
+        if fsync:
+            self._last_fsync = time.monotonic()
+            self.fsync_count += 1
+        self.batch_count += 1
+        self._commit_ms.append((done - start) * 1000)
+        for game, queued_at, future in batch:
+            if success:
+                self.stored_count += 1
+            else:
+                self.failed_count += 1
+            self._latency_ms.append((done - queued_at) * 1000)
+            future.set_result(success)
+            self._queue.task_done()
+        if success:
+            logger.info(f"Stored {len(batch)} games in {(done - start) * 1000:.1f}ms (fsync: {fsync})")
+
+    @staticmethod
+    def _summarize(values: List[float]) -> Dict[str, Any]:
+        if not values:
+            return {"count": 0}
+        ordered = sorted(values)
+        return {
+            "count": len(ordered),
+            "mean_ms": round(sum(ordered) / len(ordered), 2),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            "max_ms": round(ordered[-1], 2),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "fsync": self.fsync.value,
+            "queued": self._queue.qsize(),
+            "stored": self.stored_count,
+            "failed": self.failed_count,
+            "waited": self.waited_count,
+            "batches": self.batch_count,
+            "fsyncs": self.fsync_count,
+            "commit": self._summarize(list(self._commit_ms)),
+            "latency": self._summarize(list(self._latency_ms)),
+        }
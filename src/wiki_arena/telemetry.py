@@ -0,0 +1,191 @@
+"""
+In-process latency spans, exported as Prometheus histograms.
+
+Hot paths time their stages with `spans.span(name, **labels)`:
+
+    with spans.span("game.llm_wait", provider="openai"):
+        message = await model.generate_response(...)
+
+Each (name, labels) pair accumulates a histogram of durations in seconds.
+`render_prometheus` writes all of them as the `wiki_arena_span_duration_seconds`
+family, which the backend serves at /metrics. With a sample rate below 1 only
+that share of spans is timed (the rest cost one random() call), so counts are
+of sampled spans while the duration distributions stay representative.
+
+Labels must have few distinct values (provider, handler, direction), never
+game ids or page titles.
+"""
+
+import bisect
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+METRIC_NAME = "wiki_arena_span_duration_seconds"
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+class Histogram:
+    """Cumulative-on-export histogram of durations in seconds."""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None when empty or above the last bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+class _Span:
+    __slots__ = ("recorder", "key", "start")
+
+    def __init__(self, recorder: "SpanRecorder", key: LabelKey):
+        self.recorder = recorder
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder._record(self.key, time.perf_counter() - self.start)
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+def _label_key(name: str, labels: Dict[str, Any]) -> LabelKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+class SpanRecorder:
+    """
+    Collects span durations into per (name, labels) histograms.
+
+    Spans may end on any thread (the solver and storage run some work in
+    threads); a lock guards the histograms.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: Dict[LabelKey, Histogram] = {}
+        self._lock = threading.Lock()
+        self.sample_rate = sample_rate
+
+    @property
+    def sample_rate(self) -> float:
+        return self._sample_rate
+
+    @sample_rate.setter
+    def sample_rate(self, value: float):
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"Sample rate must be between 0 and 1, got {value}")
+        self._sample_rate = value
+
+    def span(self, name: str, **labels: Any):
+        """Context manager timing its block as one span (or nothing, if not sampled)."""
+        if self._sample_rate < 1.0 and random.random() >= self._sample_rate:
+            return _NOOP_SPAN
+        return _Span(self, _label_key(name, labels))
+
+    def observe(self, name: str, seconds: float, **labels: Any):
+        """Record a duration measured elsewhere (subject to sampling like a span)."""
+        if self._sample_rate < 1.0 and random.random() >= self._sample_rate:
+            return
+        self._record(_label_key(name, labels), seconds)
+
+    def _record(self, key: LabelKey, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Count, mean and bucketed p50/p95/p99 per span, slowest total time first."""
+        stats = []
+        with self._lock:
+            for (name, labels), histogram in self._histograms.items():
+                stat = {
+                    "span": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "total_ms": histogram.sum * 1000,
+                    "avg_ms": histogram.sum / histogram.count * 1000 if histogram.count else 0.0,
+                }
+                for q in (0.5, 0.95, 0.99):
+                    bound = histogram.quantile(q)
+                    stat[f"p{round(q * 100)}_ms_le"] = bound * 1000 if bound is not None else None
+                stats.append(stat)
+        return sorted(stats, key=lambda item: item["total_ms"], reverse=True)
+
+    def render_prometheus(self) -> str:
+        """All span histograms in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            snapshot = [
+                (key, list(histogram.counts), histogram.sum, histogram.count)
+                for key, histogram in sorted(self._histograms.items())
+            ]
+
+        lines = [
+            f"# HELP {METRIC_NAME} Duration of instrumented spans (sampled).",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for (name, labels), counts, total, count in snapshot:
+            pairs = (("span", name),) + labels
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{METRIC_NAME}_bucket{{{_format_labels(pairs + (("le", _format_bound(bound)),))}}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_bucket{{{_format_labels(pairs + (("le", "+Inf"),))}}} {count}')
+            lines.append(f"{METRIC_NAME}_sum{{{_format_labels(pairs)}}} {total!r}")
+            lines.append(f"{METRIC_NAME}_count{{{_format_labels(pairs)}}} {count}")
+
+        lines += [
+            "# HELP wiki_arena_span_sample_rate Share of spans that are timed.",
+            "# TYPE wiki_arena_span_sample_rate gauge",
+            f"wiki_arena_span_sample_rate {self._sample_rate!r}",
+        ]
+        return "\n".join(lines) + "\n"
+
+# Process-wide recorder used by the instrumented code
+spans = SpanRecorder(sample_rate=float(os.getenv("SPAN_SAMPLE_RATE", "1.0")))
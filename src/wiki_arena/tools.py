@@ -3,6 +3,7 @@
 
 from typing import Dict, Any, List
 
+from wiki_arena.models import LinkFormat
 from wiki_arena.wikipedia import LiveWikiService
 
 # Tool Implementation
@@ -32,24 +33,49 @@ NAVIGATE_TOOL_SCHEMA = {
     }
 }
 
+NAVIGATE_BY_INDEX_TOOL_SCHEMA = {
+    "name": "navigate_by_index",
+    "description": "Navigate to the Wikipedia page with the given number in the current page's link list and get all available links on that page.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "link_index": {
+                "type": "integer",
+                "description": "Number of the link in the current page's link list"
+            }
+        },
+        "required": ["link_index"]
+    }
+}
+
 # Tool Registry
 # This maps tool names to their schema and implementation
 TOOL_REGISTRY = {
     "navigate": {
         "schema": NAVIGATE_TOOL_SCHEMA,
         "implementation": navigate,
-    }
+    },
+    # The game resolves the index to a page title before navigating
+    "navigate_by_index": {
+        "schema": NAVIGATE_BY_INDEX_TOOL_SCHEMA,
+        "implementation": navigate,
+    },
 }
 
 
-def get_tools() -> List[Dict[str, Any]]:
+def get_tools(link_format: LinkFormat = LinkFormat.LIST) -> List[Dict[str, Any]]:
     """
-    Get all tool schemas available for the WikiArena game.
+    Get the tool schemas available for the WikiArena game.
     
+    Args:
+        link_format: How links are shown to the model. Numbered links are
+            navigated by index, all other formats by page title.
+
     Returns:
         List of tool definitions in MCP format
     """
-    return [t["schema"] for t in TOOL_REGISTRY.values()]
+    tool_name = "navigate_by_index" if link_format == LinkFormat.NUMBERED else "navigate"
+    return [TOOL_REGISTRY[tool_name]["schema"]]
 
 
 def get_tool_by_name(name: str) -> Dict[str, Any]:
@@ -0,0 +1,31 @@
+"""
+Cheap token estimates for budgeting and reporting.
+
+Provider tokenizers are not available offline, so these helpers use the usual
+~4 characters per token rule of thumb. They are good enough for rate limiting
+and for comparing context layouts, not for billing.
+"""
+
+from typing import Iterable
+
+from wiki_arena.models import AssistantMessage, ContextMessage
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_context_tokens(context: Iterable[ContextMessage]) -> int:
+    """Estimate the number of input tokens a context will cost."""
+    total = 0
+    for message in context:
+        total += estimate_tokens(message.content or "")
+        if isinstance(message, AssistantMessage) and message.tool_calls:
+            for tool_call in message.tool_calls:
+                total += estimate_tokens(tool_call.name) + estimate_tokens(str(tool_call.arguments))
+    return total
@@ -1,18 +1,27 @@
+import asyncio
 import logging
+import os
 import httpx
 import urllib.parse
-from typing import List
+from typing import List, Optional, Set
 
 from ..models import Page
+from ..telemetry import spans
 
 class LiveWikiService:
     """
     Service for interacting directly with the live Wikipedia API.
     All methods are asynchronous.
     """
-    def __init__(self, language: str = "en"):
+    # The API accepts up to 50 titles per query for regular clients
+    MAX_TITLES_PER_QUERY = 50
+    # Continuations followed in a multi-title link check before the titles left are checked one by one
+    MAX_LINK_CHECK_CONTINUATIONS = 2
+
+    def __init__(self, language: str = "en", base_url: Optional[str] = None):
         self.language = language
-        self.base_url = f"https://{language}.wikipedia.org/w/api.php"
+        # WIKIPEDIA_API_URL points every service at another MediaWiki API (e.g. the load test's fake one)
+        self.base_url = base_url or os.getenv("WIKIPEDIA_API_URL") or f"https://{language}.wikipedia.org/w/api.php"
         self.logger = logging.getLogger(__name__)
 
     async def get_random_pages(self, count: int = 20) -> List[str]:
@@ -76,10 +85,79 @@ class LiveWikiService:
             self.logger.debug(f"Error checking incoming links for '{page_title}': {e}")
             return False
 
+    async def pages_with_outgoing_links(self, page_titles: List[str]) -> Set[str]:
+        """Return the titles that have any outgoing links, checking many titles per request."""
+        return await self._pages_with_links(page_titles, prop="links", prefix="pl")
+
+    async def pages_with_incoming_links(self, page_titles: List[str]) -> Set[str]:
+        """Return the titles that have any incoming links, checking many titles per request."""
+        return await self._pages_with_links(page_titles, prop="linkshere", prefix="lh")
+
+    async def _pages_with_links(self, page_titles: List[str], prop: str, prefix: str) -> Set[str]:
+        """
+        Multi-title version of has_outgoing_links/has_incoming_links.
+
+        The result limit is shared by all titles in a query, so continuations are
+        followed until every title has shown a link or the results run out. A
+        title without links would make that page through all the links of the
+        others, so after MAX_LINK_CHECK_CONTINUATIONS the titles still unresolved
+        are checked one by one with the single-title check (one link each).
+        Titles whose check fails are treated as having no links.
+        """
+        found: Set[str] = set()
+        unresolved: List[str] = []
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                for i in range(0, len(page_titles), self.MAX_TITLES_PER_QUERY):
+                    chunk = page_titles[i:i + self.MAX_TITLES_PER_QUERY]
+                    params = {
+                        "action": "query", "format": "json", "formatversion": "2", "prop": prop,
+                        "titles": "|".join(chunk), f"{prefix}limit": "max", f"{prefix}namespace": "0"
+                    }
+                    original_titles = {}
+                    found_in_chunk: Set[str] = set()
+                    missing: Set[str] = set()
+                    continue_params = {}
+                    continuations = 0
+                    while True:
+                        response = await client.get(self.base_url, params={**params, **continue_params})
+                        response.raise_for_status()
+                        data = response.json()
+                        query = data.get("query", {})
+                        for normalized in query.get("normalized", []):
+                            original_titles[normalized["to"]] = normalized["from"]
+                        for page in query.get("pages", []):
+                            if page.get(prop):
+                                found_in_chunk.add(page["title"])
+                            elif page.get("missing") or page.get("invalid"):
+                                missing.add(page["title"])
+                        continue_params = data.get("continue", {})
+                        if not continue_params or len(found_in_chunk) + len(missing) >= len(chunk):
+                            break
+                        if continuations == self.MAX_LINK_CHECK_CONTINUATIONS:
+                            resolved = {original_titles.get(title, title) for title in found_in_chunk | missing}
+                            unresolved.extend(title for title in chunk if title not in resolved)
+                            break
+                        continuations += 1
+                    found.update(original_titles.get(title, title) for title in found_in_chunk)
+        except httpx.RequestError as e:
+            self.logger.debug(f"Error checking {prop} for {len(page_titles)} pages: {e}")
+        
+        if unresolved:
+            check = self.has_outgoing_links if prop == "links" else self.has_incoming_links
+            results = await asyncio.gather(*[check(title) for title in unresolved])
+            found.update(title for title, has_links in zip(unresolved, results) if has_links)
+        self.logger.debug(f"{len(found)}/{len(page_titles)} pages have {prop} ({len(unresolved)} checked one by one)")
+        return found
+
     async def get_page(self, page_title: str, include_all_namespaces: bool = False) -> Page:
         """
         Fetch a full Wikipedia page, including all its links using pagination.
         """
+        with spans.span("wiki.page_fetch"):
+            return await self._get_page(page_title, include_all_namespaces)
+
+    async def _get_page(self, page_title: str, include_all_namespaces: bool) -> Page:
         all_links = []
         plcontinue = None
         page_info = {}
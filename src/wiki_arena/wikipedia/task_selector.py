@@ -6,7 +6,7 @@ Efficiently selects random Wikipedia tasks for games.
 
 import asyncio
 import logging
-from typing import Optional, List, Set
+from typing import Optional, List, Set, Tuple
 
 from ..models import Task
 from .live_service import LiveWikiService
@@ -17,8 +17,10 @@ class WikipediaTaskSelector:
     
     Algorithm:
     1. Get a batch of random pages from the service.
-    2. Find a valid start page from the batch (must have outgoing links).
-    3. Find a valid target page from the remaining candidates (must have incoming links).
+    2. Check the whole batch for outgoing and incoming links at once
+       (two concurrent multi-title requests).
+    3. Pick the first candidate with outgoing links as the start page and the first
+       other candidate with incoming links as the target page.
     
     This process minimizes direct API calls by using the dedicated service.
     """
@@ -53,19 +55,35 @@ class WikipediaTaskSelector:
     
     async def _find_valid_start_page(self, candidates: List[str]) -> Optional[str]:
         """Find first valid start page from candidates by checking for outgoing links."""
+        with_outgoing = await self.service.pages_with_outgoing_links(candidates)
+        return self._first_start_page(candidates, with_outgoing)
+    
+    async def _find_valid_target_page(self, candidates: List[str], exclude_page: str) -> Optional[str]:
+        """Find first valid target page from candidates by checking for incoming links."""
+        available_candidates = [p for p in candidates if p != exclude_page]
+        with_incoming = await self.service.pages_with_incoming_links(available_candidates)
+        return self._first_target_page(available_candidates, with_incoming, exclude_page)
+    
+    async def _validate_candidates(self, candidates: List[str]) -> Tuple[Set[str], Set[str]]:
+        """Find which candidates have outgoing and incoming links, checking both concurrently."""
+        with_outgoing, with_incoming = await asyncio.gather(
+            self.service.pages_with_outgoing_links(candidates),
+            self.service.pages_with_incoming_links(candidates),
+        )
+        return with_outgoing, with_incoming
+    
+    def _first_start_page(self, candidates: List[str], with_outgoing: Set[str]) -> Optional[str]:
         for page in candidates:
-            if await self.service.has_outgoing_links(page):
+            if page in with_outgoing:
                 self.logger.debug(f"Found valid start page: '{page}'")
                 return page
         
         self.logger.debug("No valid start page found in candidate batch.")
         return None
     
-    async def _find_valid_target_page(self, candidates: List[str], exclude_page: str) -> Optional[str]:
-        """Find first valid target page from candidates by checking for incoming links."""
-        available_candidates = [p for p in candidates if p != exclude_page]
-        for page in available_candidates:
-            if await self.service.has_incoming_links(page):
+    def _first_target_page(self, candidates: List[str], with_incoming: Set[str], exclude_page: str) -> Optional[str]:
+        for page in candidates:
+            if page != exclude_page and page in with_incoming:
                 self.logger.debug(f"Found valid target page: '{page}'")
                 return page
         
@@ -90,14 +108,16 @@ class WikipediaTaskSelector:
                     self.logger.debug(f"Not enough valid pages ({len(valid_pages)}) in attempt {attempt + 1}")
                     continue
                 
-                # Step 2: Find a valid start page
-                start_page = await self._find_valid_start_page(valid_pages)
+                # Step 2: Check the whole batch for outgoing and incoming links
+                with_outgoing, with_incoming = await self._validate_candidates(valid_pages)
+                
+                # Step 3: Pick a start page, then a different target page, in candidate order
+                start_page = self._first_start_page(valid_pages, with_outgoing)
                 if not start_page:
                     self.logger.debug(f"No valid start page found in attempt {attempt + 1}")
                     continue
                 
-                # Step 3: Find a valid target page from the remaining candidates
-                target_page = await self._find_valid_target_page(valid_pages, exclude_page=start_page)
+                target_page = self._first_target_page(valid_pages, with_incoming, exclude_page=start_page)
                 if not target_page:
                     self.logger.debug(f"No valid target page found in attempt {attempt + 1}")
                     continue
@@ -0,0 +1,49 @@
+"""
+Tests for access control on the admin endpoints.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api import admin
+
+
+@pytest.fixture
+def admin_config(monkeypatch):
+    monkeypatch.setattr(admin.config, "admin_token", None)
+    monkeypatch.setattr(admin.config, "admin_endpoints_open", False)
+    return admin.config
+
+
+def test_admin_endpoints_are_closed_without_a_token(admin_config):
+    with pytest.raises(HTTPException) as error:
+        admin.require_admin(None)
+    assert error.value.status_code == 403
+
+    admin_config.admin_endpoints_open = True
+    admin.require_admin(None)
+
+
+def test_admin_token_is_required_when_configured(admin_config):
+    admin_config.admin_token = "secret"
+    admin_config.admin_endpoints_open = True
+
+    for header in (None, "wrong"):
+        with pytest.raises(HTTPException):
+            admin.require_admin(header)
+    admin.require_admin("secret")
+
+
+def test_span_sample_rate_requires_admin(admin_config, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(admin.spans, "sample_rate", admin.spans.sample_rate)
+    app = FastAPI()
+    app.include_router(admin.router)
+    client = TestClient(app)
+
+    assert client.put("/api/admin/span-sample-rate", params={"rate": 0.5}).status_code == 403
+    admin_config.admin_token = "secret"
+    response = client.put("/api/admin/span-sample-rate", params={"rate": 0.5}, headers={"X-Admin-Token": "secret"})
+    assert response.json() == {"sample_rate": 0.5}
@@ -0,0 +1,323 @@
+"""
+Tests for the broker implementations and multi-worker WebSocket fan-out.
+
+The Redis broker runs against a small in-test stand-in server speaking the
+subset of the Redis protocol it uses.
+"""
+
+import asyncio
+import fnmatch
+import json
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from wiki_arena import GameEvent
+from backend.broker import InProcessBroker, RedisBroker, RespConnection, create_broker
+from backend.exceptions import BrokerException
+from backend.services.worker_affinity import WORKER_HEADER, WorkerAffinity
+from backend.websockets.game_hub import GameWebSocketManager
+
+
+class StandInRedisServer:
+    """Just enough of a Redis server: PING, AUTH, SELECT, SET (NX/XX/PX), GET, DEL, PUBLISH, PSUBSCRIBE."""
+
+    def __init__(self):
+        self.values = {}
+        self.subscribers = []  # (pattern, writer)
+        self.clients = []
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        for _, writer in self.subscribers:
+            writer.close()
+        await self.server.wait_closed()
+
+    def disconnect_clients(self):
+        """Drop every client connection, like a broker restart."""
+        for writer in self.clients:
+            writer.close()
+        self.clients.clear()
+        self.subscribers.clear()
+
+    async def _read_command(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2].decode())
+        return args
+
+    @staticmethod
+    def _bulk(value):
+        if value is None:
+            return b"$-1\r\n"
+        data = value.encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    def _get(self, key):
+        value, expires_at = self.values.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.values[key]
+            return None
+        return value
+
+    async def _serve(self, reader, writer):
+        self.clients.append(writer)
+        while True:
+            try:
+                args = await self._read_command(reader)
+            except (ConnectionError, ValueError):
+                args = None
+            if args is None:
+                writer.close()
+                break
+            command, rest = args[0].upper(), args[1:]
+            if command in ("PING", "AUTH", "SELECT"):
+                reply = b"+OK\r\n"
+            elif command == "SET":
+                key, value, options = rest[0], rest[1], [option.upper() for option in rest[2:]]
+                exists = self._get(key) is not None
+                if ("NX" in options and exists) or ("XX" in options and not exists):
+                    reply = b"$-1\r\n"
+                else:
+                    expires_at = time.monotonic() + int(rest[2 + options.index("PX") + 1]) / 1000 if "PX" in options else None
+                    self.values[key] = (value, expires_at)
+                    reply = b"+OK\r\n"
+            elif command == "GET":
+                reply = self._bulk(self._get(rest[0]))
+            elif command == "DEL":
+                reply = b":%d\r\n" % (self.values.pop(rest[0], None) is not None)
+            elif command == "PUBLISH":
+                channel, message = rest
+                receivers = [(p, w) for p, w in self.subscribers if fnmatch.fnmatchcase(channel, p)]
+                for pattern, subscriber in receivers:
+                    subscriber.write(
+                        b"*4\r\n" + self._bulk("pmessage") + self._bulk(pattern) + self._bulk(channel) + self._bulk(message)
+                    )
+                reply = b":%d\r\n" % len(receivers)
+            elif command == "PSUBSCRIBE":
+                self.subscribers.append((rest[0], writer))
+                reply = b"*3\r\n" + self._bulk("psubscribe") + self._bulk(rest[0]) + b":1\r\n"
+            else:
+                reply = b"-ERR unknown command\r\n"
+            if writer.is_closing():
+                break
+            writer.write(reply)
+            await writer.drain()
+
+
+@asynccontextmanager
+async def worker_brokers(kind: str):
+    """
+    Yields a factory of brokers that share messages, like the brokers of several workers.
+
+    (Set up inside the test: async fixtures run on a different event loop here.)
+    """
+    server = StandInRedisServer()
+    await server.start()
+    shared = InProcessBroker()
+    brokers = []
+
+    async def make():
+        if kind == "memory":
+            return shared
+        broker = RedisBroker(f"redis://127.0.0.1:{server.port}/0")
+        await broker.start()
+        brokers.append(broker)
+        return broker
+
+    try:
+        yield make
+    finally:
+        for broker in brokers:
+            await broker.stop()
+        await server.stop()
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        self.frames.append(json.loads(frame))
+
+
+class LocalStateCollector:
+    """State collector of a worker that only runs the games it was given."""
+
+    def __init__(self, game_ids):
+        self.game_ids = set(game_ids)
+        self.steps = {}
+
+    async def get_complete_state(self, game_id: str):
+        game = {"game_id": game_id, "steps": self.steps.get(game_id, 0)} if game_id in self.game_ids else None
+        return {"game": game, "solver_results": []}
+
+
+async def wait_until(condition, timeout: float = 1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.005)
+
+
+def test_create_broker_picks_implementation_from_url():
+    assert isinstance(create_broker(None), InProcessBroker)
+    assert isinstance(create_broker("memory://"), InProcessBroker)
+    broker = create_broker("redis://:secret@cache:6380/2")
+    assert isinstance(broker, RedisBroker)
+    assert (broker.host, broker.port, broker.password, broker.db) == ("cache", 6380, "secret", 2)
+    with pytest.raises(ValueError):
+        create_broker("kafka://broker")
+
+
+def test_resp_encoding():
+    assert RespConnection.encode("SET", "key", 5) == b"*3\r\n$3\r\nSET\r\n$3\r\nkey\r\n$1\r\n5\r\n"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["memory", "redis"])
+async def test_brokers_store_claim_and_publish_in_order(kind):
+    async with worker_brokers(kind) as broker_factory:
+        first, second = await broker_factory(), await broker_factory()
+        received = []
+
+        async def on_message(channel, message):
+            received.append((channel, message))
+
+        await second.subscribe("ws.*", on_message)
+
+        await first.set("plain", "value")
+        await first.set("short", "lived", ttl_s=0.05)
+        assert await second.get("plain") == "value"
+        assert await second.get("short") == "lived"
+        await asyncio.sleep(0.08)
+        assert await second.get("short") is None
+        await first.delete("plain")
+        assert await second.get("plain") is None
+
+        assert await first.claim("owner:game:g1", "worker-a", ttl_s=1) == "worker-a"
+        assert await second.claim("owner:game:g1", "worker-b", ttl_s=1) == "worker-a"
+        assert await first.claim("owner:game:g1", "worker-a", ttl_s=1) == "worker-a"
+
+        for i in range(5):
+            await first.publish("ws.game", f"message {i}")
+        await first.publish("other", "ignored")
+        await wait_until(lambda: len(received) == 5)
+        assert received == [("ws.game", f"message {i}") for i in range(5)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["memory", "redis"])
+async def test_clients_on_any_worker_receive_every_move(kind):
+    async with worker_brokers(kind) as broker_factory:
+        worker_a, worker_b = GameWebSocketManager(), GameWebSocketManager()
+        worker_a.state_collector = LocalStateCollector(["g1", "g2"])
+        worker_b.state_collector = LocalStateCollector([])
+        await worker_a.attach_broker(await broker_factory(), "worker-a", snapshot_interval_s=0.01)
+        await worker_b.attach_broker(await broker_factory(), "worker-b")
+
+        await worker_a.announce_task("t1", ["g1", "g2"])
+        await wait_until(lambda: "t1" in worker_b.task_games)
+
+        game_watcher = FakeWebSocket()
+        task_watcher = FakeWebSocket()
+        await worker_b.connect(game_watcher, "g1")
+        await worker_b.connect_task(task_watcher, "t1")
+
+        for step in range(1, 4):
+            worker_a.state_collector.steps["g1"] = step
+            await worker_a.broadcast_to_game("g1", {"type": "GAME_MOVE_COMPLETED", "game_id": "g1", "steps": step})
+        await worker_a.broadcast_to_task("t1", {"type": "TASK_ENDED", "task_id": "t1"})
+        await wait_until(lambda: len(game_watcher.frames) == 5 and len(task_watcher.frames) == 5)
+
+        assert [(f["type"], f["seq"]) for f in game_watcher.frames[1:]] == [
+            ("GAME_MOVE_COMPLETED", 1), ("GAME_MOVE_COMPLETED", 2), ("GAME_MOVE_COMPLETED", 3), ("TASK_ENDED", 4)
+        ]
+        assert [f["seq"] for f in task_watcher.frames[1:]] == [1, 2, 3, 4]
+
+        # A client joining on worker B gets worker A's stored snapshot and can resume from worker B's log
+        await worker_a.flush_snapshots()
+        late = FakeWebSocket()
+        await worker_b.connect(late, "g1")
+        assert late.frames[0]["seq"] == 4
+        assert late.frames[0]["complete_state"]["game"]["steps"] == 3
+        resumed = FakeWebSocket()
+        await worker_b.connect(resumed, "g1", since_seq=2)
+        assert [f["seq"] for f in resumed.frames[1:]] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_redis_broker_reconnects_and_resubscribes():
+    server = StandInRedisServer()
+    await server.start()
+    broker = RedisBroker(f"redis://127.0.0.1:{server.port}/0", max_backoff_s=0.05)
+    received = []
+
+    async def slow_callback(channel, message):
+        await asyncio.sleep(0.01)
+        received.append(message)
+
+    try:
+        await broker.start()
+        await broker.subscribe("ws.*", slow_callback)
+        await broker.publish("ws.game", "before")
+        await wait_until(lambda: received == ["before"])
+
+        server.disconnect_clients()
+        await asyncio.sleep(0.01)
+        # The first command finds the connection dead, the next one reconnects
+        with pytest.raises(BrokerException):
+            await broker.set("key", "value")
+        await asyncio.sleep(0.2)
+        await broker.set("key", "value")
+        assert await broker.get("key") == "value"
+
+        await wait_until(lambda: len(server.subscribers) == 1)
+        for i in range(3):
+            await broker.publish("ws.game", f"after {i}")
+        await wait_until(lambda: len(received) == 4)
+        assert received == ["before", "after 0", "after 1", "after 2"]
+        assert broker.reconnects == 2
+    finally:
+        await broker.stop()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["memory", "redis"])
+async def test_worker_affinity_claims_and_points_to_owner(kind):
+    async with worker_brokers(kind) as broker_factory:
+        worker_a = WorkerAffinity(await broker_factory(), "worker-a", ttl_s=0.3)
+        worker_b = WorkerAffinity(await broker_factory(), "worker-b", ttl_s=0.3)
+        await worker_a.start()
+
+        await worker_a.handle_task_selected(GameEvent(
+            type="task_selected", game_id="t1", data={"task_id": "t1", "game_ids": ["g1", "g2"]}
+        ))
+        # Renewed past the original ttl
+        await asyncio.sleep(0.4)
+
+        assert await worker_b.owner_of("game", "g2") == "worker-a"
+        misdirected = await worker_b.misdirected("game", "g1")
+        assert misdirected.status_code == 421
+        assert misdirected.headers[WORKER_HEADER] == "worker-a"
+        assert await worker_a.misdirected("game", "g1") is None
+
+        await worker_a.handle_game_ended(GameEvent(type="game_ended", game_id="g1", data={}))
+        assert await worker_b.owner_of("game", "g1") is None
+        await worker_a.stop()
+        assert await worker_b.owner_of("task", "t1") is None
@@ -0,0 +1,115 @@
+"""
+Tests for admitting games within the global and per-provider concurrency limits.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import Mock
+
+from backend.coordinators.game_coordinator import GameCoordinator
+from backend.coordinators.game_scheduler import GameScheduler
+from backend.models.api_models import GamePriority
+
+
+def submit_all(scheduler, games, launched):
+    for game_id, provider, priority in games:
+        scheduler.submit(game_id, provider, lambda game_id=game_id: launched.append(game_id), priority)
+
+
+def test_global_limit_queues_games_until_slots_free():
+    scheduler = GameScheduler(max_concurrent=2)
+    launched = []
+    submit_all(scheduler, [(f"g{i}", "openai", GamePriority.INTERACTIVE) for i in range(4)], launched)
+
+    assert launched == ["g0", "g1"]
+    assert list(scheduler.get_queue()) == ["g2", "g3"]
+    assert scheduler.get_queue()["g3"]["position"] == 2
+
+    scheduler.release("g0")
+    assert launched == ["g0", "g1", "g2"]
+    # Dropping a queued game does not free a slot
+    scheduler.release("g3")
+    scheduler.release("g1")
+    assert launched == ["g0", "g1", "g2"]
+    assert scheduler.get_stats()["running"] == 1
+    assert scheduler.get_stats()["queue_wait"]["interactive"]["count"] == 3
+
+
+def test_interactive_games_are_admitted_before_batch_games():
+    scheduler = GameScheduler(max_concurrent=1)
+    launched = []
+    submit_all(scheduler, [
+        ("running", "openai", GamePriority.BATCH),
+        ("batch_1", "openai", GamePriority.BATCH),
+        ("batch_2", "openai", GamePriority.BATCH),
+        ("interactive", "openai", GamePriority.INTERACTIVE),
+    ], launched)
+
+    assert list(scheduler.get_queue()) == ["interactive", "batch_1", "batch_2"]
+    scheduler.release("running")
+    scheduler.release("interactive")
+    assert launched == ["running", "interactive", "batch_1"]
+
+
+def test_provider_limit_does_not_block_other_providers():
+    scheduler = GameScheduler(max_concurrent=4, provider_limits={"anthropic": 1})
+    launched = []
+    submit_all(scheduler, [
+        ("a1", "anthropic", GamePriority.INTERACTIVE),
+        ("a2", "anthropic", GamePriority.INTERACTIVE),
+        ("o1", "openai", GamePriority.BATCH),
+    ], launched)
+
+    assert launched == ["a1", "o1"]
+    assert scheduler.get_stats()["running_by_provider"] == {"anthropic": 1, "openai": 1}
+    scheduler.release("a1")
+    assert launched == ["a1", "o1", "a2"]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_reports_queued_games_and_runs_them_as_slots_free():
+    coordinator = GameCoordinator(Mock(), Mock(), GameScheduler(max_concurrent=1))
+    finish = {}
+
+    def add_game(game_id):
+        finished = asyncio.Event()
+        finish[game_id] = finished
+        game = Mock()
+        game.config.model.provider = "random"
+        game.run = finished.wait
+        coordinator.active_games[game_id] = game
+
+    add_game("g1")
+    add_game("g2")
+    assert await coordinator.start_games(["g1", "g2"]) == 2
+    assert coordinator.get_active_games() == {"g1": "background", "g2": "queued"}
+
+    finish["g1"].set()
+    await asyncio.sleep(0.01)
+    assert coordinator.get_active_games() == {"g2": "background"}
+
+    await coordinator.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_does_not_launch_queued_games():
+    coordinator = GameCoordinator(Mock(), Mock(), GameScheduler(max_concurrent=1))
+    started = []
+
+    for game_id in ["g1", "g2"]:
+        game = Mock()
+        game.config.model.provider = "random"
+        game.run = lambda game_id=game_id: started.append(game_id) or asyncio.Event().wait()
+        coordinator.active_games[game_id] = game
+    await coordinator.start_games(["g1", "g2"])
+    await asyncio.sleep(0)
+
+    await coordinator.shutdown()
+    await asyncio.sleep(0)
+
+    assert started == ["g1"]
+    assert coordinator.background_tasks == {}
+    assert not [task for task in asyncio.all_tasks() if task.get_name().startswith("game:")]
+    coordinator.scheduler.submit("g3", "random", lambda: started.append("g3"))
+    assert started == ["g1"]
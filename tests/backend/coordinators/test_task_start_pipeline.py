@@ -0,0 +1,98 @@
+"""
+Tests for starting a task's games concurrently with its initial solve.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from wiki_arena import EventBus
+from wiki_arena.models import Page, Task
+from wiki_arena.solver import SolverResponse
+from backend.coordinators.task_coordinator import TaskCoordinator
+from backend.handlers.solver_handler import SolverHandler
+from backend.models.api_models import CreateTaskRequest, CustomTaskStrategy
+from backend.services import task_selector_service as selector_module
+
+
+class SlowSolver:
+    def __init__(self, delay_s: float, fail: bool = False):
+        self.delay_s = delay_s
+        self.fail = fail
+
+    async def find_shortest_path(self, start: str, target: str) -> SolverResponse:
+        await asyncio.sleep(self.delay_s)
+        if self.fail:
+            raise ValueError("No path found")
+        return SolverResponse(paths=[[start, target]], path_length=1, computation_time_ms=self.delay_s * 1000)
+
+
+@pytest.fixture(autouse=True)
+def fixed_task(monkeypatch):
+    async def select_task(strategy):
+        return Task(start_page_title="Start", target_page_title="Target")
+
+    monkeypatch.setattr(selector_module.task_selector_service, "select_task", select_task)
+
+
+def build(solver, solve_wait_ms):
+    """Wire coordinators and solver handler like the app lifespan does."""
+    event_bus = EventBus()
+    timeline = []
+
+    game_coordinator = Mock()
+    game_coordinator.wiki_service = Mock(get_page=AsyncMock(return_value=Page(title="Start", url="https://example")))
+    game_coordinator.setup_game = AsyncMock(side_effect=["game_1", "game_2"])
+
+    async def start_games(game_ids, background=True, priority=None):
+        timeline.append(("games_started", tuple(game_ids)))
+        return len(game_ids)
+
+    game_coordinator.start_games = start_games
+    coordinator = TaskCoordinator(event_bus, game_coordinator, solve_wait_ms=solve_wait_ms)
+    solver_handler = SolverHandler(event_bus, solver)
+
+    async def record(event):
+        timeline.append((event.type, event.data.get("shortest_path_length")))
+
+    event_bus.subscribe("task_selected", solver_handler.handle_task_selected)
+    event_bus.subscribe("task_solved", coordinator.handle_task_solved)
+    event_bus.subscribe("task_solved", record)
+    event_bus.subscribe("task_solve_failed", coordinator.handle_task_solve_failed)
+    event_bus.subscribe("task_solve_failed", record)
+    return coordinator, timeline
+
+
+def request() -> CreateTaskRequest:
+    return CreateTaskRequest(task_strategy=CustomTaskStrategy(), model_names=["random", "random"])
+
+
+@pytest.mark.asyncio
+async def test_slow_solve_does_not_delay_game_start():
+    coordinator, timeline = build(SlowSolver(delay_s=0.2), solve_wait_ms=20)
+
+    await asyncio.wait_for(coordinator.create_task(request()), timeout=0.1)
+    await asyncio.sleep(0.3)
+
+    assert timeline == [("games_started", ("game_1", "game_2")), ("task_solved", 1)]
+
+
+@pytest.mark.asyncio
+async def test_fast_solve_starts_games_without_waiting_out_the_timeout():
+    coordinator, timeline = build(SlowSolver(delay_s=0.01), solve_wait_ms=5000)
+
+    await coordinator.create_task(request())
+    await asyncio.sleep(0.1)
+
+    assert timeline == [("task_solved", 1), ("games_started", ("game_1", "game_2"))]
+
+
+@pytest.mark.asyncio
+async def test_failed_solve_releases_games_waiting_indefinitely():
+    coordinator, timeline = build(SlowSolver(delay_s=0.01, fail=True), solve_wait_ms=None)
+
+    await coordinator.create_task(request())
+    await asyncio.sleep(0.1)
+
+    assert timeline == [("task_solve_failed", None), ("games_started", ("game_1", "game_2"))]
@@ -9,7 +9,8 @@ import logging
 from typing import List
 
 from wiki_arena import EventBus, GameEvent
-from wiki_arena.models import GameState, GameConfig, ModelConfig, Page, Move, GameStatus
+from wiki_arena.models import GameState, GameConfig, ModelConfig, Page, Move, GameStatus, Task
+from wiki_arena.solver import SolverResponse
 from backend.handlers import SolverHandler
 
 logger = logging.getLogger(__name__)
@@ -245,4 +246,80 @@ class TestSolverHandler:
         for expected_id in expected_ids:
             assert expected_id in game_ids, f"Missing result for {expected_id}"
         
-        assert len(analysis_results) >= 3, f"Expected at least 3 results, got {len(analysis_results)}" 
\ No newline at end of file
+        assert len(analysis_results) >= 3, f"Expected at least 3 results, got {len(analysis_results)}" 
+
+class SlowSolver:
+    """Solves every path with length 1 after `delay` seconds."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.cancelled = 0
+
+    async def find_shortest_path(self, start: str, target: str):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return SolverResponse(paths=[[start, target]], path_length=1, computation_time_ms=0.0)
+
+
+def move_event(game_id: str, page: str) -> GameEvent:
+    config = GameConfig(
+        start_page_title="Start", target_page_title="Target", model=ModelConfig(provider="random", model_name="random")
+    )
+    state = GameState(game_id=game_id, config=config, current_page=Page(title=page, url=f"https://example/{page}"))
+    return GameEvent(
+        type="move_completed", game_id=game_id,
+        data={"game_state": state, "move": Move(step=1, from_page_title="Start", to_page_title=page)}
+    )
+
+
+@pytest.mark.asyncio
+async def test_game_end_drops_cached_paths_and_cancels_move_solves():
+    solver = SlowSolver()
+    handler = SolverHandler(EventBus(), solver)
+    await handler.handle_move_completed(move_event("game", "Middle"))
+    await asyncio.sleep(0.01)
+    assert handler.get_cached_results("game")[0]["optimal_path_length"] == 1
+
+    solver.delay = 10
+    await handler.handle_move_completed(move_event("game", "Other"))
+    await asyncio.sleep(0)
+    await handler.handle_game_ended(GameEvent(type="game_ended", game_id="game", data={}))
+    await asyncio.sleep(0)
+
+    assert solver.cancelled == 1
+    assert handler.cache == {} and handler.move_solves == {}
+
+
+@pytest.mark.asyncio
+async def test_moves_handled_after_the_game_ended_are_not_solved():
+    solver = SlowSolver(delay=0.01)
+    handler = SolverHandler(EventBus(), solver)
+    solve = asyncio.create_task(handler._find_shortest_paths("game", "Middle", "Target"))
+    await asyncio.sleep(0)
+    # The game ends while this solve runs outside move_solves, and its last move is handled after that
+    await handler.handle_game_ended(GameEvent(type="game_ended", game_id="game", data={}))
+    await handler.handle_move_completed(move_event("game", "Other"))
+    await solve
+
+    assert handler.cache == {} and handler.move_solves == {}
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_running_solves():
+    solver = SlowSolver(delay=10)
+    handler = SolverHandler(EventBus(), solver)
+    await handler.handle_move_completed(move_event("game", "Middle"))
+    await handler.handle_task_selected(GameEvent(
+        type="task_selected", game_id="task",
+        data={"task": Task(start_page_title="Start", target_page_title="Target"), "task_id": "task", "game_ids": ["game"]}
+    ))
+    await asyncio.sleep(0)
+
+    await handler.shutdown()
+
+    assert solver.cancelled == 2
+    assert handler.task_solves == {} and handler.move_solves == {}
+    assert not [task for task in asyncio.all_tasks() if task.get_name().startswith("solve-")]
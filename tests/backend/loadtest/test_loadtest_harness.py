@@ -0,0 +1,148 @@
+"""
+Tests for the load test pieces: the fake MediaWiki API, the fake model and the report logic.
+"""
+
+from pathlib import Path
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+from backend.loadtest.fake_wiki import FakeWikiGraph, create_app
+from backend.loadtest.harness import (
+    LevelResult,
+    LoadTestConfig,
+    LoadTestReport,
+    TimelinePoint,
+    compare_to_baseline,
+    find_ceiling,
+    percentiles,
+)
+from wiki_arena.language_models import FakeModel
+from wiki_arena.models import GameConfig, GameState, ModelConfig, Page
+from wiki_arena.solver import StaticSolverDB
+from wiki_arena.wikipedia import LiveWikiService
+
+
+async def test_live_service_reads_fake_wiki():
+    # More links than one response holds, so get_page has to follow plcontinue
+    graph = FakeWikiGraph(num_pages=700, links_per_page=520, seed=1)
+    async with TestServer(create_app(graph)) as server:
+        service = LiveWikiService(base_url=str(server.make_url("/w/api.php")))
+        await check_live_service(graph, service)
+
+
+async def check_live_service(graph: FakeWikiGraph, service: LiveWikiService):
+    page = await service.get_page("Page 3")
+    assert page.title == "Page 3"
+    assert page.links == [graph.title(other) for other in graph.links[3]]
+
+    assert await service.has_outgoing_links("Page 3")
+    assert await service.has_incoming_links("Page 3")
+    assert await service.pages_with_outgoing_links(["Page 1", "Page 2", "Nowhere"]) == {"Page 1", "Page 2"}
+    assert len(await service.get_random_pages(5)) == 5
+    with pytest.raises(ValueError):
+        await service.get_page("Nowhere")
+
+
+async def test_fake_graph_sqlite_matches_graph(tmp_path):
+    graph = FakeWikiGraph(num_pages=50, links_per_page=5, seed=2)
+    graph.write_sqlite(tmp_path / "wiki_graph.sqlite")
+    db = StaticSolverDB(str(tmp_path / "wiki_graph.sqlite"))
+
+    page_id = await db.get_page_id("Page 7")
+    assert page_id == 8
+    assert await db.get_outgoing_links(page_id) == [other + 1 for other in graph.links[7]]
+    assert await db.get_incoming_links(page_id) == [other + 1 for other in graph.backlinks[7]]
+
+
+async def test_fake_model_is_deterministic_and_takes_the_target():
+    model = FakeModel(ModelConfig(
+        provider="fake", model_name="fake", input_cost_per_1m_tokens=0, output_cost_per_1m_tokens=0,
+        settings={"latency_ms": 0, "seed": 3, "input_tokens": 10, "output_tokens": 2},
+    ))
+    tools = [{"name": "navigate"}]
+
+    def state(links):
+        return GameState(
+            game_id="game-1",
+            config=GameConfig(start_page_title="Start", target_page_title="Target", model=model.model_config),
+            current_page=Page(title="Start", url="http://test.com", links=links),
+        )
+
+    links = [f"Link {i}" for i in range(100)]
+    first = await model.generate_response(tools, [], state(links))
+    second = await model.generate_response(tools, [], state(links))
+    assert first.tool_calls[0].arguments == second.tool_calls[0].arguments
+    assert first.metrics.total_tokens == 12
+
+    winning = await model.generate_response(tools, [], state(links + ["Target"]))
+    assert winning.tool_calls[0].arguments == {"to_page_title": "Target"}
+
+    by_index = await model.generate_response([{"name": "navigate_by_index"}], [], state(["A", "Target"]))
+    assert by_index.tool_calls[0].arguments == {"link_index": 2}
+
+
+def level(concurrency: int, move_p95: float, lag_p99: float, tasks_per_s: float = 1.0, errors: int = 0) -> LevelResult:
+    return LevelResult(
+        concurrency=concurrency,
+        elapsed_s=10.0,
+        moves=100,
+        tasks_per_s=tasks_per_s,
+        move_latency_ms={"p95": move_p95},
+        loop_lag_ms={"p99": lag_p99},
+        errors=errors,
+    )
+
+
+def test_percentiles():
+    stats = percentiles([float(i) for i in range(1, 101)])
+    assert stats["p50"] == 51.0
+    assert stats["p99"] == 100.0
+    assert percentiles([])["p95"] is None
+
+
+def test_ceiling_is_highest_level_within_slos():
+    config = LoadTestConfig(lag_slo_ms=100, max_slowdown=0.5)
+    levels = [
+        level(1, move_p95=300, lag_p99=10),
+        level(2, move_p95=400, lag_p99=50),
+        level(4, move_p95=440, lag_p99=100, errors=1),
+        level(8, move_p95=800, lag_p99=50),
+        level(16, move_p95=440, lag_p99=250),
+    ]
+    assert find_ceiling(levels, config) == 2
+    assert find_ceiling([], config) is None
+
+
+def test_compare_to_baseline_reports_regressions():
+    config = LoadTestConfig()
+    baseline = LoadTestReport(config=config, levels=[level(1, 300, 10), level(2, 350, 20)], ceiling=2)
+
+    same = LoadTestReport(config=config, levels=[level(1, 310, 10), level(2, 360, 20)], ceiling=2)
+    assert compare_to_baseline(same, baseline) == []
+
+    worse = LoadTestReport(config=config, levels=[level(1, 300, 10), level(2, 500, 20, tasks_per_s=0.5)], ceiling=1)
+    regressions = compare_to_baseline(worse, baseline)
+    assert len(regressions) == 3
+    assert "ceiling dropped from 2 to 1" in regressions
+
+
+def test_summary_report_leaves_out_timelines(tmp_path):
+    report = LoadTestReport(config=LoadTestConfig(), levels=[level(1, 300, 10)], ceiling=1)
+    report.levels[0].timeline = [TimelinePoint(t_s=0.0, rss_mb=120.0, loop_lag_ms=12.0)]
+
+    report.save(tmp_path / "full.json")
+    report.save(tmp_path / "summary.json", summary=True)
+
+    assert LoadTestReport.load(tmp_path / "full.json").levels[0].timeline == report.levels[0].timeline
+    summary = LoadTestReport.load(tmp_path / "summary.json")
+    assert summary.levels[0].timeline == [] and summary.levels[0].move_latency_ms == report.levels[0].move_latency_ms
+    assert '"timeline"' not in (tmp_path / "summary.json").read_text()
+
+
+def test_committed_baseline_holds_only_rounded_summaries():
+    baseline_path = Path(__file__).parents[3] / "src" / "backend" / "loadtest" / "baseline.json"
+    baseline = LoadTestReport.load(baseline_path)
+
+    assert baseline.levels and all(not level.timeline for level in baseline.levels)
+    assert all(value == round(value, 2) for level in baseline.levels for value in level.loop_lag_ms.values() if value is not None)
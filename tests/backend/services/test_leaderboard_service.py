@@ -0,0 +1,136 @@
+"""
+Tests for the incremental leaderboard and the service feeding it from game_ended events.
+"""
+
+import asyncio
+import random
+from datetime import datetime
+
+import pytest
+
+from wiki_arena import GameEvent
+from wiki_arena.models import ErrorType, GameConfig, GameError, GameResult, GameState, GameStatus, ModelConfig, Move, Page
+from wiki_arena.ratings import IncrementalLeaderboard, LeaderboardGenerator
+from wiki_arena.storage import GameRepository, GameStorageService, GameSummary, StorageConfig
+from backend.services.leaderboard_service import LeaderboardService
+
+
+def game_state(game_id: str, model_name: str, steps: int, target: str = "Target") -> GameState:
+    return GameState(
+        game_id=game_id,
+        config=GameConfig(
+            start_page_title="Start",
+            target_page_title=target,
+            model=ModelConfig(provider="test", model_name=model_name),
+        ),
+        current_page=Page(title=target, url=f"https://example/{target}"),
+        steps=steps,
+        status=GameStatus.WON,
+    )
+
+
+def random_games(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        game_state(f"game_{i}", f"model_{rng.randrange(6)}", rng.randrange(2, 9), target=f"Target {rng.randrange(15)}")
+        for i in range(count)
+    ]
+
+
+class SummarySource:
+    def __init__(self, summaries):
+        self.summaries = summaries
+
+    def get_summaries(self):
+        return self.summaries
+
+
+def test_incremental_ratings_match_a_full_rebuild():
+    states = random_games(120)
+    leaderboard = IncrementalLeaderboard()
+    for state in states[:80]:
+        leaderboard.add_game(GameSummary.from_game_state(state))
+    leaderboard.refresh()
+    first_iterations = leaderboard.last_iterations
+    for state in states[80:]:
+        leaderboard.add_game(GameSummary.from_game_state(state))
+    assert leaderboard.stale
+    ratings = leaderboard.refresh()
+
+    rebuilt = LeaderboardGenerator(SummarySource([GameSummary.from_game_state(s) for s in states])).generate_elo_ratings()
+    assert ratings == rebuilt
+    assert leaderboard.last_iterations < first_iterations  # warm start
+    assert not leaderboard.stale
+    assert leaderboard.refresh() is ratings  # nothing new, nothing refitted
+    assert leaderboard.refresh_count == 2
+
+    board = leaderboard.get_leaderboard()
+    assert [entry["rank"] for entry in board] == list(range(1, len(board) + 1))
+    assert [entry["elo"] for entry in board] == sorted(ratings.values(), reverse=True)
+    assert sum(entry["games"] for entry in board) == 120
+
+
+def test_duplicate_games_are_ignored():
+    leaderboard = IncrementalLeaderboard()
+    summary = GameSummary.from_game_state(game_state("g1", "alpha", 3))
+    assert leaderboard.add_game(summary)
+    assert not leaderboard.add_game(summary)
+    assert leaderboard.add_games([summary, GameSummary.from_game_state(game_state("g2", "beta", 4))]) == 1
+    assert leaderboard.refresh() == {"alpha": 1320, "beta": -2400}
+
+
+@pytest.mark.asyncio
+async def test_service_loads_stored_games_and_coalesces_refreshes(tmp_path):
+    storage_config = StorageConfig(storage_dir=str(tmp_path), enable_summary_csv=False)
+    storage = GameStorageService(storage_config)
+    stored = random_games(40, seed=1)
+    for state in stored:
+        storage.store_game(GameResult.from_game_state(state))
+
+    service = LeaderboardService(storage_config, refresh_delay_ms=20)
+    await service.start()
+    assert service.get_leaderboard()["loaded"]
+    assert service.get_stats()["games"] == 40
+    assert service.get_stats()["refreshes"] == 1
+
+    new_games = [game_state(f"new_{i}", f"model_{i % 3}", 2 + i % 4, target="Target 0") for i in range(5)]
+    for state in new_games + stored[:2]:  # already stored games are not counted twice
+        await service.handle_game_ended(GameEvent(type="game_ended", game_id=state.game_id, data={"game_state": state}))
+    assert service.get_leaderboard()["pending_games"]
+
+    deadline = asyncio.get_running_loop().time() + 2
+    while service.get_leaderboard()["pending_games"]:
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+    assert service.get_stats()["refreshes"] == 2
+    assert service.get_stats()["games"] == 45
+
+    for state in new_games:
+        storage.store_game(GameResult.from_game_state(state))
+    expected = LeaderboardGenerator(GameRepository(storage_config)).generate_elo_ratings()
+    assert {entry["model_name"]: entry["elo"] for entry in service.get_leaderboard()["ratings"]} == expected
+    await service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_service_skips_games_the_storage_filters_out(tmp_path):
+    storage_config = StorageConfig(
+        storage_dir=str(tmp_path), store_lost_games=False, excluded_error_types=[ErrorType.PROVIDER_RATE_LIMIT]
+    )
+    service = LeaderboardService(storage_config)
+    won = game_state("won", "alpha", 3)
+    lost = game_state("lost", "beta", 30)
+    lost.status = GameStatus.LOST_MAX_STEPS
+    rate_limited = game_state("rate_limited", "beta", 2)
+    rate_limited.status = GameStatus.ERROR
+    rate_limited.move_history = [
+        Move(step=1, from_page_title="Start", error=GameError(type=ErrorType.PROVIDER_RATE_LIMIT, message="slow down"))
+    ]
+
+    for state in [won, lost, rate_limited]:
+        await service.handle_game_ended(GameEvent(type="game_ended", game_id=state.game_id, data={"game_state": state}))
+
+    assert service.get_stats()["games"] == 1
+    assert [GameStorageService(storage_config).should_store_game(GameResult.from_game_state(state))
+            for state in [won, lost, rate_limited]] == [True, False, False]
+    await service.shutdown()
@@ -0,0 +1,116 @@
+"""
+Tests for the pre-warmed TaskPool and its use by TaskCoordinator.
+"""
+
+import asyncio
+import itertools
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from wiki_arena import EventBus
+from wiki_arena.models import Page, Task
+from wiki_arena.solver import SolverResponse
+from backend.coordinators.task_coordinator import TaskCoordinator
+from backend.models.api_models import CreateTaskRequest, RandomTaskStrategy
+from backend.services import task_pool as task_pool_module
+from backend.services.task_pool import TaskPool
+
+
+class FakeWikiService:
+    async def get_page(self, title: str) -> Page:
+        await asyncio.sleep(0.001)
+        return Page(title=title, url=f"https://example/{title}", links=["Target"])
+
+
+class FakeSolver:
+    async def find_shortest_path(self, start: str, target: str) -> SolverResponse:
+        return SolverResponse(paths=[[start, target]], path_length=1, computation_time_ms=0.1)
+
+
+@pytest.fixture
+def selected_tasks(monkeypatch):
+    """Every selection returns a new task; set `fail` to make selection fail."""
+    counter = itertools.count()
+    state = {"fail": False}
+
+    async def select_task(strategy):
+        await asyncio.sleep(0.001)
+        if state["fail"]:
+            return None
+        return Task(start_page_title=f"Start {next(counter)}", target_page_title="Target")
+
+    monkeypatch.setattr(task_pool_module.task_selector_service, "select_task", select_task)
+    return state
+
+
+async def wait_until(condition, timeout: float = 1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_pool_fills_and_refills_after_each_draw(selected_tasks):
+    pool = TaskPool(FakeWikiService(), FakeSolver(), size=3)
+    await pool.start()
+    await wait_until(lambda: pool.get_stats()["ready"] == 3)
+
+    prepared = pool.take()
+
+    assert prepared.start_page.title == prepared.task.start_page_title
+    assert prepared.solver_result.path_length == 1
+    await wait_until(lambda: pool.get_stats()["ready"] == 3)
+    stats = pool.get_stats()
+    assert stats["hits"] == 1 and stats["hit_rate"] == 1.0
+    assert stats["refills_completed"] == 4
+    assert stats["avg_refill_latency_ms"] > 0
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_empty_pool_counts_misses_and_backs_off_on_failures(selected_tasks):
+    selected_tasks["fail"] = True
+    pool = TaskPool(FakeWikiService(), size=2, retry_delay_s=10)
+    await pool.start()
+    await wait_until(lambda: pool.refills_failed == 2)
+
+    assert pool.take() is None
+    await asyncio.sleep(0.01)
+
+    stats = pool.get_stats()
+    assert stats["misses"] == 1 and stats["hit_rate"] == 0.0
+    # Failed refills wait out the retry delay instead of retrying immediately
+    assert stats["refills_failed"] == 2
+    await pool.stop()
+    assert pool.get_stats()["refills_in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_task_coordinator_uses_pool_for_matching_random_strategy(selected_tasks):
+    pool = TaskPool(FakeWikiService(), FakeSolver(), size=1)
+    await pool.start()
+    await wait_until(lambda: pool.get_stats()["ready"] == 1)
+
+    game_coordinator = Mock()
+    game_coordinator.wiki_service = FakeWikiService()
+    game_coordinator.setup_game = AsyncMock(side_effect=lambda **kwargs: f"game_{kwargs['start_page'].title}")
+    event_bus = EventBus()
+    published = []
+    event_bus.subscribe("task_selected", lambda event: published.append(event) or asyncio.sleep(0))
+    coordinator = TaskCoordinator(event_bus, game_coordinator, pool)
+
+    pooled = await coordinator.create_task(CreateTaskRequest(task_strategy=RandomTaskStrategy(), model_names=["random"]))
+    # A random strategy with other settings than the pool's is selected on demand
+    other = await coordinator.create_task(CreateTaskRequest(
+        task_strategy=RandomTaskStrategy(language="de"), model_names=["random"]
+    ))
+
+    assert pooled.start_page == "Start 0"
+    assert published[0].data["solver_result"].path_length == 1
+    assert other.start_page != "Start 0"
+    assert published[1].data["solver_result"] is None
+    assert pool.hits == 1 and pool.misses == 0
+    await coordinator.shutdown()
+    await pool.stop()
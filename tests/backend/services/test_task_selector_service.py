@@ -1,7 +1,10 @@
 import pytest
 from unittest.mock import Mock, AsyncMock
-from backend.services.task_selector_service import CustomTaskSelector
-from backend.models.api_models import CustomTaskStrategy
+from pydantic import ValidationError
+from backend.config import config
+from backend.services.task_selector_service import CorpusTaskSelector, CustomTaskSelector, task_selector_service
+from backend.models.api_models import CorpusTaskStrategy, CreateTaskRequest, CustomTaskStrategy
+from wiki_arena.solver import TaskCorpus
 from wiki_arena.models import Task
 
 class TestCustomTaskSelector:
@@ -106,6 +109,22 @@ class TestCustomTaskSelector:
         
         assert task is None
     
+    @pytest.mark.asyncio
+    async def test_no_pages_provided_uses_one_random_batch(self, mock_service):
+        """Test that fully random custom tasks validate a single batch with multi-title checks."""
+        selector = CustomTaskSelector(CustomTaskStrategy())
+        selector.wiki = mock_service
+        mock_service.get_random_pages.return_value = ["Philosophy", "Science"]
+        mock_service.pages_with_outgoing_links = AsyncMock(return_value={"Philosophy", "Science"})
+        mock_service.pages_with_incoming_links = AsyncMock(return_value={"Philosophy", "Science"})
+        
+        task = await selector.select_task()
+        
+        assert (task.start_page_title, task.target_page_title) == ("Philosophy", "Science")
+        mock_service.get_random_pages.assert_called_once()
+        mock_service.has_outgoing_links.assert_not_called()
+        mock_service.has_incoming_links.assert_not_called()
+    
     def test_get_strategy_info_both_pages(self):
         """Test strategy info when both pages are provided."""
         strategy = CustomTaskStrategy(start_page="Philosophy", target_page="Science")
@@ -140,4 +159,49 @@ class TestCustomTaskSelector:
         assert info["strategy"] == "custom"
         assert info["start_page"] == "random"
         assert info["target_page"] == "random"
-        assert info["language"] == "en" 
\ No newline at end of file
+        assert info["language"] == "en" 
+
+
+class TestCorpusTaskSelector:
+    """Test drawing tasks from a precomputed corpus."""
+
+    @pytest.fixture
+    def corpus_dir(self, tmp_path, monkeypatch):
+        TaskCorpus({2: [("Cat", "Dog")], 4: [("Philosophy", "Science")]}).save(tmp_path / "task_corpus.tsv")
+        monkeypatch.setattr(config, "corpus_dir", str(tmp_path))
+        return tmp_path
+
+    def test_request_parses_corpus_strategy(self):
+        request = CreateTaskRequest(task_strategy={"type": "corpus", "path_length": 3}, model_names=["random"])
+        assert isinstance(request.task_strategy, CorpusTaskStrategy)
+
+        request = CreateTaskRequest(task_strategy={"type": "random"}, model_names=["random"])
+        assert not isinstance(request.task_strategy, CorpusTaskStrategy)
+
+    def test_corpus_names_cannot_leave_the_corpus_directory(self):
+        for name in ("../secrets", "/etc/passwd", "a/b", ""):
+            with pytest.raises(ValidationError):
+                CorpusTaskStrategy(type="corpus", corpus=name)
+
+    @pytest.mark.asyncio
+    async def test_draws_task_of_requested_length(self, corpus_dir):
+        strategy = CorpusTaskStrategy(type="corpus", path_length=4)
+
+        task = await task_selector_service.select_task(strategy)
+
+        assert (task.start_page_title, task.target_page_title) == ("Philosophy", "Science")
+        assert CorpusTaskSelector(strategy).get_strategy_info()["path_length"] == "4"
+
+    @pytest.mark.asyncio
+    async def test_missing_length_or_file_returns_none(self, corpus_dir):
+        assert await CorpusTaskSelector(CorpusTaskStrategy(type="corpus", path_length=3)).select_task() is None
+        assert await CorpusTaskSelector(CorpusTaskStrategy(type="corpus", corpus="missing")).select_task() is None
+
+    @pytest.mark.asyncio
+    async def test_corpus_cache_is_bounded(self, corpus_dir):
+        for i in range(CorpusTaskSelector.MAX_CACHED_CORPORA + 2):
+            TaskCorpus({2: [("Cat", "Dog")]}).save(corpus_dir / f"corpus_{i}.tsv")
+            assert await CorpusTaskSelector(CorpusTaskStrategy(type="corpus", corpus=f"corpus_{i}")).select_task()
+
+        assert len(CorpusTaskSelector._corpora) == CorpusTaskSelector.MAX_CACHED_CORPORA
+        assert corpus_dir / "corpus_0.tsv" not in CorpusTaskSelector._corpora
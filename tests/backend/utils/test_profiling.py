@@ -0,0 +1,85 @@
+"""
+Tests for the runtime diagnostics: sampling profiler, loop lag monitor and task ages.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.utils.profiling import LoopLagMonitor, SamplingProfiler, TaskAgeTracker
+
+
+def blocking_work(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiler_samples_target_thread():
+    stop = threading.Event()
+    worker = threading.Thread(target=blocking_work, args=(stop,))
+    worker.start()
+    try:
+        profiler = SamplingProfiler(thread_id=worker.ident, interval_s=0.001)
+        profiler.run(0.2)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profiler.samples > 10
+    collapsed = profiler.collapsed()
+    assert "blocking_work" in collapsed
+    top_line = collapsed.splitlines()[0]
+    assert int(top_line.rsplit(" ", 1)[1]) > 0
+
+    document = profiler.speedscope()
+    frames = document["shared"]["frames"]
+    profile = document["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"]) == len(profiler.stacks)
+    assert any(frame["name"] == "blocking_work" for frame in frames)
+    assert all(index < len(frames) for sample in profile["samples"] for index in sample)
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_sees_blocking_call():
+    monitor = LoopLagMonitor(interval_s=0.01, stall_threshold_s=0.05)
+    monitor.start()
+    await asyncio.sleep(0.03)
+    time.sleep(0.1)  # blocks the loop
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+
+    stats = monitor.get_stats()
+    assert stats["max_ms"] >= 80
+    assert stats["stalls"] >= 1
+    assert not stats["running"]
+
+
+@pytest.mark.asyncio
+async def test_pending_tasks_oldest_first():
+    tracker = TaskAgeTracker()
+    tracker.install()
+    try:
+        async def run_game():
+            await asyncio.sleep(10)
+
+        old = asyncio.create_task(run_game(), name="game:old")
+        await asyncio.sleep(0.02)
+        new = asyncio.create_task(asyncio.sleep(10), name="solve-move:new")
+        await asyncio.sleep(0)
+
+        tasks = tracker.pending_tasks(limit=1000)
+        names = [task["name"] for task in tasks]
+        assert names.index("game:old") < names.index("solve-move:new")
+        assert tasks[names.index("game:old")]["age_s"] >= 0.02
+        assert [task["name"] for task in tracker.pending_tasks(prefix="game:")] == ["game:old"]
+        assert tracker.get_stats()["by_name_prefix"]["game"] == 1
+        # Where the game waits (in asyncio.sleep), not the line of run_game awaiting it
+        assert tasks[names.index("game:old")]["waiting_at"].startswith(asyncio.tasks.__file__)
+    finally:
+        tracker.uninstall()
+        for task in (old, new):
+            task.cancel()
+        await asyncio.gather(old, new, return_exceptions=True)
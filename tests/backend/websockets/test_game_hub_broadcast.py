@@ -0,0 +1,104 @@
+"""
+Tests for GameWebSocketManager broadcast fan-out (encode once, concurrent sends, send timeouts).
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from wiki_arena.models import GameStatus, Page
+from backend.websockets.game_hub import GameWebSocketManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay_s: float = 0.0, fail: bool = False):
+        self.delay_s = delay_s
+        self.fail = fail
+        self.frames = []
+        self.received_at = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+    async def send_text(self, frame: str):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        await asyncio.sleep(self.delay_s)
+        self.frames.append(frame)
+        self.received_at.append(asyncio.get_running_loop().time())
+
+
+async def connect_all(manager, game_id, websockets):
+    for websocket in websockets:
+        await manager.connect(websocket, game_id)
+        websocket.frames.clear()
+        websocket.received_at.clear()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_encodes_once_and_sends_identical_frames():
+    manager = GameWebSocketManager()
+    websockets = [FakeWebSocket() for _ in range(5)]
+    await connect_all(manager, "game", websockets)
+
+    encoded = []
+    encode = manager._encode_message
+    manager._encode_message = lambda message: encoded.append(message) or encode(message)
+
+    timestamp = datetime(2025, 1, 1, 12, 0)
+    await manager.broadcast_to_game("game", {
+        "type": "GAME_MOVE_COMPLETED",
+        "status": GameStatus.IN_PROGRESS,
+        "page": Page(title="Alpha", url="https://example/Alpha", links=["Beta"]),
+        "timestamp": timestamp,
+    })
+
+    assert len(encoded) == 1
+    assert len({websocket.frames[0] for websocket in websockets}) == 1
+    data = json.loads(websockets[0].frames[0])
+    assert data["status"] == GameStatus.IN_PROGRESS.value
+    assert data["page"]["links"] == ["Beta"]
+    assert data["timestamp"].startswith("2025-01-01T12:00:00")
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_stall_others_and_is_dropped():
+    manager = GameWebSocketManager(send_timeout_s=0.05)
+    fast = [FakeWebSocket(delay_s=0.001) for _ in range(3)]
+    slow = FakeWebSocket()
+    await connect_all(manager, "game", fast + [slow])
+    slow.delay_s = 1.0
+
+    started = asyncio.get_running_loop().time()
+    await manager.broadcast_to_game("game", {"type": "GAME_MOVE_COMPLETED"})
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert elapsed < 0.5
+    assert all(websocket.received_at[0] - started < 0.04 for websocket in fast)
+    assert slow not in manager.connection_games
+    assert slow.close_code == 1013
+    assert manager.get_connection_count("game") == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_connections_are_removed():
+    manager = GameWebSocketManager()
+    healthy = FakeWebSocket()
+    broken = FakeWebSocket()
+    await connect_all(manager, "game", [healthy, broken])
+    broken.fail = True
+
+    await manager.broadcast_to_game("game", {"type": "GAME_ENDED"})
+    assert manager.get_connection_count("game") == 1
+    assert healthy.frames and broken not in manager.connection_games
+    assert broken.close_code == 1011 and healthy.close_code is None
+
+    healthy.fail = True
+    await manager.broadcast_to_game("game", {"type": "GAME_ENDED"})
+    assert "game" not in manager.get_all_games()
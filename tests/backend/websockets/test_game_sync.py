@@ -0,0 +1,185 @@
+"""
+Tests for sequence-numbered deltas, compact snapshots and resuming game WebSocket clients.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from wiki_arena.models import GameConfig, GameState, GameStatus, ModelConfig, Move, Page
+from backend.websockets.game_hub import GameWebSocketManager
+from backend.websockets.game_sync import GameSyncLog, compact_game_state
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        self.frames.append(json.loads(frame))
+
+
+class FakeStateCollector:
+    def __init__(self, game_state: GameState, on_collect=None):
+        self.game_state = game_state
+        self.on_collect = on_collect
+
+    async def get_complete_state(self, game_id: str):
+        snapshot = {"game": compact_game_state(self.game_state), "solver_results": []}
+        if self.on_collect:
+            await self.on_collect()
+        return snapshot
+
+
+def game_state() -> GameState:
+    links = [f"Link {i}" for i in range(500)]
+    return GameState(
+        game_id="game",
+        config=GameConfig(
+            start_page_title="Alpha",
+            target_page_title="Gamma",
+            model=ModelConfig(provider="random", model_name="random"),
+        ),
+        current_page=Page(title="Beta", url="https://example/Beta", text="x" * 10_000, links=links),
+        move_history=[Move(step=1, from_page_title="Alpha", to_page_title="Beta")],
+        steps=1,
+        status=GameStatus.IN_PROGRESS,
+    )
+
+
+def test_sync_log_numbers_deltas_and_bounds_history():
+    log = GameSyncLog(history_size=3)
+    message = {"type": "GAME_MOVE_COMPLETED"}
+
+    deltas = [log.record("game", message) for _ in range(5)]
+    log.record("other", message)
+
+    assert [delta["seq"] for delta in deltas] == [1, 2, 3, 4, 5]
+    assert "seq" not in message
+    assert log.current_seq("game") == 5 and log.current_seq("other") == 1
+    assert [delta["seq"] for delta in log.deltas_since("game", 2)] == [3, 4, 5]
+    assert log.deltas_since("game", 5) == []
+    # Deltas 2 and earlier were evicted, and seq 9 is ahead of the server
+    assert log.deltas_since("game", 1) is None
+    assert log.deltas_since("game", 9) is None
+
+
+def test_sync_log_evicts_least_recently_updated_ended_games():
+    log = GameSyncLog(max_games=2)
+    for game_id in ["a", "b", "a", "c"]:
+        log.record(game_id, {"type": "GAME_ENDED"})
+
+    assert log.current_seq("b") == 0
+    assert log.current_seq("a") == 2 and log.current_seq("c") == 1
+
+
+def test_sync_log_keeps_running_and_watched_games():
+    watched = {"b"}
+    log = GameSyncLog(max_games=1, is_watched=watched.__contains__)
+    log.record("running", {"type": "GAME_MOVE_COMPLETED"})
+    log.record("b", {"type": "GAME_ENDED"})
+    log.record("c", {"type": "GAME_ENDED"})
+
+    # Over the limit, but only "c" has ended and nobody watches it
+    assert log.current_seq("c") == 0
+    assert log.record("running", {"type": "GAME_MOVE_COMPLETED"})["seq"] == 2
+    assert log.current_seq("b") == 1
+
+    watched.clear()
+    log.record("d", {"type": "GAME_ENDED"})
+    assert log.current_seq("b") == 0 and log.current_seq("running") == 2
+
+
+def test_compact_snapshot_drops_context_and_page_contents():
+    state = game_state()
+    snapshot = compact_game_state(state)
+
+    assert snapshot["current_page"] == {"title": "Beta", "url": "https://example/Beta"}
+    assert snapshot["move_history"][0]["to_page_title"] == "Beta"
+    assert snapshot["status"] == "in_progress"
+    assert "context" not in snapshot
+    assert len(json.dumps(snapshot)) * 10 < len(state.model_dump_json())
+
+
+@pytest.mark.asyncio
+async def test_reconnecting_client_gets_only_missed_deltas():
+    manager = GameWebSocketManager()
+    manager.state_collector = FakeStateCollector(game_state())
+    first = FakeWebSocket()
+    await manager.connect(first, "game")
+    for step in range(1, 4):
+        await manager.broadcast_to_game("game", {"type": "GAME_MOVE_COMPLETED", "step": step})
+
+    assert first.frames[0]["type"] == "CONNECTION_ESTABLISHED"
+    assert first.frames[0]["seq"] == 0
+    assert [frame["seq"] for frame in first.frames[1:]] == [1, 2, 3]
+
+    await manager.disconnect(first)
+    await manager.broadcast_to_game("game", {"type": "GAME_MOVE_COMPLETED", "step": 4})
+    resumed = FakeWebSocket()
+    await manager.connect(resumed, "game", since_seq=3)
+
+    assert [(frame["type"], frame["seq"]) for frame in resumed.frames] == [
+        ("CONNECTION_RESUMED", 3), ("GAME_MOVE_COMPLETED", 4)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_client_gets_snapshot_when_it_cannot_resume():
+    manager = GameWebSocketManager(sync_history_size=2)
+    manager.state_collector = FakeStateCollector(game_state())
+    for step in range(1, 6):
+        await manager.broadcast_to_game("game", {"type": "GAME_MOVE_COMPLETED", "step": step})
+
+    client = FakeWebSocket()
+    await manager.connect(client, "game", since_seq=1)
+
+    assert len(client.frames) == 1
+    assert client.frames[0]["type"] == "CONNECTION_ESTABLISHED"
+    assert client.frames[0]["seq"] == 5
+    assert client.frames[0]["complete_state"]["game"]["current_page"]["title"] == "Beta"
+
+
+@pytest.mark.asyncio
+async def test_deltas_broadcast_while_connecting_follow_the_snapshot():
+    manager = GameWebSocketManager()
+    await manager.broadcast_to_game("game", {"type": "GAME_MOVE_COMPLETED", "step": 1})
+
+    async def broadcast_during_collection():
+        await manager.broadcast_to_game("game", {"type": "GAME_MOVE_COMPLETED", "step": 2})
+
+    manager.state_collector = FakeStateCollector(game_state(), on_collect=broadcast_during_collection)
+    client = FakeWebSocket()
+    await manager.connect(client, "game")
+    await manager.broadcast_to_game("game", {"type": "GAME_MOVE_COMPLETED", "step": 3})
+
+    # The snapshot's seq is read after collecting, so delta 2 isn't sent again
+    assert [(frame["type"], frame["seq"]) for frame in client.frames] == [
+        ("CONNECTION_ESTABLISHED", 2), ("GAME_MOVE_COMPLETED", 3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_deltas_held_while_resuming_are_sent_in_order():
+    manager = GameWebSocketManager()
+    for step in range(1, 3):
+        await manager.broadcast_to_game("game", {"type": "GAME_MOVE_COMPLETED", "step": step})
+
+    class SlowWebSocket(FakeWebSocket):
+        async def send_text(self, frame: str):
+            await asyncio.sleep(0.01)
+            await super().send_text(frame)
+
+    client = SlowWebSocket()
+    connecting = asyncio.create_task(manager.connect(client, "game", since_seq=1))
+    await asyncio.sleep(0)
+    await manager.broadcast_to_game("game", {"type": "GAME_MOVE_COMPLETED", "step": 3})
+    await connecting
+
+    assert [(frame["type"], frame["seq"]) for frame in client.frames] == [
+        ("CONNECTION_RESUMED", 1), ("GAME_MOVE_COMPLETED", 2), ("GAME_MOVE_COMPLETED", 3)
+    ]
@@ -0,0 +1,130 @@
+"""
+Tests for task-level WebSocket channels in GameWebSocketManager and WebSocketHandler.
+"""
+
+import json
+
+import pytest
+
+from wiki_arena import GameEvent
+from backend.handlers import websocket_handler as handler_module
+from backend.handlers.websocket_handler import WebSocketHandler
+from backend.websockets.game_hub import GameWebSocketManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        self.frames.append(json.loads(frame))
+
+
+class FakeStateCollector:
+    async def get_complete_state(self, game_id: str):
+        return {"game": {"game_id": game_id}, "solver_results": []}
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = GameWebSocketManager()
+    monkeypatch.setattr(handler_module, "websocket_manager", manager)
+    return manager
+
+
+async def connect(manager, task_id=None, game_id=None, **kwargs):
+    websocket = FakeWebSocket()
+    if task_id:
+        await manager.connect_task(websocket, task_id, **kwargs)
+    else:
+        await manager.connect(websocket, game_id, **kwargs)
+    return websocket
+
+
+@pytest.mark.asyncio
+async def test_task_subscriber_gets_every_game_of_its_task_only(manager):
+    manager.register_task("task_a", ["a1", "a2"])
+    manager.register_task("task_b", ["b1"])
+    watcher = await connect(manager, task_id="task_a")
+    other = await connect(manager, task_id="task_b")
+
+    await manager.broadcast_to_game("a1", {"type": "GAME_MOVE_COMPLETED", "game_id": "a1"})
+    await manager.broadcast_to_game("a2", {"type": "GAME_MOVE_COMPLETED", "game_id": "a2"})
+
+    assert [(frame["game_id"], frame["seq"]) for frame in watcher.frames[1:]] == [("a1", 1), ("a2", 2)]
+    assert len(other.frames) == 1
+
+
+@pytest.mark.asyncio
+async def test_task_broadcast_only_reaches_interested_channels(manager):
+    manager.register_task("task_a", ["a1", "a2"])
+    manager.register_task("task_b", ["b1"])
+    task_watcher = await connect(manager, task_id="task_a")
+    game_watcher = await connect(manager, game_id="a2")
+    unrelated = await connect(manager, game_id="b1")
+
+    encoded = []
+    encode = manager._encode_message
+    manager._encode_message = lambda message: encoded.append(message) or encode(message)
+
+    await manager.broadcast_to_task("task_a", {"type": "TASK_ENDED", "task_id": "task_a"})
+
+    assert task_watcher.frames[-1]["type"] == game_watcher.frames[-1]["type"] == "TASK_ENDED"
+    assert len(unrelated.frames) == 1
+    # One frame for the task channel and one for the only game channel with a subscriber
+    assert len(encoded) == 2
+
+
+@pytest.mark.asyncio
+async def test_task_snapshot_and_resume(manager):
+    manager.state_collector = FakeStateCollector()
+    manager.register_task("task_a", ["a2", "a1"])
+    await manager.broadcast_to_game("a1", {"type": "GAME_MOVE_COMPLETED", "game_id": "a1"})
+
+    fresh = await connect(manager, task_id="task_a")
+    await manager.broadcast_to_game("a2", {"type": "GAME_MOVE_COMPLETED", "game_id": "a2"})
+    await manager.disconnect(fresh)
+    await manager.broadcast_to_game("a1", {"type": "GAME_ENDED", "game_id": "a1"})
+    resumed = await connect(manager, task_id="task_a", since_seq=2)
+
+    snapshot = fresh.frames[0]
+    assert snapshot["type"] == "CONNECTION_ESTABLISHED" and snapshot["seq"] == 1
+    assert sorted(snapshot["complete_state"]["games"]) == ["a1", "a2"]
+    assert [(frame["type"], frame["seq"]) for frame in resumed.frames] == [
+        ("CONNECTION_RESUMED", 2), ("GAME_ENDED", 3)
+    ]
+    assert manager.get_task_connection_count("task_a") == 1
+
+
+@pytest.mark.asyncio
+async def test_handler_registers_task_and_sends_solve_once_per_channel(manager):
+    handler = WebSocketHandler()
+    await handler.handle_task_selected(GameEvent(
+        type="task_selected", game_id="task_a", data={"task_id": "task_a", "game_ids": ["a1", "a2"]}
+    ))
+    watcher = await connect(manager, task_id="task_a")
+
+    await handler.handle_task_solved(GameEvent(type="task_solved", game_id="task_a", data={
+        "task_id": "task_a",
+        "game_ids": ["a1", "a2"],
+        "shortest_paths": [["Start", "Target"]],
+        "shortest_path_length": 1,
+    }))
+
+    assert len(watcher.frames) == 2
+    update = watcher.frames[1]
+    assert update["type"] == "OPTIMAL_PATHS_UPDATED"
+    assert update["game_ids"] == ["a1", "a2"]
+    assert update["optimal_path_length"] == 1
+
+
+def test_task_registry_is_bounded():
+    manager = GameWebSocketManager(max_tasks=2)
+    for i in range(3):
+        manager.register_task(f"task_{i}", [f"game_{i}"])
+
+    assert list(manager.task_games) == ["task_1", "task_2"]
+    assert "game_0" not in manager.game_tasks
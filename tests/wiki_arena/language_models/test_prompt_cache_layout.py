@@ -0,0 +1,92 @@
+"""
+Tests for prompt cache breakpoint placement and per-game cache statistics.
+"""
+
+import pytest
+
+from wiki_arena.context_builder import ContextBuilder
+from wiki_arena.language_models import AnthropicModel
+from wiki_arena.models import (
+    AssistantMessage,
+    AssistantToolCall,
+    GameConfig,
+    GameResult,
+    GameState,
+    ModelCallMetrics,
+    ModelConfig,
+    Page,
+    SystemMessage,
+    ToolResultMessage,
+)
+
+
+@pytest.fixture
+def anthropic_model(monkeypatch) -> AnthropicModel:
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    return AnthropicModel(ModelConfig(provider="anthropic", model_name="claude-3-5-haiku-20241022"))
+
+
+def transcript(builder: ContextBuilder, titles):
+    pages = [Page(title=title, url="https://example", links=[f"{title} link {i}" for i in range(20)]) for title in titles]
+    context = [SystemMessage(content="system"), builder.page_message(pages[0], initial=True)]
+    for step, page in enumerate(pages[1:]):
+        tool_call = AssistantToolCall(id=f"call_{step}", name="navigate", arguments={"to_page_title": page.title})
+        context.append(AssistantMessage(tool_calls=[tool_call]))
+        context.append(ToolResultMessage(tool_call_id=tool_call.id, content=builder.tool_result(page)))
+        context.append(builder.page_message(page))
+    return context
+
+
+def breakpoint_positions(messages):
+    return [i for i, message in enumerate(messages) if "cache_control" in message["content"][-1]]
+
+
+def test_full_transcript_caches_last_message(anthropic_model):
+    builder = ContextBuilder()
+    context = builder.build(transcript(builder, ["A", "B", "C"]))
+
+    system, messages = anthropic_model._format_context(context, builder.stable_prefix_length(context))
+
+    assert system[0]["cache_control"] == {"type": "ephemeral"}
+    assert breakpoint_positions(messages) == [len(messages) - 1]
+
+
+def test_windowed_transcript_caches_before_listing_that_will_be_stubbed(anthropic_model):
+    builder = ContextBuilder(history_window=1)
+    context = builder.build(transcript(builder, ["A", "B", "C"]))
+
+    _, messages = anthropic_model._format_context(context, builder.stable_prefix_length(context))
+
+    # Breakpoint on the tool result right before the current (full) listing
+    assert breakpoint_positions(messages) == [len(messages) - 2]
+    assert messages[-2]["content"][-1]["type"] == "tool_result"
+
+
+def test_compacted_transcript_only_caches_system_prompt(anthropic_model):
+    builder = ContextBuilder(compact_history=True)
+    context = builder.build(transcript(builder, ["A", "B", "C"]))
+
+    system, messages = anthropic_model._format_context(context, builder.stable_prefix_length(context))
+
+    assert "cache_control" in system[0]
+    assert breakpoint_positions(messages) == []
+
+
+def test_game_result_reports_cache_ratios():
+    model = ModelConfig(provider="anthropic", model_name="claude-3-5-haiku-20241022")
+    state = GameState(
+        game_id="game_1",
+        config=GameConfig(start_page_title="A", target_page_title="B", model=model),
+        current_page=Page(title="A", url="https://example"),
+        context=[
+            AssistantMessage(metrics=ModelCallMetrics(input_tokens=100, cache_creation_input_tokens=300)),
+            AssistantMessage(metrics=ModelCallMetrics(input_tokens=100, cache_creation_input_tokens=100, cache_read_input_tokens=400)),
+        ],
+    )
+
+    result = GameResult.from_game_state(state)
+
+    assert result.total_cache_creation_input_tokens == 400
+    assert result.total_cache_read_input_tokens == 400
+    assert result.cache_hit_rate == pytest.approx(400 / 1000)
+    assert result.cache_read_to_creation_ratio == pytest.approx(1.0)
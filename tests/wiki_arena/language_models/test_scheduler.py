@@ -0,0 +1,164 @@
+"""
+Tests for the model call scheduler: token buckets, fair queueing and retries.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from wiki_arena.language_models import (
+    LanguageModel,
+    LLMProviderError,
+    LLMRateLimitError,
+    ModelCallScheduler,
+    RateLimit,
+    RetryPolicy,
+    ScheduledLanguageModel,
+)
+from wiki_arena.language_models.scheduler import FairTokenBucket
+from wiki_arena.models import (
+    AssistantMessage,
+    ContextMessage,
+    GameConfig,
+    GameState,
+    ModelCallMetrics,
+    ModelConfig,
+    Page,
+)
+
+
+class FlakyModel(LanguageModel):
+    """Fake model that fails a fixed number of times before answering."""
+
+    def __init__(self, model_config: ModelConfig, failures: List[Exception]):
+        super().__init__(model_config)
+        self.failures = list(failures)
+        self.calls = 0
+
+    def _calculate_cost(self, input_tokens, output_tokens, cache_creation_tokens=0, cache_read_tokens=0):
+        return 0.0
+
+    def _format_tools(self, mcp_tools: List[Dict[str, Any]]) -> Any:
+        return mcp_tools
+
+    def _format_context(self, context: List[ContextMessage]) -> Any:
+        return context
+
+    async def generate_response(self, tools, context, game_state) -> AssistantMessage:
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return AssistantMessage(content="ok", metrics=ModelCallMetrics(total_tokens=10))
+
+
+@pytest.fixture
+def model_config() -> ModelConfig:
+    return ModelConfig(provider="fake", model_name="fake-model", settings={"max_tokens": 0})
+
+
+def make_game_state(model_config: ModelConfig, game_id: str = "game_1") -> GameState:
+    config = GameConfig(start_page_title="A", target_page_title="B", model=model_config)
+    return GameState(config=config, current_page=Page(title="A", url="https://a", links=["B"]), game_id=game_id)
+
+
+@pytest.fixture
+def fast_retries() -> RetryPolicy:
+    return RetryPolicy(max_retries=2, base_delay_s=0.01, max_delay_s=0.02)
+
+
+class TestFairTokenBucket:
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill(self):
+        bucket = FairTokenBucket(rate_per_minute=600, capacity=1)  # 10 tokens/s
+
+        start = time.monotonic()
+        await bucket.acquire(1, "a")
+        await bucket.acquire(1, "a")
+        elapsed = time.monotonic() - start
+
+        assert elapsed >= 0.08
+
+    @pytest.mark.asyncio
+    async def test_clients_are_served_round_robin(self):
+        bucket = FairTokenBucket(rate_per_minute=6000, capacity=1)
+        await bucket.acquire(1, "warmup")  # empty the bucket so everyone queues
+        order = []
+
+        async def worker(client_id: str, n: int):
+            await bucket.acquire(1, client_id)
+            order.append(f"{client_id}{n}")
+
+        tasks = [asyncio.create_task(worker("a", n)) for n in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(worker("b", 0)))
+        await asyncio.gather(*tasks)
+
+        assert order.index("b0") <= 1, f"b should not wait behind all of a's calls: {order}"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_block_queue(self):
+        bucket = FairTokenBucket(rate_per_minute=6000, capacity=1)
+        await bucket.acquire(1, "a")
+
+        stuck = asyncio.create_task(bucket.acquire(1, "a"))
+        await asyncio.sleep(0)
+        stuck.cancel()
+
+        await asyncio.wait_for(bucket.acquire(1, "b"), timeout=1.0)
+        assert bucket.waiting == 0
+
+
+class TestModelCallScheduler:
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limit_and_records_wait(self, model_config, fast_retries):
+        model = FlakyModel(model_config, [LLMRateLimitError(), LLMRateLimitError()])
+        scheduled = ScheduledLanguageModel(model, ModelCallScheduler(retry_policy=fast_retries))
+
+        message = await scheduled.generate_response([], [], make_game_state(model_config))
+
+        assert model.calls == 3
+        assert message.metrics.retries == 2
+        assert message.metrics.queue_wait_ms > 0
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, model_config, fast_retries):
+        model = FlakyModel(model_config, [LLMRateLimitError()] * 3)
+        scheduled = ScheduledLanguageModel(model, ModelCallScheduler(retry_policy=fast_retries))
+
+        with pytest.raises(LLMRateLimitError):
+            await scheduled.generate_response([], [], make_game_state(model_config))
+        assert model.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_other_provider_errors_are_not_retried(self, model_config, fast_retries):
+        model = FlakyModel(model_config, [LLMProviderError("bad request")])
+        scheduled = ScheduledLanguageModel(model, ModelCallScheduler(retry_policy=fast_retries))
+
+        with pytest.raises(LLMProviderError):
+            await scheduled.generate_response([], [], make_game_state(model_config))
+        assert model.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_model_request_limit_throttles_calls(self, model_config):
+        scheduler = ModelCallScheduler()
+        scheduler.set_model_limit("fake-model", RateLimit(requests_per_minute=600))  # 10/s, burst 600
+        bucket = scheduler._buckets_for(model_config)[0][0]
+        bucket.drain()
+
+        scheduled = ScheduledLanguageModel(FlakyModel(model_config, []), scheduler)
+        message = await scheduled.generate_response([], [], make_game_state(model_config))
+
+        assert message.metrics.queue_wait_ms >= 50
+        assert message.metrics.retries == 0
+
+    @pytest.mark.asyncio
+    async def test_unlimited_models_do_not_wait(self, model_config):
+        scheduled = ScheduledLanguageModel(FlakyModel(model_config, []), ModelCallScheduler())
+
+        message = await scheduled.generate_response([], [], make_game_state(model_config))
+
+        assert message.metrics.queue_wait_ms == 0
@@ -0,0 +1,196 @@
+"""
+Tests for the matrix Bradley-Terry fit: convergence, warm starts,
+disconnected comparison graphs and bootstrap intervals.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from wiki_arena.ratings import BradleyTerryModel, LeaderboardGenerator
+from wiki_arena.storage import GameSummary
+
+
+def add_record(model: BradleyTerryModel, winner: str, loser: str, wins: int, losses: int = 0, ties: int = 0):
+    for _ in range(wins):
+        model.add_pairwise_comparison(winner, loser, 1, 2)
+    for _ in range(losses):
+        model.add_pairwise_comparison(winner, loser, 2, 1)
+    for _ in range(ties):
+        model.add_pairwise_comparison(winner, loser, 3, 3)
+
+
+def reference_strengths(win_matrix, iterations=2000):
+    """Plain-Python MM iteration, run to convergence."""
+    models = sorted(set(win_matrix) | {m for row in win_matrix.values() for m in row})
+    wins = {i: sum(win_matrix.get(i, {}).values()) for i in models}
+    strengths = {m: 1.0 for m in models}
+    for _ in range(iterations):
+        new = {}
+        for i in models:
+            denominator = sum(
+                (win_matrix.get(i, {}).get(j, 0) + win_matrix.get(j, {}).get(i, 0)) / (strengths[i] + strengths[j])
+                for j in models if j != i
+            )
+            new[i] = wins[i] / denominator
+        mean = sum(new.values()) / len(new)
+        strengths = {m: s / mean for m, s in new.items()}
+    return strengths
+
+
+@pytest.fixture
+def three_models():
+    model = BradleyTerryModel()
+    add_record(model, "alpha", "beta", wins=6, losses=3, ties=1)
+    add_record(model, "beta", "gamma", wins=5, losses=2)
+    add_record(model, "alpha", "gamma", wins=7, losses=1, ties=2)
+    return model
+
+
+def test_matches_reference_fit_and_stops_early(three_models):
+    strengths = three_models.calculate_strengths(iterations=1000, tolerance=1e-10)
+    expected = reference_strengths(three_models.get_win_matrix_readable())
+
+    assert strengths == pytest.approx(expected, rel=1e-6)
+    assert 0 < three_models.last_iterations < 1000
+    assert three_models.get_win_matrix_readable()["alpha"] == {"beta": 6.5, "gamma": 8.0}
+
+
+def test_warm_start_converges_in_fewer_iterations(three_models):
+    strengths = three_models.calculate_strengths(tolerance=1e-8)
+    cold_iterations = three_models.last_iterations
+
+    add_record(three_models, "gamma", "beta", wins=1)
+    warm = three_models.calculate_strengths(tolerance=1e-8, initial_strengths=strengths)
+    warm_iterations = three_models.last_iterations
+    cold = three_models.calculate_strengths(tolerance=1e-8)
+
+    assert warm == pytest.approx(cold, rel=1e-5)
+    assert warm_iterations < cold_iterations
+
+
+def test_task_results_match_pairwise_comparisons():
+    models = ["a", "b", "a", "c", "b"]
+    steps = [3, 5, 4, 3, 2]
+    pairwise = BradleyTerryModel()
+    for i in range(len(models)):
+        for j in range(i + 1, len(models)):
+            pairwise.add_pairwise_comparison(models[i], models[j], steps[i], steps[j])
+    batched = BradleyTerryModel()
+    batched.add_task_results(models, steps)
+
+    assert batched.get_win_matrix_readable() == pairwise.get_win_matrix_readable()
+
+
+def test_disconnected_groups_are_rated_separately():
+    model = BradleyTerryModel()
+    add_record(model, "a1", "a2", wins=3, losses=1)
+    add_record(model, "b1", "b2", wins=30, losses=10)
+    model.add_pairwise_comparison("loner", "winner", 9, 1)
+
+    strengths = model.calculate_strengths()
+    elo = model.strengths_to_elo(strengths)
+
+    # Same win ratio in each group gives the same ratings, each group centred on the average strength
+    assert strengths["a1"] == pytest.approx(strengths["b1"])
+    assert strengths["a1"] + strengths["a2"] == pytest.approx(2.0)
+    assert elo["a1"] > 1200 > elo["a2"]
+    assert strengths["loner"] == 0.0
+    assert strengths["winner"] == pytest.approx(2.0)
+
+
+def test_bootstrap_intervals_contain_estimate_and_narrow_with_data(three_models):
+    strengths = three_models.calculate_strengths()
+    elo = three_models.strengths_to_elo(strengths)
+    intervals = three_models.bootstrap_elo_intervals(num_samples=300, initial_strengths=strengths, seed=7)
+
+    for name, (low, high) in intervals.items():
+        assert low <= elo[name] <= high
+    assert intervals == three_models.bootstrap_elo_intervals(num_samples=300, initial_strengths=strengths, seed=7)
+
+    more_data = BradleyTerryModel()
+    add_record(more_data, "alpha", "beta", wins=60, losses=30, ties=10)
+    add_record(more_data, "beta", "gamma", wins=50, losses=20)
+    add_record(more_data, "alpha", "gamma", wins=70, losses=10, ties=20)
+    narrow = more_data.bootstrap_elo_intervals(num_samples=300, seed=7)
+    width = lambda bounds: bounds[1] - bounds[0]
+    assert width(narrow["beta"]) < width(intervals["beta"])
+
+
+def test_bootstrap_is_chunked(monkeypatch, three_models):
+    monkeypatch.setattr("wiki_arena.ratings.bradley_terry.BOOTSTRAP_CHUNK_CELLS", 9 * 7)
+    chunked = three_models.bootstrap_elo_intervals(num_samples=50, seed=1)
+    assert set(chunked) == {"alpha", "beta", "gamma"}
+
+
+def test_prior_keeps_undefeated_and_winless_models_finite():
+    model = BradleyTerryModel()
+    add_record(model, "champion", "middle", wins=4)
+    add_record(model, "middle", "last", wins=4)
+
+    unbounded = model.calculate_strengths(iterations=200)
+    assert model.last_iterations == 200
+    assert unbounded["last"] == 0.0
+
+    strengths = model.calculate_strengths(iterations=200, prior=1.0)
+    assert model.last_iterations < 200
+    assert strengths["champion"] > strengths["middle"] > strengths["last"] > 0
+    assert sum(strengths.values()) / 3 == pytest.approx(1.0)
+
+
+class SummarySource:
+    def __init__(self, summaries):
+        self.summaries = summaries
+
+    def get_summaries(self):
+        return self.summaries
+
+
+def summary(game_id: str, task_id: str, model_name: str, steps: int) -> GameSummary:
+    return GameSummary(game_id, task_id, "test", model_name, "won", steps, 0.0, 0, 0)
+
+
+def test_leaderboard_generator_warm_starts_and_reports_intervals():
+    games = []
+    for task in range(12):
+        steps = {"alpha": 3, "beta": 4 if task % 3 else 2, "gamma": 5 if task % 4 else 3}
+        games.extend(summary(f"{name}_{task}", f"task_{task}", name, count) for name, count in steps.items())
+    source = SummarySource(games)
+    generator = LeaderboardGenerator(source)
+
+    ratings = generator.generate_elo_ratings(prior=0.5)
+    cold_iterations = generator.bt_model.last_iterations
+    source.summaries = games + [summary("alpha_extra", "task_0", "alpha", 9)]
+    generator.generate_elo_ratings(prior=0.5)
+    intervals = generator.generate_confidence_intervals(num_samples=200, seed=3)
+
+    assert ratings["alpha"] > ratings["beta"] > ratings["gamma"]
+    assert generator.bt_model.last_iterations < cold_iterations
+    assert set(intervals) == {"alpha", "beta", "gamma"}
+
+
+@pytest.mark.slow
+def test_hundreds_of_models_fit_quickly():
+    rng = np.random.default_rng(0)
+    names = [f"model_{i}" for i in range(300)]
+    skill = rng.normal(size=len(names))
+    model = BradleyTerryModel()
+    for _ in range(200):
+        players = rng.choice(len(names), size=20, replace=False)
+        steps = np.round(10 - 2 * skill[players] + rng.normal(size=20))
+        model.add_task_results([names[p] for p in players], steps.tolist())
+
+    start = time.perf_counter()
+    strengths = model.calculate_strengths(prior=1.0)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    model.bootstrap_elo_intervals(num_samples=100, initial_strengths=strengths, prior=1.0, seed=0)
+    bootstrap_seconds = time.perf_counter() - start
+
+    fitted = np.log([strengths[name] for name in names])
+    assert np.corrcoef(fitted, skill)[0, 1] > 0.8
+    assert model.last_iterations < 100
+    assert fit_seconds < 2
+    assert bootstrap_seconds < 30
+    print(f"fit: {fit_seconds * 1000:.0f}ms ({model.last_iterations} iterations), 100 bootstrap samples: {bootstrap_seconds:.2f}s")
@@ -0,0 +1,78 @@
+"""
+Tests for bootstrapping the leaderboard over tasks, in process and in a worker pool.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from wiki_arena.ratings import LeaderboardBootstrap, LeaderboardGenerator
+from wiki_arena.ratings.bootstrap import TaskOutcomes
+from wiki_arena.storage import GameSummary
+
+
+class SummarySource:
+    def __init__(self, summaries):
+        self.summaries = summaries
+
+    def get_summaries(self):
+        return self.summaries
+
+
+def make_games(num_tasks: int = 40, seed: int = 0):
+    """Four models of clearly different skill and one that is rarely played."""
+    rng = random.Random(seed)
+    skill = {"strong": 3, "good": 5, "fair": 6, "weak": 9}
+    games = []
+    for task in range(num_tasks):
+        for model, steps in skill.items():
+            games.append(GameSummary(f"{model}_{task}", f"task_{task}", "test", model, "won", steps + rng.randint(-2, 2), 0.0, 0, 0))
+        if task % 10 == 0:
+            games.append(GameSummary(f"rare_{task}", f"task_{task}", "test", "rare", "won", rng.randint(3, 9), 0.0, 0, 0))
+    return games
+
+
+def test_task_outcomes_sum_to_the_win_matrix():
+    generator = LeaderboardGenerator(SummarySource(make_games()))
+    generator.generate_elo_ratings()
+    outcomes = TaskOutcomes.from_games(generator._fetch_and_group_games_by_task())
+
+    matrix = outcomes.win_matrices(np.ones((1, outcomes.num_tasks)))[0]
+    expected = generator.get_current_win_matrix()
+    for i, model in enumerate(outcomes.models):
+        for j, opponent in enumerate(outcomes.models):
+            assert matrix[i, j] == expected.get(model, {}).get(opponent, 0.0)
+
+
+def test_bootstrap_intervals_and_rank_probabilities():
+    result = LeaderboardBootstrap(LeaderboardGenerator(SummarySource(make_games()))).run(
+        num_samples=200, workers=1, seed=5
+    )
+
+    assert result.num_samples == 200 and result.num_tasks == 40
+    for model, (low, high) in result.intervals.items():
+        assert low <= result.ratings[model] <= high
+    np.testing.assert_allclose(result.rank_probabilities.sum(axis=1), 1.0)
+    assert result.rank_probability("strong")[1] > 0.9
+    assert result.rank_interval("weak") in {(4, 5), (5, 5)}
+    assert result.rank_interval("rare")[1] - result.rank_interval("rare")[0] >= 1
+    assert result.elapsed_s >= result.fit_s > 0
+
+
+@pytest.mark.slow
+def test_worker_pool_gives_the_same_result_as_one_process():
+    bootstrap = LeaderboardBootstrap(LeaderboardGenerator(SummarySource(make_games())))
+    in_process = bootstrap.run(num_samples=120, workers=1, seed=11, samples_per_job=25)
+    pooled = bootstrap.run(num_samples=120, workers=2, seed=11, samples_per_job=25)
+
+    assert pooled.workers == 2
+    assert pooled.intervals == in_process.intervals
+    np.testing.assert_array_equal(pooled.rank_probabilities, in_process.rank_probabilities)
+
+
+def test_no_comparisons_gives_empty_intervals():
+    games = [GameSummary("only", "task", "test", "alpha", "won", 3, 0.0, 0, 0)]
+    result = LeaderboardBootstrap(LeaderboardGenerator(SummarySource(games))).run(num_samples=10, workers=1)
+    assert result.num_samples == 0
+    assert result.intervals == {}
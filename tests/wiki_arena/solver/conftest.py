@@ -0,0 +1,34 @@
+"""
+Shared fixtures for solver tests on small wiki_graph.sqlite databases.
+"""
+
+import sqlite3
+from typing import Callable, Dict, List
+
+import pytest
+
+from wiki_arena.solver import StaticSolverDB
+
+
+@pytest.fixture
+def make_graph_db(tmp_path) -> Callable[[Dict[int, List[int]], Dict[int, str]], StaticSolverDB]:
+    """Build a wiki_graph.sqlite of article pages from their outgoing links and titles (by page id)."""
+    def make(links: Dict[int, List[int]], titles: Dict[int, str]) -> StaticSolverDB:
+        db_path = tmp_path / "wiki_graph.sqlite"
+        with sqlite3.connect(db_path) as db:
+            db.execute("CREATE TABLE pages (id INTEGER PRIMARY KEY, namespace INTEGER, title TEXT, is_redirect INTEGER)")
+            db.execute(
+                "CREATE TABLE links (id INTEGER PRIMARY KEY, outgoing_links_count INTEGER, incoming_links_count INTEGER, "
+                "outgoing_links TEXT, incoming_links TEXT)"
+            )
+            db.execute("CREATE TABLE redirects (source_id INTEGER PRIMARY KEY, target_id INTEGER)")
+            for page_id, title in titles.items():
+                outgoing = links.get(page_id, [])
+                incoming = [source for source, targets in links.items() if page_id in targets]
+                db.execute("INSERT INTO pages VALUES (?, 0, ?, 0)", (page_id, title))
+                db.execute(
+                    "INSERT INTO links VALUES (?, ?, ?, ?, ?)",
+                    (page_id, len(outgoing), len(incoming), "|".join(map(str, outgoing)), "|".join(map(str, incoming))),
+                )
+        return StaticSolverDB(str(db_path))
+    return make
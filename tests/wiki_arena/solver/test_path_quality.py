@@ -0,0 +1,125 @@
+"""
+Tests for bulk path quality scoring on a small wiki_graph.sqlite fixture.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import List
+
+import pytest
+
+from wiki_arena.models import GameConfig, GameError, ErrorType, GameResult, GameStatus, ModelConfig, Move
+from wiki_arena.solver import PathQualityAnalyzer, StaticSolverDB
+
+# Alpha -> Beta -> Gamma -> Delta, a shortcut Alpha -> Gamma, and Epsilon -> Alpha
+LINKS = {
+    1: [2, 3],
+    2: [3],
+    3: [4],
+    4: [],
+    5: [1],
+}
+TITLES = {1: "Alpha", 2: "Beta", 3: "Gamma", 4: "Delta", 5: "Epsilon"}
+
+
+@pytest.fixture
+def graph_db(make_graph_db) -> StaticSolverDB:
+    return make_graph_db(LINKS, TITLES)
+
+
+def make_game(game_id: str, model_name: str, path: List[str], status: GameStatus = GameStatus.WON) -> GameResult:
+    moves = [Move(step=i + 1, from_page_title=a, to_page_title=b) for i, (a, b) in enumerate(zip(path, path[1:]))]
+    return GameResult(
+        game_id=game_id,
+        config=GameConfig(
+            start_page_title=path[0],
+            target_page_title="Delta",
+            model=ModelConfig(provider="random", model_name=model_name),
+        ),
+        status=status,
+        steps=len(moves),
+        path_taken=path,
+        moves=moves,
+        start_timestamp=datetime(2025, 6, 1, 12),
+        end_timestamp=datetime(2025, 6, 1, 12, 5),
+    )
+
+
+@pytest.mark.asyncio
+async def test_reverse_bfs_distances(graph_db):
+    analyzer = PathQualityAnalyzer(db=graph_db)
+
+    assert await analyzer.distances_to(4) == {4: 0, 3: 1, 1: 2, 2: 2, 5: 3}
+    assert await analyzer.distances_to(4, needed={3}) == {4: 0, 3: 1}
+
+
+@pytest.mark.asyncio
+async def test_analyze_scores_moves_and_games(graph_db, tmp_path):
+    games = [
+        make_game("detour", "model-a", ["Alpha", "Beta", "Gamma", "Delta"]),
+        make_game("optimal", "model-b", ["Alpha", "Gamma", "Delta"]),
+        make_game("lost", "model-b", ["Alpha", "Epsilon"], status=GameStatus.LOST_MAX_STEPS),
+    ]
+    games[2].moves.insert(0, Move(
+        step=0, from_page_title="Alpha", error=GameError(type=ErrorType.MODEL_INVALID_LINK, message="no such link")
+    ))
+
+    report = await PathQualityAnalyzer(db=graph_db).analyze(games)
+
+    deltas = {(move.game_id, move.step): move.distance_delta for move in report.moves}
+    assert deltas == {
+        ("detour", 1): 0, ("detour", 2): -1, ("detour", 3): -1,
+        ("optimal", 1): -1, ("optimal", 2): -1,
+        ("lost", 1): 1,
+    }
+    assert report.targets == 1
+
+    by_id = {game.game_id: game for game in report.games}
+    assert by_id["detour"].excess_steps == 1
+    assert by_id["optimal"].excess_steps == 0
+    assert by_id["optimal"].optimal_move_rate == 1.0
+    assert by_id["lost"].final_distance == 3
+    assert by_id["lost"].regressions == 1
+    assert by_id["lost"].excess_steps is None
+
+    summary = report.model_summary()
+    assert summary["model-a"]["optimal_move_rate"] == pytest.approx(2 / 3)
+    assert summary["model-b"]["mean_distance_delta"] == pytest.approx(-1 / 3)
+
+    report.write_csv(tmp_path / "moves.csv", tmp_path / "games.csv")
+    header = (tmp_path / "moves.csv").read_text().splitlines()[0]
+    assert header.endswith("distance_before,distance_after,distance_delta,optimal")
+
+
+@pytest.mark.asyncio
+async def test_unknown_target_gets_no_distances(graph_db):
+    game = make_game("unknown", "model-a", ["Alpha", "Beta"])
+    game.config.target_page_title = "Nowhere"
+
+    report = await PathQualityAnalyzer(db=graph_db).analyze([game])
+
+    assert [move.distance_delta for move in report.moves] == [None]
+    assert report.games[0].moves_scored == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_page_ids_resolve_like_single_lookups(graph_db):
+    with sqlite3.connect(graph_db.db_path) as db:
+        db.execute("INSERT INTO pages VALUES (6, 0, 'Zeta', 1)")
+        db.execute("INSERT INTO redirects VALUES (6, 3)")
+    titles = ["Alpha", "beta", "Zeta", "Nowhere"]
+
+    assert await graph_db.batch_get_page_ids(titles + [""]) == {
+        **{title: await graph_db.get_page_id(title) for title in titles}, "": None
+    }
+    assert (await graph_db.batch_get_page_ids(["beta", "Zeta"])) == {"beta": 2, "Zeta": 3}
+
+
+@pytest.mark.asyncio
+async def test_analyze_consumes_games_as_a_stream(graph_db):
+    games = (make_game(f"g{i}", "model-a", ["Alpha", "Gamma", "Delta"]) for i in range(3))
+
+    report = await PathQualityAnalyzer(db=graph_db).analyze(games)
+
+    assert [game.game_id for game in report.games] == ["g0", "g1", "g2"]
+    assert {move.distance_delta for move in report.moves} == {-1}
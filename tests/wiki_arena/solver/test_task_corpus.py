@@ -0,0 +1,79 @@
+"""
+Tests for offline task corpus generation on a small wiki_graph.sqlite fixture.
+"""
+
+import asyncio
+import random
+import sqlite3
+
+import pytest
+
+from wiki_arena.batch import load_task_corpus
+from wiki_arena.solver import StaticSolverDB, TaskCorpus, TaskCorpusGenerator
+
+# Article chain Page_0 -> Page_1 -> ... -> Page_5, plus pages the generator must skip
+CHAIN = [f"Page_{i}" for i in range(6)]
+
+
+@pytest.fixture
+def graph_db(make_graph_db) -> StaticSolverDB:
+    ids = range(1, len(CHAIN) + 1)
+    graph_db = make_graph_db({page_id: [page_id + 1] for page_id in ids[:-1]}, dict(zip(ids, CHAIN)))
+    with sqlite3.connect(graph_db.db_path) as db:
+        # A talk page and a redirect, both linked into the chain
+        db.execute("INSERT INTO pages VALUES (100, 1, 'Page_0', 0)")
+        db.execute("INSERT INTO links VALUES (100, 1, 1, '1', '1')")
+        db.execute("INSERT INTO pages VALUES (101, 0, 'Page_Zero', 1)")
+        db.execute("INSERT INTO links VALUES (101, 1, 1, '1', '1')")
+        db.execute("INSERT INTO redirects VALUES (101, 1)")
+    return graph_db
+
+
+@pytest.mark.asyncio
+async def test_degree_arrays_skip_redirects_and_other_namespaces(graph_db):
+    generator = TaskCorpusGenerator(db=graph_db)
+    await generator.load_candidates()
+
+    assert list(generator.start_candidates) == [1, 2, 3, 4, 5]
+    assert list(generator.target_candidates) == [2, 3, 4, 5, 6]
+
+
+@pytest.mark.asyncio
+async def test_generate_stratifies_by_path_length(graph_db):
+    generator = TaskCorpusGenerator(db=graph_db, seed=0)
+
+    corpus = await generator.generate({1: 3, 2: 2}, max_attempts=500)
+
+    assert corpus.count(1) == 3
+    assert corpus.count(2) == 2
+    assert corpus.path_lengths == [1, 2]
+    for path_length in corpus.path_lengths:
+        for start, target in corpus.tasks_by_length[path_length]:
+            assert CHAIN.index(target.replace(" ", "_")) - CHAIN.index(start.replace(" ", "_")) == path_length
+
+
+@pytest.mark.asyncio
+async def test_generate_stops_when_every_start_is_the_target(graph_db):
+    generator = TaskCorpusGenerator(db=graph_db, seed=0)
+    generator.start_candidates = generator.target_candidates = [2]
+
+    corpus = await asyncio.wait_for(generator.generate({1: 1}, max_attempts=10), timeout=5)
+
+    assert len(corpus) == 0
+
+
+def test_corpus_round_trip_and_draw(tmp_path):
+    corpus = TaskCorpus({2: [("Cat", "Dog")], 3: [("Philosophy", "Science"), ("Moon", "Tide")]})
+    path = tmp_path / "task_corpus.tsv"
+    corpus.save(path)
+
+    loaded = TaskCorpus.load(path)
+    rng = random.Random(0)
+
+    assert len(loaded) == 3
+    assert loaded.draw(2, rng).task_id == "Cat__to__Dog"
+    assert {loaded.draw(3, rng).start_page_title for _ in range(20)} == {"Philosophy", "Moon"}
+    with pytest.raises(ValueError):
+        loaded.draw(4)
+    # The batch runner reads the same file
+    assert len(load_task_corpus(path)) == 3
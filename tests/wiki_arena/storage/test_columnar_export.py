@@ -0,0 +1,134 @@
+"""
+Tests for the incremental Parquet export and column-pruned queries.
+"""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from wiki_arena.models import GameConfig, GameError, ErrorType, GameResult, GameStatus, ModelConfig, Move
+from wiki_arena.ratings import LeaderboardGenerator
+from wiki_arena.storage import GameRepository, GameStorageService, StorageConfig
+from wiki_arena.storage.columnar import ColumnarExporter, ColumnarGames
+
+
+def make_game(game_id: str, model_name: str, steps: int, day: int = 1, target: str = "Target") -> GameResult:
+    return GameResult(
+        game_id=game_id,
+        config=GameConfig(
+            start_page_title="Start",
+            target_page_title=target,
+            model=ModelConfig(provider="openai", model_name=model_name),
+        ),
+        status=GameStatus.WON,
+        steps=steps,
+        path_taken=["Start", "Target"],
+        moves=[
+            Move(step=1, from_page_title="Start", error=GameError(type=ErrorType.MODEL_INVALID_LINK, message="no such link")),
+            Move(step=2, from_page_title="Start", to_page_title="Target"),
+        ],
+        start_timestamp=datetime(2025, 6, day, 12),
+        end_timestamp=datetime(2025, 6, day, 12, 5),
+        total_estimated_cost_usd=0.5,
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return GameStorageService(StorageConfig(storage_dir=str(tmp_path / "results"), enable_summary_csv=False))
+
+
+def test_export_is_incremental_and_partitioned(storage, tmp_path):
+    exporter = ColumnarExporter(storage.config, tmp_path / "columnar")
+    storage.store_game(make_game("g1", "gpt-4o", 3, day=1))
+    storage.store_game(make_game("g2", "org/model:v2", 5, day=2))
+    assert exporter.export() == {"games": 2, "moves": 4}
+
+    storage.store_game(make_game("g3", "gpt-4o", 4, day=1))
+    assert exporter.export() == {"games": 1, "moves": 2}
+    assert exporter.export() == {"games": 0, "moves": 0}
+
+    assert (tmp_path / "columnar" / "games" / "date=2025-06-02" / "model=org_model_v2").is_dir()
+    games = ColumnarGames(tmp_path / "columnar")
+    table = games.scan(columns=["game_id", "model_name", "steps"])
+    assert table.column_names == ["game_id", "model_name", "steps"]
+    assert sorted(table.column("game_id").to_pylist()) == ["g1", "g2", "g3"]
+
+    assert sorted(games.scan(columns=["game_id"], models=["gpt-4o"]).column("game_id").to_pylist()) == ["g1", "g3"]
+    assert games.scan(columns=["game_id"], since="2025-06-02").column("game_id").to_pylist() == ["g2"]
+    moves = games.scan(table="moves", columns=["game_id", "step", "error_type"], models=["org/model:v2"])
+    assert moves.to_pylist() == [
+        {"game_id": "g2", "step": 1, "error_type": "model_invalid_link"},
+        {"game_id": "g2", "step": 2, "error_type": None},
+    ]
+
+
+def test_compact_merges_partition_files_without_changing_rows(storage, tmp_path):
+    exporter = ColumnarExporter(storage.config, tmp_path / "columnar")
+    for i in range(3):
+        storage.store_game(make_game(f"g{i}", "gpt-4o", i + 1))
+        exporter.export()
+    partition = tmp_path / "columnar" / "games" / "date=2025-06-01" / "model=gpt-4o"
+    assert len(list(partition.glob("*.parquet"))) == 3
+
+    assert exporter.compact() == 4  # 2 game files and 2 move files fewer
+    assert len(list(partition.glob("*.parquet"))) == 1
+    storage.store_game(make_game("g3", "gpt-4o", 4))
+    exporter.export()
+    assert sorted(ColumnarGames(tmp_path / "columnar").scan(columns=["game_id"]).column("game_id").to_pylist()) == [
+        "g0", "g1", "g2", "g3"
+    ]
+
+
+def test_replaced_data_file_rebuilds_the_export(storage, tmp_path):
+    exporter = ColumnarExporter(storage.config, tmp_path / "columnar")
+    storage.store_game(make_game("old_1", "gpt-4o", 3))
+    storage.store_game(make_game("old_2", "gpt-4o", 3))
+    exporter.export()
+    storage.config.jsonl_path.unlink()
+    storage.store_game(make_game("new", "gpt-4o", 3))
+
+    exporter.export()
+    assert ColumnarGames(tmp_path / "columnar").scan(columns=["game_id"]).column("game_id").to_pylist() == ["new"]
+
+
+def test_replaced_data_file_of_the_same_size_rebuilds_the_export(storage, tmp_path):
+    exporter = ColumnarExporter(storage.config, tmp_path / "columnar")
+    storage.store_game(make_game("old_1", "gpt-4o", 3))
+    exporter.export()
+    storage.config.jsonl_path.unlink()
+    storage.store_game(make_game("new_1", "gpt-4o", 3))
+    storage.store_game(make_game("new_2", "gpt-4o", 3))
+
+    exporter.export()
+    assert sorted(ColumnarGames(tmp_path / "columnar").scan(columns=["game_id"]).column("game_id").to_pylist()) == [
+        "new_1", "new_2"
+    ]
+
+
+def test_game_stored_twice_is_exported_once(storage, tmp_path):
+    exporter = ColumnarExporter(storage.config, tmp_path / "columnar")
+    storage.store_game(make_game("g1", "gpt-4o", 3))
+    exporter.export()
+    storage.store_game(make_game("g1", "gpt-4o", 3))
+    storage.store_game(make_game("g2", "gpt-4o", 3))
+    storage.store_game(make_game("g2", "gpt-4o", 3))
+
+    assert exporter.export() == {"games": 1, "moves": 2}
+    assert sorted(ColumnarGames(tmp_path / "columnar").scan(columns=["game_id"]).column("game_id").to_pylist()) == [
+        "g1", "g2"
+    ]
+
+
+def test_leaderboard_from_columnar_export_matches_repository(storage, tmp_path):
+    for i, (alpha_steps, beta_steps) in enumerate([(3, 5), (4, 6), (7, 2)]):
+        storage.store_game(make_game(f"a{i}", "alpha", alpha_steps, target=f"Target {i}"))
+        storage.store_game(make_game(f"b{i}", "beta", beta_steps, target=f"Target {i}"))
+    ColumnarExporter(storage.config, tmp_path / "columnar").export()
+
+    from_repository = LeaderboardGenerator(GameRepository(storage.config)).generate_elo_ratings()
+    from_columnar = LeaderboardGenerator(ColumnarGames(tmp_path / "columnar")).generate_elo_ratings()
+    assert from_columnar == from_repository
+    assert from_columnar["alpha"] > from_columnar["beta"]
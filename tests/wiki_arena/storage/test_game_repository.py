@@ -0,0 +1,154 @@
+"""
+Tests for the binary game index and the lazily loading GameRepository.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from wiki_arena.models import GameConfig, GameResult, GameStatus, ModelConfig, Task
+from wiki_arena.storage import GameIndex, GameRepository, GameStorageService, StorageConfig
+from wiki_arena.storage import game_repository as repository_module
+
+
+def make_game(game_id: str, model_name: str, start: str = "Start", target: str = "Target", steps: int = 3) -> GameResult:
+    return GameResult(
+        game_id=game_id,
+        config=GameConfig(
+            start_page_title=start,
+            target_page_title=target,
+            model=ModelConfig(provider="random", model_name=model_name),
+        ),
+        status=GameStatus.WON,
+        steps=steps,
+        start_timestamp=datetime(2025, 1, 1),
+        end_timestamp=datetime(2025, 1, 1, 0, 5),
+        total_estimated_cost_usd=0.25,
+    )
+
+
+@pytest.fixture
+def storage_config(tmp_path):
+    return StorageConfig(storage_dir=str(tmp_path), enable_summary_csv=False)
+
+
+def append_without_index(storage_config, game: GameResult):
+    """Append a game the way older versions did, without an index record."""
+    with open(storage_config.jsonl_path, "a", encoding="utf-8") as f:
+        f.write(game.model_dump_json() + "\n")
+
+
+@pytest.fixture
+def count_scanned(monkeypatch):
+    scanned = []
+    scan_jsonl = repository_module.scan_jsonl
+
+    def counting_scan(path, start, end):
+        summaries, position = scan_jsonl(path, start, end)
+        scanned.extend(summary.game_id for summary in summaries)
+        return summaries, position
+
+    monkeypatch.setattr(repository_module, "scan_jsonl", counting_scan)
+    return scanned
+
+
+def test_stored_games_are_looked_up_through_the_index(storage_config, count_scanned):
+    storage = GameStorageService(storage_config)
+    storage.store_game(make_game("g1", "alpha"))
+    storage.store_game(make_game("g2", "beta"))
+    storage.store_game(make_game("g3", "alpha", start="Other"))
+
+    repository = GameRepository(storage_config)
+    task_id = Task(start_page_title="Start", target_page_title="Target").task_id
+
+    assert count_scanned == []
+    assert [game.game_id for game in repository.get_games_by_task_id(task_id)] == ["g1", "g2"]
+    assert [summary.game_id for summary in repository.get_summaries_by_model("alpha")] == ["g1", "g3"]
+    summary = repository.get_summary("g2")
+    assert (summary.model_name, summary.status, summary.steps, summary.total_estimated_cost_usd) == ("beta", "won", 3, 0.25)
+    assert repository.get_game_by_id("g3") == make_game("g3", "alpha", start="Other")
+    assert [game.game_id for game in repository.get_all_games()] == ["g1", "g2", "g3"]
+    assert storage.get_stored_game_ids() == {"g1", "g2", "g3"}
+
+
+def test_stored_ids_and_games_are_read_lazily(storage_config, monkeypatch):
+    storage = GameStorageService(storage_config)
+    for i in range(3):
+        storage.store_game(make_game(f"g{i}", "alpha"))
+    parsed = []
+    model_validate_json = GameResult.model_validate_json
+    monkeypatch.setattr(GameResult, "model_validate_json", lambda data: parsed.append(data) or model_validate_json(data))
+
+    def no_repository(*args, **kwargs):
+        raise AssertionError("the index covers the file")
+
+    monkeypatch.setattr("wiki_arena.storage.game_storage.GameRepository", no_repository)
+    assert storage.get_stored_game_ids() == {"g0", "g1", "g2"}
+
+    games = GameRepository(storage_config).get_all_games()
+    assert len(games) == 3 and parsed == []
+    assert games[1].game_id == "g1" and len(parsed) == 1
+    assert [game.game_id for game in games[1:]] == ["g1", "g2"]
+
+
+def test_stored_ids_include_unindexed_games(storage_config):
+    storage = GameStorageService(storage_config)
+    append_without_index(storage_config, make_game("old", "alpha"))
+    storage.store_game(make_game("new", "beta"))
+
+    assert storage.get_stored_game_ids() == {"old", "new"}
+
+
+def test_unindexed_games_are_indexed_once(storage_config, count_scanned):
+    append_without_index(storage_config, make_game("old_1", "alpha"))
+    GameStorageService(storage_config).store_game(make_game("new", "beta"))
+    append_without_index(storage_config, make_game("old_2", "alpha"))
+
+    repository = GameRepository(storage_config)
+    assert sorted(count_scanned) == ["old_1", "old_2"]
+    assert [summary.game_id for summary in repository.get_summaries()] == ["old_1", "new", "old_2"]
+
+    count_scanned.clear()
+    assert [game.game_id for game in GameRepository(storage_config).get_all_games()] == ["old_1", "new", "old_2"]
+    assert count_scanned == []
+
+
+def test_refresh_loads_only_appended_games(storage_config, count_scanned):
+    storage = GameStorageService(storage_config)
+    storage.store_game(make_game("g1", "alpha"))
+    repository = GameRepository(storage_config)
+
+    storage.store_game(make_game("g2", "beta"))
+    append_without_index(storage_config, make_game("g3", "alpha"))
+    # A line still being written is left for the next refresh
+    with open(storage_config.jsonl_path, "a", encoding="utf-8") as f:
+        f.write('{"game_id": "partial"')
+
+    repository.refresh_cache()
+    assert count_scanned == ["g3"]
+    assert [summary.game_id for summary in repository.get_summaries()] == ["g1", "g2", "g3"]
+    assert repository.get_game_by_id("g3").game_id == "g3"
+
+
+def test_replaced_data_file_rebuilds_the_index(storage_config):
+    storage = GameStorageService(storage_config)
+    storage.store_game(make_game("g1", "alpha"))
+    storage.store_game(make_game("g2", "alpha"))
+    storage_config.jsonl_path.unlink()
+    append_without_index(storage_config, make_game("other", "beta"))
+
+    repository = GameRepository(storage_config)
+    assert [summary.game_id for summary in repository.get_summaries()] == ["other"]
+    assert [summary.game_id for summary in GameIndex(storage_config.index_path).load()[0]] == ["other"]
+
+
+def test_torn_index_record_is_ignored_and_cut_off(storage_config):
+    storage = GameStorageService(storage_config)
+    storage.store_game(make_game("g1", "alpha"))
+    with open(storage_config.index_path, "ab") as f:
+        f.write(b"\x40\x00\x00\x00\x01")
+
+    assert [summary.game_id for summary in GameIndex(storage_config.index_path).load()[0]] == ["g1"]
+    GameStorageService(storage_config).store_game(make_game("g2", "alpha"))
+    assert [summary.game_id for summary in GameIndex(storage_config.index_path).load()[0]] == ["g1", "g2"]
+    assert [summary.game_id for summary in GameRepository(storage_config).get_summaries()] == ["g1", "g2"]
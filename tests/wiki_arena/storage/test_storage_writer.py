@@ -0,0 +1,148 @@
+"""
+Tests and a benchmark for group-committed game storage.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from statistics import mean
+
+import pytest
+
+from wiki_arena.models import GameConfig, GameResult, GameStatus, ModelConfig
+from wiki_arena.storage import FsyncPolicy, GameRepository, GameStorageService, GameStorageWriter, StorageConfig
+
+
+def make_game(game_id: str) -> GameResult:
+    return GameResult(
+        game_id=game_id,
+        config=GameConfig(
+            start_page_title="Start",
+            target_page_title="Target",
+            model=ModelConfig(provider="random", model_name="random"),
+        ),
+        status=GameStatus.WON,
+        steps=3,
+        path_taken=["Start", "Middle", "Target"],
+        start_timestamp=datetime(2025, 1, 1),
+        end_timestamp=datetime(2025, 1, 1, 0, 5),
+    )
+
+
+@pytest.fixture
+def storage_service(tmp_path):
+    return GameStorageService(StorageConfig(storage_dir=str(tmp_path)))
+
+
+def stored_ids(storage_service):
+    return [summary.game_id for summary in GameRepository(storage_service.config).get_summaries()]
+
+
+def test_games_are_group_committed_in_order(storage_service):
+    writer = GameStorageWriter(storage_service, max_batch_size=8, max_batch_delay_ms=50)
+    writer.start()
+    futures = [writer.submit(make_game(f"g{i}")) for i in range(20)]
+    writer.flush()
+
+    assert all(future.result() for future in futures)
+    assert stored_ids(storage_service) == [f"g{i}" for i in range(20)]
+    stats = writer.get_stats()
+    assert stats["stored"] == 20
+    assert stats["batches"] < 20
+    assert stats["fsyncs"] == stats["batches"]
+    # One header and one row per game
+    assert len(storage_service.config.csv_path.read_text().splitlines()) == 21
+    writer.close()
+
+
+def test_close_writes_queued_games(storage_service):
+    writer = GameStorageWriter(storage_service, fsync=FsyncPolicy.NEVER, max_batch_delay_ms=1000)
+    for i in range(5):
+        writer.submit(make_game(f"g{i}"))
+    writer.close()
+
+    assert stored_ids(storage_service) == [f"g{i}" for i in range(5)]
+    assert writer.get_stats()["fsyncs"] == 0
+
+
+@pytest.mark.asyncio
+async def test_submit_waits_for_room_when_the_queue_is_full(storage_service):
+    committing, release = threading.Event(), threading.Event()
+    store_games = storage_service.store_games
+
+    def slow_store_games(games, fsync=False):
+        committing.set()
+        release.wait(timeout=5)
+        return store_games(games, fsync=fsync)
+
+    storage_service.store_games = slow_store_games
+    writer = GameStorageWriter(storage_service, max_batch_size=1, queue_size=2)
+    first = writer.submit(make_game("g0"))
+    assert committing.wait(timeout=5)
+    queued = [writer.submit(make_game(f"g{i}")) for i in range(1, 3)]
+    assert writer.is_full()
+
+    waiting = asyncio.ensure_future(asyncio.to_thread(writer.submit, make_game("g3")))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+
+    release.set()
+    last = await asyncio.wait_for(waiting, timeout=5)
+    writer.close()
+    assert first.result() and all(future.result() for future in queued) and last.result()
+    assert stored_ids(storage_service) == ["g0", "g1", "g2", "g3"]
+    assert writer.get_stats()["waited"] == 1
+
+
+def test_start_cuts_off_an_interrupted_write(storage_service):
+    storage_service.store_game(make_game("before_crash"))
+    with open(storage_service.config.jsonl_path, "ab") as f:
+        f.write(b'{"game_id": "torn", "config": {')
+
+    writer = GameStorageWriter(storage_service)
+    writer.start()
+    writer.submit(make_game("after_restart")).result(timeout=5)
+    writer.close()
+
+    assert stored_ids(storage_service) == ["before_crash", "after_restart"]
+    assert storage_service.config.jsonl_path.read_bytes().count(b"\n") == 2
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("fsync", list(FsyncPolicy))
+async def test_storage_throughput_and_handler_latency(tmp_path, fsync):
+    """Games stored per second, and time added to game_ended handling, with and without the writer."""
+    games = [make_game(f"g{i}") for i in range(200)]
+
+    direct = GameStorageService(StorageConfig(storage_dir=str(tmp_path / "direct")))
+    direct_times = []
+    start = time.perf_counter()
+    for game in games:
+        t0 = time.perf_counter()
+        direct.store_games([game], fsync=fsync != FsyncPolicy.NEVER)
+        direct_times.append((time.perf_counter() - t0) * 1000)
+    direct_rate = len(games) / (time.perf_counter() - start)
+
+    writer = GameStorageWriter(GameStorageService(StorageConfig(storage_dir=str(tmp_path / "writer"))), fsync=fsync)
+    writer.start()
+    submit_times = []
+    start = time.perf_counter()
+    futures = []
+    for game in games:
+        t0 = time.perf_counter()
+        futures.append(writer.submit(game))
+        submit_times.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(0)
+    await asyncio.gather(*[asyncio.wrap_future(future) for future in futures])
+    writer_rate = len(games) / (time.perf_counter() - start)
+    stats = writer.get_stats()
+    writer.close()
+
+    print(
+        f"💾 fsync={fsync.value}: direct {direct_rate:.0f} games/s ({mean(direct_times):.3f} ms on the loop per game), "
+        f"writer {writer_rate:.0f} games/s ({mean(submit_times):.3f} ms on the loop per game, "
+        f"{stats['batches']} batches, p95 write latency {stats['latency']['p95_ms']} ms)"
+    )
+    assert all(future.result() for future in futures)
+    assert mean(submit_times) < mean(direct_times)
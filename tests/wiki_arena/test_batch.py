@@ -0,0 +1,112 @@
+"""
+Tests for the batch runner: corpus loading, concurrency caps and resuming.
+"""
+
+import asyncio
+import uuid
+from typing import Any, Dict, List
+
+import pytest
+
+import wiki_arena.batch as batch_module
+from wiki_arena.batch import BatchRunner, load_task_corpus
+from wiki_arena.language_models import LanguageModel
+from wiki_arena.models import AssistantMessage, AssistantToolCall, ModelCallMetrics, ModelConfig, Page, Task
+from wiki_arena.storage import GameStorageService, StorageConfig
+
+
+class FakeWikiService:
+    """Every page links straight to 'Target'."""
+
+    def __init__(self):
+        self.fetches: Dict[str, int] = {}
+
+    async def get_page(self, title: str, include_all_namespaces: bool = False) -> Page:
+        self.fetches[title] = self.fetches.get(title, 0) + 1
+        return Page(title=title, url=f"https://example/{title}", links=["Detour", "Target"])
+
+
+class DirectModel(LanguageModel):
+    """Always navigates to 'Target', tracking how many calls overlap per provider."""
+    active: Dict[str, int] = {}
+    peak: Dict[str, int] = {}
+
+    def _calculate_cost(self, input_tokens, output_tokens, cache_creation_tokens=0, cache_read_tokens=0):
+        return 0.0
+
+    def _format_tools(self, mcp_tools: List[Dict[str, Any]]) -> Any:
+        return mcp_tools
+
+    def _format_context(self, context) -> Any:
+        return context
+
+    async def generate_response(self, tools, context, game_state) -> AssistantMessage:
+        provider = self.model_config.provider
+        DirectModel.active[provider] = DirectModel.active.get(provider, 0) + 1
+        DirectModel.peak[provider] = max(DirectModel.peak.get(provider, 0), DirectModel.active[provider])
+        await asyncio.sleep(0.01)
+        DirectModel.active[provider] -= 1
+        tool_call = AssistantToolCall(id=uuid.uuid4().hex, name="navigate", arguments={"to_page_title": "Target"})
+        return AssistantMessage(tool_calls=[tool_call], metrics=ModelCallMetrics())
+
+
+@pytest.fixture(autouse=True)
+def fake_models(monkeypatch):
+    DirectModel.active, DirectModel.peak = {}, {}
+
+    def create(model_key: str):
+        provider = model_key.split("-")[0]
+        return DirectModel(ModelConfig(provider=provider, model_name=model_key))
+
+    monkeypatch.setattr(batch_module, "create_scheduled_model", create)
+
+
+@pytest.fixture
+def storage_service(tmp_path) -> GameStorageService:
+    return GameStorageService(StorageConfig(storage_dir=str(tmp_path)))
+
+
+@pytest.fixture
+def tasks() -> List[Task]:
+    return [Task(start_page_title=f"Start {i}", target_page_title="Target") for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_runs_all_games_within_provider_caps(storage_service, tasks):
+    wiki_service = FakeWikiService()
+    runner = BatchRunner(storage_service, wiki_service=wiki_service, max_concurrency=4, provider_concurrency={"slow": 1})
+    jobs = BatchRunner.build_jobs(tasks, ["slow-model", "fast-model"])
+
+    stats = await runner.run(jobs)
+
+    assert stats.completed == 12
+    assert stats.status_counts == {"won": 12}
+    assert DirectModel.peak["slow"] == 1
+    assert DirectModel.peak["fast"] > 1
+    assert storage_service.get_stored_game_ids() == {job.game_id for job in jobs}
+    # Both models share each start page fetch
+    assert all(wiki_service.fetches[task.start_page_title] == 1 for task in tasks)
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_stored_games(storage_service, tasks):
+    jobs = BatchRunner.build_jobs(tasks, ["fast-model"], repeats=2)
+    first = BatchRunner(storage_service, wiki_service=FakeWikiService())
+    await first.run(jobs[:5])
+
+    second = BatchRunner(storage_service, wiki_service=FakeWikiService())
+    stats = await second.run(jobs)
+
+    assert stats.skipped == 5
+    assert stats.completed == len(jobs) - 5
+    assert len(storage_service.get_stored_game_ids()) == len(jobs)
+
+
+def test_load_task_corpus(tmp_path):
+    tsv = tmp_path / "tasks.tsv"
+    tsv.write_text("# start\ttarget\nPhilosophy\tScience\t3\nCat\tDog\n", encoding="utf-8")
+    jsonl = tmp_path / "tasks.jsonl"
+    jsonl.write_text('{"start_page_title": "Cat", "target_page_title": "Dog"}\n', encoding="utf-8")
+
+    assert [t.task_id for t in load_task_corpus(tsv)] == ["Philosophy__to__Science", "Cat__to__Dog"]
+    assert load_task_corpus(jsonl)[0].target_page_title == "Dog"
@@ -0,0 +1,146 @@
+"""
+Tests for ContextBuilder link formats, index navigation and rolling history window.
+"""
+
+import pytest
+
+from wiki_arena.cli.context_tokens import compare_link_formats
+from wiki_arena.context_builder import ContextBuilder
+from wiki_arena.models import (
+    AssistantToolCall,
+    LinkFormat,
+    Page,
+    PageMessage,
+    SystemMessage,
+    ToolResultMessage,
+)
+
+
+@pytest.fixture
+def page() -> Page:
+    return Page(title="Python", url="https://en.wikipedia.org/wiki/Python", links=["Guido van Rossum", "Monty Python", "Snake"])
+
+
+def make_pages(count: int, links_per_page: int = 50):
+    titles = [f"Page {i}" for i in range(count)]
+    return [
+        Page(title=title, url=f"https://example/{i}", links=[titles[(i + 1) % count]] + [f"Filler {i}-{j}" for j in range(links_per_page)])
+        for i, title in enumerate(titles)
+    ]
+
+
+class TestLinkFormats:
+
+    def test_list_format_matches_original_message(self, page):
+        message = ContextBuilder().page_message(page, initial=True)
+
+        assert isinstance(message, PageMessage)
+        assert message.page_title == "Python"
+        assert message.content == (
+            "You are currently on the page 'Python'.\n"
+            f"Here are the available links:\n{page.links}"
+        )
+
+    def test_list_format_keeps_link_count_in_tool_result(self, page):
+        assert ContextBuilder().tool_result(page) == "Successfully navigated to 'Python'. It has 3 links."
+        assert ContextBuilder(LinkFormat.NEWLINE).tool_result(page) == "Successfully navigated to 'Python'."
+
+    def test_newline_format(self, page):
+        message = ContextBuilder(LinkFormat.NEWLINE).page_message(page)
+
+        assert message.content.startswith("You are now on the page 'Python'.")
+        assert message.content.endswith("Guido van Rossum\nMonty Python\nSnake")
+
+    def test_numbered_format_uses_index_tool(self, page):
+        builder = ContextBuilder(LinkFormat.NUMBERED)
+
+        assert "1. Guido van Rossum\n2. Monty Python\n3. Snake" in builder.page_message(page).content
+        assert [tool["name"] for tool in builder.get_tools()] == ["navigate_by_index"]
+        assert [tool["name"] for tool in ContextBuilder().get_tools()] == ["navigate"]
+
+
+class TestResolvePageTitle:
+
+    def test_resolves_title_and_index(self, page):
+        builder = ContextBuilder(LinkFormat.NUMBERED)
+
+        by_title = AssistantToolCall(id="1", name="navigate", arguments={"to_page_title": "Snake"})
+        by_index = AssistantToolCall(id="2", name="navigate_by_index", arguments={"link_index": 2})
+
+        assert builder.resolve_page_title(by_title, page) == "Snake"
+        assert builder.resolve_page_title(by_index, page) == "Monty Python"
+
+    @pytest.mark.parametrize("link_index", [0, 4, "two"])
+    def test_invalid_index_raises(self, page, link_index):
+        tool_call = AssistantToolCall(id="1", name="navigate_by_index", arguments={"link_index": link_index})
+
+        with pytest.raises(ValueError):
+            ContextBuilder(LinkFormat.NUMBERED).resolve_page_title(tool_call, page)
+
+
+class TestHistoryWindow:
+
+    def test_window_stubs_stale_listings_only_in_model_view(self):
+        builder = ContextBuilder(history_window=1)
+        pages = make_pages(3)
+        context = [SystemMessage(content="system"), builder.page_message(pages[0], initial=True)]
+        for page in pages[1:]:
+            context.append(ToolResultMessage(tool_call_id="x", content=builder.tool_result(page)))
+            context.append(builder.page_message(page))
+
+        built = builder.build(context)
+        listings = [m for m in built if isinstance(m, PageMessage)]
+
+        assert [m.content for m in listings[:-1]] == ["You were on the page 'Page 0'.", "You were on the page 'Page 1'."]
+        assert listings[-1] is context[-1]
+        # The stored transcript is untouched
+        assert "Filler 0-0" in context[1].content
+
+    def test_no_window_returns_context_unchanged(self):
+        context = [SystemMessage(content="system")]
+        assert ContextBuilder().build(context) is context
+
+
+class TestCacheLayout:
+
+    def build_transcript(self, builder, pages):
+        context = [SystemMessage(content="system"), builder.page_message(pages[0], initial=True)]
+        for page in pages[1:]:
+            context.append(ToolResultMessage(tool_call_id="x", content=builder.tool_result(page)))
+            context.append(builder.page_message(page))
+        return context
+
+    def test_compact_history_summarizes_visited_pages(self):
+        builder = ContextBuilder(compact_history=True)
+        context = self.build_transcript(builder, make_pages(3))
+
+        built = builder.build(context)
+
+        assert len(built) == 2
+        assert built[1].content.startswith("Pages visited so far: Page 0 -> Page 1\nYou are now on the page 'Page 2'.")
+        assert builder.stable_prefix_length(built) == 1
+
+    @pytest.mark.parametrize("builder", [
+        ContextBuilder(),
+        ContextBuilder(history_window=1),
+        ContextBuilder(history_window=2),
+    ])
+    def test_stable_prefix_is_sent_unchanged_next_turn(self, builder):
+        pages = make_pages(5)
+        for turn in range(2, len(pages)):
+            current = builder.build(self.build_transcript(builder, pages[:turn]))
+            following = builder.build(self.build_transcript(builder, pages[:turn + 1]))
+            stable = builder.stable_prefix_length(current)
+
+            assert stable >= 1
+            assert [m.content for m in following[:stable]] == [m.content for m in current[:stable]]
+
+
+def test_compact_formats_use_fewer_tokens():
+    results = compare_link_formats(make_pages(5), history_window=1)
+    totals = {strategy: sum(turns) for strategy, turns in results.items()}
+
+    assert totals["newline"] < totals["list"]
+    assert totals["list+window1"] < totals["list"]
+    assert totals["numbered+window1"] < totals["numbered"]
+    assert totals["list+compact"] < totals["list+window1"]
@@ -7,7 +7,7 @@ import pytest
 import asyncio
 import logging
 
-from wiki_arena import EventBus, GameEvent
+from wiki_arena import EventBus, GameEvent, OverflowPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -133,4 +133,176 @@ class TestEventBus:
         
         # Add another subscriber
         event_bus.subscribe("count_test", dummy_handler)
-        assert event_bus.get_subscriber_count("count_test") == 2 
\ No newline at end of file
+        assert event_bus.get_subscriber_count("count_test") == 2 
+
+@pytest.mark.unit
+class TestQueuedEventBus:
+    """Unit tests for per-subscriber queues and overflow policies."""
+
+    @pytest.mark.asyncio
+    async def test_publish_does_not_wait_for_slow_handler(self):
+        event_bus = EventBus(queued=True)
+        release = asyncio.Event()
+        fast_calls, slow_calls = [], []
+
+        async def slow_handler(event: GameEvent):
+            await release.wait()
+            slow_calls.append(event.data["step"])
+
+        async def fast_handler(event: GameEvent):
+            fast_calls.append(event.data["step"])
+
+        event_bus.subscribe("move_completed", slow_handler)
+        event_bus.subscribe("move_completed", fast_handler)
+
+        for step in range(3):
+            await asyncio.wait_for(
+                event_bus.publish(GameEvent(type="move_completed", game_id="g", data={"step": step})), timeout=0.1
+            )
+        await asyncio.sleep(0.01)
+
+        assert fast_calls == [0, 1, 2]
+        assert slow_calls == []
+        assert {s["handler"].split(".")[-1]: s["queue_depth"] for s in event_bus.get_stats()}["slow_handler"] == 2
+
+        release.set()
+        await event_bus.drain()
+        assert slow_calls == [0, 1, 2]
+        await event_bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_overflow_policies(self):
+        event_bus = EventBus(queued=True, queue_size=1)
+        release = asyncio.Event()
+        received = {"drop": [], "coalesce": []}
+
+        def handler(name):
+            async def handle(event: GameEvent):
+                await release.wait()
+                received[name].append((event.game_id, event.data["step"]))
+            return handle
+
+        event_bus.subscribe("move", handler("drop"), overflow=OverflowPolicy.DROP)
+        event_bus.subscribe("move", handler("coalesce"), queue_size=10, overflow=OverflowPolicy.COALESCE)
+
+        for step in range(4):
+            for game_id in ("a", "b"):
+                await event_bus.publish(GameEvent(type="move", game_id=game_id, data={"step": step}))
+                await asyncio.sleep(0)
+        release.set()
+        await event_bus.drain()
+
+        # The first event was taken by the worker and one more fit in the queue
+        assert received["drop"] == [("a", 0), ("b", 0)]
+        # Only the latest pending event per game survives
+        assert received["coalesce"] == [("a", 0), ("b", 3), ("a", 3)]
+        drop_stats, coalesce_stats = event_bus.get_stats()
+        assert drop_stats["dropped"] == 6
+        assert coalesce_stats["coalesced"] == 5
+        await event_bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_block_policy_applies_backpressure_and_isolates_errors(self):
+        event_bus = EventBus(queued=True, queue_size=1)
+        handled = []
+
+        async def failing_then_slow(event: GameEvent):
+            await asyncio.sleep(0.02)
+            if event.data["step"] == 0:
+                raise ValueError("Intentional test failure")
+            handled.append(event.data["step"])
+
+        event_bus.subscribe("move", failing_then_slow)
+
+        await event_bus.publish(GameEvent(type="move", game_id="g", data={"step": 0}))
+        await asyncio.sleep(0)
+        await event_bus.publish(GameEvent(type="move", game_id="g", data={"step": 1}))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(event_bus.publish(GameEvent(type="move", game_id="g", data={"step": 2})), timeout=0.005)
+        await event_bus.publish(GameEvent(type="move", game_id="g", data={"step": 3}))
+        await event_bus.shutdown()
+
+        assert handled == [1, 3]
+        assert event_bus.get_stats()[0]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lane_keeps_publish_order_across_handlers(self):
+        event_bus = EventBus(queued=True)
+        sent = []
+
+        async def slow_move(event: GameEvent):
+            await asyncio.sleep(0.01)
+            sent.append(("move", event.data["step"]))
+
+        async def game_ended(event: GameEvent):
+            sent.append(("ended", event.data["step"]))
+
+        event_bus.subscribe("move_completed", slow_move, lane="websocket")
+        event_bus.subscribe("game_ended", game_ended, lane="websocket")
+
+        for step in range(3):
+            await event_bus.publish(GameEvent(type="move_completed", game_id="g", data={"step": step}))
+        await event_bus.publish(GameEvent(type="game_ended", game_id="g", data={"step": 3}))
+        await event_bus.drain()
+
+        # Separate queues would have sent the end first
+        assert sent == [("move", 0), ("move", 1), ("move", 2), ("ended", 3)]
+        assert {stats["lane"] for stats in event_bus.get_stats()} == {"websocket"}
+        await event_bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_lane_is_ordered_per_game_and_does_not_block_on_a_full_game(self):
+        event_bus = EventBus(queued=True, queue_size=1)
+        release = asyncio.Event()
+        sent = []
+
+        async def move(event: GameEvent):
+            if event.game_id == "slow":
+                await release.wait()
+            sent.append((event.game_id, event.data["step"]))
+
+        event_bus.subscribe("move_completed", move, lane="websocket", overflow=OverflowPolicy.DROP)
+
+        for step in range(3):
+            await asyncio.wait_for(
+                event_bus.publish(GameEvent(type="move_completed", game_id="slow", data={"step": step})), timeout=0.1
+            )
+            await asyncio.sleep(0)
+        await event_bus.publish(GameEvent(type="move_completed", game_id="fast", data={"step": 0}))
+        await asyncio.sleep(0.01)
+        assert sent == [("fast", 0)]
+
+        release.set()
+        await event_bus.drain()
+        # The first move was being handled and the second queued, so only the third was dropped
+        assert sent == [("fast", 0), ("slow", 0), ("slow", 1)]
+        assert event_bus.get_stats()[0]["dropped"] == 1
+        assert event_bus._lanes["websocket"].partitions == {}
+        await event_bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_the_given_handlers_only(self):
+        event_bus = EventBus(queued=True)
+        release = asyncio.Event()
+        stored = []
+
+        async def store(event: GameEvent):
+            stored.append(event.game_id)
+
+        async def broadcast(event: GameEvent):
+            await release.wait()
+
+        event_bus.subscribe("game_ended", store)
+        event_bus.subscribe("game_ended", broadcast, lane="websocket")
+        await event_bus.publish(GameEvent(type="game_ended", game_id="g", data={}))
+
+        await asyncio.wait_for(event_bus.drain([store]), timeout=0.1)
+        assert stored == ["g"]
+        await event_bus.shutdown(drain=False)
+
+    def test_game_event_is_slotted_and_validated(self):
+        event = GameEvent(type="move", game_id="g", data={})
+
+        assert not hasattr(event, "__dict__")
+        with pytest.raises(ValueError):
+            GameEvent(type="", game_id="g", data={})
@@ -0,0 +1,128 @@
+"""
+Tests for interned page links and the compact page listings that reference them.
+"""
+
+import gc
+
+from pydantic import Field
+
+from wiki_arena.context_builder import ContextBuilder
+from wiki_arena.link_store import LinkStore, game_memory, games_memory
+from wiki_arena.models import (
+    GameConfig,
+    GameState,
+    LinkFormat,
+    ModelConfig,
+    Page,
+    PageMessage,
+    SystemMessage,
+    UserMessage,
+)
+
+
+def make_page(title: str, count: int = 300) -> Page:
+    return Page(title=title, url=f"https://example/{title}", links=[f"{title} link {i}" for i in range(count)])
+
+
+def make_state(game_id: str, builder: ContextBuilder, pages) -> GameState:
+    config = GameConfig(
+        start_page_title=pages[0].title,
+        target_page_title="Target",
+        model=ModelConfig(provider="random", model_name="random"),
+    )
+    context = [SystemMessage(content="Navigate to Target."), builder.page_message(pages[0], initial=True)]
+    context += [builder.page_message(page) for page in pages[1:]]
+    return GameState(game_id=game_id, config=config, current_page=pages[-1], context=context, steps=len(pages) - 1)
+
+
+def test_listings_share_interned_links():
+    store = LinkStore()
+    page = make_page("Start")
+    first = ContextBuilder(store=store).page_message(page, initial=True)
+    second = ContextBuilder(LinkFormat.NUMBERED, store=store).page_message(make_page("Start"))
+
+    assert first.links is second.links
+    assert store.get_stats()["hits"] == 1
+    assert "1. Start link 0\n2. Start link 1" in second.content
+
+    edited = ContextBuilder(store=store).page_message(make_page("Start", count=10))
+    assert edited.links is not first.links
+    assert len(first.links) == 300
+
+
+def test_store_drops_unreferenced_pages():
+    store = LinkStore()
+    message = ContextBuilder(store=store).page_message(make_page("Start"))
+    assert store.get_stats()["pages"] == 1
+
+    del message
+    gc.collect()
+    assert store.get_stats()["pages"] == 0
+
+
+def test_serialized_listing_is_unchanged():
+    page = make_page("Start", count=3)
+    message = ContextBuilder().page_message(page, initial=True)
+    explicit = PageMessage(content=message.content, page_title="Start")
+
+    assert message.model_dump(mode="json") == {
+        "role": "user",
+        "content": f"You are currently on the page 'Start'.\nHere are the available links:\n{page.links}",
+        "page_title": "Start",
+    }
+    assert explicit.model_dump_json() == message.model_dump_json()
+    assert explicit.links is None
+    assert message.model_dump(exclude={"content"}) == {"role": "user", "page_title": "Start"}
+    assert message.model_dump(include={"content"}) == {"content": message.content}
+
+
+def test_game_state_schema_is_unchanged():
+    class ListingMessage(UserMessage):
+        page_title: str = Field(..., description="The page whose links this message lists.")
+
+    expected = ListingMessage.model_json_schema()
+    for mode in ("validation", "serialization"):
+        schema = GameState.model_json_schema(mode=mode)["$defs"]["PageMessage"]
+        assert list(schema["properties"]) == ["role", "content", "page_title"]
+        assert schema["properties"] == expected["properties"]
+        assert schema["required"] == expected["required"]
+
+
+def test_game_state_round_trips_through_json():
+    builder = ContextBuilder()
+    state = make_state("game-1", builder, [make_page("Start"), make_page("Middle")])
+    state.context.append(UserMessage(content="You must use a tool to navigate."))
+
+    dumped = state.model_dump_json()
+    parsed = GameState.model_validate_json(dumped)
+
+    assert isinstance(parsed.context[1], PageMessage)
+    assert parsed.context[1].content == state.context[1].content
+    assert parsed.model_dump_json() == dumped
+
+
+def test_game_memory_counts_shared_links_once():
+    builder = ContextBuilder()
+    pages = [make_page(f"Page {i}") for i in range(10)]
+    first = make_state("game-1", builder, pages)
+    second = make_state("game-2", builder, pages[:1] + pages[5:])
+
+    memory = game_memory(first)
+    assert memory["listings"] == 10
+    assert memory["shared_pages"] == 10
+    assert memory["own_bytes"] < memory["rendered_bytes"]
+
+    report = games_memory([first, second])
+    assert [game["game_id"] for game in report["games"]] == ["game-1", "game-2"]
+    assert report["total_shared_bytes"] == memory["shared_bytes"]
+
+
+def test_state_snapshot_is_independent_but_shares_links():
+    state = make_state("game", ContextBuilder(store=LinkStore()), [make_page("Start"), make_page("Next")])
+    snapshot = state.model_copy(deep=True)
+    state.context.append(UserMessage(content="later"))
+    state.steps += 1
+
+    assert len(snapshot.context) == 3 and snapshot.steps == 1
+    assert snapshot.context[1].links is state.context[1].links
+    assert snapshot.context[2].content == state.context[2].content
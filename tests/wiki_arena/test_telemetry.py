@@ -0,0 +1,65 @@
+"""
+Tests for span histograms and their Prometheus export.
+"""
+
+import pytest
+
+from wiki_arena import EventBus, GameEvent, SpanRecorder, spans
+
+
+def test_span_records_histogram_and_renders_prometheus():
+    recorder = SpanRecorder(buckets=(0.01, 0.1, 1.0))
+    recorder.observe("game.llm_wait", 0.05, provider="openai")
+    recorder.observe("game.llm_wait", 0.5, provider="openai")
+    recorder.observe("game.llm_wait", 0.1, provider="openai")  # bucket bounds are inclusive
+    with recorder.span("game.context_format"):
+        pass
+
+    text = recorder.render_prometheus()
+
+    assert "# TYPE wiki_arena_span_duration_seconds histogram" in text
+    assert 'wiki_arena_span_duration_seconds_bucket{span="game.llm_wait",provider="openai",le="0.01"} 0' in text
+    assert 'wiki_arena_span_duration_seconds_bucket{span="game.llm_wait",provider="openai",le="0.1"} 2' in text
+    assert 'wiki_arena_span_duration_seconds_bucket{span="game.llm_wait",provider="openai",le="+Inf"} 3' in text
+    assert 'wiki_arena_span_duration_seconds_count{span="game.llm_wait",provider="openai"} 3' in text
+    assert 'wiki_arena_span_duration_seconds_count{span="game.context_format"} 1' in text
+    assert "wiki_arena_span_sample_rate 1.0" in text
+
+    stats = {stat["span"]: stat for stat in recorder.get_stats()}
+    assert stats["game.llm_wait"]["count"] == 3
+    assert stats["game.llm_wait"]["p50_ms_le"] == pytest.approx(100.0)
+
+
+def test_label_values_are_escaped():
+    recorder = SpanRecorder()
+    recorder.observe("event.handler", 0.001, handler='Handler."quoted"')
+
+    assert 'handler="Handler.\\"quoted\\""' in recorder.render_prometheus()
+
+
+def test_sampling_skips_spans():
+    recorder = SpanRecorder(sample_rate=0.0)
+    for _ in range(100):
+        with recorder.span("game.turn"):
+            pass
+    recorder.observe("game.turn", 0.1)
+
+    assert recorder.get_stats() == []
+    with pytest.raises(ValueError):
+        recorder.sample_rate = 1.5
+
+
+@pytest.mark.asyncio
+async def test_event_handler_latency_is_exported():
+    spans.reset()
+    bus = EventBus()
+
+    async def handle(event: GameEvent):
+        pass
+
+    bus.subscribe("move_completed", handle)
+    await bus.publish(GameEvent(type="move_completed", game_id="g1", data={}))
+
+    handler_stats = [stat for stat in spans.get_stats() if stat["span"] == "event.handler"]
+    assert handler_stats[0]["labels"]["event_type"] == "move_completed"
+    assert handler_stats[0]["count"] == 1
@@ -0,0 +1,99 @@
+"""
+Tests for batched candidate validation in the task selector and live service (no network).
+"""
+
+import asyncio
+from typing import List, Set
+
+import httpx
+import pytest
+
+from wiki_arena.wikipedia.live_service import LiveWikiService
+from wiki_arena.wikipedia.task_selector import WikipediaTaskSelector
+
+
+class FakeBatchService:
+    """Answers link checks for whole candidate batches and records the calls."""
+
+    def __init__(self, random_pages: List[str], with_outgoing: Set[str], with_incoming: Set[str]):
+        self.random_pages = random_pages
+        self.with_outgoing = with_outgoing
+        self.with_incoming = with_incoming
+        self.calls: List[str] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def get_random_pages(self, count: int = 20) -> List[str]:
+        return list(self.random_pages)
+
+    async def _check(self, name: str, titles: List[str], valid: Set[str]) -> Set[str]:
+        self.calls.append(name)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {title for title in titles if title in valid}
+
+    async def pages_with_outgoing_links(self, titles: List[str]) -> Set[str]:
+        return await self._check("outgoing", titles, self.with_outgoing)
+
+    async def pages_with_incoming_links(self, titles: List[str]) -> Set[str]:
+        return await self._check("incoming", titles, self.with_incoming)
+
+
+@pytest.mark.asyncio
+async def test_select_task_validates_batch_in_two_concurrent_requests():
+    service = FakeBatchService(
+        random_pages=["Category:Skip", "Dead end", "Alpha", "Beta", "Orphan", "Gamma"],
+        with_outgoing={"Alpha", "Beta", "Gamma", "Orphan"},
+        with_incoming={"Alpha", "Beta", "Gamma", "Dead end"},
+    )
+    selector = WikipediaTaskSelector(live_wiki_service=service)
+
+    task = await selector.select_task_async()
+
+    # First start candidate in order, then the first different one with incoming links
+    assert (task.start_page_title, task.target_page_title) == ("Alpha", "Dead end")
+    assert sorted(service.calls) == ["incoming", "outgoing"]
+    assert service.peak_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_find_valid_pages_keep_candidate_order():
+    service = FakeBatchService([], with_outgoing={"C", "B"}, with_incoming={"A", "C"})
+    selector = WikipediaTaskSelector(live_wiki_service=service)
+
+    assert await selector._find_valid_start_page(["A", "B", "C"]) == "B"
+    assert await selector._find_valid_target_page(["A", "B", "C"], exclude_page="A") == "C"
+    assert await selector._find_valid_start_page(["A"]) is None
+
+
+@pytest.mark.asyncio
+async def test_live_service_checks_many_titles_per_request(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        requests.append(params)
+        if "plcontinue" not in params:
+            # The shared result limit ran out after the first page's links
+            return httpx.Response(200, json={
+                "continue": {"plcontinue": "2|0|X", "continue": "||"},
+                "query": {
+                    "normalized": [{"from": "alpha", "to": "Alpha"}],
+                    "pages": [{"title": "Alpha", "links": [{"title": "X"}]}, {"title": "Beta"}, {"title": "Gamma"}],
+                },
+            })
+        return httpx.Response(200, json={
+            "query": {"pages": [{"title": "Alpha"}, {"title": "Beta", "links": [{"title": "Y"}]}, {"title": "Gamma"}]},
+        })
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs))
+
+    found = await LiveWikiService().pages_with_outgoing_links(["alpha", "Beta", "Gamma"])
+
+    assert found == {"alpha", "Beta"}
+    assert len(requests) == 2
+    assert requests[0]["titles"] == "alpha|Beta|Gamma"
+    assert requests[1]["plcontinue"] == "2|0|X"
@@ -0,0 +1,62 @@
+"""
+Tests for the multi-title link checks of LiveWikiService against a mocked API.
+"""
+
+import functools
+
+import httpx
+import pytest
+
+from wiki_arena.wikipedia.live_service import LiveWikiService
+
+LINKS = {"Big": [f"Big {i}" for i in range(1500)], "Small": ["Small 0", "Small 1"], "Orphan": []}
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    """Serve LINKS like the API: a multi-title query shares one limit of 500 links, in title order."""
+    seen = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        titles = params["titles"].split("|")
+        seen.append(params)
+        if params.get("pllimit") == "1":
+            links = [{"ns": 0, "title": link} for link in LINKS[titles[0]][:1]]
+            return httpx.Response(200, json={"query": {"pages": {"1": {"title": titles[0], "links": links}}}})
+
+        stream = [(title, link) for title in titles for link in LINKS[title]]
+        offset = int(params.get("plcontinue", 0))
+        shown = stream[offset:offset + 500]
+        pages = [
+            {"title": title, "links": [{"ns": 0, "title": link} for owner, link in shown if owner == title]}
+            for title in titles
+        ]
+        data = {"query": {"pages": pages}}
+        if offset + 500 < len(stream):
+            data["continue"] = {"plcontinue": str(offset + 500), "continue": "||"}
+        return httpx.Response(200, json=data)
+
+    monkeypatch.setattr(httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handle)))
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_orphan_title_does_not_page_through_other_links(requests):
+    service = LiveWikiService(base_url="http://wiki.test/w/api.php")
+
+    found = await service.pages_with_outgoing_links(["Big", "Small", "Orphan"])
+
+    assert found == {"Big", "Small"}
+    multi = [params for params in requests if "|" in params["titles"]]
+    single = [params["titles"] for params in requests if "|" not in params["titles"]]
+    assert len(multi) == 1 + LiveWikiService.MAX_LINK_CHECK_CONTINUATIONS
+    assert sorted(single) == ["Orphan", "Small"]
+
+
+@pytest.mark.asyncio
+async def test_titles_resolved_without_continuing(requests):
+    service = LiveWikiService(base_url="http://wiki.test/w/api.php")
+
+    assert await service.pages_with_outgoing_links(["Small", "Orphan"]) == {"Small"}
+    assert len(requests) == 1